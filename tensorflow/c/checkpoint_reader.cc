@@ -17,6 +17,8 @@ limitations under the License.
 
 #include <unordered_set>
 
+#include "tensorflow/core/framework/tensor_slice.h"
+#include "tensorflow/core/lib/core/errors.h"
 #include "tensorflow/core/lib/core/status.h"
 #include "tensorflow/core/lib/core/stringpiece.h"
 #include "tensorflow/core/platform/env.h"
@@ -31,7 +33,10 @@ class TensorSliceReader;
 
 CheckpointReader::CheckpointReader(const string& filename,
                                    TF_Status* out_status)
-    : reader_(nullptr), v2_reader_(nullptr), var_to_shape_map_ptr_(nullptr) {
+    : reader_(nullptr),
+      v2_reader_(nullptr),
+      var_to_shape_map_ptr_(nullptr),
+      var_to_data_type_map_ptr_(nullptr) {
   // Depending on whether this is a V2 ckpt, initializes "reader_" or
   // "v2_reader_".
   std::vector<string> v2_path;
@@ -43,7 +48,7 @@ CheckpointReader::CheckpointReader(const string& filename,
       Set_TF_Status_from_Status(out_status, v2_reader_->status());
       return;
     }
-    var_to_shape_map_ptr_ = BuildV2VarToShapeMap();
+    BuildV2VarMaps(&var_to_shape_map_ptr_, &var_to_data_type_map_ptr_);
   } else {
     reader_ = new TensorSliceReader(filename);
     if (!reader_->status().ok()) {
@@ -52,11 +57,19 @@ CheckpointReader::CheckpointReader(const string& filename,
     }
     var_to_shape_map_ptr_ =
         new TensorSliceReader::VarToShapeMap(reader_->GetVariableToShapeMap());
+    var_to_data_type_map_ptr_ = new VarToDataTypeMap;
+    for (const auto& name_and_shape : *var_to_shape_map_ptr_) {
+      DataType dtype;
+      if (reader_->HasTensor(name_and_shape.first, nullptr, &dtype)) {
+        (*var_to_data_type_map_ptr_)[name_and_shape.first] = dtype;
+      }
+    }
   }
 }
 
 CheckpointReader::~CheckpointReader() {
   delete var_to_shape_map_ptr_;
+  delete var_to_data_type_map_ptr_;
   delete reader_;
   delete v2_reader_;
 }
@@ -74,6 +87,12 @@ CheckpointReader::GetVariableToShapeMap() const {
   return *var_to_shape_map_ptr_;
 }
 
+const CheckpointReader::VarToDataTypeMap&
+CheckpointReader::GetVariableToDataTypeMap() const {
+  CHECK(var_to_data_type_map_ptr_);
+  return *var_to_data_type_map_ptr_;
+}
+
 const string CheckpointReader::DebugString() const {
   if (reader_ != nullptr) return reader_->DebugString();
   return v2_reader_->DebugString();
@@ -100,7 +119,79 @@ void CheckpointReader::GetTensor(
   }
 }
 
-TensorSliceReader::VarToShapeMap* CheckpointReader::BuildV2VarToShapeMap() {
+void CheckpointReader::GetTensorSlice(
+    const string& name, const std::vector<int64>& begin,
+    const std::vector<int64>& size,
+    std::unique_ptr<tensorflow::Tensor>* out_tensor,
+    TF_Status* out_status) const {
+  Status status;
+  tensorflow::DataType dtype;
+  tensorflow::TensorShape shape;
+  if (reader_ != nullptr) {
+    status = errors::Unimplemented(
+        "Reading slices is only supported for V2 checkpoints");
+  } else {
+    status = v2_reader_->LookupDtypeAndShape(name, &dtype, &shape);
+  }
+  if (status.ok() && (static_cast<int>(begin.size()) != shape.dims() ||
+                      static_cast<int>(size.size()) != shape.dims())) {
+    status = errors::InvalidArgument(
+        "Expected begin and size of length ", shape.dims(), " for tensor ",
+        name, " of shape ", shape.DebugString(), ", got ", begin.size(),
+        " and ", size.size());
+  }
+  TensorSlice slice(shape.dims());
+  TensorShape slice_shape;
+  for (int d = 0; status.ok() && d < shape.dims(); ++d) {
+    const int64 length = size[d] == -1 ? shape.dim_size(d) - begin[d] : size[d];
+    if (begin[d] < 0 || length < 0 || begin[d] + length > shape.dim_size(d)) {
+      status = errors::InvalidArgument(
+          "Slice of size ", length, " at ", begin[d], " is out of bounds in "
+          "dimension ", d, " of tensor ", name, " of shape ",
+          shape.DebugString());
+      break;
+    }
+    slice.set_start(d, begin[d]);
+    slice.set_length(d, length);
+    slice_shape.AddDim(length);
+  }
+  if (status.ok()) {
+    out_tensor->reset(new Tensor(dtype, slice_shape));
+    if (shape.dims() == 0) {
+      status = v2_reader_->Lookup(name, out_tensor->get());
+    } else if (slice_shape.num_elements() > 0) {
+      status = v2_reader_->LookupSlice(name, slice, out_tensor->get());
+    }
+    if (!status.ok()) out_tensor->reset();
+  }
+  if (!status.ok()) {
+    Set_TF_Status_from_Status(out_status, status);
+  }
+}
+
+void CheckpointReader::GetTensorDataLocation(const string& name,
+                                             string* filename, int64* offset,
+                                             DataType* dtype,
+                                             TensorShape* shape,
+                                             TF_Status* out_status) const {
+  Status status;
+  if (reader_ != nullptr) {
+    status = errors::Unimplemented(
+        "Tensors can only be memory-mapped from V2 checkpoints");
+  } else {
+    status = v2_reader_->LookupDtypeAndShape(name, dtype, shape);
+    if (status.ok()) {
+      status = v2_reader_->LookupDataLocation(name, filename, offset);
+    }
+  }
+  if (!status.ok()) {
+    Set_TF_Status_from_Status(out_status, status);
+  }
+}
+
+void CheckpointReader::BuildV2VarMaps(
+    TensorSliceReader::VarToShapeMap** var_to_shape_map,
+    VarToDataTypeMap** var_to_data_type_map) {
   CHECK(v2_reader_ != nullptr);
   CHECK(v2_reader_->status().ok());
 
@@ -123,18 +214,18 @@ TensorSliceReader::VarToShapeMap* CheckpointReader::BuildV2VarToShapeMap() {
   }
 
   // Second pass: adds the entries, ignoring the filtered keys.
-  TensorSliceReader::VarToShapeMap* var_to_shape_map =
-      new TensorSliceReader::VarToShapeMap;
+  *var_to_shape_map = new TensorSliceReader::VarToShapeMap;
+  *var_to_data_type_map = new VarToDataTypeMap;
   v2_reader_->Seek(kHeaderEntryKey);
   for (v2_reader_->Next(); v2_reader_->Valid(); v2_reader_->Next()) {
     if (filtered_keys.count(v2_reader_->key().ToString()) > 0) continue;
     CHECK(entry.ParseFromArray(v2_reader_->value().data(),
                                v2_reader_->value().size()))
         << entry.InitializationErrorString();
-    (*var_to_shape_map)[v2_reader_->key().ToString()] =
-        TensorShape(entry.shape());
+    const string key = v2_reader_->key().ToString();
+    (**var_to_shape_map)[key] = TensorShape(entry.shape());
+    (**var_to_data_type_map)[key] = entry.dtype();
   }
-  return var_to_shape_map;  // Owned by caller.
 }
 
 }  // namespace checkpoint
@@ -16,8 +16,12 @@ limitations under the License.
 #ifndef TENSORFLOW_C_CHECKPOINT_READER_H
 #define TENSORFLOW_C_CHECKPOINT_READER_H
 
+#include <unordered_map>
+#include <vector>
+
 #include "tensorflow/c/tf_status_helper.h"
 #include "tensorflow/core/framework/tensor_shape.h"
+#include "tensorflow/core/framework/types.pb.h"
 #include "tensorflow/core/lib/core/status.h"
 #include "tensorflow/core/platform/types.h"
 #include "tensorflow/core/util/tensor_bundle/tensor_bundle.h"
@@ -37,6 +41,8 @@ class TensorSliceReader;
 // variables.
 class CheckpointReader {
  public:
+  typedef std::unordered_map<string, DataType> VarToDataTypeMap;
+
   CheckpointReader(const string& filepattern, TF_Status* out_status);
   ~CheckpointReader();
 
@@ -47,21 +53,46 @@ class CheckpointReader {
   // tensor are combined into a single entry.
   const TensorSliceReader::VarToShapeMap& GetVariableToShapeMap() const;
 
+  // Returns a map from variable names to their data type.  Slices of a
+  // partitioned tensor are combined into a single entry.
+  const VarToDataTypeMap& GetVariableToDataTypeMap() const;
+
   // Attempts to look up the tensor named "name" and stores the found result in
   // "out_tensor".
   void GetTensor(const string& name,
                  std::unique_ptr<tensorflow::Tensor>* out_tensor,
                  TF_Status* out_status) const;
 
+  // Reads the slice of the tensor named "name" that starts at "begin" and has
+  // "size" elements in each dimension, and stores it in "out_tensor".  A size
+  // of -1 selects all the remaining elements of a dimension.  Only the bytes of
+  // the slice are read where the checkpoint layout allows it.  Only supported
+  // for V2 checkpoints.
+  void GetTensorSlice(const string& name, const std::vector<int64>& begin,
+                      const std::vector<int64>& size,
+                      std::unique_ptr<tensorflow::Tensor>* out_tensor,
+                      TF_Status* out_status) const;
+
+  // Looks up where the bytes of the tensor named "name" are stored in a V2
+  // checkpoint, so that they can be memory-mapped: see
+  // BundleReader::LookupDataLocation().  Also stores the tensor's dtype and
+  // shape in "dtype" and "shape".
+  void GetTensorDataLocation(const string& name, string* filename,
+                             int64* offset, DataType* dtype,
+                             TensorShape* shape, TF_Status* out_status) const;
+
  private:
-  // Uses "v2_reader_" to build a "var name -> shape" map; owned by caller.
+  // Uses "v2_reader_" to build the "var name -> shape" and "var name ->
+  // dtype" maps; both owned by caller.
   // REQUIRES: "v2_reader_ != nullptr && v2_reader_.status().ok()".
-  TensorSliceReader::VarToShapeMap* BuildV2VarToShapeMap();
+  void BuildV2VarMaps(TensorSliceReader::VarToShapeMap** var_to_shape_map,
+                      VarToDataTypeMap** var_to_data_type_map);
 
   // Invariant: exactly one of "reader_" and "v2_reader_" is non-nullptr.
   TensorSliceReader* reader_;                               // Owned.
   BundleReader* v2_reader_;                                 // Owned.
   TensorSliceReader::VarToShapeMap* var_to_shape_map_ptr_;  // Owned.
+  VarToDataTypeMap* var_to_data_type_map_ptr_;              // Owned.
 
   TF_DISALLOW_COPY_AND_ASSIGN(CheckpointReader);
 };
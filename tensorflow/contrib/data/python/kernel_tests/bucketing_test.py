@@ -28,6 +28,7 @@ from tensorflow.python.framework import tensor_shape
 from tensorflow.python.ops import array_ops
 from tensorflow.python.ops import math_ops
 from tensorflow.python.ops import string_ops
+from tensorflow.python.ops import variables
 from tensorflow.python.platform import test
 
 
@@ -95,6 +96,49 @@ class BucketingTest(test.TestCase):
       self.assertAllEqual([0, 0, 0], sess.run(get_next))
       self.assertAllEqual([1], sess.run(get_next))
 
+  def testWindowSizeFunc(self):
+    components = np.array([0, 0, 1, 1, 1, 0, 0, 1, 0], dtype=np.int64)
+    iterator = dataset_ops.Iterator.from_dataset(
+        dataset_ops.Dataset.from_tensor_slices(components)
+        .group_by_window(lambda x: x % 2, lambda _, xs: xs.batch(3),
+                         window_size_func=lambda key: key + 2))
+    init_op = iterator.initializer
+    get_next = iterator.get_next()
+
+    with self.test_session() as sess:
+      sess.run(init_op)
+      # Even elements are grouped in windows of 2, and odd elements in
+      # windows of 3.
+      self.assertAllEqual([0, 0], sess.run(get_next))
+      self.assertAllEqual([1, 1, 1], sess.run(get_next))
+      self.assertAllEqual([0, 0], sess.run(get_next))
+      self.assertAllEqual([0], sess.run(get_next))
+      self.assertAllEqual([1], sess.run(get_next))
+      with self.assertRaises(errors.OutOfRangeError):
+        sess.run(get_next)
+
+  def testInvalidWindowSizeFunc(self):
+    iterator = dataset_ops.Iterator.from_dataset(
+        dataset_ops.Dataset.range(10)
+        .group_by_window(lambda x: x % 2, lambda _, xs: xs.batch(4),
+                         window_size_func=lambda key: key - 1))
+    init_op = iterator.initializer
+    get_next = iterator.get_next()
+
+    with self.test_session() as sess:
+      sess.run(init_op)
+      with self.assertRaisesRegexp(errors.InvalidArgumentError,
+                                   "Window size must be greater than zero"):
+        sess.run(get_next)
+
+  def testWindowSizeAndWindowSizeFuncAreExclusive(self):
+    dataset = dataset_ops.Dataset.range(10)
+    with self.assertRaises(ValueError):
+      dataset.group_by_window(lambda x: x % 2, lambda _, xs: xs.batch(4))
+    with self.assertRaises(ValueError):
+      dataset.group_by_window(lambda x: x % 2, lambda _, xs: xs.batch(4), 4,
+                              window_size_func=lambda _: 4)
+
   def testReduceFuncError(self):
     components = np.random.randint(100, size=(200,)).astype(np.int64)
 
@@ -152,9 +196,7 @@ class BucketingTest(test.TestCase):
 
 
 # NOTE(mrry): These tests are based on the tests in
-# bucket_ops_test.py. Currently, different batch sizes for each key
-# are not supported, although this would be possible to add to
-# `Dataset.group_by_window()`.
+# bucket_ops_test.py.
 class BucketTest(test.TestCase):
 
   def _dynamicPad(self, bucket, window, window_size):
@@ -288,5 +330,139 @@ class BucketTest(test.TestCase):
           np.arange(64, 128, 2, dtype=np.int64), bucketed_values_even1[0])
 
 
+class BucketBySequenceLengthTest(test.TestCase):
+
+  def _makeDataset(self, lengths):
+    def _map_fn(x):
+      return x, array_ops.fill([math_ops.cast(x, dtypes.int32)], x)
+
+    return (dataset_ops.Dataset.from_tensor_slices(lengths)
+            .map(_map_fn)
+            .bucket_by_sequence_length(
+                lambda _, sequence: array_ops.shape(sequence)[0],
+                bucket_boundaries=[3],
+                bucket_batch_sizes=[2, 3]))
+
+  def testBucketBySequenceLength(self):
+    lengths = np.array([1, 2, 3, 4, 5, 1, 6], dtype=np.int64)
+    dataset = self._makeDataset(lengths)
+    self.assertEqual([[None], [None, None]],
+                     [s.as_list() for s in dataset.output_shapes])
+    iterator = dataset.make_initializable_iterator()
+    init_op = iterator.initializer
+    get_next = iterator.get_next()
+
+    with self.test_session() as sess:
+      sess.run(variables.local_variables_initializer())
+      sess.run(init_op)
+
+      # The batches of the first bucket are padded to its longest length,
+      # even when their elements are shorter.
+      self.assertAllEqual(([1, 2], [[1, 0], [2, 2]]), sess.run(get_next))
+      # The batches of the last bucket are padded to their longest element.
+      self.assertAllEqual(
+          ([3, 4, 5], [[3, 3, 3, 0, 0], [4, 4, 4, 4, 0], [5, 5, 5, 5, 5]]),
+          sess.run(get_next))
+      # The final batches of each bucket are produced in bucket order.
+      self.assertAllEqual(([1], [[1, 0]]), sess.run(get_next))
+      self.assertAllEqual(([6], [[6, 6, 6, 6, 6, 6]]), sess.run(get_next))
+      with self.assertRaises(errors.OutOfRangeError):
+        sess.run(get_next)
+
+  def testPaddingStats(self):
+    lengths = np.array([1, 2, 3, 4, 5, 1, 6], dtype=np.int64)
+    dataset = self._makeDataset(lengths)
+    stats = dataset.stats()
+    iterator = dataset.make_initializable_iterator()
+    init_op = iterator.initializer
+    get_next = iterator.get_next()
+
+    with self.test_session() as sess:
+      sess.run(variables.local_variables_initializer())
+      sess.run(init_op)
+      self.assertEqual(0, sess.run(stats["num_batches"]))
+      self.assertEqual(0.0, sess.run(stats["padding_waste"]))
+
+      with self.assertRaises(errors.OutOfRangeError):
+        while True:
+          sess.run(get_next)
+
+      results = sess.run(stats)
+      self.assertEqual(4, results["num_batches"])
+      self.assertEqual(7, results["num_elements"])
+      self.assertEqual(sum(lengths), results["total_length"])
+      # 2 * 2 + 3 * 5 + 1 * 2 + 1 * 6.
+      self.assertEqual(27, results["total_padded_length"])
+      self.assertAllClose(5.0 / 27.0, results["padding_waste"])
+
+  def testPaddingValues(self):
+    dataset = (dataset_ops.Dataset.from_tensor_slices(
+        np.array([1, 2], dtype=np.int32))
+               .map(lambda x: array_ops.fill([x], x))
+               .bucket_by_sequence_length(
+                   lambda x: array_ops.shape(x)[0],
+                   bucket_boundaries=[4],
+                   bucket_batch_sizes=[2, 2],
+                   padding_values=-1))
+    iterator = dataset.make_initializable_iterator()
+
+    with self.test_session() as sess:
+      sess.run(variables.local_variables_initializer())
+      sess.run(iterator.initializer)
+      self.assertAllEqual([[1, -1, -1], [2, 2, -1]],
+                          sess.run(iterator.get_next()))
+
+  def testPadsOnlyMeasuredDimensions(self):
+    def _map_fn(x):
+      # The target is longer than the source, whose first dimension is the
+      # length, and the source has a second unknown dimension.
+      return (array_ops.fill([x, 5 - x], x),
+              array_ops.fill([x + 2], x))
+
+    def _make_dataset(padded_shapes=None):
+      return (dataset_ops.Dataset.from_tensor_slices(
+          np.array([1, 2, 3], dtype=np.int32))
+              .map(_map_fn)
+              .bucket_by_sequence_length(
+                  lambda source, _: array_ops.shape(source)[0],
+                  bucket_boundaries=[5],
+                  bucket_batch_sizes=[3, 1],
+                  padded_shapes=padded_shapes))
+
+    iterator = _make_dataset().make_initializable_iterator()
+    explicit_iterator = _make_dataset(
+        padded_shapes=([-1, -1], [-1])).make_initializable_iterator()
+
+    with self.test_session() as sess:
+      sess.run(variables.local_variables_initializer())
+      sess.run([iterator.initializer, explicit_iterator.initializer])
+      source, target = sess.run(iterator.get_next())
+      # Only the length is padded to the longest length of the bucket.
+      self.assertAllEqual(
+          [[[1, 1, 1, 1], [0, 0, 0, 0], [0, 0, 0, 0], [0, 0, 0, 0]],
+           [[2, 2, 2, 0], [2, 2, 2, 0], [0, 0, 0, 0], [0, 0, 0, 0]],
+           [[3, 3, 0, 0], [3, 3, 0, 0], [3, 3, 0, 0], [0, 0, 0, 0]]],
+          source)
+      self.assertAllEqual(
+          [[1, 1, 1, 0, 0], [2, 2, 2, 2, 0], [3, 3, 3, 3, 3]], target)
+      # Dimensions of -1 are padded to the longest element of the batch.
+      source, target = sess.run(explicit_iterator.get_next())
+      self.assertEqual((3, 3, 4), source.shape)
+      self.assertEqual((3, 5), target.shape)
+
+  def testInvalidArguments(self):
+    dataset = dataset_ops.Dataset.range(10).map(
+        lambda x: array_ops.fill([math_ops.cast(x, dtypes.int32)], x))
+    length_fn = lambda x: array_ops.shape(x)[0]
+    with self.assertRaises(ValueError):
+      dataset.bucket_by_sequence_length(length_fn, [], [1])
+    with self.assertRaises(TypeError):
+      dataset.bucket_by_sequence_length(length_fn, [2.5], [1, 1])
+    with self.assertRaises(ValueError):
+      dataset.bucket_by_sequence_length(length_fn, [3, 2], [1, 1, 1])
+    with self.assertRaises(ValueError):
+      dataset.bucket_by_sequence_length(length_fn, [2, 3], [1, 1])
+
+
 if __name__ == "__main__":
   test.main()
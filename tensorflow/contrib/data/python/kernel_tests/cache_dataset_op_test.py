@@ -0,0 +1,203 @@
+# Copyright 2017 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Tests for the experimental input pipeline ops."""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import glob
+import os
+
+from tensorflow.contrib.data.python.ops import dataset_ops
+from tensorflow.python.framework import dtypes
+from tensorflow.python.framework import errors
+from tensorflow.python.ops import array_ops
+from tensorflow.python.ops import math_ops
+from tensorflow.python.ops import random_ops
+from tensorflow.python.platform import test
+
+
+class MemoryCacheDatasetTest(test.TestCase):
+
+  def testCacheInMemory(self):
+    iterator = (dataset_ops.Dataset.range(10)
+                .map(lambda _: random_ops.random_uniform(()))
+                .cache()
+                .repeat(3)
+                .make_one_shot_iterator())
+    get_next = iterator.get_next()
+
+    with self.test_session() as sess:
+      values = [sess.run(get_next) for _ in range(30)]
+      with self.assertRaises(errors.OutOfRangeError):
+        sess.run(get_next)
+
+    # The later epochs read the elements of the first one from the cache.
+    self.assertAllEqual(values[:10], values[10:20])
+    self.assertAllEqual(values[:10], values[20:])
+
+  def testPartialEpochIsNotCached(self):
+    iterator = (dataset_ops.Dataset.range(10)
+                .map(lambda _: random_ops.random_uniform(()))
+                .cache()
+                .take(5)
+                .repeat(2)
+                .make_one_shot_iterator())
+    get_next = iterator.get_next()
+
+    with self.test_session() as sess:
+      values = [sess.run(get_next) for _ in range(10)]
+      with self.assertRaises(errors.OutOfRangeError):
+        sess.run(get_next)
+
+    # The first epoch stopped before the end of the input, so the second
+    # one computes its elements again.
+    self.assertNotEqual(values[:5], values[5:])
+
+
+class FileCacheDatasetTest(test.TestCase):
+
+  def setUp(self):
+    self.cache_prefix = os.path.join(self.get_temp_dir(),
+                                     "cache_%s" % self._testMethodName)
+    self.filename = array_ops.placeholder(dtypes.string, shape=[])
+
+  def _cacheFiles(self):
+    return glob.glob(self.cache_prefix + "*")
+
+  def testCacheToFile(self):
+    iterator = (dataset_ops.Dataset.range(10)
+                .cache(self.filename)
+                .make_initializable_iterator())
+    init_op = iterator.initializer
+    get_next = iterator.get_next()
+
+    # A dataset with different elements reads those of the cache file.
+    cached_iterator = (dataset_ops.Dataset.range(20)
+                       .cache(self.filename)
+                       .make_initializable_iterator())
+    cached_init_op = cached_iterator.initializer
+    cached_get_next = cached_iterator.get_next()
+
+    with self.test_session() as sess:
+      sess.run(init_op, feed_dict={self.filename: self.cache_prefix})
+      for i in range(10):
+        self.assertEqual(i, sess.run(get_next))
+      with self.assertRaises(errors.OutOfRangeError):
+        sess.run(get_next)
+      self.assertTrue(os.path.exists(self.cache_prefix + ".index"))
+
+      sess.run(cached_init_op, feed_dict={self.filename: self.cache_prefix})
+      for i in range(10):
+        self.assertEqual(i, sess.run(cached_get_next))
+      with self.assertRaises(errors.OutOfRangeError):
+        sess.run(cached_get_next)
+
+  def testCacheToFileWithRepeat(self):
+    iterator = (dataset_ops.Dataset.range(5)
+                .map(lambda x: (x, math_ops.to_float(x) * 0.5))
+                .cache(self.filename)
+                .repeat(2)
+                .make_initializable_iterator())
+    init_op = iterator.initializer
+    get_next = iterator.get_next()
+
+    with self.test_session() as sess:
+      sess.run(init_op, feed_dict={self.filename: self.cache_prefix})
+      for _ in range(2):
+        for i in range(5):
+          self.assertEqual((i, i * 0.5), sess.run(get_next))
+      with self.assertRaises(errors.OutOfRangeError):
+        sess.run(get_next)
+
+  def testPartialCacheFileIsDiscarded(self):
+    iterator = (dataset_ops.Dataset.range(10)
+                .cache(self.filename)
+                .make_initializable_iterator())
+    init_op = iterator.initializer
+    get_next = iterator.get_next()
+
+    with self.test_session() as sess:
+      sess.run(init_op, feed_dict={self.filename: self.cache_prefix})
+      for i in range(5):
+        self.assertEqual(i, sess.run(get_next))
+
+      # Reinitializing the iterator interrupts the writing of the cache file.
+      sess.run(init_op, feed_dict={self.filename: self.cache_prefix})
+      self.assertEqual([], self._cacheFiles())
+
+      for i in range(10):
+        self.assertEqual(i, sess.run(get_next))
+      with self.assertRaises(errors.OutOfRangeError):
+        sess.run(get_next)
+      self.assertTrue(os.path.exists(self.cache_prefix + ".index"))
+      self.assertEqual([], glob.glob(self.cache_prefix + "*.tempstate*"))
+
+  def testConcurrentWritersOfSameCacheFile(self):
+    def _make_iterator():
+      return (dataset_ops.Dataset.range(10)
+              .cache(self.filename)
+              .make_initializable_iterator())
+    iterators = [_make_iterator(), _make_iterator()]
+    get_nexts = [iterator.get_next() for iterator in iterators]
+
+    with self.test_session() as sess:
+      for iterator in iterators:
+        sess.run(iterator.initializer,
+                 feed_dict={self.filename: self.cache_prefix})
+      # Each writer only deletes its own partial files, so starting the
+      # second one does not break the first one.
+      for i in range(5):
+        self.assertEqual(i, sess.run(get_nexts[0]))
+      for i in range(10):
+        self.assertEqual(i, sess.run(get_nexts[1]))
+      with self.assertRaises(errors.OutOfRangeError):
+        sess.run(get_nexts[1])
+      for i in range(5, 10):
+        self.assertEqual(i, sess.run(get_nexts[0]))
+      with self.assertRaises(errors.OutOfRangeError):
+        sess.run(get_nexts[0])
+      self.assertTrue(os.path.exists(self.cache_prefix + ".index"))
+      self.assertEqual([], glob.glob(self.cache_prefix + "*.tempstate*"))
+
+  def testCacheFileWithDifferentTypes(self):
+    iterator = (dataset_ops.Dataset.range(10)
+                .cache(self.filename)
+                .make_initializable_iterator())
+    init_op = iterator.initializer
+    get_next = iterator.get_next()
+
+    float_iterator = (dataset_ops.Dataset.range(10)
+                      .map(math_ops.to_float)
+                      .cache(self.filename)
+                      .make_initializable_iterator())
+    float_init_op = float_iterator.initializer
+    float_get_next = float_iterator.get_next()
+
+    with self.test_session() as sess:
+      sess.run(init_op, feed_dict={self.filename: self.cache_prefix})
+      for i in range(10):
+        self.assertEqual(i, sess.run(get_next))
+      with self.assertRaises(errors.OutOfRangeError):
+        sess.run(get_next)
+
+      sess.run(float_init_op, feed_dict={self.filename: self.cache_prefix})
+      with self.assertRaisesRegexp(errors.InvalidArgumentError,
+                                   "different types or shapes"):
+        sess.run(float_get_next)
+
+
+if __name__ == "__main__":
+  test.main()
@@ -0,0 +1,190 @@
+# Copyright 2017 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Tests for the experimental input pipeline ops."""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import itertools
+
+import numpy as np
+
+from tensorflow.contrib.data.python.ops import dataset_ops
+from tensorflow.python.framework import dtypes
+from tensorflow.python.framework import errors
+from tensorflow.python.ops import array_ops
+from tensorflow.python.platform import test
+
+
+class InterleaveDatasetTest(test.TestCase):
+
+  def _interleave(self, lists, cycle_length, block_length):
+    """Python implementation of the interleaving of `lists`."""
+    num_open = 0
+
+    # `all_iterators` acts as a queue of iterators over each element of `lists`.
+    all_iterators = [iter(l) for l in lists]
+
+    # `open_iterators` are the iterators whose elements are currently being
+    # interleaved.
+    open_iterators = []
+    for _ in range(cycle_length):
+      if all_iterators:
+        open_iterators.append(all_iterators.pop(0))
+        num_open += 1
+      else:
+        open_iterators.append(None)
+
+    while num_open or all_iterators:
+      for i in range(cycle_length):
+        if open_iterators[i] is None:
+          if all_iterators:
+            open_iterators[i] = all_iterators.pop(0)
+            num_open += 1
+          else:
+            continue
+        for _ in range(block_length):
+          try:
+            yield next(open_iterators[i])
+          except StopIteration:
+            open_iterators[i] = None
+            num_open -= 1
+            break
+
+  def _makeDataset(self, input_values, cycle_length, block_length,
+                   parallel=False, sloppy=False):
+    # Each input element `x` is mapped to a dataset with `x` copies of `x`.
+    dataset = dataset_ops.Dataset.from_tensor_slices(input_values)
+    map_func = lambda x: dataset_ops.Dataset.from_tensors(x).repeat(x)
+    if parallel:
+      return dataset.parallel_interleave(map_func, cycle_length, block_length,
+                                         sloppy=sloppy)
+    return dataset.interleave(map_func, cycle_length, block_length)
+
+  def _expectedOutput(self, input_values, cycle_length, block_length):
+    return list(self._interleave([[x] * x for x in input_values],
+                                 cycle_length, block_length))
+
+  def testPythonImplementation(self):
+    input_lists = [[4, 4, 4, 4], [5, 5, 5, 5, 5], [6, 6, 6, 6, 6, 6],
+                   [4, 4, 4, 4], [5, 5, 5, 5, 5], [6, 6, 6, 6, 6, 6]]
+
+    # Cycle length 1 acts like `Dataset.flat_map()`.
+    self.assertEqual(list(itertools.chain(*input_lists)),
+                     list(self._interleave(input_lists, 1, 1)))
+
+    # Cycle length > 1.
+    # When the cycle comes back to a list that is already exhausted, it moves
+    # on to the next position without producing an element.
+    expected_elements = [4, 5, 4, 5, 4, 5, 4, 5, 5, 6, 6, 4, 6, 4, 6, 4, 6, 4,
+                         6, 5, 6, 5, 6, 5, 6, 5, 6, 5, 6, 6]
+    self.assertEqual(expected_elements,
+                     list(self._interleave(input_lists, 2, 1)))
+
+  def testInterleaveDataset(self):
+    input_values = array_ops.placeholder(dtypes.int64, shape=[None])
+    cycle_length = array_ops.placeholder(dtypes.int64, shape=[])
+    block_length = array_ops.placeholder(dtypes.int64, shape=[])
+    iterator = self._makeDataset(
+        input_values, cycle_length, block_length).make_initializable_iterator()
+    init_op = iterator.initializer
+    get_next = iterator.get_next()
+
+    with self.test_session() as sess:
+      for values, cycle, block in [([4, 5, 6], 1, 1), ([4, 5, 6], 2, 1),
+                                   ([4, 5, 6], 2, 3), ([4, 5, 6], 7, 2),
+                                   ([4, 0, 6], 2, 2), ([], 2, 2)]:
+        sess.run(init_op, feed_dict={input_values: values,
+                                     cycle_length: cycle,
+                                     block_length: block})
+        for expected in self._expectedOutput(values, cycle, block):
+          self.assertEqual(expected, sess.run(get_next))
+        with self.assertRaises(errors.OutOfRangeError):
+          sess.run(get_next)
+
+  def testParallelInterleaveDataset(self):
+    input_values = array_ops.placeholder(dtypes.int64, shape=[None])
+    cycle_length = array_ops.placeholder(dtypes.int64, shape=[])
+    block_length = array_ops.placeholder(dtypes.int64, shape=[])
+    iterator = self._makeDataset(
+        input_values, cycle_length, block_length,
+        parallel=True).make_initializable_iterator()
+    init_op = iterator.initializer
+    get_next = iterator.get_next()
+
+    with self.test_session() as sess:
+      for values, cycle, block in [([4, 5, 6], 1, 1), ([4, 5, 6], 2, 1),
+                                   ([4, 5, 6], 2, 3), ([4, 5, 6], 7, 2),
+                                   ([4, 0, 6], 2, 2), ([], 2, 2)]:
+        sess.run(init_op, feed_dict={input_values: values,
+                                     cycle_length: cycle,
+                                     block_length: block})
+        # Without `sloppy`, the order is the same as `Dataset.interleave()`.
+        for expected in self._expectedOutput(values, cycle, block):
+          self.assertEqual(expected, sess.run(get_next))
+        with self.assertRaises(errors.OutOfRangeError):
+          sess.run(get_next)
+
+  def testSloppyParallelInterleaveDataset(self):
+    values = [4, 5, 6, 7, 8]
+    iterator = self._makeDataset(
+        values, 3, 2, parallel=True, sloppy=True).make_one_shot_iterator()
+    get_next = iterator.get_next()
+
+    with self.test_session() as sess:
+      produced = []
+      with self.assertRaises(errors.OutOfRangeError):
+        while True:
+          produced.append(sess.run(get_next))
+    self.assertEqual(sorted(self._expectedOutput(values, 3, 2)),
+                     sorted(produced))
+
+  def testParallelInterleaveForwardsErrors(self):
+    components = np.array([1., 2., np.nan, 4.]).astype(np.float32)
+    iterator = (dataset_ops.Dataset.range(2)
+                .parallel_interleave(
+                    lambda _: dataset_ops.Dataset.from_tensor_slices(
+                        components).map(
+                            lambda x: array_ops.check_numerics(x, "message")),
+                    cycle_length=2)
+                .make_one_shot_iterator())
+    get_next = iterator.get_next()
+
+    with self.test_session() as sess:
+      for i in range(2):
+        for _ in range(2):
+          self.assertEqual(components[i], sess.run(get_next))
+      # The 3rd element of each dataset is NaN, so `check_numerics()` fails.
+      for _ in range(2):
+        with self.assertRaises(errors.InvalidArgumentError):
+          sess.run(get_next)
+      for _ in range(2):
+        self.assertEqual(components[3], sess.run(get_next))
+      with self.assertRaises(errors.OutOfRangeError):
+        sess.run(get_next)
+
+  def testInvalidCycleLength(self):
+    for parallel in [False, True]:
+      iterator = self._makeDataset(
+          [4, 5, 6], 0, 1, parallel=parallel).make_initializable_iterator()
+
+      with self.test_session() as sess:
+        with self.assertRaisesRegexp(errors.InvalidArgumentError,
+                                     "cycle_length must be greater than zero"):
+          sess.run(iterator.initializer)
+
+
+if __name__ == "__main__":
+  test.main()
@@ -0,0 +1,177 @@
+# Copyright 2017 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Tests for the experimental input pipeline ops."""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import time
+
+import numpy as np
+
+from tensorflow.contrib.data.python.ops import dataset_ops
+from tensorflow.core.example import example_pb2
+from tensorflow.core.example import feature_pb2
+from tensorflow.python.client import session
+from tensorflow.python.framework import dtypes
+from tensorflow.python.framework import errors
+from tensorflow.python.framework import ops
+from tensorflow.python.ops import array_ops
+from tensorflow.python.ops import control_flow_ops
+from tensorflow.python.ops import math_ops
+from tensorflow.python.ops import parsing_ops
+from tensorflow.python.platform import test
+
+
+class MapAndBatchDatasetTest(test.TestCase):
+
+  def testMapAndBatch(self):
+    components = (np.arange(7),
+                  np.array([[1, 2, 3]]) * np.arange(7)[:, np.newaxis],
+                  np.array(37.0) * np.arange(7))
+
+    def _map_fn(x, y, z):
+      return math_ops.square(x), math_ops.square(y), math_ops.square(z)
+
+    batch_size = array_ops.placeholder(dtypes.int64, shape=[])
+    dataset = (dataset_ops.Dataset.from_tensor_slices(components)
+               .map_and_batch(_map_fn, batch_size))
+    self.assertEqual([[None] + list(c.shape[1:]) for c in components],
+                     [t.as_list() for t in dataset.output_shapes])
+
+    iterator = dataset.make_initializable_iterator()
+    init_op = iterator.initializer
+    get_next = iterator.get_next()
+
+    with self.test_session() as sess:
+      # The same elements as `map(_map_fn).batch(batch_size)`, including a
+      # partial final batch.
+      for batch_size_value in [1, 2, 7, 8]:
+        sess.run(init_op, feed_dict={batch_size: batch_size_value})
+        for start in range(0, 7, batch_size_value):
+          result = sess.run(get_next)
+          for component, result_component in zip(components, result):
+            self.assertAllEqual(
+                component[start:start + batch_size_value] ** 2,
+                result_component)
+        with self.assertRaises(errors.OutOfRangeError):
+          sess.run(get_next)
+
+  def testMapAndBatchWithDifferentShapes(self):
+    iterator = (dataset_ops.Dataset.range(4)
+                .map_and_batch(lambda x: array_ops.fill([x], x), 4)
+                .make_initializable_iterator())
+
+    with self.test_session() as sess:
+      sess.run(iterator.initializer)
+      with self.assertRaisesRegexp(errors.InvalidArgumentError,
+                                   "Cannot batch tensors with different shapes"):
+        sess.run(iterator.get_next())
+
+  def testInvalidBatchSize(self):
+    iterator = (dataset_ops.Dataset.range(10)
+                .map_and_batch(lambda x: x, 0)
+                .make_initializable_iterator())
+
+    with self.test_session() as sess:
+      with self.assertRaisesRegexp(errors.InvalidArgumentError,
+                                   "Batch size must be greater than zero"):
+        sess.run(iterator.initializer)
+
+
+class ParseExampleBenchmark(test.Benchmark):
+  """Compares the ways of parsing batches of `tf.Example` protos."""
+
+  def _example(self, num_features):
+    return example_pb2.Example(features=feature_pb2.Features(feature={
+        "f%d" % i: feature_pb2.Feature(
+            float_list=feature_pb2.FloatList(value=[float(i)]))
+        for i in range(num_features)
+    })).SerializeToString()
+
+  def _run(self, name, make_dataset, num_features=100, batch_size=128,
+           num_batches=100):
+    """Benchmarks parsing `num_batches` batches of synthetic Examples.
+
+    Args:
+      name: The name of the benchmark.
+      make_dataset: A function mapping a `Dataset` of serialized Examples, the
+        features to parse, and the batch size to a `Dataset` of tuples of
+        parsed, batched features.
+      num_features: The number of features of each Example.
+      batch_size: The number of Examples in each batch.
+      num_batches: The number of batches to time.
+    """
+    features = {
+        "f%d" % i: parsing_ops.FixedLenFeature([], dtypes.float32)
+        for i in range(num_features)
+    }
+    with ops.Graph().as_default():
+      dataset = dataset_ops.Dataset.from_tensors(
+          self._example(num_features)).repeat()
+      get_next = make_dataset(dataset, features, batch_size)
+      get_next = get_next.make_one_shot_iterator().get_next()
+      get_next_op = control_flow_ops.group(*get_next)
+      with session.Session() as sess:
+        for _ in range(5):
+          sess.run(get_next_op)  # warm up.
+        start_time = time.time()
+        for _ in range(num_batches):
+          sess.run(get_next_op)
+        duration = time.time() - start_time
+
+    records_per_second = num_batches * batch_size / duration
+    print("%s: %f records/s" % (name, records_per_second))
+    self.report_benchmark(
+        name=name,
+        iters=num_batches,
+        wall_time=duration / num_batches,
+        extras={"records_per_second": records_per_second})
+
+  def benchmarkMapThenBatch(self):
+
+    def _make_dataset(dataset, features, batch_size):
+      # One `ParseExample` per record, as `read_batch_features()` used to do.
+      def _parse(x):
+        parsed = parsing_ops.parse_single_example(x, features)
+        return tuple(parsed[key] for key in sorted(features))
+      return dataset.map(_parse).batch(batch_size)
+
+    self._run("parse_example_map_then_batch", _make_dataset)
+
+  def benchmarkMapAndBatch(self):
+
+    def _make_dataset(dataset, features, batch_size):
+      def _parse(x):
+        parsed = parsing_ops.parse_single_example(x, features)
+        return tuple(parsed[key] for key in sorted(features))
+      return dataset.map_and_batch(_parse, batch_size)
+
+    self._run("parse_example_map_and_batch", _make_dataset)
+
+  def benchmarkBatchThenParse(self):
+
+    def _make_dataset(dataset, features, batch_size):
+      # One `ParseExample` per batch, as `read_batch_features()` does.
+      def _parse(x):
+        parsed = parsing_ops.parse_example(x, features)
+        return tuple(parsed[key] for key in sorted(features))
+      return dataset.batch(batch_size).map(_parse)
+
+    self._run("parse_example_batch_then_parse", _make_dataset)
+
+
+if __name__ == "__main__":
+  test.main()
@@ -0,0 +1,153 @@
+# Copyright 2017 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Tests for the experimental input pipeline ops."""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import numpy as np
+
+from tensorflow.contrib.data.python.ops import dataset_ops
+from tensorflow.python.framework import dtypes
+from tensorflow.python.framework import errors
+from tensorflow.python.ops import array_ops
+from tensorflow.python.platform import test
+
+
+class PrefetchDatasetTest(test.TestCase):
+
+  def testPrefetchDataset(self):
+    buffer_size_placeholder = array_ops.placeholder(dtypes.int64, shape=[])
+    dataset = (dataset_ops.Dataset.range(10)
+               .map(lambda x: x * x)
+               .prefetch(buffer_size_placeholder))
+    self.assertEqual(dtypes.int64, dataset.output_types)
+    self.assertEqual([], dataset.output_shapes)
+
+    iterator = dataset.make_initializable_iterator()
+    init_op = iterator.initializer
+    get_next = iterator.get_next()
+
+    with self.test_session() as sess:
+      for buffer_size in [1, 5, 20]:
+        sess.run(init_op, feed_dict={buffer_size_placeholder: buffer_size})
+        for i in range(10):
+          self.assertEqual(i * i, sess.run(get_next))
+        with self.assertRaises(errors.OutOfRangeError):
+          sess.run(get_next)
+
+  def testPrefetchBatchedDataset(self):
+    components = np.arange(12).reshape(6, 2)
+    iterator = (dataset_ops.Dataset.from_tensor_slices(components)
+                .batch(4)
+                .prefetch(2)
+                .make_one_shot_iterator())
+    get_next = iterator.get_next()
+
+    with self.test_session() as sess:
+      self.assertAllEqual(components[:4], sess.run(get_next))
+      self.assertAllEqual(components[4:], sess.run(get_next))
+      with self.assertRaises(errors.OutOfRangeError):
+        sess.run(get_next)
+
+  def testPrefetchForwardsErrors(self):
+    components = np.array([1., 2., 3., np.nan, 5.]).astype(np.float32)
+    iterator = (dataset_ops.Dataset.from_tensor_slices(components)
+                .map(lambda x: array_ops.check_numerics(x, "message"))
+                .prefetch(2)
+                .make_initializable_iterator())
+    init_op = iterator.initializer
+    get_next = iterator.get_next()
+
+    with self.test_session() as sess:
+      sess.run(init_op)
+      for i in range(3):
+        self.assertEqual(components[i], sess.run(get_next))
+      # The 4th element is NaN, so `array_ops.check_numerics()` should fail.
+      with self.assertRaises(errors.InvalidArgumentError):
+        sess.run(get_next)
+      self.assertEqual(components[4], sess.run(get_next))
+      with self.assertRaises(errors.OutOfRangeError):
+        sess.run(get_next)
+
+  def testInvalidBufferSize(self):
+    iterator = (dataset_ops.Dataset.range(10)
+                .prefetch(0)
+                .make_initializable_iterator())
+
+    with self.test_session() as sess:
+      with self.assertRaisesRegexp(errors.InvalidArgumentError,
+                                   "buffer_size must be greater than zero"):
+        sess.run(iterator.initializer)
+
+  def testStats(self):
+    dataset = dataset_ops.Dataset.range(10).prefetch(3)
+    stats = dataset.stats()
+    iterator = dataset.make_initializable_iterator()
+    init_op = iterator.initializer
+    get_next = iterator.get_next()
+
+    with self.test_session() as sess:
+      stats_value = sess.run(stats)
+      self.assertEqual(3, stats_value["buffer_size"])
+      self.assertEqual(0, stats_value["num_get_next"])
+      self.assertEqual(0, stats_value["num_waits"])
+
+      sess.run(init_op)
+      for i in range(10):
+        self.assertEqual(i, sess.run(get_next))
+      with self.assertRaises(errors.OutOfRangeError):
+        sess.run(get_next)
+
+      stats_value = sess.run(stats)
+      self.assertEqual(0, stats_value["buffered"])
+      self.assertEqual(10, stats_value["num_get_next"])
+      self.assertLessEqual(0, stats_value["num_waits"])
+      self.assertGreaterEqual(10, stats_value["num_waits"])
+      self.assertLessEqual(0., stats_value["mean_buffered"])
+      self.assertGreaterEqual(3., stats_value["mean_buffered"])
+
+  def testStatsAreResetOnInitialization(self):
+    dataset = dataset_ops.Dataset.range(10).prefetch(3)
+    stats = dataset.stats()
+    iterator = dataset.make_initializable_iterator()
+    init_op = iterator.initializer
+    get_next = iterator.get_next()
+
+    with self.test_session() as sess:
+      sess.run(init_op)
+      for _ in range(4):
+        sess.run(get_next)
+      self.assertEqual(4, sess.run(stats["num_get_next"]))
+      sess.run(init_op)
+      self.assertEqual(0, sess.run(stats["num_get_next"]))
+      sess.run(get_next)
+      self.assertEqual(1, sess.run(stats["num_get_next"]))
+
+  def testStatsAreSeparatePerDataset(self):
+    dataset_1 = dataset_ops.Dataset.range(10).prefetch(3)
+    dataset_2 = dataset_ops.Dataset.range(10).prefetch(3)
+    get_next = dataset_1.make_one_shot_iterator().get_next()
+    stats_1 = dataset_1.stats()
+    stats_2 = dataset_2.stats()
+
+    with self.test_session() as sess:
+      sess.run(get_next)
+      self.assertEqual(1, sess.run(stats_1["num_get_next"]))
+      self.assertEqual(0, sess.run(stats_2["num_get_next"]))
+
+
+if __name__ == "__main__":
+  test.main()
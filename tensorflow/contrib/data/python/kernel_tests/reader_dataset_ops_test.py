@@ -345,7 +345,8 @@ class ReadBatchFeaturesTest(test.TestCase):
     self._num_records = 7
     self.test_filenames = self._createFiles()
 
-  def _read_batch_features(self, filenames, num_epochs, batch_size):
+  def _read_batch_features(self, filenames, num_epochs, batch_size,
+                           reader_num_threads=1):
     self.filenames = filenames
     self.num_epochs = num_epochs
     self.batch_size = batch_size
@@ -360,7 +361,8 @@ class ReadBatchFeaturesTest(test.TestCase):
         },
         reader=dataset_ops.TFRecordDataset,
         randomize_input=False,
-        num_epochs=self.num_epochs)
+        num_epochs=self.num_epochs,
+        reader_num_threads=reader_num_threads)
 
   def _record(self, f, r):
     example = example_pb2.Example(features=feature_pb2.Features(
@@ -496,5 +498,22 @@ class ReadBatchFeaturesTest(test.TestCase):
             with self.assertRaises(errors.OutOfRangeError):
               self._next_actual_batch(sess)
 
+  def testReadWithMultipleThreads(self):
+    with self.test_session() as sess:
+      self.outputs = self._read_batch_features(
+          filenames=self.test_filenames,
+          num_epochs=1,
+          batch_size=1,
+          reader_num_threads=self._num_files)
+      # The records of the files are interleaved, one record at a time.
+      for r in range(self._num_records):
+        for f in range(self._num_files):
+          actual_batch = self._next_actual_batch(sess)
+          self.assertAllEqual([f], actual_batch[0])
+          self.assertAllEqual([r], actual_batch[4])
+      with self.assertRaises(errors.OutOfRangeError):
+        self._next_actual_batch(sess)
+
+
 if __name__ == "__main__":
   test.main()
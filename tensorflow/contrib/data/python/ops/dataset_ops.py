@@ -18,6 +18,7 @@ from __future__ import division
 from __future__ import print_function
 
 import abc
+import uuid
 
 import numpy as np
 
@@ -562,7 +563,8 @@ class Dataset(object):
                           reader_args=None,
                           randomize_input=True,
                           num_epochs=None,
-                          capacity=10000):
+                          capacity=10000,
+                          reader_num_threads=1):
     """Reads batches of Examples.
 
     Args:
@@ -579,6 +581,9 @@ class Dataset(object):
       num_epochs: Integer specifying the number of times to read through the
         dataset. If None, cycles through the dataset forever.
       capacity: Capacity of the ShuffleDataset.
+      reader_num_threads: The number of files to read concurrently. The
+        records of these files are interleaved, in a nondeterministic order if
+        `randomize_input` is true.
 
     Returns:
       A `Dataset`.
@@ -587,17 +592,15 @@ class Dataset(object):
       filenames = _get_file_names(file_pattern, randomize_input)
     else:
       filenames = file_pattern
-    if reader_args:
-      dataset = reader(filenames, *reader_args)
-    else:
-      dataset = reader(filenames)
+    dataset = _read_files(filenames, reader, reader_args, reader_num_threads,
+                          sloppy=randomize_input)
     dataset = dataset.repeat(num_epochs)
     if randomize_input:
       dataset = dataset.shuffle(capacity)
-    dataset = dataset.map(
-        lambda x: _parse_example(nest.flatten(x), features)
-    )
+    # Parse a whole batch of serialized Examples at once, which is much faster
+    # than parsing each Example and batching the results.
     dataset = dataset.batch(batch_size)
+    dataset = dataset.map(lambda x: _parse_example(x, features))
     return dataset
 
   def repeat(self, count=None):
@@ -614,6 +617,32 @@ class Dataset(object):
     """
     return RepeatDataset(self, count)
 
+  def cache(self, filename=None):
+    """Caches the elements in this dataset.
+
+    The first iterator over the new dataset that reaches the end of this
+    dataset stores its elements, and the iterators created afterwards (e.g.
+    for the later epochs of `dataset.cache().repeat()`) read the elements from
+    the cache, without computing this dataset again. An iterator that does not
+    reach the end of this dataset discards the elements that it stored, and
+    so does an iterator that gets an error from this dataset.
+
+    Args:
+      filename: (Optional.) A `tf.string` scalar `tf.Tensor`, representing the
+        path of a file on the filesystem to use for caching the elements. The
+        file is written as a tensor bundle, with the `.index` file only created
+        when the cache is complete. Each writer of the cache writes it under
+        its own temporary prefix, and deletes its files if it does not complete
+        the cache. A complete cache file is reused by subsequent programs, so
+        it must be deleted when the elements of this dataset change. If `filename` is `None` or empty, the
+        elements are cached in memory, for as long as the new dataset lives
+        (e.g. until the next initialization of an initializable iterator).
+
+    Returns:
+      A `Dataset`.
+    """
+    return CacheDataset(self, filename)
+
   def enumerate(self, start=0):
     """Enumerate the elements of this dataset.  Similar to python's `enumerate`.
 
@@ -698,6 +727,30 @@ class Dataset(object):
     """
     return BatchDataset(self, batch_size)
 
+  def map_and_batch(self, map_func, batch_size):
+    """Maps `map_func` across this dataset, and combines the results in batches.
+
+    `dataset.map_and_batch(map_func, batch_size)` produces the same elements as
+    `dataset.map(map_func).batch(batch_size)`, but copies each result of
+    `map_func` into its slice of the batch tensors as soon as it is computed,
+    instead of materializing every mapped element before batching them.
+
+    If `map_func` can operate on a batch of elements at once (e.g.
+    `tf.parse_example()`), `dataset.batch(batch_size).map(map_func)` is usually
+    faster still, because it runs `map_func` once per batch.
+
+    Args:
+      map_func: A function mapping a nested structure of tensors (having
+        shapes and types defined by `self.output_shapes` and
+        `self.output_types`) to another nested structure of tensors.
+      batch_size: A `tf.int64` scalar `tf.Tensor`, representing the number of
+        consecutive elements of this dataset to combine in a single batch.
+
+    Returns:
+      A `Dataset`.
+    """
+    return MapAndBatchDataset(self, map_func, batch_size)
+
   def padded_batch(self, batch_size, padded_shapes, padding_values=None):
     """Combines consecutive elements of this dataset into padded batches.
 
@@ -769,7 +822,8 @@ class Dataset(object):
     """
     return DenseToSparseBatchDataset(self, batch_size, row_shape)
 
-  def group_by_window(self, key_func, reduce_func, window_size):
+  def group_by_window(self, key_func, reduce_func, window_size=None,
+                      window_size_func=None):
     """Performs a windowed "group-by" operation on this dataset.
 
     This method maps each consecutive element in this dataset to a key
@@ -778,6 +832,9 @@ class Dataset(object):
     key. All execpt the final window for each key will contain
     `window_size` elements; the final window may be smaller.
 
+    The window size may instead depend on the key, by passing a
+    `window_size_func` that maps each key to its window size.
+
     Args:
       key_func: A function mapping a nested structure of tensors
         (having shapes and types defined by `self.output_shapes` and
@@ -786,12 +843,90 @@ class Dataset(object):
         consecutive elements matching that key to another dataset.
       window_size: A `tf.int64` scalar `tf.Tensor`, representing the number of
         consecutive elements matching the same key to combine in a single
-        batch, which will be passed to `reduce_func`.
+        batch, which will be passed to `reduce_func`. Mutually exclusive with
+        `window_size_func`.
+      window_size_func: A function mapping a key to a `tf.int64` scalar
+        `tf.Tensor`, representing the number of consecutive elements matching
+        that key to combine in a single batch, which will be passed to
+        `reduce_func`. Mutually exclusive with `window_size`.
 
     Returns:
       A `Dataset`.
+
+    Raises:
+      ValueError: if neither or both of {`window_size`, `window_size_func`} are
+        passed.
     """
-    return GroupByWindowDataset(self, key_func, reduce_func, window_size)
+    if (window_size is None) == (window_size_func is None):
+      raise ValueError("Must pass either window_size or window_size_func.")
+
+    return GroupByWindowDataset(self, key_func, reduce_func,
+                                window_size=window_size,
+                                window_size_func=window_size_func)
+
+  def bucket_by_sequence_length(self, length_fn, bucket_boundaries,
+                                bucket_batch_sizes, padded_shapes=None,
+                                padding_values=None):
+    """Batches the elements of this dataset in buckets of similar length.
+
+    This method maps each element of this dataset to a length using
+    `length_fn`, and assigns it to the bucket whose boundaries contain that
+    length. Two extra buckets are created, one for lengths
+    `< bucket_boundaries[0]` and one for lengths `>= bucket_boundaries[-1]`.
+    Consecutive elements in bucket `i` are combined into batches of
+    `bucket_batch_sizes[i]` elements (the final batch of each bucket may be
+    smaller). Unlike `Dataset.group_by_window()` followed by
+    `Dataset.padded_batch()`, the unknown dimensions that `length_fn` measures
+    are padded to the longest length that the bucket can contain (i.e. one
+    less than the upper boundary of the bucket), so that the batches of a
+    bucket all have the same shape in those dimensions. An unknown dimension
+    is taken to be measured by `length_fn` in the elements in which its size
+    equals their length; elements differing in which dimensions those are
+    are batched separately. The other unknown dimensions, and all of them in
+    the last bucket, which has no upper boundary, are padded to the longest
+    element of the batch. For example:
+
+    ```python
+    # NOTE: The following examples use `{ ... }` to represent the
+    # contents of a dataset.
+    a = { [1], [2, 2], [3, 3, 3], [4, 4, 4, 4], [5, 5, 5, 5, 5] }
+
+    a.bucket_by_sequence_length(lambda x: tf.shape(x)[0],
+                                bucket_boundaries=[3],
+                                bucket_batch_sizes=[2, 3]) == {
+        [[1, 0], [2, 2]],
+        [[3, 3, 3, 0, 0], [4, 4, 4, 4, 0], [5, 5, 5, 5, 5]]
+    }
+    ```
+
+    The amount of padding that this adds is available from
+    `BucketBySequenceLengthDataset.stats()`.
+
+    Args:
+      length_fn: A function mapping a nested structure of tensors (having
+        shapes and types defined by `self.output_shapes` and
+        `self.output_types`) to a scalar `tf.int32` or `tf.int64` tensor,
+        representing the length of the element.
+      bucket_boundaries: A list of increasing Python integers, representing
+        the boundaries between the buckets.
+      bucket_batch_sizes: A list of Python integers, with one more element than
+        `bucket_boundaries`, representing the batch size of each bucket.
+      padded_shapes: (Optional.) A nested structure of `tf.TensorShape` or
+        lists of dimensions, representing the shape of each component of the
+        elements. Unknown dimensions are padded as described above, and
+        dimensions of `-1` are always padded to the longest element of the
+        batch. Defaults to `self.output_shapes`.
+      padding_values: (Optional.) A nested structure of scalar-shaped
+        `tf.Tensor`, representing the padding values to use for the
+        respective components.  Defaults are `0` for numeric types and
+        the empty string for string types.
+
+    Returns:
+      A `BucketBySequenceLengthDataset`.
+    """
+    return BucketBySequenceLengthDataset(self, length_fn, bucket_boundaries,
+                                         bucket_batch_sizes, padded_shapes,
+                                         padding_values)
 
   def map(self, map_func, num_threads=None, output_buffer_size=None):
     """Maps `map_func` across this datset.
@@ -826,6 +961,115 @@ class Dataset(object):
     """
     return FlatMapDataset(self, map_func)
 
+  def interleave(self, map_func, cycle_length, block_length=1):
+    """Maps `map_func` across this dataset, and interleaves the results.
+
+    For example, you can use `Dataset.interleave()` to process many input files
+    concurrently:
+
+    ```python
+    # Preprocess 4 files concurrently, and interleave blocks of 16 records from
+    # each file.
+    filenames = ["/var/data/file1.txt", "/var/data/file2.txt", ...]
+    dataset = (Dataset.from_tensor_slices(filenames)
+               .interleave(lambda x: TextLineDataset(x).map(parse_fn),
+                           cycle_length=4, block_length=16))
+    ```
+
+    The `cycle_length` and `block_length` arguments control the order in which
+    elements are produced. `cycle_length` controls the number of input elements
+    that are processed concurrently. If you set `cycle_length` to 1, this
+    transformation will handle one input element at a time, and will produce
+    identical results to `Dataset.flat_map()`. In general, this transformation
+    will apply `map_func` to `cycle_length` input elements, open iterators on
+    the returned `Dataset` objects, and cycle through them producing
+    `block_length` consecutive elements from each iterator, and consuming the
+    next input element each time it reaches the end of an iterator.
+
+    For example:
+
+    ```python
+    # NOTE: The following examples use `{ ... }` to represent the
+    # contents of a dataset.
+    a = { 1, 2, 3, 4, 5 }
+
+    # NOTE: New lines indicate "block" boundaries.
+    a.interleave(lambda x: Dataset.from_tensors(x).repeat(6),
+                 cycle_length=2, block_length=4) == {
+        1, 1, 1, 1,
+        2, 2, 2, 2,
+        1, 1,
+        2, 2,
+        3, 3, 3, 3,
+        4, 4, 4, 4,
+        3, 3,
+        4, 4,
+        5, 5, 5, 5,
+        5, 5,
+    }
+    ```
+
+    Args:
+      map_func: A function mapping a nested structure of tensors (having shapes
+        and types defined by `self.output_shapes` and `self.output_types`) to a
+        `Dataset`.
+      cycle_length: A `tf.int64` scalar `tf.Tensor`, representing the number of
+        input elements that will be processed concurrently.
+      block_length: (Optional.) A `tf.int64` scalar `tf.Tensor`, representing
+        the number of consecutive elements to produce from each input element
+        before cycling to another input element.
+
+    Returns:
+      A `Dataset`.
+    """
+    return InterleaveDataset(self, map_func, cycle_length, block_length)
+
+  def parallel_interleave(self, map_func, cycle_length, block_length=1,
+                          sloppy=False, buffer_output_elements=None):
+    """Maps `map_func` across this dataset, and interleaves the results.
+
+    Unlike `Dataset.interleave()`, an iterator over the new dataset gets the
+    elements of each of the `cycle_length` datasets that it interleaves on a
+    separate background thread. This makes it possible to read many files
+    concurrently, e.g. from network-attached storage, where a single reader is
+    limited by the latency of the storage rather than its bandwidth:
+
+    ```python
+    filenames = ["/var/data/file1.tfrecord", "/var/data/file2.tfrecord", ...]
+    dataset = (Dataset.from_tensor_slices(filenames)
+               .parallel_interleave(TFRecordDataset, cycle_length=8))
+    ```
+
+    If `sloppy` is `False`, the elements are produced in the same order as by
+    `Dataset.interleave()`. If it is `True`, an iterator that finds no
+    buffered element for the current input element produces an element of the
+    next input element that has one, instead of waiting; the order of the
+    elements is then nondeterministic, but a slow file does not stall the
+    others.
+
+    Args:
+      map_func: A function mapping a nested structure of tensors (having shapes
+        and types defined by `self.output_shapes` and `self.output_types`) to a
+        `Dataset`.
+      cycle_length: A `tf.int64` scalar `tf.Tensor`, representing the number of
+        input elements that will be processed concurrently, and the number of
+        threads that process them.
+      block_length: (Optional.) A `tf.int64` scalar `tf.Tensor`, representing
+        the number of consecutive elements to produce from each input element
+        before cycling to another input element.
+      sloppy: (Optional.) A `tf.bool` scalar `tf.Tensor`, representing whether
+        the elements may be produced in nondeterministic order.
+      buffer_output_elements: (Optional.) A `tf.int64` scalar `tf.Tensor`,
+        representing the maximum number of elements of each input element that
+        will be buffered ahead of time. Defaults to `block_length`.
+
+    Returns:
+      A `Dataset`.
+    """
+    return ParallelInterleaveDataset(self, map_func, cycle_length,
+                                     block_length, sloppy,
+                                     buffer_output_elements)
+
   def unbatch(self):
     """Splits elements of this dataset into sequences of consecutive elements.
 
@@ -852,6 +1096,26 @@ class Dataset(object):
     """
     return FilterDataset(self, predicate)
 
+  def prefetch(self, buffer_size):
+    """Creates a `Dataset` that prefetches elements from this dataset.
+
+    An iterator over the new dataset gets up to `buffer_size` elements of this
+    dataset ahead of time, on a background thread, so that producing them
+    overlaps with the computation that consumes them. For example, ending an
+    input pipeline with `dataset.batch(32).prefetch(2)` computes the next two
+    batches while a training step runs.
+
+    The occupancy of the buffer is available from `PrefetchDataset.stats()`.
+
+    Args:
+      buffer_size: A `tf.int64` scalar `tf.Tensor`, representing the
+        maximum number of elements that will be buffered when prefetching.
+
+    Returns:
+      A `PrefetchDataset`.
+    """
+    return PrefetchDataset(self, buffer_size)
+
 
 class TensorDataset(Dataset):
   """A `Dataset` with a single element, viz. a nested structure of tensors."""
@@ -1090,6 +1354,105 @@ class ShuffleDataset(Dataset):
     return self._input_dataset.output_types
 
 
+class PrefetchDataset(Dataset):
+  """A `Dataset` that asynchronously prefetches elements from its input."""
+
+  def __init__(self, input_dataset, buffer_size):
+    """See `Dataset.prefetch()` for details."""
+    super(PrefetchDataset, self).__init__()
+    self._input_dataset = input_dataset
+    self._buffer_size = ops.convert_to_tensor(
+        buffer_size, dtype=dtypes.int64, name="buffer_size")
+    # Names the statistics that the iterators over this dataset record. The
+    # name is unique across clients, which may share the resources of a
+    # server.
+    self._shared_name = "%s_%s" % (
+        ops.get_default_graph().unique_name("prefetch_stats"),
+        uuid.uuid4().hex)
+
+  def make_dataset_resource(self):
+    return gen_dataset_ops.prefetch_dataset(
+        self._input_dataset.make_dataset_resource(),
+        buffer_size=self._buffer_size,
+        shared_name=self._shared_name,
+        output_shapes=nest.flatten(self.output_shapes),
+        output_types=nest.flatten(self.output_types))
+
+  def stats(self, name=None):
+    """Returns the buffer occupancy statistics of this dataset.
+
+    The statistics cover the last iterator over this dataset that was
+    initialized in the session: they are reset each time an iterator over
+    this dataset is initialized. If `num_waits` is close to `num_get_next`, the
+    consumer of the iterators is waiting for the input pipeline, and would
+    benefit from a faster one. If `mean_buffered` is close to `buffer_size`,
+    the input pipeline keeps ahead of the consumer.
+
+    Args:
+      name: (Optional.) A name for the operation.
+
+    Returns:
+      A dictionary with the following scalar `tf.Tensor`s:
+      * `"buffer_size"`: The `tf.int64` maximum number of elements buffered by
+        an iterator.
+      * `"buffered"`: The `tf.int64` number of elements currently buffered.
+      * `"num_get_next"`: The `tf.int64` number of elements requested.
+      * `"num_waits"`: The `tf.int64` number of requests that found the buffer
+        empty and had to wait for the input.
+      * `"mean_buffered"`: The `tf.float32` mean number of elements found in
+        the buffer by the requests.
+    """
+    with ops.name_scope(name, "prefetch_stats"):
+      buffered, num_get_next, num_waits, buffered_sum = (
+          gen_dataset_ops.prefetch_dataset_stats(
+              shared_name=self._shared_name))
+      mean_buffered = math_ops.to_float(buffered_sum) / math_ops.to_float(
+          math_ops.maximum(num_get_next, 1))
+      return {
+          "buffer_size": self._buffer_size,
+          "buffered": buffered,
+          "num_get_next": num_get_next,
+          "num_waits": num_waits,
+          "mean_buffered": mean_buffered,
+      }
+
+  @property
+  def output_shapes(self):
+    return self._input_dataset.output_shapes
+
+  @property
+  def output_types(self):
+    return self._input_dataset.output_types
+
+
+class CacheDataset(Dataset):
+  """A `Dataset` that caches elements of its input."""
+
+  def __init__(self, input_dataset, filename):
+    """See `Dataset.cache()` for details."""
+    super(CacheDataset, self).__init__()
+    self._input_dataset = input_dataset
+    if filename is None:
+      filename = ""
+    self._filename = ops.convert_to_tensor(
+        filename, dtype=dtypes.string, name="filename")
+
+  def make_dataset_resource(self):
+    return gen_dataset_ops.cache_dataset(
+        self._input_dataset.make_dataset_resource(),
+        filename=self._filename,
+        output_shapes=nest.flatten(self.output_shapes),
+        output_types=nest.flatten(self.output_types))
+
+  @property
+  def output_shapes(self):
+    return self._input_dataset.output_shapes
+
+  @property
+  def output_types(self):
+    return self._input_dataset.output_types
+
+
 class TakeDataset(Dataset):
   """A `Dataset` containing the first `count` elements from its input."""
 
@@ -1317,7 +1680,8 @@ class _ResourceDataset(Dataset):
 class GroupByWindowDataset(Dataset):
   """A `Dataset` that groups its input and performs a windowed reduction."""
 
-  def __init__(self, input_dataset, key_func, reduce_func, window_size):
+  def __init__(self, input_dataset, key_func, reduce_func, window_size=None,
+               window_size_func=None):
     """See `Dataset.group_by_window()` for details."""
     super(GroupByWindowDataset, self).__init__()
     self._input_dataset = input_dataset
@@ -1359,14 +1723,44 @@ class GroupByWindowDataset(Dataset):
     self._reduce_func = tf_reduce_func
     self._reduce_func.add_to_graph(ops.get_default_graph())
 
+    if window_size_func is None:
+      self._window_size_func = None
+      return
+
+    @function.Defun(dtypes.int64)
+    def tf_window_size_func(key):
+      """A wrapper for Defun that facilitates shape inference."""
+      key.set_shape([])
+      window_size = ops.convert_to_tensor(
+          window_size_func(key), dtype=dtypes.int64)
+      if window_size.dtype != dtypes.int64:
+        raise ValueError(
+            "`window_size_func` must return a single tf.int64 tensor.")
+      return window_size
+
+    self._window_size_func = tf_window_size_func
+    self._window_size_func.add_to_graph(ops.get_default_graph())
+
   def make_dataset_resource(self):
-    return gen_dataset_ops.group_by_window_dataset(
+    if self._window_size_func is None:
+      return gen_dataset_ops.group_by_window_dataset(
+          self._input_dataset.make_dataset_resource(),
+          self._key_func.captured_inputs,
+          self._reduce_func.captured_inputs,
+          self._window_size,
+          key_func=self._key_func,
+          reduce_func=self._reduce_func,
+          output_types=nest.flatten(self.output_types),
+          output_shapes=nest.flatten(self.output_shapes))
+    # The size of the windows depends on the key.
+    return gen_dataset_ops.group_by_window_dataset_v2(
         self._input_dataset.make_dataset_resource(),
         self._key_func.captured_inputs,
         self._reduce_func.captured_inputs,
-        self._window_size,
+        self._window_size_func.captured_inputs,
         key_func=self._key_func,
         reduce_func=self._reduce_func,
+        window_size_func=self._window_size_func,
         output_types=nest.flatten(self.output_types),
         output_shapes=nest.flatten(self.output_shapes))
 
@@ -1379,6 +1773,214 @@ class GroupByWindowDataset(Dataset):
     return self._output_types
 
 
+class BucketBySequenceLengthDataset(Dataset):
+  """A `Dataset` that batches its input in buckets of similar length."""
+
+  def __init__(self, input_dataset, length_fn, bucket_boundaries,
+               bucket_batch_sizes, padded_shapes, padding_values):
+    """See `Dataset.bucket_by_sequence_length()` for details."""
+    super(BucketBySequenceLengthDataset, self).__init__()
+    if not isinstance(bucket_boundaries, (list, tuple)):
+      raise TypeError(
+          "bucket_boundaries must be a list or tuple, but received: %s" %
+          (bucket_boundaries,))
+    if not bucket_boundaries:
+      raise ValueError("bucket_boundaries must not be empty")
+    for boundary in bucket_boundaries:
+      if not isinstance(boundary, int):
+        raise TypeError(
+            "bucket boundaries must be integers, but saw: %s" % (boundary,))
+    for (s, e) in zip(bucket_boundaries[:-1], bucket_boundaries[1:]):
+      if s >= e:
+        raise ValueError(
+            "Buckets must contain sequential increasing lengths, but saw: "
+            "%d before %d" % (s, e))
+    if len(bucket_batch_sizes) != len(bucket_boundaries) + 1:
+      raise ValueError(
+          "bucket_batch_sizes must have one more element than "
+          "bucket_boundaries, but received %d and %d elements" %
+          (len(bucket_batch_sizes), len(bucket_boundaries)))
+
+    if padded_shapes is None:
+      padded_shapes = input_dataset.output_shapes
+
+    def as_padded_shape(shape):
+      """Returns `shape` as a list of ints, `None`s and `-1`s."""
+      if isinstance(shape, tensor_shape.TensorShape):
+        if shape.ndims is None:
+          raise ValueError(
+              "bucket_by_sequence_length requires the rank of each component "
+              "to be known, but it is unknown in: %s" % (padded_shapes,))
+        return shape.as_list()
+      return [-1 if (dim is not None and
+                     not isinstance(dim, tensor_shape.Dimension) and
+                     int(dim) == -1)
+              else tensor_shape.as_dimension(dim).value for dim in shape]
+
+    padded_shapes = nest.map_structure_up_to(input_dataset.output_shapes,
+                                             as_padded_shape, padded_shapes)
+    flat_padded_shapes = nest.flatten_up_to(input_dataset.output_shapes,
+                                            padded_shapes)
+    # The unknown dimensions, as (component, dimension) pairs. Those that
+    # `length_fn` measures are padded to the longest length of the bucket,
+    # and the others to the longest element of the batch, like `-1`.
+    unknown_dims = [(i, d) for i, shape in enumerate(flat_padded_shapes)
+                    for d, dim in enumerate(shape) if dim is None]
+    # The elements are grouped by their bucket and by which of the unknown
+    # dimensions have their length, in one bit per dimension of the key.
+    num_buckets = len(bucket_boundaries) + 1
+    if len(unknown_dims) + num_buckets.bit_length() > 62:
+      raise ValueError(
+          "bucket_by_sequence_length supports at most %d unknown dimensions "
+          "with %d buckets, but saw %d in: %s" %
+          (62 - num_buckets.bit_length(), num_buckets, len(unknown_dims),
+           padded_shapes))
+    dim_bits = [1 << k for k in range(len(unknown_dims))]
+    num_keys_per_bucket = 1 << len(unknown_dims)
+    if padding_values is not None:
+      padding_values = (padding_values, np.int64(0), False)
+
+    # The longest length that each bucket can contain, where `-1` pads the
+    # batches of the last bucket to their longest element.
+    max_lengths = [boundary - 1 for boundary in bucket_boundaries] + [-1]
+
+    def bucket_id(length):
+      return math_ops.reduce_sum(
+          math_ops.to_int64(
+              math_ops.less_equal(
+                  constant_op.constant(bucket_boundaries, dtype=dtypes.int64),
+                  length)))
+
+    def batch_size(bucket):
+      return array_ops.gather(
+          constant_op.constant(bucket_batch_sizes, dtype=dtypes.int64),
+          bucket)
+
+    def max_length(bucket):
+      return array_ops.gather(
+          constant_op.constant(max_lengths, dtype=dtypes.int64), bucket)
+
+    def add_length(*args):
+      if nest.is_sequence(input_dataset.output_types):
+        element = args
+      else:
+        element, = args
+      length = math_ops.to_int64(length_fn(*args))
+      flat_element = nest.flatten(element)
+      is_length = [
+          math_ops.equal(
+              array_ops.shape(flat_element[i], out_type=dtypes.int64)[d],
+              length)
+          for i, d in unknown_dims]
+      if is_length:
+        is_length = array_ops.stack(is_length)
+      else:
+        is_length = array_ops.zeros([0], dtype=dtypes.bool)
+      return element, length, is_length
+
+    def key_func(unused_element, length, is_length):
+      return bucket_id(length) * num_keys_per_bucket + math_ops.reduce_sum(
+          math_ops.to_int64(is_length) *
+          constant_op.constant(dim_bits, dtype=dtypes.int64))
+
+    def bucket_of_key(key):
+      return key // num_keys_per_bucket
+
+    def reduce_func(key, window):
+      bucket_max_length = max_length(bucket_of_key(key))
+      padded_dims = {}
+      for (i, d), bit in zip(unknown_dims, dim_bits):
+        padded_dims[i, d] = array_ops.where(
+            math_ops.equal(key // bit % 2, 1), bucket_max_length,
+            constant_op.constant(-1, dtype=dtypes.int64))
+      shapes = [
+          ops.convert_to_tensor(
+              [padded_dims[i, d] if dim is None else dim
+               for d, dim in enumerate(shape)], dtype=dtypes.int64)
+          for i, shape in enumerate(flat_padded_shapes)]
+      return window.padded_batch(
+          batch_size(bucket_of_key(key)),
+          (nest.pack_sequence_as(input_dataset.output_shapes, shapes),
+           tensor_shape.scalar(), tensor_shape.vector(len(unknown_dims))),
+          padding_values)
+
+    self._stats = resource_variable_ops.ResourceVariable(
+        initial_value=array_ops.zeros([4], dtype=dtypes.int64),
+        trainable=False,
+        collections=[ops.GraphKeys.LOCAL_VARIABLES],
+        name="bucket_stats",
+        dtype=dtypes.int64)
+
+    def record_stats(batch, lengths, unused_is_length):
+      num_elements = array_ops.shape(lengths, out_type=dtypes.int64)[0]
+      # All of the elements of a batch are in the same bucket, and the
+      # batches of the last bucket are padded to their longest element.
+      padded_length = math_ops.maximum(max_length(bucket_id(lengths[0])),
+                                       math_ops.reduce_max(lengths))
+      update = self._stats.assign_add(array_ops.stack([
+          constant_op.constant(1, dtype=dtypes.int64),
+          num_elements,
+          math_ops.reduce_sum(lengths),
+          num_elements * padded_length]))
+      with ops.control_dependencies([update]):
+        return nest.map_structure(array_ops.identity, batch)
+
+    self._dataset = (input_dataset
+                     .map(add_length)
+                     .group_by_window(
+                         key_func, reduce_func,
+                         window_size_func=lambda key: batch_size(
+                             bucket_of_key(key)))
+                     .map(record_stats))
+
+  def make_dataset_resource(self):
+    return self._dataset.make_dataset_resource()
+
+  def stats(self, name=None):
+    """Returns the padding statistics of this dataset.
+
+    The statistics cover all iterators over this dataset in the session, and
+    are measured in the units of `length_fn`. They are stored in a local
+    variable, which must be initialized (e.g. with
+    `tf.local_variables_initializer()`) before initializing an iterator over
+    this dataset.
+
+    Args:
+      name: (Optional.) A name for the operation.
+
+    Returns:
+      A dictionary with the following scalar `tf.Tensor`s:
+      * `"num_batches"`: The `tf.int64` number of batches produced.
+      * `"num_elements"`: The `tf.int64` number of elements in those batches.
+      * `"total_length"`: The `tf.int64` sum of the lengths of the elements.
+      * `"total_padded_length"`: The `tf.int64` sum of the lengths of the
+        elements after padding.
+      * `"padding_waste"`: The `tf.float32` fraction of `total_padded_length`
+        that is padding.
+    """
+    with ops.name_scope(name, "bucket_stats"):
+      num_batches, num_elements, total_length, total_padded_length = (
+          array_ops.unstack(self._stats.read_value(), num=4))
+      padding_waste = math_ops.to_float(
+          total_padded_length - total_length) / math_ops.to_float(
+              math_ops.maximum(total_padded_length, 1))
+      return {
+          "num_batches": num_batches,
+          "num_elements": num_elements,
+          "total_length": total_length,
+          "total_padded_length": total_padded_length,
+          "padding_waste": padding_waste,
+      }
+
+  @property
+  def output_shapes(self):
+    return self._dataset.output_shapes
+
+  @property
+  def output_types(self):
+    return self._dataset.output_types
+
+
 def _most_specific_compatible_shape(s1, s2):
   """Returns the most specific shape compatible with `s1` and `s2`."""
   if s1.dims is None:
@@ -1476,6 +2078,32 @@ class MapDataset(Dataset):
     return self._output_types
 
 
+class MapAndBatchDataset(MapDataset):
+  """A `Dataset` that maps a function over its input and batches the result."""
+
+  def __init__(self, input_dataset, map_func, batch_size):
+    """See `Dataset.map_and_batch()` for details."""
+    super(MapAndBatchDataset, self).__init__(input_dataset, map_func)
+    self._batch_size = ops.convert_to_tensor(
+        batch_size, dtype=dtypes.int64, name="batch_size")
+
+  def make_dataset_resource(self):
+    return gen_dataset_ops.map_and_batch_dataset(
+        self._input_dataset.make_dataset_resource(),
+        self._map_func.captured_inputs,
+        self._batch_size,
+        f=self._map_func,
+        output_types=nest.flatten(self.output_types),
+        output_shapes=nest.flatten(self.output_shapes))
+
+  @property
+  def output_shapes(self):
+    return nest.pack_sequence_as(self._output_shapes, [
+        tensor_shape.vector(None).concatenate(s)
+        for s in nest.flatten(self._output_shapes)
+    ])
+
+
 class FlatMapDataset(Dataset):
   """A `Dataset` that maps a function over its input and flattens the result."""
 
@@ -1528,6 +2156,62 @@ class FlatMapDataset(Dataset):
     return self._output_types
 
 
+class InterleaveDataset(FlatMapDataset):
+  """A `Dataset` that interleaves the result of a function over its input."""
+
+  def __init__(self, input_dataset, map_func, cycle_length, block_length):
+    """See `Dataset.interleave()` for details."""
+    super(InterleaveDataset, self).__init__(input_dataset, map_func)
+    self._cycle_length = ops.convert_to_tensor(
+        cycle_length, dtype=dtypes.int64, name="cycle_length")
+    self._block_length = ops.convert_to_tensor(
+        block_length, dtype=dtypes.int64, name="block_length")
+
+  def make_dataset_resource(self):
+    return gen_dataset_ops.interleave_dataset(
+        self._input_dataset.make_dataset_resource(),
+        self._map_func.captured_inputs,
+        self._cycle_length,
+        self._block_length,
+        f=self._map_func,
+        output_types=nest.flatten(self.output_types),
+        output_shapes=nest.flatten(self.output_shapes))
+
+
+class ParallelInterleaveDataset(InterleaveDataset):
+  """A `Dataset` that interleaves the result of a function over its input.
+
+  The iterators over this dataset get the elements of the interleaved datasets
+  on background threads.
+  """
+
+  def __init__(self, input_dataset, map_func, cycle_length, block_length,
+               sloppy, buffer_output_elements):
+    """See `Dataset.parallel_interleave()` for details."""
+    super(ParallelInterleaveDataset, self).__init__(
+        input_dataset, map_func, cycle_length, block_length)
+    self._sloppy = ops.convert_to_tensor(
+        sloppy, dtype=dtypes.bool, name="sloppy")
+    if buffer_output_elements is None:
+      self._buffer_output_elements = self._block_length
+    else:
+      self._buffer_output_elements = ops.convert_to_tensor(
+          buffer_output_elements, dtype=dtypes.int64,
+          name="buffer_output_elements")
+
+  def make_dataset_resource(self):
+    return gen_dataset_ops.parallel_interleave_dataset(
+        self._input_dataset.make_dataset_resource(),
+        self._map_func.captured_inputs,
+        self._cycle_length,
+        self._block_length,
+        self._buffer_output_elements,
+        self._sloppy,
+        f=self._map_func,
+        output_types=nest.flatten(self.output_types),
+        output_shapes=nest.flatten(self.output_shapes))
+
+
 class FilterDataset(Dataset):
   """A `Dataset` that filters its input according to a predicate function."""
 
@@ -1770,7 +2454,8 @@ def read_batch_features(file_pattern,
                         reader_args=None,
                         randomize_input=True,
                         num_epochs=None,
-                        capacity=10000):
+                        capacity=10000,
+                        reader_num_threads=1):
   """Reads batches of Examples.
 
   Example:
@@ -1829,15 +2514,16 @@ def read_batch_features(file_pattern,
       dataset. If None, cycles through the dataset forever.
     capacity: Capacity of the ShuffleDataset. A large capacity ensures better
       shuffling but would increase memory usage and startup time.
+    reader_num_threads: The number of files to read concurrently, each on a
+      separate thread. The records of these files are interleaved, in a
+      nondeterministic order if `randomize_input` is true.
 
   Returns:
     A dict from keys in features to Tensor or SparseTensor objects.
   """
   filenames = _get_file_names(file_pattern, randomize_input)
-  if reader_args:
-    dataset = reader(filenames, *reader_args)
-  else:
-    dataset = reader(filenames)
+  dataset = _read_files(filenames, reader, reader_args, reader_num_threads,
+                        sloppy=randomize_input)
   dataset = dataset.repeat(num_epochs)
   if randomize_input:
     dataset = dataset.shuffle(capacity)
@@ -1861,6 +2547,34 @@ def read_batch_features(file_pattern,
   return result
 
 
+def _read_files(filenames, reader, reader_args, reader_num_threads, sloppy):
+  """Returns a `Dataset` of the records of `filenames`, read concurrently.
+
+  Args:
+    filenames: A list or a `tf.string` vector `tf.Tensor` of file names.
+    reader: A function or class that can be called with a `filenames` tensor
+      and (optional) `reader_args` and returns a `Dataset` of records.
+    reader_args: Additional arguments to pass to the reader class.
+    reader_num_threads: The number of files to read concurrently.
+    sloppy: Whether the records may be produced in nondeterministic order.
+
+  Returns:
+    A `Dataset` that interleaves the records of `reader_num_threads` files at a
+    time, in the order of `filenames`. With one thread, the reader reads the
+    files one after the other, without interleaving.
+  """
+  def read_file(filename):
+    if reader_args:
+      return reader(filename, *reader_args)
+    else:
+      return reader(filename)
+
+  if reader_num_threads == 1:
+    return read_file(filenames)
+  return Dataset.from_tensor_slices(filenames).parallel_interleave(
+      read_file, cycle_length=reader_num_threads, sloppy=sloppy)
+
+
 def _parse_example(serialized, features):
   parsed = parsing_ops.parse_example(serialized, features)
   result = []
@@ -27,8 +27,8 @@ from tensorflow.python.ops import variable_scope as vs
 from tensorflow.python.ops import variables
 from tensorflow.python.platform import gfile
 from tensorflow.python.platform import tf_logging as logging
+from tensorflow.python.training import delta_checkpoint
 from tensorflow.python.training import saver
-from tensorflow.python.training import training as train
 
 __all__ = [
     "load_checkpoint",
@@ -47,6 +47,9 @@ def _get_checkpoint_filename(filepattern):
 def load_checkpoint(filepattern):
   """Returns CheckpointReader for latest checkpoint.
 
+  Delta checkpoints written by a `Saver` with `max_deltas` are resolved
+  against the checkpoints they were written on top of.
+
   Args:
     filepattern: Directory with checkpoints file or path to checkpoint.
 
@@ -60,7 +63,7 @@ def load_checkpoint(filepattern):
   if filename is None:
     raise ValueError("Couldn't find 'checkpoint' file or checkpoints in "
                      "given directory %s" % filepattern)
-  return train.NewCheckpointReader(filename)
+  return delta_checkpoint.load_checkpoint_reader(filename)
 
 
 def load_variable(checkpoint_dir, name):
@@ -197,6 +197,8 @@ def get_name_scope_ops(ops, scope):
   Raises:
     TypeError: if ops cannot be converted to a list of tf.Operation.
   """
+  if isinstance(ops, tf_ops.Graph):
+    return ops.get_operations_in_name_scope(scope)
   if scope and scope[-1] == "/":
     scope = scope[:-1]
   return filter_ops_from_regex(ops, "^{}(/.*)?$".format(scope))
@@ -657,6 +659,8 @@ def select_ops(*args, **kwargs):
       raise ValueError("Wrong keywords argument: {}.".format(k))
 
   ops = []
+  # Set of the selected ops, for constant-time membership tests.
+  ops_set = set()
 
   for arg in args:
     if can_be_regex(arg):
@@ -669,15 +673,17 @@ def select_ops(*args, **kwargs):
         continue
       ops_ = filter_ops_from_regex(graph, regex)
       for op_ in ops_:
-        if op_ not in ops:
+        if op_ not in ops_set:
           if positive_filter is None or positive_filter(op_):
             ops.append(op_)
+            ops_set.add(op_)
     else:
       ops_aux = util.make_list_of_op(arg, ignore_ts=True)
       if positive_filter is not None:
         ops_aux = [op for op in ops_aux if positive_filter(op)]
-      ops_aux = [op for op in ops_aux if op not in ops]
+      ops_aux = [op for op in ops_aux if op not in ops_set]
       ops += ops_aux
+      ops_set.update(ops_aux)
 
   return ops
 
@@ -19,6 +19,8 @@ from __future__ import division
 from __future__ import print_function
 
 import functools
+import time
+
 import numpy as np
 from tensorflow.contrib.layers.python.layers import feature_column
 from tensorflow.contrib.learn.python.learn.estimators import dnn
@@ -97,6 +99,37 @@ class DNNClassifierBenchmark(test.Benchmark):
 
     self._report_metrics(metrics)
 
+  def _benchmark_steps_per_run(self, steps_per_run):
+    classifier = dnn.DNNClassifier(
+        feature_columns=(feature_column.real_valued_column(
+            'feature', dimension=4),),
+        hidden_units=(3, 3),
+        config=run_config.RunConfig(
+            tf_random_seed=1, steps_per_run=steps_per_run))
+    input_fn = test_data.iris_input_logistic_fn
+    steps = 1000
+    start_time = time.time()
+    classifier.fit(input_fn=input_fn, steps=steps)
+    wall_time = time.time() - start_time
+    metrics = classifier.evaluate(input_fn=input_fn, steps=1)
+    estimator_test_utils.assert_in_range(steps, steps + steps_per_run,
+                                         'global_step', metrics)
+    estimator_test_utils.assert_in_range(0.9, 1.0, 'accuracy', metrics)
+
+    self.report_benchmark(
+        iters=metrics['global_step'],
+        wall_time=wall_time,
+        extras={'steps_per_sec': metrics['global_step'] / wall_time})
+
+  def benchmarkLogisticMatrixData1StepPerRun(self):
+    self._benchmark_steps_per_run(1)
+
+  def benchmarkLogisticMatrixData10StepsPerRun(self):
+    self._benchmark_steps_per_run(10)
+
+  def benchmarkLogisticMatrixData100StepsPerRun(self):
+    self._benchmark_steps_per_run(100)
+
   def benchmarkLogisticMatrixDataLabels1D(self):
 
     def _input_fn():
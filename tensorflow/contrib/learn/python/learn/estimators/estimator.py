@@ -64,6 +64,7 @@ from tensorflow.python.platform import gfile
 from tensorflow.python.platform import tf_logging as logging
 from tensorflow.python.saved_model import builder as saved_model_builder
 from tensorflow.python.saved_model import tag_constants
+from tensorflow.python.summary import summary
 from tensorflow.python.training import basic_session_run_hooks
 from tensorflow.python.training import device_setter
 from tensorflow.python.training import monitored_session
@@ -951,9 +952,21 @@ class BaseEstimator(
     with self._graph.as_default() as g, g.device(self._device_fn):
       random_seed.set_random_seed(self._config.tf_random_seed)
       global_step = contrib_framework.create_global_step(g)
-      features, labels = input_fn()
-      self._check_inputs(features, labels)
-      model_fn_ops = self._get_train_ops(features, labels)
+      step_model_fn_ops = []
+
+      def _train_step():
+        features, labels = input_fn()
+        self._check_inputs(features, labels)
+        step_model_fn_ops.append(self._get_train_ops(features, labels))
+        return step_model_fn_ops[0].train_op, step_model_fn_ops[0].loss
+
+      # With more than one step per run, input_fn and model_fn are called in
+      # the body of a loop, and only the loss of the last step is visible. A
+      # core `RunConfig` has no `steps_per_run`.
+      train_op, loss, step_summary = monitored_session.repeat_train_step(
+          _train_step, getattr(self._config, 'steps_per_run', 1))
+      model_fn_ops = step_model_fn_ops[0]._replace(train_op=train_op,
+                                                   loss=loss)
       ops.add_to_collection(ops.GraphKeys.LOSSES, model_fn_ops.loss)
       all_hooks.extend([
           basic_session_run_hooks.NanTensorHook(model_fn_ops.loss),
@@ -967,6 +980,14 @@ class BaseEstimator(
       all_hooks.extend(hooks)
 
       scaffold = model_fn_ops.scaffold or monitored_session.Scaffold()
+      if step_summary is not None and scaffold.summary_op is None:
+        # The summaries of the loop can only be computed with its train op, so
+        # they are not in the SUMMARIES collection.
+        other_summaries = summary.merge_all()
+        if other_summaries is not None:
+          step_summary = summary.merge([step_summary, other_summaries])
+        scaffold = monitored_session.Scaffold(
+            summary_op=step_summary, copy_from_scaffold=scaffold)
       if not (scaffold.saver or ops.get_collection(ops.GraphKeys.SAVERS)):
         ops.add_to_collection(
             ops.GraphKeys.SAVERS,
@@ -42,6 +42,7 @@ _DEFAULT_UID_WHITE_LIST = [
     'session_config',
     'keep_checkpoint_max',
     'keep_checkpoint_every_n_hours',
+    'steps_per_run',
 ]
 
 
@@ -232,7 +233,8 @@ class RunConfig(ClusterConfig, core_run_config.RunConfig):
                keep_checkpoint_every_n_hours=10000,
                evaluation_master='',
                model_dir=None,
-               session_config=None):
+               session_config=None,
+               steps_per_run=1):
     """Constructor.
 
     Note that the superclass `ClusterConfig` may set properties like
@@ -269,6 +271,13 @@ class RunConfig(ClusterConfig, core_run_config.RunConfig):
       session_config: a ConfigProto used to set session parameters, or None.
         Note - using this argument, it is easy to provide settings which break
         otherwise perfectly good models. Use with care.
+      steps_per_run: Number of training steps run by each call to
+        `Session.run()` while training, in a loop in the graph. See
+        `tf.train.repeat_train_step`. Defaults to 1. With more than 1, the
+        `input_fn` and `model_fn` are called in the body of the loop, so they
+        must not use queues, e.g. `tf.train.batch`, nor create lookup tables:
+        training then raises a `ValueError`. Read the input with a `Dataset`
+        iterator instead.
     """
     super(RunConfig, self).__init__(
         master=master, evaluation_master=evaluation_master)
@@ -297,6 +306,7 @@ class RunConfig(ClusterConfig, core_run_config.RunConfig):
     self._keep_checkpoint_max = keep_checkpoint_max
     self._keep_checkpoint_every_n_hours = keep_checkpoint_every_n_hours
     self._model_dir = _get_model_dir(model_dir)
+    self._steps_per_run = steps_per_run
 
   @experimental
   def uid(self, whitelist=None):
@@ -367,6 +377,10 @@ class RunConfig(ClusterConfig, core_run_config.RunConfig):
   def keep_checkpoint_every_n_hours(self):
     return self._keep_checkpoint_every_n_hours
 
+  @property
+  def steps_per_run(self):
+    return self._steps_per_run
+
 
 def _count_ps(cluster_spec):
   """Counts the number of parameter servers in cluster_spec."""
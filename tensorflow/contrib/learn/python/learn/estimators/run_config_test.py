@@ -292,7 +292,8 @@ class RunConfigTest(test.TestCase):
         save_checkpoints_secs=14,
         session_config=config_pb2.ConfigProto(allow_soft_placement=True),
         keep_checkpoint_max=16,
-        keep_checkpoint_every_n_hours=17)
+        keep_checkpoint_every_n_hours=17,
+        steps_per_run=18)
     self.assertEqual(11, config.tf_random_seed)
     self.assertEqual(12, config.save_summary_steps)
     self.assertEqual(13, config.save_checkpoints_steps)
@@ -301,6 +302,7 @@ class RunConfigTest(test.TestCase):
                      config.session_config)
     self.assertEqual(16, config.keep_checkpoint_max)
     self.assertEqual(17, config.keep_checkpoint_every_n_hours)
+    self.assertEqual(18, config.steps_per_run)
 
     new_config = run_config_lib.RunConfig(
         tf_random_seed=21,
@@ -309,7 +311,8 @@ class RunConfigTest(test.TestCase):
         save_checkpoints_secs=24,
         session_config=config_pb2.ConfigProto(allow_soft_placement=False),
         keep_checkpoint_max=26,
-        keep_checkpoint_every_n_hours=27)
+        keep_checkpoint_every_n_hours=27,
+        steps_per_run=28)
     self.assertEqual(config.uid(), new_config.uid())
     # model_dir is not on the default whitelist.
     self.assertNotEqual(config.uid(whitelist=[]),
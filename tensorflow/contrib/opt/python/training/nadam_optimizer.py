@@ -48,6 +48,10 @@ class NadamOptimizer(adam.AdamOptimizer):
         use_locking=self._use_locking,
         use_nesterov=True).op
 
+  def _apply_dense_fused(self, grads, var_list):
+    return super(NadamOptimizer, self)._apply_dense_fused(
+        grads, var_list, use_nesterov=True)
+
   def _resource_apply_dense(self, grad, var):
     m = self.get_slot(var, "m")
     v = self.get_slot(var, "v")
@@ -27,6 +27,7 @@ See @{$python/contrib.training} guide.
 @@bucket_by_sequence_length
 @@GreedyLoadBalancingStrategy
 @@byte_size_load_fn
+@@bandwidth_load_fn
 @@FailureTolerator
 @@rejection_sample
 @@stratified_sample
@@ -19,6 +19,8 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import re
+
 import numpy as np
 
 from tensorflow.python.framework import tensor_shape
@@ -37,12 +39,24 @@ class GreedyLoadBalancingStrategy(object):
 
   One reasonable heuristic is the `byte_size_load_fn`, which
   estimates load as the number of bytes that would be used to store and
-  transmit the entire variable.  More advanced load functions
-  could consider the difference in access patterns across ops, or trade
-  off CPU-intensive ops with RAM-intensive ops with network bandwidth.
+  transmit the entire variable, i.e. greedy bin-packing of the ps memory.
+  `bandwidth_load_fn` instead estimates the bytes each variable sends and
+  receives per step, which matters more for sparsely accessed embedding
+  variables.
 
   This class is intended to be used as a `ps_strategy` in
-  `tf.train.replica_device_setter`.
+  `tf.train.replica_device_setter`. Once the graph is built, `ps_loads` and
+  `placements` report the resulting balance, before any session is created:
+
+  ```python
+  strategy = tf.contrib.training.GreedyLoadBalancingStrategy(
+      num_ps, tf.contrib.training.byte_size_load_fn)
+  with tf.device(tf.train.replica_device_setter(cluster=cluster,
+                                                ps_strategy=strategy)):
+    # Build your graph
+  for task, load in enumerate(strategy.ps_loads):
+    tf.logging.info("ps task %d: %d bytes", task, load)
+  ```
   """
 
   def __init__(self, num_tasks, load_fn):
@@ -56,6 +70,17 @@ class GreedyLoadBalancingStrategy(object):
     self._num_tasks = num_tasks
     self._load_fn = load_fn
     self._ps_loads = np.zeros(num_tasks)
+    self._placements = {}
+
+  @property
+  def ps_loads(self):
+    """A list with the total load placed on each ps task so far."""
+    return self._ps_loads.tolist()
+
+  @property
+  def placements(self):
+    """A dict mapping the name of each placed op to its ps task index."""
+    return dict(self._placements)
 
   def __call__(self, op):
     """Choose a ps task index for the given `Operation`.
@@ -70,9 +95,25 @@ class GreedyLoadBalancingStrategy(object):
     """
     task = np.argmin(self._ps_loads)
     self._ps_loads[task] += self._load_fn(op)
+    self._placements[op.name] = int(task)
     return task
 
 
+def _output_shape(op):
+  """Returns the fully-defined shape of the single output of `op`."""
+  if len(op.outputs) != 1:
+    raise ValueError("Op %s must have a single output" % op)
+  shape = op.outputs[0].get_shape()
+  if not shape.is_fully_defined():
+    # Due to legacy behavior, scalar "Variable" ops have output Tensors that
+    # have unknown shape when the op is created (and hence passed to this
+    # load function for placement), even though the scalar shape is set
+    # explicitly immediately afterward.
+    shape = tensor_shape.TensorShape(op.get_attr("shape"))
+  shape.assert_is_fully_defined()
+  return shape
+
+
 def byte_size_load_fn(op):
   """Load function that computes the byte size of a single-output `Operation`.
 
@@ -92,16 +133,48 @@ def byte_size_load_fn(op):
     ValueError: if `op` does not have a single output, or if the shape of the
       single output is not fully-defined.
   """
-  if len(op.outputs) != 1:
-    raise ValueError("Op %s must have a single output" % op)
-  output = op.outputs[0]
-  elem_size = output.dtype.size
-  shape = output.get_shape()
-  if not shape.is_fully_defined():
-    # Due to legacy behavior, scalar "Variable" ops have output Tensors that
-    # have unknown shape when the op is created (and hence passed to this
-    # load function for placement), even though the scalar shape is set
-    # explicitly immediately afterward.
-    shape = tensor_shape.TensorShape(op.get_attr("shape"))
-  shape.assert_is_fully_defined()
-  return shape.num_elements() * elem_size
+  shape = _output_shape(op)
+  return shape.num_elements() * op.outputs[0].dtype.size
+
+
+def bandwidth_load_fn(rows_per_step=None):
+  """Returns a load function that estimates the per-step traffic of an op.
+
+  Every step, each worker reads a variable and sends back an update of the
+  same size. For dense variables that is the whole variable. Embedding
+  variables are only accessed through `gather` and sparse updates, so their
+  traffic is proportional to the number of rows looked up per step rather
+  than to their size.
+
+  Intended to be used with `GreedyLoadBalancingStrategy`.
+
+  Args:
+    rows_per_step: A list of `(pattern, rows)` pairs, or a dict, mapping
+      regular expressions to the expected number of rows looked up per step in
+      the variables they match. Patterns are matched against the start of the
+      op name, as with `re.match`, and the first matching pair in the list
+      wins. Ops that match no pattern are treated as dense variables.
+
+  Returns:
+    A function that takes an `Operation` with a single output, typically a
+    "Variable" op, and returns the number of bytes it is expected to send and
+    receive per step.
+  """
+  rows_per_step = rows_per_step or []
+  if isinstance(rows_per_step, dict):
+    rows_per_step = sorted(rows_per_step.items())
+  patterns = [(re.compile(pattern), rows) for pattern, rows in rows_per_step]
+
+  def _load_fn(op):
+    shape = _output_shape(op)
+    elem_size = op.outputs[0].dtype.size
+    num_elements = shape.num_elements()
+    for pattern, rows in patterns:
+      if pattern.match(op.name) and shape.ndims:
+        row_elements = shape[1:].num_elements()
+        num_elements = min(rows, shape[0].value) * row_elements
+        break
+    # One read and one update of the same size.
+    return 2 * num_elements * elem_size
+
+  return _load_fn
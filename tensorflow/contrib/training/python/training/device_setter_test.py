@@ -92,6 +92,39 @@ class GreedyLoadBalancingStrategyTest(test.TestCase):
       self.assertDeviceEqual("/job:ps/task:0", u.device)
       self.assertDeviceEqual("/job:ps/task:0", u.initializer.device)
 
+  def testReportsLoads(self):
+    strategy = device_setter_lib.GreedyLoadBalancingStrategy(
+        2, device_setter_lib.byte_size_load_fn)
+    with ops.device(
+        device_setter.replica_device_setter(
+            cluster=self._cluster_spec, ps_strategy=strategy)):
+      variables.Variable(array_ops.zeros([2, 2]), name="u")
+      variables.Variable(array_ops.zeros([2, 1]), name="v")
+      variables.Variable(array_ops.zeros([2, 2]), name="w")
+    self.assertEqual([16, 24], strategy.ps_loads)
+    self.assertEqual({"u": 0, "v": 1, "w": 1}, strategy.placements)
+
+  def testBandwidthLoadFn(self):
+    strategy = device_setter_lib.GreedyLoadBalancingStrategy(
+        2, device_setter_lib.bandwidth_load_fn({"emb": 10}))
+    with ops.device(
+        device_setter.replica_device_setter(
+            cluster=self._cluster_spec, ps_strategy=strategy)):
+      emb = variables.Variable(array_ops.zeros([1000, 8]), name="emb")
+      w = variables.Variable(array_ops.zeros([100, 4]), name="w")
+      x = variables.Variable(array_ops.zeros([10, 10]), name="x")
+      self.assertDeviceEqual("/job:ps/task:0", emb.device)
+      self.assertDeviceEqual("/job:ps/task:1", w.device)
+      self.assertDeviceEqual("/job:ps/task:0", x.device)
+    # 10 rows of 8 floats for the embedding, everything for the others.
+    self.assertEqual([2 * 4 * (10 * 8 + 100), 2 * 4 * 400], strategy.ps_loads)
+
+  def testBandwidthLoadFnCapsRows(self):
+    load_fn = device_setter_lib.bandwidth_load_fn([("emb", 100)])
+    with ops.Graph().as_default():
+      emb = variables.Variable(array_ops.zeros([10, 3]), name="emb")
+      self.assertEqual(2 * 4 * 30, load_fn(emb.op))
+
 
 if __name__ == "__main__":
   test.main()
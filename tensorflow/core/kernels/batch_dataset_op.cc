@@ -16,6 +16,7 @@ limitations under the License.
 
 #include "tensorflow/core/framework/partial_tensor_shape.h"
 #include "tensorflow/core/framework/tensor.h"
+#include "tensorflow/core/kernels/batch_util.h"
 
 namespace tensorflow {
 
@@ -90,60 +91,6 @@ class BatchDatasetOp : public OpKernel {
     }
 
    private:
-    // Copies element into the index^th slice of parent (in the 0th dimension).
-    //
-    // TODO(mrry): Reconcile this method with the similar method in
-    // the queue implementation.
-    template <DataType DT>
-    static Status HandleElementToSlice(const Tensor& element, Tensor* parent,
-                                       int index) {
-      typedef typename EnumToDataType<DT>::Type T;
-      if (element.NumElements() !=
-          (parent->NumElements() / parent->dim_size(0))) {
-        TensorShape chip_shape = parent->shape();
-        chip_shape.RemoveDim(0);
-        return errors::Internal(
-            "HandleElementToSlice Cannot copy slice: number of elements does "
-            "not "
-            "match.  Shapes are: [element]: ",
-            element.shape().DebugString(),
-            ", [parent slice]: ", chip_shape.DebugString());
-      }
-      auto parent_as_matrix = parent->flat_outer_dims<T>();
-      parent_as_matrix.chip(index, 0) = element.flat<T>();
-      return Status::OK();
-    }
-
-    // Copies element into the index^th slice of parent (in the 0th dimension).
-    static Status CopyElementToSlice(const Tensor& element, Tensor* parent,
-                                     int64 index) {
-#define HANDLE_TYPE(DT)                                                   \
-  if (element.dtype() == DT) {                                            \
-    TF_RETURN_IF_ERROR(HandleElementToSlice<DT>(element, parent, index)); \
-    return Status::OK();                                                  \
-  }
-      HANDLE_TYPE(DT_FLOAT);
-      HANDLE_TYPE(DT_HALF);
-      HANDLE_TYPE(DT_DOUBLE);
-      HANDLE_TYPE(DT_INT32);
-      HANDLE_TYPE(DT_UINT8);
-      HANDLE_TYPE(DT_INT16);
-      HANDLE_TYPE(DT_INT8);
-      HANDLE_TYPE(DT_STRING);
-      HANDLE_TYPE(DT_COMPLEX64);
-      HANDLE_TYPE(DT_COMPLEX128);
-      HANDLE_TYPE(DT_INT64);
-      HANDLE_TYPE(DT_BOOL);
-      HANDLE_TYPE(DT_QINT8);
-      HANDLE_TYPE(DT_QUINT8);
-      HANDLE_TYPE(DT_QINT32);
-      HANDLE_TYPE(DT_QINT16);
-      HANDLE_TYPE(DT_QUINT16);
-#undef HANDLE_TYPE
-      return errors::Unimplemented("CopyElementToSlice Unhandled data type: ",
-                                   element.dtype());
-    }
-
     class Iterator : public DatasetIterator<Dataset> {
      public:
       explicit Iterator(const Dataset* dataset)
@@ -194,7 +141,7 @@ class BatchDatasetOp : public OpKernel {
           // Build the output tuple component by copying one slice
           // from each input element in the batch.
           for (size_t i = 0; i < num_batch_elements; ++i) {
-            TF_RETURN_IF_ERROR(CopyElementToSlice(
+            TF_RETURN_IF_ERROR(batch_util::CopyElementToSlice(
                 batch_elements[i][component_index], &batch_component, i));
           }
           out_tensors->emplace_back(std::move(batch_component));
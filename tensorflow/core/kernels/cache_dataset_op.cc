@@ -0,0 +1,378 @@
+/* Copyright 2017 The TensorFlow Authors. All Rights Reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+==============================================================================*/
+#include "tensorflow/core/kernels/dataset.h"
+
+#include "tensorflow/core/framework/partial_tensor_shape.h"
+#include "tensorflow/core/framework/tensor.h"
+#include "tensorflow/core/lib/random/random.h"
+#include "tensorflow/core/lib/strings/strcat.h"
+#include "tensorflow/core/util/tensor_bundle/naming.h"
+#include "tensorflow/core/util/tensor_bundle/tensor_bundle.h"
+
+namespace tensorflow {
+
+namespace {
+
+// See documentation in ../ops/dataset_ops.cc for a high-level
+// description of the following op.
+
+class CacheDatasetOp : public OpKernel {
+ public:
+  explicit CacheDatasetOp(OpKernelConstruction* ctx) : OpKernel(ctx) {}
+
+  void Compute(OpKernelContext* ctx) override {
+    // Create a new CacheDatasetOp::Dataset, insert it in the step-local
+    // container, and return it as the output.
+    DatasetBase* input;
+    OP_REQUIRES_OK(ctx, LookupResource(ctx, HandleFromInput(ctx, 0), &input));
+    core::ScopedUnref unref_input(input);
+
+    const Tensor* filename_t;
+    OP_REQUIRES_OK(ctx, ctx->input("filename", &filename_t));
+    OP_REQUIRES(ctx, TensorShapeUtils::IsScalar(filename_t->shape()),
+                errors::InvalidArgument("filename must be a scalar"));
+    const string& filename = filename_t->scalar<string>()();
+
+    DatasetBase* dataset = new Dataset(input, filename, ctx->env());
+    Tensor* output = nullptr;
+    OP_REQUIRES_OK(ctx, ctx->allocate_output(0, TensorShape({}), &output));
+    ResourceHandle handle = MakeResourceHandle<DatasetBase>(
+        ctx, ctx->step_container()->name(), name());
+    OP_REQUIRES_OK(ctx, CreateResource(ctx, handle, dataset));
+    output->flat<ResourceHandle>()(0) = handle;
+  }
+
+ private:
+  class Dataset : public DatasetBase {
+   public:
+    Dataset(const DatasetBase* input, const string& filename, Env* env)
+        : input_(input), filename_(filename), env_(env) {
+      input_->Ref();
+    }
+
+    ~Dataset() override { input_->Unref(); }
+
+    // The first iterator over this dataset that finds no complete cache
+    // fills it in while passing through the elements of `input_`. The
+    // iterators created while it does so simply iterate over `input_`, and
+    // the iterators created after it has reached the end of `input_` read
+    // the elements from the cache.
+    std::unique_ptr<IteratorBase> MakeIterator() const override {
+      if (filename_.empty()) {
+        mutex_lock l(mu_);
+        if (memory_cache_) {
+          return std::unique_ptr<IteratorBase>(
+              new MemoryReaderIterator(this, memory_cache_));
+        }
+        if (!writing_) {
+          writing_ = true;
+          return std::unique_ptr<IteratorBase>(new MemoryWriterIterator(this));
+        }
+      } else {
+        if (env_->FileExists(MetaFilename(filename_)).ok()) {
+          return std::unique_ptr<IteratorBase>(new FileReaderIterator(this));
+        }
+        mutex_lock l(mu_);
+        if (!writing_) {
+          writing_ = true;
+          return std::unique_ptr<IteratorBase>(new FileWriterIterator(this));
+        }
+      }
+      return input_->MakeIterator();
+    }
+
+    const DataTypeVector& output_dtypes() const override {
+      return input_->output_dtypes();
+    }
+    const std::vector<PartialTensorShape>& output_shapes() const override {
+      return input_->output_shapes();
+    }
+
+    string DebugString() override { return "CacheDatasetOp::Dataset"; }
+
+   private:
+    typedef std::vector<std::vector<Tensor>> MemoryCache;
+
+    // Returns the key under which component `component` of element `index`
+    // is stored in the cache file.
+    static string CacheKey(int64 index, int component) {
+      return strings::StrCat(index, "_", component);
+    }
+
+    // Called by the writing iterator when it has cached every element of
+    // `input_`, which the subsequent iterators will read from `cache` (or
+    // from the cache file, if `cache` is null).
+    void FinishWriting(std::shared_ptr<const MemoryCache> cache) const {
+      mutex_lock l(mu_);
+      memory_cache_ = std::move(cache);
+      writing_ = false;
+    }
+
+    // Called by the writing iterator when it gives up on filling in the
+    // cache, so that the next iterator over this dataset tries again.
+    void AbandonWriting() const {
+      mutex_lock l(mu_);
+      writing_ = false;
+    }
+
+    // Deletes the files of the cache being written under the unique
+    // `temp_prefix`, which no other writer uses.
+    Status DeletePartialCacheFiles(const string& temp_prefix) const {
+      std::vector<string> partial_files;
+      Status s = env_->GetMatchingPaths(strings::StrCat(temp_prefix, "*"),
+                                        &partial_files);
+      if (errors::IsNotFound(s)) {
+        // The directory of the cache file does not exist yet.
+        return Status::OK();
+      }
+      TF_RETURN_IF_ERROR(s);
+      for (const string& partial_file : partial_files) {
+        TF_RETURN_IF_ERROR(env_->DeleteFile(partial_file));
+      }
+      return Status::OK();
+    }
+
+    // Moves the cache written under `temp_prefix` to `filename_`. The
+    // metadata file is moved last, so that the cache only exists once it is
+    // complete.
+    Status RenameCacheFiles(const string& temp_prefix) const {
+      TF_RETURN_IF_ERROR(env_->RenameFile(DataFilename(temp_prefix, 0, 1),
+                                          DataFilename(filename_, 0, 1)));
+      return env_->RenameFile(MetaFilename(temp_prefix),
+                              MetaFilename(filename_));
+    }
+
+    class MemoryWriterIterator : public DatasetIterator<Dataset> {
+     public:
+      explicit MemoryWriterIterator(const Dataset* dataset)
+          : DatasetIterator<Dataset>(dataset),
+            input_impl_(dataset->input_->MakeIterator()),
+            cache_(new MemoryCache) {}
+
+      ~MemoryWriterIterator() override {
+        // The elements cached by an iterator that did not reach the end of
+        // the input are discarded.
+        mutex_lock l(mu_);
+        if (cache_) {
+          dataset()->AbandonWriting();
+        }
+      }
+
+      Status GetNext(IteratorContext* ctx, std::vector<Tensor>* out_tensors,
+                     bool* end_of_sequence) override {
+        mutex_lock l(mu_);
+        Status s = input_impl_->GetNext(ctx, out_tensors, end_of_sequence);
+        if (!cache_) {
+          return s;
+        }
+        if (!s.ok()) {
+          // The cache would not reproduce the error, so stop filling it in.
+          cache_.reset();
+          dataset()->AbandonWriting();
+          return s;
+        }
+        if (*end_of_sequence) {
+          dataset()->FinishWriting(std::move(cache_));
+          return Status::OK();
+        }
+        // `Tensor` copies share the underlying buffers.
+        cache_->push_back(*out_tensors);
+        return Status::OK();
+      }
+
+     private:
+      mutex mu_;
+      const std::unique_ptr<IteratorBase> input_impl_ GUARDED_BY(mu_);
+      // Null once this iterator has stopped filling in the cache.
+      std::shared_ptr<MemoryCache> cache_ GUARDED_BY(mu_);
+    };
+
+    class MemoryReaderIterator : public DatasetIterator<Dataset> {
+     public:
+      MemoryReaderIterator(const Dataset* dataset,
+                           std::shared_ptr<const MemoryCache> cache)
+          : DatasetIterator<Dataset>(dataset), cache_(std::move(cache)) {}
+
+      Status GetNext(IteratorContext* ctx, std::vector<Tensor>* out_tensors,
+                     bool* end_of_sequence) override {
+        mutex_lock l(mu_);
+        if (index_ < cache_->size()) {
+          *out_tensors = (*cache_)[index_++];
+          *end_of_sequence = false;
+        } else {
+          *end_of_sequence = true;
+        }
+        return Status::OK();
+      }
+
+     private:
+      const std::shared_ptr<const MemoryCache> cache_;
+      mutex mu_;
+      size_t index_ GUARDED_BY(mu_) = 0;
+    };
+
+    class FileWriterIterator : public DatasetIterator<Dataset> {
+     public:
+      explicit FileWriterIterator(const Dataset* dataset)
+          : DatasetIterator<Dataset>(dataset),
+            input_impl_(dataset->input_->MakeIterator()),
+            temp_prefix_(strings::StrCat(dataset->filename_, ".",
+                                         random::New64(), ".tempstate")) {}
+
+      ~FileWriterIterator() override {
+        mutex_lock l(mu_);
+        if (writing_) {
+          AbandonWriting();
+        }
+      }
+
+      Status GetNext(IteratorContext* ctx, std::vector<Tensor>* out_tensors,
+                     bool* end_of_sequence) override {
+        mutex_lock l(mu_);
+        if (writing_ && !writer_) {
+          // Other writers of the same cache file, in this or in another
+          // process, use other prefixes.
+          writer_.reset(new BundleWriter(dataset()->env_, temp_prefix_));
+          Status s = writer_->status();
+          if (!s.ok()) {
+            AbandonWriting();
+            return s;
+          }
+        }
+
+        Status s = input_impl_->GetNext(ctx, out_tensors, end_of_sequence);
+        if (!writing_) {
+          return s;
+        }
+        if (!s.ok()) {
+          // The cache would not reproduce the error, so stop filling it in.
+          AbandonWriting();
+          return s;
+        }
+        if (*end_of_sequence) {
+          // The cache is only renamed to `filename_` once all of its
+          // contents are written, so the iterators over this dataset never
+          // read a partial cache.
+          s = writer_->Finish();
+          if (s.ok()) {
+            s = dataset()->RenameCacheFiles(temp_prefix_);
+          }
+          if (!s.ok()) {
+            AbandonWriting();
+            return s;
+          }
+          writer_.reset();
+          writing_ = false;
+          dataset()->FinishWriting(nullptr);
+          return Status::OK();
+        }
+        for (int i = 0; i < out_tensors->size(); ++i) {
+          s = writer_->Add(CacheKey(num_elements_, i), (*out_tensors)[i]);
+          if (!s.ok()) {
+            AbandonWriting();
+            return s;
+          }
+        }
+        ++num_elements_;
+        return Status::OK();
+      }
+
+     private:
+      void AbandonWriting() EXCLUSIVE_LOCKS_REQUIRED(mu_) {
+        writer_.reset();
+        dataset()->DeletePartialCacheFiles(temp_prefix_).IgnoreError();
+        writing_ = false;
+        dataset()->AbandonWriting();
+      }
+
+      mutex mu_;
+      const std::unique_ptr<IteratorBase> input_impl_ GUARDED_BY(mu_);
+      // The prefix under which this iterator writes the cache file.
+      const string temp_prefix_;
+      std::unique_ptr<BundleWriter> writer_ GUARDED_BY(mu_);
+      // False once this iterator has stopped filling in the cache.
+      bool writing_ GUARDED_BY(mu_) = true;
+      int64 num_elements_ GUARDED_BY(mu_) = 0;
+    };
+
+    class FileReaderIterator : public DatasetIterator<Dataset> {
+     public:
+      explicit FileReaderIterator(const Dataset* dataset)
+          : DatasetIterator<Dataset>(dataset) {}
+
+      Status GetNext(IteratorContext* ctx, std::vector<Tensor>* out_tensors,
+                     bool* end_of_sequence) override {
+        mutex_lock l(mu_);
+        if (!reader_) {
+          reader_.reset(
+              new BundleReader(dataset()->env_, dataset()->filename_));
+        }
+        TF_RETURN_IF_ERROR(reader_->status());
+
+        const DataTypeVector& output_dtypes = dataset()->output_dtypes();
+        if (!reader_->Contains(CacheKey(index_, 0))) {
+          *end_of_sequence = true;
+          return Status::OK();
+        }
+        out_tensors->clear();
+        out_tensors->reserve(output_dtypes.size());
+        for (int i = 0; i < output_dtypes.size(); ++i) {
+          const string key = CacheKey(index_, i);
+          DataType dtype;
+          TensorShape shape;
+          TF_RETURN_IF_ERROR(reader_->LookupDtypeAndShape(key, &dtype, &shape));
+          if (dtype != output_dtypes[i] ||
+              !dataset()->output_shapes()[i].IsCompatibleWith(shape)) {
+            return errors::InvalidArgument(
+                "The cache file ", dataset()->filename_,
+                " was written by a dataset with different types or shapes: "
+                "component ",
+                i, " has type ", DataTypeString(dtype), " and shape ",
+                shape.DebugString(), ", but the dataset has type ",
+                DataTypeString(output_dtypes[i]), " and shape ",
+                dataset()->output_shapes()[i].DebugString(), ".");
+          }
+          out_tensors->emplace_back(dtype, shape);
+          TF_RETURN_IF_ERROR(reader_->Lookup(key, &out_tensors->back()));
+        }
+        ++index_;
+        *end_of_sequence = false;
+        return Status::OK();
+      }
+
+     private:
+      mutex mu_;
+      std::unique_ptr<BundleReader> reader_ GUARDED_BY(mu_);
+      int64 index_ GUARDED_BY(mu_) = 0;
+    };
+
+    const DatasetBase* const input_;
+    const string filename_;
+    Env* const env_;
+
+    mutable mutex mu_;
+    // True while an iterator over this dataset is filling in the cache.
+    mutable bool writing_ GUARDED_BY(mu_) = false;
+    // The elements of `input_`, once an iterator has cached them in memory.
+    mutable std::shared_ptr<const MemoryCache> memory_cache_ GUARDED_BY(mu_);
+  };
+};
+
+REGISTER_KERNEL_BUILDER(Name("CacheDataset").Device(DEVICE_CPU),
+                        CacheDatasetOp);
+
+}  // namespace
+
+}  // namespace tensorflow
@@ -336,8 +336,378 @@ class GroupByWindowDatasetOp : public OpKernel {
   const NameAttrList* reduce_func_;
 };
 
+// Like "GroupByWindowDataset", but the size of the windows of each key is
+// computed by a function of the key.
+class GroupByWindowDatasetV2Op : public OpKernel {
+ public:
+  explicit GroupByWindowDatasetV2Op(OpKernelConstruction* ctx)
+      : OpKernel(ctx), graph_def_version_(ctx->graph_def_version()) {
+    OP_REQUIRES_OK(ctx, ctx->GetAttr("key_func", &key_func_));
+    OP_REQUIRES_OK(ctx, ctx->GetAttr("reduce_func", &reduce_func_));
+    OP_REQUIRES_OK(ctx, ctx->GetAttr("window_size_func", &window_size_func_));
+    OP_REQUIRES_OK(ctx, ctx->GetAttr("output_types", &output_types_));
+    OP_REQUIRES_OK(ctx, ctx->GetAttr("output_shapes", &output_shapes_));
+  }
+
+  void Compute(OpKernelContext* ctx) override {
+    DatasetBase* input;
+    OP_REQUIRES_OK(ctx, LookupResource(ctx, HandleFromInput(ctx, 0), &input));
+    core::ScopedUnref unref_input(input);
+
+    // Get captured inputs for the key, reduce, and window size functions.
+    OpInputList key_func_other_argument_inputs;
+    OP_REQUIRES_OK(ctx, ctx->input_list("key_func_other_arguments",
+                                        &key_func_other_argument_inputs));
+    std::vector<Tensor> key_func_other_arguments;
+    key_func_other_arguments.reserve(key_func_other_argument_inputs.size());
+    for (const Tensor& t : key_func_other_argument_inputs) {
+      key_func_other_arguments.push_back(t);
+    }
+    OpInputList reduce_func_other_argument_inputs;
+    OP_REQUIRES_OK(ctx, ctx->input_list("reduce_func_other_arguments",
+                                        &reduce_func_other_argument_inputs));
+    std::vector<Tensor> reduce_func_other_arguments;
+    reduce_func_other_arguments.reserve(
+        reduce_func_other_argument_inputs.size());
+    for (const Tensor& t : reduce_func_other_argument_inputs) {
+      reduce_func_other_arguments.push_back(t);
+    }
+    OpInputList window_size_func_other_argument_inputs;
+    OP_REQUIRES_OK(ctx,
+                   ctx->input_list("window_size_func_other_arguments",
+                                   &window_size_func_other_argument_inputs));
+    std::vector<Tensor> window_size_func_other_arguments;
+    window_size_func_other_arguments.reserve(
+        window_size_func_other_argument_inputs.size());
+    for (const Tensor& t : window_size_func_other_argument_inputs) {
+      window_size_func_other_arguments.push_back(t);
+    }
+    // TODO(mrry): Refactor CapturedFunction to share the runtime
+    // state between multiple functions?
+    std::unique_ptr<CapturedFunction> captured_key_func;
+    OP_REQUIRES_OK(ctx,
+                   CapturedFunction::Create(ctx, key_func_, graph_def_version_,
+                                            std::move(key_func_other_arguments),
+                                            &captured_key_func));
+    std::unique_ptr<CapturedFunction> captured_reduce_func;
+    OP_REQUIRES_OK(
+        ctx, CapturedFunction::Create(ctx, reduce_func_, graph_def_version_,
+                                      std::move(reduce_func_other_arguments),
+                                      &captured_reduce_func));
+    std::unique_ptr<CapturedFunction> captured_window_size_func;
+    OP_REQUIRES_OK(ctx, CapturedFunction::Create(
+                            ctx, window_size_func_, graph_def_version_,
+                            std::move(window_size_func_other_arguments),
+                            &captured_window_size_func));
+
+    DatasetBase* dataset = new Dataset(
+        input, std::move(captured_key_func), std::move(captured_reduce_func),
+        std::move(captured_window_size_func), output_types_, output_shapes_);
+
+    Tensor* output = nullptr;
+    OP_REQUIRES_OK(ctx, ctx->allocate_output(0, TensorShape({}), &output));
+    ResourceHandle handle = MakeResourceHandle<DatasetBase>(
+        ctx, ctx->step_container()->name(), name());
+    OP_REQUIRES_OK(ctx, CreateResource(ctx, handle, dataset));
+    output->flat<ResourceHandle>()(0) = handle;
+  }
+
+ private:
+  class Dataset : public DatasetBase {
+   public:
+    Dataset(const DatasetBase* input,
+            std::unique_ptr<CapturedFunction> captured_key_func,
+            std::unique_ptr<CapturedFunction> captured_reduce_func,
+            std::unique_ptr<CapturedFunction> captured_window_size_func,
+            const DataTypeVector& output_types,
+            const std::vector<PartialTensorShape>& output_shapes)
+        : input_(input),
+          captured_key_func_(std::move(captured_key_func)),
+          captured_reduce_func_(std::move(captured_reduce_func)),
+          captured_window_size_func_(std::move(captured_window_size_func)),
+          output_types_(output_types),
+          output_shapes_(output_shapes) {
+      input_->Ref();
+    }
+
+    ~Dataset() override { input_->Unref(); }
+
+    std::unique_ptr<IteratorBase> MakeIterator() const override {
+      return std::unique_ptr<IteratorBase>(new Iterator(this));
+    }
+
+    const DataTypeVector& output_dtypes() const override {
+      return output_types_;
+    }
+    const std::vector<PartialTensorShape>& output_shapes() const override {
+      return output_shapes_;
+    }
+
+    string DebugString() override {
+      return "GroupByWindowDatasetV2Op::Dataset";
+    }
+
+   private:
+    class Iterator : public DatasetIterator<Dataset> {
+     public:
+      explicit Iterator(const Dataset* dataset)
+          : DatasetIterator<Dataset>(dataset),
+            input_impl_(dataset->input_->MakeIterator()) {}
+
+      Status GetNext(IteratorContext* ctx, std::vector<Tensor>* out_tensors,
+                     bool* end_of_sequence) override {
+        mutex_lock l(mu_);
+        do {
+          if (current_group_iterator_) {
+            // We are currently processing a group, so try to get the
+            // next element.
+            bool end_of_group;
+            TF_RETURN_IF_ERROR(current_group_iterator_->GetNext(
+                ctx, out_tensors, &end_of_group));
+            if (!end_of_group) {
+              // Produce the subelement as output.
+              *end_of_sequence = false;
+              return Status::OK();
+            }
+            // We have reached the end of the current group, so maybe move on
+            // to the next group.
+            current_group_iterator_.reset();
+          }
+
+          // Iterate through the input dataset until we get a full
+          // group, or reach the end.
+          while (!end_of_input_) {
+            std::vector<Tensor> next_input_element;
+            TF_RETURN_IF_ERROR(
+                input_impl_->GetNext(ctx, &next_input_element, &end_of_input_));
+
+            if (!end_of_input_) {
+              FunctionLibraryRuntime::Options opts;
+              // Choose a step ID that is guaranteed not to clash with any
+              // Session-generated step ID. DirectSession only generates
+              // non-negative step IDs (contiguous, starting from 0), and
+              // MasterSession generates 56-bit random step IDs whose MSB is
+              // always 0, so a negative random step ID should suffice.
+              opts.step_id = -std::abs(static_cast<int64>(random::New64()));
+              opts.runner = ctx->runner();
+              ScopedStepContainer step_container(
+                  opts.step_id, [this, ctx](const string& name) {
+                    dataset()
+                        ->captured_key_func_->resource_manager()
+                        ->Cleanup(name)
+                        .IgnoreError();
+                  });
+              opts.step_container = &step_container;
+
+              // Run the key function on the input element to identify its
+              // group.
+              std::vector<Tensor> key_func_output;
+              TF_RETURN_IF_ERROR(dataset()->captured_key_func_->Run(
+                  opts, next_input_element, &key_func_output));
+
+              if (key_func_output.size() != 1 ||
+                  key_func_output[0].dtype() != DT_INT64 ||
+                  key_func_output[0].NumElements() != 1) {
+                // TODO(mrry): Support non-int64 keys.
+                return errors::InvalidArgument(
+                    "`key_func` must return a scalar int64.");
+              }
+              const int64 key = key_func_output[0].scalar<int64>()();
+
+              if (window_sizes_.find(key) == window_sizes_.end()) {
+                // Run the window size function on the key to identify the
+                // size of its windows.
+                int64 window_size;
+                TF_RETURN_IF_ERROR(
+                    GetWindowSize(ctx, key_func_output[0], &window_size));
+                window_sizes_[key] = window_size;
+              }
+
+              std::vector<std::vector<Tensor>>& group = groups_[key];
+              group.push_back(std::move(next_input_element));
+
+              if (static_cast<int64>(group.size()) == window_sizes_[key]) {
+                TF_RETURN_IF_ERROR(StartFlushingGroup(ctx, key));
+                break;
+              }
+            }
+          }
+
+          if (end_of_input_) {
+            if (!groups_.empty()) {
+              // We have consumed all of the input, so flush an
+              // arbitrarily chosen group.
+              TF_RETURN_IF_ERROR(
+                  StartFlushingGroup(ctx, groups_.begin()->first));
+            }
+          }
+        } while (current_group_iterator_ || !end_of_input_);
+
+        *end_of_sequence = true;
+        return Status::OK();
+      }
+
+     private:
+      Status GetWindowSize(IteratorContext* ctx, const Tensor& key,
+                           int64* window_size) {
+        FunctionLibraryRuntime::Options opts;
+        // Choose a step ID that is guaranteed not to clash with any
+        // Session-generated step ID. DirectSession only generates
+        // non-negative step IDs (contiguous, starting from 0), and
+        // MasterSession generates 56-bit random step IDs whose MSB is
+        // always 0, so a negative random step ID should suffice.
+        opts.step_id = -std::abs(static_cast<int64>(random::New64()));
+        opts.runner = ctx->runner();
+        ScopedStepContainer step_container(
+            opts.step_id, [this, ctx](const string& name) {
+              dataset()
+                  ->captured_window_size_func_->resource_manager()
+                  ->Cleanup(name)
+                  .IgnoreError();
+            });
+        opts.step_container = &step_container;
+
+        std::vector<Tensor> window_size_func_output;
+        TF_RETURN_IF_ERROR(dataset()->captured_window_size_func_->Run(
+            opts, {key}, &window_size_func_output));
+
+        if (window_size_func_output.size() != 1 ||
+            window_size_func_output[0].dtype() != DT_INT64 ||
+            window_size_func_output[0].NumElements() != 1) {
+          return errors::InvalidArgument(
+              "`window_size_func` must return a scalar int64.");
+        }
+        *window_size = window_size_func_output[0].scalar<int64>()();
+        if (*window_size <= 0) {
+          return errors::InvalidArgument(
+              "Window size must be greater than zero, but got ", *window_size,
+              " for key ", key.scalar<int64>()(), ".");
+        }
+        return Status::OK();
+      }
+
+      Status StartFlushingGroup(IteratorContext* ctx, int64 key)
+          EXCLUSIVE_LOCKS_REQUIRED(mu_) {
+        FunctionLibraryRuntime::Options opts;
+        // Choose a step ID that is guaranteed not to clash with any
+        // Session-generated step ID. DirectSession only generates
+        // non-negative step IDs (contiguous, starting from 0), and
+        // MasterSession generates 56-bit random step IDs whose MSB is
+        // always 0, so a negative random step ID should suffice.
+        opts.step_id = -std::abs(static_cast<int64>(random::New64()));
+        opts.runner = ctx->runner();
+        ScopedStepContainer step_container(
+            opts.step_id, [this, ctx](const string& name) {
+              dataset()
+                  ->captured_reduce_func_->resource_manager()
+                  ->Cleanup(name)
+                  .IgnoreError();
+            });
+        opts.step_container = &step_container;
+
+        DatasetBase* group_dataset;
+        TF_RETURN_IF_ERROR(NewWindowDataset(
+            std::move(groups_[key]), dataset()->input_->output_dtypes(),
+            dataset()->input_->output_shapes(), &group_dataset));
+        groups_.erase(key);
+
+        Tensor key_arg(DT_INT64, TensorShape({}));
+        key_arg.scalar<int64>()() = key;
+
+        Tensor group_dataset_arg(DT_RESOURCE, TensorShape({}));
+
+        // NOTE(mrry): We cannot use the core `MakeResourceHandle()`,
+        // `LookupResource()` or `DeleteResource()` functions, because
+        // we have an `IteratorContext*` and not an
+        // `OpKernelContext*`, so we replicate the necessary
+        // functionality here.
+        ResourceHandle group_dataset_handle;
+        group_dataset_handle.set_device(
+            dataset()->captured_reduce_func_->device()->attributes().name());
+        group_dataset_handle.set_container(step_container.name());
+        group_dataset_handle.set_name(kWindowResourceName);
+        auto type_index = MakeTypeIndex<DatasetBase>();
+        group_dataset_handle.set_hash_code(type_index.hash_code());
+        group_dataset_handle.set_maybe_type_name(type_index.name());
+        // NOTE(mrry): Ownership of `group_dataset` transfers to
+        // `step_container` here.
+        TF_RETURN_IF_ERROR(dataset()
+                               ->captured_reduce_func_->resource_manager()
+                               ->Create<DatasetBase>(
+                                   group_dataset_handle.container(),
+                                   group_dataset_handle.name(), group_dataset));
+
+        group_dataset_arg.scalar<ResourceHandle>()() = group_dataset_handle;
+
+        std::vector<Tensor> args(
+            {std::move(key_arg), std::move(group_dataset_arg)});
+        std::vector<Tensor> return_values;
+
+        TF_RETURN_IF_ERROR(
+            dataset()->captured_reduce_func_->Run(opts, args, &return_values));
+
+        if (!(return_values.size() == 1 &&
+              return_values[0].dtype() == DT_RESOURCE &&
+              TensorShapeUtils::IsScalar(return_values[0].shape()))) {
+          return errors::InvalidArgument(
+              "`reduce_func` must return a single scalar of dtype "
+              "DT_RESOURCE.");
+        }
+
+        // Retrieve the dataset that was created in `f`.
+        DatasetBase* returned_dataset;
+        const ResourceHandle& dataset_resource =
+            return_values[0].scalar<ResourceHandle>()();
+        if (type_index.hash_code() != dataset_resource.hash_code()) {
+          return errors::InvalidArgument(
+              "`reduce_func` must return a Dataset resource.");
+        }
+        TF_RETURN_IF_ERROR(
+            dataset()->captured_reduce_func_->resource_manager()->Lookup(
+                dataset_resource.container(), dataset_resource.name(),
+                &returned_dataset));
+        core::ScopedUnref unref_returned_dataset(returned_dataset);
+
+        // Create an iterator for the dataset that was returned by
+        // `f`. This transfers ownership of the dataset to the
+        // iterator.
+        current_group_iterator_ = returned_dataset->MakeIterator();
+        return Status::OK();
+      }
+
+      const std::unique_ptr<IteratorBase> input_impl_;
+      mutex mu_;
+      // TODO(mrry): Optimize for dense key space if appropriate.
+      bool end_of_input_ GUARDED_BY(mu_) = false;
+      std::map<int64, std::vector<std::vector<Tensor>>> groups_ GUARDED_BY(mu_);
+      std::map<int64, int64> window_sizes_ GUARDED_BY(mu_);
+      std::unique_ptr<IteratorBase> current_group_iterator_ GUARDED_BY(mu_);
+    };
+
+    // A resource name for the temporary window dataset that is
+    // created as the input to the reduce function.
+    static constexpr const char* kWindowResourceName = "__window_dataset";
+
+    const DatasetBase* const input_;
+    const std::unique_ptr<CapturedFunction> captured_key_func_;
+    const std::unique_ptr<CapturedFunction> captured_reduce_func_;
+    const std::unique_ptr<CapturedFunction> captured_window_size_func_;
+    const DataTypeVector output_types_;
+    const std::vector<PartialTensorShape> output_shapes_;
+  };
+
+  const int graph_def_version_;
+  DataTypeVector output_types_;
+  std::vector<PartialTensorShape> output_shapes_;
+  const NameAttrList* key_func_;
+  const NameAttrList* reduce_func_;
+  const NameAttrList* window_size_func_;
+};
+
 REGISTER_KERNEL_BUILDER(Name("GroupByWindowDataset").Device(DEVICE_CPU),
                         GroupByWindowDatasetOp);
+REGISTER_KERNEL_BUILDER(Name("GroupByWindowDatasetV2").Device(DEVICE_CPU),
+                        GroupByWindowDatasetV2Op);
 
 }  // namespace
 
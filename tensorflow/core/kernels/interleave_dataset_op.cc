@@ -0,0 +1,600 @@
+/* Copyright 2017 The TensorFlow Authors. All Rights Reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+==============================================================================*/
+#include <deque>
+
+#include "tensorflow/core/kernels/dataset.h"
+
+#include "tensorflow/core/common_runtime/function.h"
+#include "tensorflow/core/framework/partial_tensor_shape.h"
+#include "tensorflow/core/framework/tensor.h"
+#include "tensorflow/core/lib/random/random.h"
+
+#include "tensorflow/core/kernels/captured_function.h"
+
+namespace tensorflow {
+
+namespace {
+
+// See documentation in ../ops/dataset_ops.cc for a high-level
+// description of the following ops.
+
+// Applies `captured_func` to `input_element`, and stores an iterator over the
+// dataset that it returns in `*out_iterator`.
+Status MakeIteratorFromInputElement(
+    IteratorContext* ctx, const std::vector<Tensor>& input_element,
+    CapturedFunction* captured_func,
+    std::unique_ptr<IteratorBase>* out_iterator) {
+  FunctionLibraryRuntime::Options opts;
+  opts.runner = ctx->runner();
+  // Choose a step ID that is guaranteed not to clash with any
+  // Session-generated step ID. DirectSession only generates
+  // non-negative step IDs (contiguous, starting from 0), and
+  // MasterSession generates 56-bit random step IDs whose MSB
+  // is always 0, so a negative random step ID should suffice.
+  opts.step_id = -std::abs(static_cast<int64>(random::New64()));
+  ScopedStepContainer step_container(
+      opts.step_id, [captured_func](const string& name) {
+        captured_func->resource_manager()->Cleanup(name).IgnoreError();
+      });
+  opts.step_container = &step_container;
+  std::vector<Tensor> return_values;
+  TF_RETURN_IF_ERROR(captured_func->Run(opts, input_element, &return_values));
+
+  if (!(return_values.size() == 1 && return_values[0].dtype() == DT_RESOURCE &&
+        TensorShapeUtils::IsScalar(return_values[0].shape()))) {
+    return errors::InvalidArgument(
+        "`f` must return a single scalar of dtype DT_RESOURCE.");
+  }
+
+  // Retrieve the dataset that was created in `f`. As in
+  // FlatMapDatasetOp, we cannot use the core `LookupResource()` or
+  // `DeleteResource()` functions, because we have an `IteratorContext*`
+  // and not an `OpKernelContext*`.
+  DatasetBase* returned_dataset;
+  const ResourceHandle& dataset_resource =
+      return_values[0].scalar<ResourceHandle>()();
+  auto type_index = MakeTypeIndex<DatasetBase>();
+  if (type_index.hash_code() != dataset_resource.hash_code()) {
+    return errors::InvalidArgument("`f` must return a Dataset resource.");
+  }
+  TF_RETURN_IF_ERROR(captured_func->resource_manager()->Lookup(
+      dataset_resource.container(), dataset_resource.name(),
+      &returned_dataset));
+  core::ScopedUnref unref_dataset(returned_dataset);
+
+  // Create an iterator for the dataset that was returned by `f`. This
+  // transfers ownership of the dataset to the iterator, so we can delete
+  // it from the resource manager.
+  *out_iterator = returned_dataset->MakeIterator();
+  return captured_func->resource_manager()->Delete<DatasetBase>(
+      dataset_resource.container(), dataset_resource.name());
+}
+
+// Parses the scalar int64 input `name`, which must be greater than zero.
+Status ParsePositiveScalarArgument(OpKernelContext* ctx, StringPiece name,
+                                   int64* output) {
+  const Tensor* t;
+  TF_RETURN_IF_ERROR(ctx->input(name, &t));
+  if (!TensorShapeUtils::IsScalar(t->shape())) {
+    return errors::InvalidArgument(name, " must be a scalar");
+  }
+  *output = t->scalar<int64>()();
+  if (*output <= 0) {
+    return errors::InvalidArgument(name, " must be greater than zero.");
+  }
+  return Status::OK();
+}
+
+class InterleaveDatasetOp : public OpKernel {
+ public:
+  explicit InterleaveDatasetOp(OpKernelConstruction* ctx)
+      : OpKernel(ctx), graph_def_version_(ctx->graph_def_version()) {
+    OP_REQUIRES_OK(ctx, ctx->GetAttr("f", &func_));
+    OP_REQUIRES_OK(ctx, ctx->GetAttr("output_types", &output_types_));
+    OP_REQUIRES_OK(ctx, ctx->GetAttr("output_shapes", &output_shapes_));
+  }
+
+  void Compute(OpKernelContext* ctx) override {
+    DatasetBase* input;
+    OP_REQUIRES_OK(ctx, LookupResource(ctx, HandleFromInput(ctx, 0), &input));
+    core::ScopedUnref unref_input(input);
+
+    OpInputList inputs;
+    OP_REQUIRES_OK(ctx, ctx->input_list("other_arguments", &inputs));
+    std::vector<Tensor> other_arguments;
+    other_arguments.reserve(inputs.size());
+    for (const Tensor& t : inputs) {
+      other_arguments.push_back(t);
+    }
+
+    int64 cycle_length;
+    OP_REQUIRES_OK(
+        ctx, ParsePositiveScalarArgument(ctx, "cycle_length", &cycle_length));
+    int64 block_length;
+    OP_REQUIRES_OK(
+        ctx, ParsePositiveScalarArgument(ctx, "block_length", &block_length));
+
+    std::unique_ptr<CapturedFunction> captured_func;
+    OP_REQUIRES_OK(ctx, CapturedFunction::Create(ctx, func_, graph_def_version_,
+                                                 std::move(other_arguments),
+                                                 &captured_func));
+
+    DatasetBase* dataset =
+        new Dataset(input, std::move(captured_func), cycle_length,
+                    block_length, output_types_, output_shapes_);
+
+    Tensor* output = nullptr;
+    OP_REQUIRES_OK(ctx, ctx->allocate_output(0, TensorShape({}), &output));
+    ResourceHandle handle = MakeResourceHandle<DatasetBase>(
+        ctx, ctx->step_container()->name(), name());
+    OP_REQUIRES_OK(ctx, CreateResource(ctx, handle, dataset));
+    output->flat<ResourceHandle>()(0) = handle;
+  }
+
+ private:
+  class Dataset : public DatasetBase {
+   public:
+    Dataset(const DatasetBase* input,
+            std::unique_ptr<CapturedFunction> captured_func, int64 cycle_length,
+            int64 block_length, const DataTypeVector& output_types,
+            const std::vector<PartialTensorShape>& output_shapes)
+        : input_(input),
+          captured_func_(std::move(captured_func)),
+          cycle_length_(cycle_length),
+          block_length_(block_length),
+          output_types_(output_types),
+          output_shapes_(output_shapes) {
+      input_->Ref();
+    }
+
+    ~Dataset() override { input_->Unref(); }
+
+    std::unique_ptr<IteratorBase> MakeIterator() const override {
+      return std::unique_ptr<IteratorBase>(new Iterator(this));
+    }
+
+    const DataTypeVector& output_dtypes() const override {
+      return output_types_;
+    }
+    const std::vector<PartialTensorShape>& output_shapes() const override {
+      return output_shapes_;
+    }
+
+    string DebugString() override { return "InterleaveDatasetOp::Dataset"; }
+
+   private:
+    class Iterator : public DatasetIterator<Dataset> {
+     public:
+      explicit Iterator(const Dataset* dataset)
+          : DatasetIterator<Dataset>(dataset),
+            input_impl_(dataset->input_->MakeIterator()),
+            current_elements_(dataset->cycle_length_) {}
+
+      Status GetNext(IteratorContext* ctx, std::vector<Tensor>* out_tensors,
+                     bool* end_of_sequence) override {
+        mutex_lock l(mu_);
+        while (!end_of_input_ || num_open_ > 0) {
+          if (current_elements_[cycle_index_]) {
+            // We are currently processing a mapped element, so try to get the
+            // next subelement.
+            bool end_of_element;
+            TF_RETURN_IF_ERROR(current_elements_[cycle_index_]->GetNext(
+                ctx, out_tensors, &end_of_element));
+            if (!end_of_element) {
+              // Produce the subelement as output.
+              if (++block_index_ == dataset()->block_length_) {
+                AdvanceToNextInCycle();
+              }
+              *end_of_sequence = false;
+              return Status::OK();
+            }
+            // We have reached the end of the current element, so move on
+            // to the next element in the cycle.
+            current_elements_[cycle_index_].reset();
+            --num_open_;
+            AdvanceToNextInCycle();
+          } else if (!end_of_input_) {
+            // Get the next element from the input dataset, and open it in
+            // the current position of the cycle.
+            std::vector<Tensor> args;
+            TF_RETURN_IF_ERROR(
+                input_impl_->GetNext(ctx, &args, &end_of_input_));
+            if (!end_of_input_) {
+              TF_RETURN_IF_ERROR(MakeIteratorFromInputElement(
+                  ctx, args, dataset()->captured_func_.get(),
+                  &current_elements_[cycle_index_]));
+              ++num_open_;
+            }
+          } else {
+            AdvanceToNextInCycle();
+          }
+        }
+
+        *end_of_sequence = true;
+        return Status::OK();
+      }
+
+     private:
+      void AdvanceToNextInCycle() EXCLUSIVE_LOCKS_REQUIRED(mu_) {
+        block_index_ = 0;
+        cycle_index_ = (cycle_index_ + 1) % dataset()->cycle_length_;
+      }
+
+      mutex mu_;
+      const std::unique_ptr<IteratorBase> input_impl_ GUARDED_BY(mu_);
+      std::vector<std::unique_ptr<IteratorBase>> current_elements_
+          GUARDED_BY(mu_);
+      size_t cycle_index_ GUARDED_BY(mu_) = 0;
+      int64 block_index_ GUARDED_BY(mu_) = 0;
+      bool end_of_input_ GUARDED_BY(mu_) = false;
+      size_t num_open_ GUARDED_BY(mu_) = 0;
+    };
+
+    const DatasetBase* const input_;
+    const std::unique_ptr<CapturedFunction> captured_func_;
+    const int64 cycle_length_;
+    const int64 block_length_;
+    const DataTypeVector output_types_;
+    const std::vector<PartialTensorShape> output_shapes_;
+  };
+
+  const int graph_def_version_;
+  DataTypeVector output_types_;
+  std::vector<PartialTensorShape> output_shapes_;
+  const NameAttrList* func_;
+};
+
+REGISTER_KERNEL_BUILDER(Name("InterleaveDataset").Device(DEVICE_CPU),
+                        InterleaveDatasetOp);
+
+class ParallelInterleaveDatasetOp : public OpKernel {
+ public:
+  explicit ParallelInterleaveDatasetOp(OpKernelConstruction* ctx)
+      : OpKernel(ctx), graph_def_version_(ctx->graph_def_version()) {
+    OP_REQUIRES_OK(ctx, ctx->GetAttr("f", &func_));
+    OP_REQUIRES_OK(ctx, ctx->GetAttr("output_types", &output_types_));
+    OP_REQUIRES_OK(ctx, ctx->GetAttr("output_shapes", &output_shapes_));
+  }
+
+  void Compute(OpKernelContext* ctx) override {
+    DatasetBase* input;
+    OP_REQUIRES_OK(ctx, LookupResource(ctx, HandleFromInput(ctx, 0), &input));
+    core::ScopedUnref unref_input(input);
+
+    OpInputList inputs;
+    OP_REQUIRES_OK(ctx, ctx->input_list("other_arguments", &inputs));
+    std::vector<Tensor> other_arguments;
+    other_arguments.reserve(inputs.size());
+    for (const Tensor& t : inputs) {
+      other_arguments.push_back(t);
+    }
+
+    int64 cycle_length;
+    OP_REQUIRES_OK(
+        ctx, ParsePositiveScalarArgument(ctx, "cycle_length", &cycle_length));
+    int64 block_length;
+    OP_REQUIRES_OK(
+        ctx, ParsePositiveScalarArgument(ctx, "block_length", &block_length));
+    int64 buffer_output_elements;
+    OP_REQUIRES_OK(ctx, ParsePositiveScalarArgument(
+                            ctx, "buffer_output_elements",
+                            &buffer_output_elements));
+
+    const Tensor* sloppy_t;
+    OP_REQUIRES_OK(ctx, ctx->input("sloppy", &sloppy_t));
+    OP_REQUIRES(ctx, TensorShapeUtils::IsScalar(sloppy_t->shape()),
+                errors::InvalidArgument("sloppy must be a scalar"));
+    const bool sloppy = sloppy_t->scalar<bool>()();
+
+    std::unique_ptr<CapturedFunction> captured_func;
+    OP_REQUIRES_OK(ctx, CapturedFunction::Create(ctx, func_, graph_def_version_,
+                                                 std::move(other_arguments),
+                                                 &captured_func));
+
+    // The worker threads call GetNext() on the open elements outside of
+    // any call to GetNext() on this dataset, so they need their own context.
+    IteratorContext::Params params;
+    params.env = ctx->env();
+    params.resource_manager = ctx->resource_manager();
+    params.runner = *(ctx->runner());
+
+    DatasetBase* dataset = new Dataset(
+        input, std::move(captured_func), cycle_length, block_length,
+        buffer_output_elements, sloppy, std::move(params), output_types_,
+        output_shapes_);
+
+    Tensor* output = nullptr;
+    OP_REQUIRES_OK(ctx, ctx->allocate_output(0, TensorShape({}), &output));
+    ResourceHandle handle = MakeResourceHandle<DatasetBase>(
+        ctx, ctx->step_container()->name(), name());
+    OP_REQUIRES_OK(ctx, CreateResource(ctx, handle, dataset));
+    output->flat<ResourceHandle>()(0) = handle;
+  }
+
+ private:
+  class Dataset : public DatasetBase {
+   public:
+    Dataset(const DatasetBase* input,
+            std::unique_ptr<CapturedFunction> captured_func, int64 cycle_length,
+            int64 block_length, int64 buffer_output_elements, bool sloppy,
+            IteratorContext::Params ctx_params,
+            const DataTypeVector& output_types,
+            const std::vector<PartialTensorShape>& output_shapes)
+        : input_(input),
+          captured_func_(std::move(captured_func)),
+          cycle_length_(cycle_length),
+          block_length_(block_length),
+          buffer_output_elements_(buffer_output_elements),
+          sloppy_(sloppy),
+          ctx_params_(std::move(ctx_params)),
+          output_types_(output_types),
+          output_shapes_(output_shapes) {
+      input_->Ref();
+    }
+
+    ~Dataset() override { input_->Unref(); }
+
+    std::unique_ptr<IteratorBase> MakeIterator() const override {
+      return std::unique_ptr<IteratorBase>(new Iterator(this));
+    }
+
+    const DataTypeVector& output_dtypes() const override {
+      return output_types_;
+    }
+    const std::vector<PartialTensorShape>& output_shapes() const override {
+      return output_shapes_;
+    }
+
+    string DebugString() override {
+      return "ParallelInterleaveDatasetOp::Dataset";
+    }
+
+   private:
+    // The iterator produces the same sequence of elements as the iterator
+    // of "InterleaveDataset", except that each open element of the cycle
+    // has a worker thread, which gets its subelements ahead of time into a
+    // buffer. If `sloppy_` is true, the iterator does not wait for the
+    // worker of the current element of the cycle, and takes a subelement
+    // from the next element that has one buffered instead.
+    class Iterator : public DatasetIterator<Dataset> {
+     public:
+      explicit Iterator(const Dataset* dataset)
+          : DatasetIterator<Dataset>(dataset),
+            iter_ctx_(dataset->ctx_params_),
+            input_impl_(dataset->input_->MakeIterator()),
+            workers_(dataset->cycle_length_) {}
+
+      ~Iterator() override {
+        // Signal the worker threads, if any, so that they terminate, and
+        // join them before the open elements are deleted.
+        std::vector<std::unique_ptr<Thread>> worker_threads;
+        {
+          mutex_lock l(mu_);
+          cancelled_ = true;
+          cond_var_.notify_all();
+          worker_threads = std::move(worker_threads_);
+        }
+        worker_threads.clear();
+      }
+
+      Status GetNext(IteratorContext* ctx, std::vector<Tensor>* out_tensors,
+                     bool* end_of_sequence) override {
+        mutex_lock l(mu_);
+        EnsureWorkerThreadsStarted(ctx);
+        while (!end_of_input_ || num_open_ > 0) {
+          // Find the element of the cycle from which to produce the next
+          // subelement, or wait for one if none of them is ready yet.
+          while (!cancelled_ && !IsReady(cycle_index_)) {
+            if (dataset()->sloppy_) {
+              const size_t index = FindReadyInCycle();
+              if (index != cycle_index_) {
+                cycle_index_ = index;
+                block_index_ = 0;
+                continue;
+              }
+            }
+            cond_var_.wait(l);
+          }
+          if (cancelled_) {
+            return errors::Cancelled(
+                "ParallelInterleaveDatasetOp::Dataset::Iterator::GetNext");
+          }
+
+          WorkerState* worker = &workers_[cycle_index_];
+          if (worker->is_open) {
+            if (!worker->buffer.empty()) {
+              // Forward the status from getting the subelement, and (if we
+              // successfully got one) its values.
+              Status s = worker->buffer.front().status;
+              if (s.ok()) {
+                *out_tensors = std::move(worker->buffer.front().value);
+              }
+              worker->buffer.pop_front();
+              if (++block_index_ == dataset()->block_length_) {
+                AdvanceToNextInCycle();
+              }
+              // Wake the worker, in case it has been waiting for space in
+              // its buffer.
+              cond_var_.notify_all();
+              *end_of_sequence = false;
+              return s;
+            }
+            // We have reached the end of the current element, so move on
+            // to the next element in the cycle.
+            worker->is_open = false;
+            worker->end_of_element = false;
+            worker->iterator.reset();
+            --num_open_;
+            AdvanceToNextInCycle();
+          } else if (!end_of_input_) {
+            // Get the next element from the input dataset, and hand it to
+            // the worker of the current position of the cycle.
+            std::vector<Tensor> args;
+            TF_RETURN_IF_ERROR(
+                input_impl_->GetNext(ctx, &args, &end_of_input_));
+            if (!end_of_input_) {
+              TF_RETURN_IF_ERROR(MakeIteratorFromInputElement(
+                  ctx, args, dataset()->captured_func_.get(),
+                  &worker->iterator));
+              worker->is_open = true;
+              ++num_open_;
+              cond_var_.notify_all();
+            }
+          } else {
+            AdvanceToNextInCycle();
+          }
+        }
+
+        *end_of_sequence = true;
+        return Status::OK();
+      }
+
+     private:
+      // A buffer element comprises a status and, if that status is
+      // OK, a vector of tensors representing a subelement.
+      struct BufferElement {
+        Status status;
+        std::vector<Tensor> value;
+      };
+
+      // The state of a position in the cycle, which is shared between the
+      // iterator and the worker thread of that position.
+      struct WorkerState {
+        // True if an element of the input is open in this position.
+        bool is_open = false;
+        // True if the worker has reached the end of the open element.
+        bool end_of_element = false;
+        // Only used by the worker thread while `is_open` and
+        // `!end_of_element`, and by the iterator otherwise.
+        std::unique_ptr<IteratorBase> iterator;
+        std::deque<BufferElement> buffer;
+      };
+
+      void EnsureWorkerThreadsStarted(IteratorContext* ctx)
+          EXCLUSIVE_LOCKS_REQUIRED(mu_) {
+        if (worker_threads_.empty()) {
+          for (int64 i = 0; i < dataset()->cycle_length_; ++i) {
+            worker_threads_.emplace_back(ctx->env()->StartThread(
+                {}, "interleave_worker_thread",
+                [this, i]() { WorkerThread(&workers_[i]); }));
+          }
+        }
+      }
+
+      // Returns true if the iterator can make progress at position `index`
+      // of the cycle without waiting for its worker.
+      bool IsReady(size_t index) EXCLUSIVE_LOCKS_REQUIRED(mu_) {
+        const WorkerState& worker = workers_[index];
+        return !worker.is_open || !worker.buffer.empty() ||
+               worker.end_of_element;
+      }
+
+      // Returns the first position of the cycle, from `cycle_index_` on,
+      // that has a buffered subelement, or `cycle_index_` if there is none.
+      size_t FindReadyInCycle() EXCLUSIVE_LOCKS_REQUIRED(mu_) {
+        for (size_t i = 1; i < workers_.size(); ++i) {
+          const size_t index = (cycle_index_ + i) % workers_.size();
+          if (workers_[index].is_open && !workers_[index].buffer.empty()) {
+            return index;
+          }
+        }
+        return cycle_index_;
+      }
+
+      void AdvanceToNextInCycle() EXCLUSIVE_LOCKS_REQUIRED(mu_) {
+        block_index_ = 0;
+        cycle_index_ = (cycle_index_ + 1) % dataset()->cycle_length_;
+      }
+
+      void WorkerThread(WorkerState* worker) {
+        while (true) {
+          // 1. Wait until an element is open in this position of the cycle,
+          // and there is space in the buffer.
+          IteratorBase* iterator;
+          {
+            mutex_lock l(mu_);
+            while (!cancelled_ &&
+                   (!worker->is_open || worker->end_of_element ||
+                    worker->buffer.size() >=
+                        dataset()->buffer_output_elements_)) {
+              cond_var_.wait(l);
+            }
+            if (cancelled_) {
+              return;
+            }
+            iterator = worker->iterator.get();
+          }
+
+          // 2. Get the next subelement of the open element. The lock is
+          // not held, so that the other workers and the iterator can make
+          // progress meanwhile.
+          BufferElement buffer_element;
+          bool end_of_element;
+          buffer_element.status =
+              iterator->GetNext(&iter_ctx_, &buffer_element.value,
+                                &end_of_element);
+
+          // 3. Signal that the subelement has been produced, or that the
+          // end of the element has been reached.
+          {
+            mutex_lock l(mu_);
+            if (buffer_element.status.ok() && end_of_element) {
+              worker->end_of_element = true;
+            } else {
+              worker->buffer.push_back(std::move(buffer_element));
+            }
+            cond_var_.notify_all();
+          }
+        }
+      }
+
+      // Only used by the worker threads.
+      IteratorContext iter_ctx_;
+
+      mutex mu_;
+      condition_variable cond_var_;
+      const std::unique_ptr<IteratorBase> input_impl_ GUARDED_BY(mu_);
+      std::vector<WorkerState> workers_ GUARDED_BY(mu_);
+      std::vector<std::unique_ptr<Thread>> worker_threads_ GUARDED_BY(mu_);
+      size_t cycle_index_ GUARDED_BY(mu_) = 0;
+      int64 block_index_ GUARDED_BY(mu_) = 0;
+      bool end_of_input_ GUARDED_BY(mu_) = false;
+      size_t num_open_ GUARDED_BY(mu_) = 0;
+      bool cancelled_ GUARDED_BY(mu_) = false;
+    };
+
+    const DatasetBase* const input_;
+    const std::unique_ptr<CapturedFunction> captured_func_;
+    const int64 cycle_length_;
+    const int64 block_length_;
+    const int64 buffer_output_elements_;
+    const bool sloppy_;
+    const IteratorContext::Params ctx_params_;
+    const DataTypeVector output_types_;
+    const std::vector<PartialTensorShape> output_shapes_;
+  };
+
+  const int graph_def_version_;
+  DataTypeVector output_types_;
+  std::vector<PartialTensorShape> output_shapes_;
+  const NameAttrList* func_;
+};
+
+REGISTER_KERNEL_BUILDER(Name("ParallelInterleaveDataset").Device(DEVICE_CPU),
+                        ParallelInterleaveDatasetOp);
+
+}  // namespace
+
+}  // namespace tensorflow
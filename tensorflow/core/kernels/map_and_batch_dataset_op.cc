@@ -0,0 +1,225 @@
+/* Copyright 2017 The TensorFlow Authors. All Rights Reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+==============================================================================*/
+#include "tensorflow/core/kernels/dataset.h"
+
+#include "tensorflow/core/common_runtime/function.h"
+#include "tensorflow/core/framework/partial_tensor_shape.h"
+#include "tensorflow/core/framework/tensor.h"
+#include "tensorflow/core/kernels/batch_util.h"
+#include "tensorflow/core/lib/random/random.h"
+
+#include "tensorflow/core/kernels/captured_function.h"
+
+namespace tensorflow {
+
+namespace {
+
+// See documentation in ../ops/dataset_ops.cc for a high-level
+// description of the following op.
+
+class MapAndBatchDatasetOp : public OpKernel {
+ public:
+  explicit MapAndBatchDatasetOp(OpKernelConstruction* ctx)
+      : OpKernel(ctx), graph_def_version_(ctx->graph_def_version()) {
+    OP_REQUIRES_OK(ctx, ctx->GetAttr("f", &func_));
+    OP_REQUIRES_OK(ctx, ctx->GetAttr("output_types", &output_types_));
+    OP_REQUIRES_OK(ctx, ctx->GetAttr("output_shapes", &output_shapes_));
+  }
+
+  void Compute(OpKernelContext* ctx) override {
+    DatasetBase* input;
+    OP_REQUIRES_OK(ctx, LookupResource(ctx, HandleFromInput(ctx, 0), &input));
+    core::ScopedUnref unref_input(input);
+
+    OpInputList inputs;
+    OP_REQUIRES_OK(ctx, ctx->input_list("other_arguments", &inputs));
+    std::vector<Tensor> other_arguments;
+    other_arguments.reserve(inputs.size());
+    for (const Tensor& t : inputs) {
+      other_arguments.push_back(t);
+    }
+
+    const Tensor* batch_size_t;
+    OP_REQUIRES_OK(ctx, ctx->input("batch_size", &batch_size_t));
+    OP_REQUIRES(ctx, TensorShapeUtils::IsScalar(batch_size_t->shape()),
+                errors::InvalidArgument("batch_size must be a scalar"));
+    const int64 batch_size = batch_size_t->flat<int64>()(0);
+    OP_REQUIRES(
+        ctx, batch_size > 0,
+        errors::InvalidArgument("Batch size must be greater than zero."));
+
+    std::unique_ptr<CapturedFunction> captured_func;
+    OP_REQUIRES_OK(ctx, CapturedFunction::Create(ctx, func_, graph_def_version_,
+                                                 std::move(other_arguments),
+                                                 &captured_func));
+
+    DatasetBase* dataset =
+        new Dataset(input, batch_size, std::move(captured_func),
+                    output_types_, output_shapes_);
+
+    Tensor* output = nullptr;
+    OP_REQUIRES_OK(ctx, ctx->allocate_output(0, TensorShape({}), &output));
+    ResourceHandle handle = MakeResourceHandle<DatasetBase>(
+        ctx, ctx->step_container()->name(), name());
+    OP_REQUIRES_OK(ctx, CreateResource(ctx, handle, dataset));
+    output->flat<ResourceHandle>()(0) = handle;
+  }
+
+ private:
+  class Dataset : public DatasetBase {
+   public:
+    Dataset(const DatasetBase* input, int64 batch_size,
+            std::unique_ptr<CapturedFunction> captured_func,
+            const DataTypeVector& output_types,
+            const std::vector<PartialTensorShape>& output_shapes)
+        : input_(input),
+          batch_size_(batch_size),
+          captured_func_(std::move(captured_func)),
+          output_types_(output_types),
+          output_shapes_(output_shapes) {
+      input_->Ref();
+    }
+
+    ~Dataset() override { input_->Unref(); }
+
+    std::unique_ptr<IteratorBase> MakeIterator() const override {
+      return std::unique_ptr<IteratorBase>(new Iterator(this));
+    }
+
+    const DataTypeVector& output_dtypes() const override {
+      return output_types_;
+    }
+    const std::vector<PartialTensorShape>& output_shapes() const override {
+      return output_shapes_;
+    }
+
+    string DebugString() override {
+      return strings::StrCat("MapAndBatchDatasetOp(", batch_size_,
+                             ")::Dataset");
+    }
+
+   private:
+    class Iterator : public DatasetIterator<Dataset> {
+     public:
+      explicit Iterator(const Dataset* dataset)
+          : DatasetIterator<Dataset>(dataset),
+            input_impl_(dataset->input_->MakeIterator()) {}
+
+      Status GetNext(IteratorContext* ctx, std::vector<Tensor>* out_tensors,
+                     bool* end_of_sequence) override {
+        mutex_lock l(mu_);
+        FunctionLibraryRuntime::Options opts;
+        // Choose a step ID that is guaranteed not to clash with any
+        // Session-generated step ID. DirectSession only generates
+        // non-negative step IDs (contiguous, starting from 0), and
+        // MasterSession generates 56-bit random step IDs whose MSB is
+        // always 0, so a negative random step ID should suffice.
+        opts.step_id = -std::abs(static_cast<int64>(random::New64()));
+        opts.runner = ctx->runner();
+
+        // Unlike a "MapDataset" followed by a "BatchDataset", we copy
+        // each mapped element into its slice of the batch as soon as it
+        // has been computed, so that only one mapped element is alive at
+        // a time, and the batch tensors are allocated once per batch.
+        std::vector<Tensor> batch;
+        std::vector<TensorShape> element_shapes;
+        int64 num_elements = 0;
+        *end_of_sequence = false;
+        while (num_elements < dataset()->batch_size_) {
+          std::vector<Tensor> args;
+          TF_RETURN_IF_ERROR(
+              input_impl_->GetNext(ctx, &args, end_of_sequence));
+          if (*end_of_sequence) {
+            break;
+          }
+
+          std::vector<Tensor> return_values;
+          TF_RETURN_IF_ERROR(
+              dataset()->captured_func_->Run(opts, args, &return_values));
+
+          if (num_elements == 0) {
+            // The first mapped element of the batch determines the shapes
+            // of the batch tensors.
+            batch.reserve(return_values.size());
+            element_shapes.reserve(return_values.size());
+            for (const Tensor& t : return_values) {
+              TensorShape batch_component_shape({dataset()->batch_size_});
+              batch_component_shape.AppendShape(t.shape());
+              batch.emplace_back(cpu_allocator(), t.dtype(),
+                                 batch_component_shape);
+              element_shapes.push_back(t.shape());
+            }
+          } else if (return_values.size() != batch.size()) {
+            return errors::InvalidArgument(
+                "`f` returned ", return_values.size(),
+                " components, but the first element of the batch has ",
+                batch.size(), ".");
+          }
+          for (size_t i = 0; i < return_values.size(); ++i) {
+            if (return_values[i].dtype() != batch[i].dtype() ||
+                !return_values[i].shape().IsSameSize(element_shapes[i])) {
+              return errors::InvalidArgument(
+                  "Cannot batch tensors with different shapes in component ",
+                  i, ". First element had shape ",
+                  element_shapes[i].DebugString(), " and element ",
+                  num_elements, " had shape ",
+                  return_values[i].shape().DebugString(), ".");
+            }
+            TF_RETURN_IF_ERROR(batch_util::CopyElementToSlice(
+                return_values[i], &batch[i], num_elements));
+          }
+          ++num_elements;
+        }
+
+        if (num_elements == 0) {
+          DCHECK(*end_of_sequence);
+          return Status::OK();
+        }
+        if (num_elements < dataset()->batch_size_) {
+          // The input ended before the batch was full, so only return
+          // the slices that we filled in.
+          for (Tensor& t : batch) {
+            t = t.Slice(0, num_elements);
+          }
+        }
+        *out_tensors = std::move(batch);
+        *end_of_sequence = false;
+        return Status::OK();
+      }
+
+     private:
+      mutex mu_;
+      const std::unique_ptr<IteratorBase> input_impl_ GUARDED_BY(mu_);
+    };
+
+    const DatasetBase* const input_;
+    const int64 batch_size_;
+    const std::unique_ptr<CapturedFunction> captured_func_;
+    const DataTypeVector output_types_;
+    const std::vector<PartialTensorShape> output_shapes_;
+  };
+
+  const int graph_def_version_;
+  DataTypeVector output_types_;
+  std::vector<PartialTensorShape> output_shapes_;
+  const NameAttrList* func_;
+};
+
+REGISTER_KERNEL_BUILDER(Name("MapAndBatchDataset").Device(DEVICE_CPU),
+                        MapAndBatchDatasetOp);
+
+}  // namespace
+
+}  // namespace tensorflow
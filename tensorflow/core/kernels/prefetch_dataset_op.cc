@@ -0,0 +1,378 @@
+/* Copyright 2017 The TensorFlow Authors. All Rights Reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+==============================================================================*/
+#include <deque>
+
+#include "tensorflow/core/kernels/dataset.h"
+#include "tensorflow/core/framework/partial_tensor_shape.h"
+#include "tensorflow/core/framework/resource_mgr.h"
+#include "tensorflow/core/framework/tensor.h"
+
+namespace tensorflow {
+
+namespace {
+
+// See documentation in ../ops/dataset_ops.cc for a high-level
+// description of the following ops.
+
+// Occupancy statistics of the buffers of the iterators over a
+// "PrefetchDataset", which "PrefetchDatasetStats" reads.
+//
+// The statistics are reset when an iterator is created, i.e. when an
+// iterator over the dataset is initialized. The iterators created before
+// then stop updating them.
+class PrefetchStats : public ResourceBase {
+ public:
+  // Resets the statistics, and returns the generation to pass to the
+  // other methods by the new iterator.
+  int64 Reset() {
+    mutex_lock l(mu_);
+    buffered_ = 0;
+    num_get_next_ = 0;
+    num_waits_ = 0;
+    buffered_sum_ = 0;
+    return ++generation_;
+  }
+
+  // Records a call to GetNext() that found `buffered` elements in the
+  // buffer, and whether it had to wait for the input.
+  void RecordGetNext(int64 generation, int64 buffered, bool waited) {
+    mutex_lock l(mu_);
+    if (generation != generation_) {
+      return;
+    }
+    ++num_get_next_;
+    if (waited) {
+      ++num_waits_;
+    }
+    buffered_sum_ += buffered;
+  }
+
+  // Adds `delta` to the number of elements currently buffered.
+  void AddBuffered(int64 generation, int64 delta) {
+    mutex_lock l(mu_);
+    if (generation != generation_) {
+      return;
+    }
+    buffered_ += delta;
+  }
+
+  void Read(int64* buffered, int64* num_get_next, int64* num_waits,
+            int64* buffered_sum) {
+    mutex_lock l(mu_);
+    *buffered = buffered_;
+    *num_get_next = num_get_next_;
+    *num_waits = num_waits_;
+    *buffered_sum = buffered_sum_;
+  }
+
+  string DebugString() override { return "PrefetchStats"; }
+
+ private:
+  mutex mu_;
+  int64 generation_ GUARDED_BY(mu_) = 0;
+  int64 buffered_ GUARDED_BY(mu_) = 0;
+  int64 num_get_next_ GUARDED_BY(mu_) = 0;
+  int64 num_waits_ GUARDED_BY(mu_) = 0;
+  int64 buffered_sum_ GUARDED_BY(mu_) = 0;
+};
+
+Status LookupOrCreatePrefetchStats(OpKernelContext* ctx, const string& name,
+                                   PrefetchStats** stats) {
+  ResourceMgr* mgr = ctx->resource_manager();
+  return mgr->LookupOrCreate<PrefetchStats>(
+      mgr->default_container(), name, stats, [](PrefetchStats** ret) {
+        *ret = new PrefetchStats;
+        return Status::OK();
+      });
+}
+
+class PrefetchDatasetOp : public OpKernel {
+ public:
+  explicit PrefetchDatasetOp(OpKernelConstruction* ctx) : OpKernel(ctx) {
+    OP_REQUIRES_OK(ctx, ctx->GetAttr("shared_name", &shared_name_));
+    OP_REQUIRES_OK(ctx, ctx->GetAttr("output_types", &output_types_));
+    OP_REQUIRES_OK(ctx, ctx->GetAttr("output_shapes", &output_shapes_));
+  }
+
+  void Compute(OpKernelContext* ctx) override {
+    DatasetBase* input;
+    OP_REQUIRES_OK(ctx, LookupResource(ctx, HandleFromInput(ctx, 0), &input));
+    core::ScopedUnref unref_input(input);
+
+    const Tensor* buffer_size_t;
+    OP_REQUIRES_OK(ctx, ctx->input("buffer_size", &buffer_size_t));
+    OP_REQUIRES(ctx, TensorShapeUtils::IsScalar(buffer_size_t->shape()),
+                errors::InvalidArgument("buffer_size must be a scalar"));
+    const int64 buffer_size = buffer_size_t->flat<int64>()(0);
+    OP_REQUIRES(
+        ctx, buffer_size > 0,
+        errors::InvalidArgument("buffer_size must be greater than zero."));
+
+    PrefetchStats* stats = nullptr;
+    if (!shared_name_.empty()) {
+      OP_REQUIRES_OK(ctx,
+                     LookupOrCreatePrefetchStats(ctx, shared_name_, &stats));
+    }
+
+    // The prefetch thread calls GetNext() on the input outside of any
+    // call to GetNext() on this dataset, so it needs its own context.
+    IteratorContext::Params params;
+    params.env = ctx->env();
+    params.resource_manager = ctx->resource_manager();
+    params.runner = *(ctx->runner());
+
+    DatasetBase* dataset = new Dataset(input, buffer_size, stats,
+                                       std::move(params), output_types_,
+                                       output_shapes_);
+
+    Tensor* output = nullptr;
+    OP_REQUIRES_OK(ctx, ctx->allocate_output(0, TensorShape({}), &output));
+    ResourceHandle handle = MakeResourceHandle<DatasetBase>(
+        ctx, ctx->step_container()->name(), name());
+    OP_REQUIRES_OK(ctx, CreateResource(ctx, handle, dataset));
+    output->flat<ResourceHandle>()(0) = handle;
+  }
+
+ private:
+  class Dataset : public DatasetBase {
+   public:
+    // Takes ownership of one reference on `stats`, which may be null.
+    Dataset(const DatasetBase* input, int64 buffer_size, PrefetchStats* stats,
+            IteratorContext::Params ctx_params,
+            const DataTypeVector& output_types,
+            const std::vector<PartialTensorShape>& output_shapes)
+        : input_(input),
+          buffer_size_(buffer_size),
+          stats_(stats),
+          ctx_params_(std::move(ctx_params)),
+          output_types_(output_types),
+          output_shapes_(output_shapes) {
+      input_->Ref();
+    }
+
+    ~Dataset() override {
+      input_->Unref();
+      if (stats_ != nullptr) {
+        stats_->Unref();
+      }
+    }
+
+    std::unique_ptr<IteratorBase> MakeIterator() const override {
+      return std::unique_ptr<IteratorBase>(new Iterator(this));
+    }
+
+    const DataTypeVector& output_dtypes() const override {
+      return output_types_;
+    }
+    const std::vector<PartialTensorShape>& output_shapes() const override {
+      return output_shapes_;
+    }
+
+    string DebugString() override { return "PrefetchDatasetOp::Dataset"; }
+
+   private:
+    class Iterator : public DatasetIterator<Dataset> {
+     public:
+      explicit Iterator(const Dataset* dataset)
+          : DatasetIterator<Dataset>(dataset),
+            iter_ctx_(dataset->ctx_params_),
+            input_impl_(dataset->input_->MakeIterator()),
+            stats_generation_(dataset->stats_ != nullptr
+                                  ? dataset->stats_->Reset()
+                                  : 0) {}
+
+      ~Iterator() override {
+        // Signal the prefetch thread, if any, so that it terminates, and
+        // join it before the buffer and the input iterator are deleted.
+        std::unique_ptr<Thread> prefetch_thread;
+        {
+          mutex_lock l(mu_);
+          cancelled_ = true;
+          cond_var_.notify_all();
+          prefetch_thread = std::move(prefetch_thread_);
+        }
+        prefetch_thread.reset();
+
+        mutex_lock l(mu_);
+        if (dataset()->stats_ != nullptr) {
+          dataset()->stats_->AddBuffered(stats_generation_,
+                                         -static_cast<int64>(buffer_.size()));
+        }
+      }
+
+      Status GetNext(IteratorContext* ctx, std::vector<Tensor>* out_tensors,
+                     bool* end_of_sequence) override {
+        mutex_lock l(mu_);
+        TF_RETURN_IF_ERROR(EnsurePrefetchThreadStarted(ctx));
+        const int64 buffered = buffer_.size();
+
+        // Wait until the next element in the buffer has been produced, or
+        // the input is exhausted.
+        bool waited = false;
+        while (!cancelled_ && buffer_.empty() && !prefetch_thread_finished_) {
+          waited = true;
+          cond_var_.wait(l);
+        }
+
+        if (cancelled_) {
+          return errors::Cancelled(
+              "PrefetchDatasetOp::Dataset::Iterator::GetNext");
+        }
+
+        if (!buffer_.empty()) {
+          if (dataset()->stats_ != nullptr) {
+            dataset()->stats_->RecordGetNext(stats_generation_, buffered,
+                                             waited);
+          }
+
+          // Forward the status from getting the element, and (if we
+          // successfully got an element) its values.
+          Status s = buffer_.front().status;
+          if (s.ok()) {
+            *out_tensors = std::move(buffer_.front().value);
+          }
+          buffer_.pop_front();
+          if (dataset()->stats_ != nullptr) {
+            dataset()->stats_->AddBuffered(stats_generation_, -1);
+          }
+          *end_of_sequence = false;
+
+          // Wake the prefetch thread, in case it has been waiting for
+          // space in the buffer.
+          cond_var_.notify_all();
+          return s;
+        }
+
+        *end_of_sequence = true;
+        return Status::OK();
+      }
+
+     private:
+      // A buffer element comprises a status and, if that status is
+      // OK, a vector of tensors representing an element of the input.
+      struct BufferElement {
+        Status status;
+        std::vector<Tensor> value;
+      };
+
+      Status EnsurePrefetchThreadStarted(IteratorContext* ctx)
+          EXCLUSIVE_LOCKS_REQUIRED(mu_) {
+        if (!prefetch_thread_ && !prefetch_thread_finished_) {
+          prefetch_thread_.reset(ctx->env()->StartThread(
+              {}, "prefetch_thread", [this]() { PrefetchThread(); }));
+        }
+        return Status::OK();
+      }
+
+      void PrefetchThread() {
+        while (true) {
+          // 1. Wait for a slot in the buffer.
+          {
+            mutex_lock l(mu_);
+            while (!cancelled_ && static_cast<int64>(buffer_.size()) ==
+                                      dataset()->buffer_size_) {
+              cond_var_.wait(l);
+            }
+            if (cancelled_) {
+              return;
+            }
+          }
+
+          // 2. Get the next element from the input. The lock is not held,
+          // so that GetNext() can take elements from the buffer meanwhile.
+          BufferElement buffer_element;
+          bool end_of_sequence;
+          buffer_element.status = input_impl_->GetNext(
+              &iter_ctx_, &buffer_element.value, &end_of_sequence);
+
+          // 3. Signal that the element has been produced, or that the
+          // input is exhausted.
+          {
+            mutex_lock l(mu_);
+            if (buffer_element.status.ok() && end_of_sequence) {
+              prefetch_thread_finished_ = true;
+              cond_var_.notify_all();
+              return;
+            }
+            buffer_.push_back(std::move(buffer_element));
+            if (dataset()->stats_ != nullptr) {
+              dataset()->stats_->AddBuffered(stats_generation_, 1);
+            }
+            cond_var_.notify_all();
+          }
+        }
+      }
+
+      // Only used by the prefetch thread.
+      IteratorContext iter_ctx_;
+      const std::unique_ptr<IteratorBase> input_impl_;
+      // The generation of `dataset()->stats_` that this iterator updates.
+      const int64 stats_generation_;
+
+      mutex mu_;
+      condition_variable cond_var_;
+      std::deque<BufferElement> buffer_ GUARDED_BY(mu_);
+      std::unique_ptr<Thread> prefetch_thread_ GUARDED_BY(mu_);
+      bool cancelled_ GUARDED_BY(mu_) = false;
+      bool prefetch_thread_finished_ GUARDED_BY(mu_) = false;
+    };
+
+    const DatasetBase* const input_;
+    const int64 buffer_size_;
+    PrefetchStats* const stats_;
+    const IteratorContext::Params ctx_params_;
+    const DataTypeVector output_types_;
+    const std::vector<PartialTensorShape> output_shapes_;
+  };
+
+  string shared_name_;
+  DataTypeVector output_types_;
+  std::vector<PartialTensorShape> output_shapes_;
+};
+
+class PrefetchDatasetStatsOp : public OpKernel {
+ public:
+  explicit PrefetchDatasetStatsOp(OpKernelConstruction* ctx) : OpKernel(ctx) {
+    OP_REQUIRES_OK(ctx, ctx->GetAttr("shared_name", &shared_name_));
+    OP_REQUIRES(ctx, !shared_name_.empty(),
+                errors::InvalidArgument("shared_name must not be empty."));
+  }
+
+  void Compute(OpKernelContext* ctx) override {
+    PrefetchStats* stats;
+    OP_REQUIRES_OK(ctx, LookupOrCreatePrefetchStats(ctx, shared_name_, &stats));
+    core::ScopedUnref unref_stats(stats);
+
+    int64 values[4];
+    stats->Read(&values[0], &values[1], &values[2], &values[3]);
+    for (int i = 0; i < 4; ++i) {
+      Tensor* output = nullptr;
+      OP_REQUIRES_OK(ctx, ctx->allocate_output(i, TensorShape({}), &output));
+      output->scalar<int64>()() = values[i];
+    }
+  }
+
+ private:
+  string shared_name_;
+};
+
+REGISTER_KERNEL_BUILDER(Name("PrefetchDataset").Device(DEVICE_CPU),
+                        PrefetchDatasetOp);
+REGISTER_KERNEL_BUILDER(Name("PrefetchDatasetStats").Device(DEVICE_CPU),
+                        PrefetchDatasetStatsOp);
+
+}  // namespace
+
+}  // namespace tensorflow
@@ -48,12 +48,15 @@ class SparseConditionalAccumulator
     : public TypedConditionalAccumulatorBase<
           std::tuple<const Tensor*, const Tensor*, const Tensor*>> {
  public:
+  // If "sum" is true, the extracted gradient holds the sum of the gradients
+  // applied at each index instead of their average.
   SparseConditionalAccumulator(const DataType& dtype,
                                const PartialTensorShape& shape,
-                               const string& name)
+                               const string& name, bool sum = false)
       : TypedConditionalAccumulatorBase<
             std::tuple<const Tensor*, const Tensor*, const Tensor*>>(
-            dtype, shape, name) {
+            dtype, shape, name),
+        sum_(sum) {
     accum_idx_vec_ = nullptr;
     count_element_ = nullptr;
     accum_val_ = nullptr;
@@ -74,6 +77,8 @@ class SparseConditionalAccumulator
   Tensor* accum_val_ = nullptr;
   PersistentTensor* accum_val_persistent_ = nullptr;
 
+  const bool sum_;
+
   typedef Eigen::TensorMap<Eigen::Tensor<T, 1, Eigen::RowMajor>,
                            Eigen::Unaligned>
       SliceT;
@@ -320,6 +325,7 @@ class SparseConditionalAccumulator
 
   void DivideAccumGradByCounter(OpKernelContext* ctx) override
       EXCLUSIVE_LOCKS_REQUIRED(this->mu_) {
+    if (sum_) return;
     const int64 nnz = count_element_->size();
     auto accum_flat = accum_val_->flat_outer_dims<T>();
     std::vector<T> count_typet;
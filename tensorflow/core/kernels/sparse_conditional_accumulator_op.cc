@@ -28,19 +28,25 @@ template <typename Device, typename T>
 class SparseConditionalAccumulatorOp : public ConditionalAccumulatorBaseOp {
  public:
   explicit SparseConditionalAccumulatorOp(OpKernelConstruction* context)
-      : ConditionalAccumulatorBaseOp(context) {}
+      : ConditionalAccumulatorBaseOp(context) {
+    OP_REQUIRES_OK(context,
+                   context->GetAttr("reduction_type", &reduction_type_));
+  }
 
  protected:
   Creator GetCreator() const override {
     return [this](ConditionalAccumulatorBase** ret) {
       SparseConditionalAccumulator<Device, T>* accumulator =
-          new SparseConditionalAccumulator<Device, T>(dtype_, shape_,
-                                                      cinfo_.name());
+          new SparseConditionalAccumulator<Device, T>(
+              dtype_, shape_, cinfo_.name(), reduction_type_ == "SUM");
       *ret = accumulator;
       return Status::OK();
     };
   }
 
+ private:
+  string reduction_type_;
+
   TF_DISALLOW_COPY_AND_ASSIGN(SparseConditionalAccumulatorOp);
 };
 
@@ -3197,4 +3197,255 @@ REGISTER_KERNELS(double, int64);
 
 #undef REGISTER_KERNELS
 
+// Base class of the MultiApply* kernels, which apply the same update to a
+// list of N variables with a single op. This saves the per-op overhead of
+// updating many small variables one op at a time.
+//
+// The inputs are the lists of variables and slots named by <ref_names>, the
+// scalars named by <scalar_names> and the list of gradients "grad". Subclasses
+// implement Apply() to update the i-th variable and its slots.
+template <typename Device, typename T>
+class MultiApplyOpBase : public OpKernel {
+ public:
+  MultiApplyOpBase(OpKernelConstruction* ctx, std::vector<string> ref_names,
+                   std::vector<string> scalar_names, string grad_name)
+      : OpKernel(ctx),
+        ref_names_(std::move(ref_names)),
+        scalar_names_(std::move(scalar_names)),
+        grad_name_(std::move(grad_name)) {
+    OP_REQUIRES_OK(ctx, ctx->GetAttr("use_locking", &use_exclusive_lock_));
+  }
+
+  void Compute(OpKernelContext* ctx) override {
+    const int num_lists = ref_names_.size();
+    std::vector<OpMutableInputList> ref_lists(num_lists);
+    for (int k = 0; k < num_lists; ++k) {
+      OP_REQUIRES_OK(ctx,
+                     ctx->mutable_input_list(ref_names_[k], &ref_lists[k]));
+    }
+    auto locks = MaybeLockRefLists(ref_lists);
+
+    OpInputList grads;
+    OP_REQUIRES_OK(ctx, ctx->input_list(grad_name_, &grads));
+    const int num_scalars = scalar_names_.size();
+    std::vector<const Tensor*> scalars(num_scalars);
+    for (int k = 0; k < num_scalars; ++k) {
+      OP_REQUIRES_OK(ctx, ctx->input(scalar_names_[k], &scalars[k]));
+      OP_REQUIRES(ctx, IsLegacyScalar(scalars[k]->shape()),
+                  errors::InvalidArgument(scalar_names_[k],
+                                          " is not a scalar: ",
+                                          scalars[k]->shape().DebugString()));
+    }
+
+    // Validate all the variables before updating any of them.
+    const int n = grads.size();
+    std::vector<std::vector<Tensor>> refs(num_lists, std::vector<Tensor>(n));
+    for (int k = 0; k < num_lists; ++k) {
+      for (int i = 0; i < n; ++i) {
+        refs[k][i] = ref_lists[k].at(i, use_exclusive_lock_);
+        OP_REQUIRES(ctx, refs[k][i].IsInitialized(),
+                    errors::FailedPrecondition(
+                        "Attempting to use uninitialized variables: ",
+                        def().input(k * n + i)));
+        OP_REQUIRES(
+            ctx, refs[k][i].shape().IsSameSize(grads[i].shape()),
+            errors::InvalidArgument(ref_names_[k], "[", i, "] and ", grad_name_,
+                                    "[", i, "] do not have the same shape",
+                                    refs[k][i].shape().DebugString(), " ",
+                                    grads[i].shape().DebugString()));
+      }
+    }
+
+    const Device& device = ctx->template eigen_device<Device>();
+    for (int i = 0; i < n; ++i) {
+      Apply(device, i, &refs, scalars, grads[i]);
+    }
+
+    for (int i = 0; i < n; ++i) {
+      ctx->forward_ref_input_to_ref_output(i, i);
+    }
+  }
+
+ protected:
+  // Updates (*refs)[0][i], the i-th variable, and its slots (*refs)[k][i]
+  // using the gradient `grad`.
+  virtual void Apply(const Device& device, int i,
+                     std::vector<std::vector<Tensor>>* refs,
+                     const std::vector<const Tensor*>& scalars,
+                     const Tensor& grad) = 0;
+
+  bool use_exclusive_lock_;
+
+ private:
+  // Like MaybeLockVariableInputMutexesInOrder(), for lists of ref inputs that
+  // may hold many variables.
+  std::vector<mutex_lock> MaybeLockRefLists(
+      std::vector<OpMutableInputList>& ref_lists) {
+    std::vector<mutex_lock> locks;
+    if (!use_exclusive_lock_) {
+      return locks;
+    }
+    std::vector<mutex*> mutexes;
+    for (OpMutableInputList& list : ref_lists) {
+      for (int i = 0; i < list.size(); ++i) {
+        mutexes.push_back(list.ref_mutex(i));
+      }
+    }
+    std::sort(mutexes.begin(), mutexes.end());
+    mutexes.erase(std::unique(mutexes.begin(), mutexes.end()), mutexes.end());
+    locks.reserve(mutexes.size());
+    for (mutex* mu : mutexes) {
+      locks.emplace_back(*mu);
+    }
+    return locks;
+  }
+
+  const std::vector<string> ref_names_;
+  const std::vector<string> scalar_names_;
+  const string grad_name_;
+};
+
+template <typename Device, typename T>
+class MultiApplyGradientDescentOp : public MultiApplyOpBase<Device, T> {
+ public:
+  explicit MultiApplyGradientDescentOp(OpKernelConstruction* ctx)
+      : MultiApplyOpBase<Device, T>(ctx, {"var"}, {"alpha"}, "delta") {}
+
+ protected:
+  void Apply(const Device& device, int i,
+             std::vector<std::vector<Tensor>>* refs,
+             const std::vector<const Tensor*>& scalars,
+             const Tensor& grad) override {
+    functor::ApplyGradientDescent<Device, T>()(
+        device, (*refs)[0][i].flat<T>(), scalars[0]->scalar<T>(),
+        grad.flat<T>());
+  }
+};
+
+template <typename Device, typename T>
+class MultiApplyMomentumOp : public MultiApplyOpBase<Device, T> {
+ public:
+  explicit MultiApplyMomentumOp(OpKernelConstruction* ctx)
+      : MultiApplyOpBase<Device, T>(ctx, {"var", "accum"}, {"lr", "momentum"},
+                                    "grad") {
+    OP_REQUIRES_OK(ctx, ctx->GetAttr("use_nesterov", &use_nesterov_));
+  }
+
+ protected:
+  void Apply(const Device& device, int i,
+             std::vector<std::vector<Tensor>>* refs,
+             const std::vector<const Tensor*>& scalars,
+             const Tensor& grad) override {
+    functor::ApplyMomentum<Device, T>()(
+        device, (*refs)[0][i].flat<T>(), (*refs)[1][i].flat<T>(),
+        scalars[0]->scalar<T>(), grad.flat<T>(), scalars[1]->scalar<T>(),
+        use_nesterov_);
+  }
+
+ private:
+  bool use_nesterov_;
+};
+
+template <typename Device, typename T>
+class MultiApplyAdamOp : public MultiApplyOpBase<Device, T> {
+ public:
+  explicit MultiApplyAdamOp(OpKernelConstruction* ctx)
+      : MultiApplyOpBase<Device, T>(
+            ctx, {"var", "m", "v"},
+            {"beta1_power", "beta2_power", "lr", "beta1", "beta2", "epsilon"},
+            "grad") {
+    OP_REQUIRES_OK(ctx, ctx->GetAttr("use_nesterov", &use_nesterov_));
+  }
+
+ protected:
+  void Apply(const Device& device, int i,
+             std::vector<std::vector<Tensor>>* refs,
+             const std::vector<const Tensor*>& scalars,
+             const Tensor& grad) override {
+    functor::ApplyAdam<Device, T>()(
+        device, (*refs)[0][i].flat<T>(), (*refs)[1][i].flat<T>(),
+        (*refs)[2][i].flat<T>(), scalars[0]->scalar<T>(),
+        scalars[1]->scalar<T>(), scalars[2]->scalar<T>(),
+        scalars[3]->scalar<T>(), scalars[4]->scalar<T>(),
+        scalars[5]->scalar<T>(), grad.flat<T>(), use_nesterov_);
+  }
+
+ private:
+  bool use_nesterov_;
+};
+
+template <typename Device, typename T>
+class MultiApplyRMSPropOp : public MultiApplyOpBase<Device, T> {
+ public:
+  explicit MultiApplyRMSPropOp(OpKernelConstruction* ctx)
+      : MultiApplyOpBase<Device, T>(ctx, {"var", "ms", "mom"},
+                                    {"lr", "rho", "momentum", "epsilon"},
+                                    "grad") {}
+
+ protected:
+  void Apply(const Device& device, int i,
+             std::vector<std::vector<Tensor>>* refs,
+             const std::vector<const Tensor*>& scalars,
+             const Tensor& grad) override {
+    functor::ApplyRMSProp<Device, T>()(
+        device, (*refs)[0][i].flat<T>(), (*refs)[1][i].flat<T>(),
+        (*refs)[2][i].flat<T>(), scalars[0]->scalar<T>(),
+        scalars[1]->scalar<T>(), scalars[2]->scalar<T>(),
+        scalars[3]->scalar<T>(), grad.flat<T>());
+  }
+};
+
+template <typename Device, typename T>
+class MultiApplyAdagradOp : public MultiApplyOpBase<Device, T> {
+ public:
+  explicit MultiApplyAdagradOp(OpKernelConstruction* ctx)
+      : MultiApplyOpBase<Device, T>(ctx, {"var", "accum"}, {"lr"}, "grad") {}
+
+ protected:
+  void Apply(const Device& device, int i,
+             std::vector<std::vector<Tensor>>* refs,
+             const std::vector<const Tensor*>& scalars,
+             const Tensor& grad) override {
+    functor::ApplyAdagrad<Device, T>()(device, (*refs)[0][i].flat<T>(),
+                                       (*refs)[1][i].flat<T>(),
+                                       scalars[0]->scalar<T>(), grad.flat<T>());
+  }
+};
+
+#define REGISTER_KERNELS(D, T)                                         \
+  REGISTER_KERNEL_BUILDER(Name("MultiApplyGradientDescent")            \
+                              .Device(DEVICE_##D)                      \
+                              .TypeConstraint<T>("T"),                 \
+                          MultiApplyGradientDescentOp<D##Device, T>);  \
+  REGISTER_KERNEL_BUILDER(Name("MultiApplyMomentum")                   \
+                              .Device(DEVICE_##D)                      \
+                              .TypeConstraint<T>("T"),                 \
+                          MultiApplyMomentumOp<D##Device, T>);         \
+  REGISTER_KERNEL_BUILDER(Name("MultiApplyAdam")                       \
+                              .Device(DEVICE_##D)                      \
+                              .TypeConstraint<T>("T"),                 \
+                          MultiApplyAdamOp<D##Device, T>);             \
+  REGISTER_KERNEL_BUILDER(Name("MultiApplyRMSProp")                    \
+                              .Device(DEVICE_##D)                      \
+                              .TypeConstraint<T>("T"),                 \
+                          MultiApplyRMSPropOp<D##Device, T>);          \
+  REGISTER_KERNEL_BUILDER(Name("MultiApplyAdagrad")                    \
+                              .Device(DEVICE_##D)                      \
+                              .TypeConstraint<T>("T"),                 \
+                          MultiApplyAdagradOp<D##Device, T>);
+#define REGISTER_CPU_KERNELS(T) REGISTER_KERNELS(CPU, T);
+
+TF_CALL_half(REGISTER_CPU_KERNELS);
+TF_CALL_float(REGISTER_CPU_KERNELS);
+TF_CALL_double(REGISTER_CPU_KERNELS);
+
+#if GOOGLE_CUDA
+// The GPU functors are declared above, next to the single variable kernels.
+REGISTER_KERNELS(GPU, Eigen::half);
+REGISTER_KERNELS(GPU, float);
+REGISTER_KERNELS(GPU, double);
+#endif
+#undef REGISTER_CPU_KERNELS
+#undef REGISTER_KERNELS
+
 }  // namespace tensorflow
@@ -988,6 +988,7 @@ REGISTER_OP("SparseConditionalAccumulator")
     .Attr("shape: shape")
     .Attr("container: string = ''")
     .Attr("shared_name: string = ''")
+    .Attr("reduction_type: { 'MEAN', 'SUM' } = 'MEAN'")
     .SetIsStateful()
     .SetShapeFn([](InferenceContext* c) {
       c->set_output(0, c->Vector(2));
@@ -1010,6 +1011,8 @@ container: If non-empty, this accumulator is placed in the given container.
   Otherwise, a default container is used.
 shared_name: If non-empty, this accumulator will be shared under the given name
   across multiple sessions.
+reduction_type: With 'MEAN', each index of the extracted gradient is the
+  average of the values applied at that index. With 'SUM', it is their sum.
 )doc");
 
 REGISTER_OP("SparseAccumulatorApplyGradient")
@@ -177,6 +177,66 @@ f: A function mapping elements of `input_dataset`, concatenated with
   `output_types` and `output_shapes`.
 )doc");
 
+REGISTER_OP("InterleaveDataset")
+    .Input("input_dataset: resource")
+    .Input("other_arguments: Targuments")
+    .Input("cycle_length: int64")
+    .Input("block_length: int64")
+    .Output("handle: resource")
+    .Attr("f: func")
+    .Attr("Targuments: list(type) >= 0")
+    .Attr("output_types: list(type) >= 1")
+    .Attr("output_shapes: list(shape) >= 1")
+    .SetShapeFn(shape_inference::ScalarShape)
+    .Doc(R"doc(
+Creates a dataset that applies `f` to the outputs of `input_dataset`.
+
+Unlike MapDataset, the `f` in InterleaveDataset is expected to return
+a Dataset resource, and InterleaveDataset will interleave the
+elements of `cycle_length` successive results, taking `block_length`
+consecutive elements from each of them in turn.
+
+f: A function mapping elements of `input_dataset`, concatenated with
+  `other_arguments`, to a Dataset resource that contains elements matching
+  `output_types` and `output_shapes`.
+cycle_length: The number of results of `f` to interleave.
+block_length: The number of consecutive elements to take from each result
+  of `f`.
+)doc");
+
+REGISTER_OP("ParallelInterleaveDataset")
+    .Input("input_dataset: resource")
+    .Input("other_arguments: Targuments")
+    .Input("cycle_length: int64")
+    .Input("block_length: int64")
+    .Input("buffer_output_elements: int64")
+    .Input("sloppy: bool")
+    .Output("handle: resource")
+    .Attr("f: func")
+    .Attr("Targuments: list(type) >= 0")
+    .Attr("output_types: list(type) >= 1")
+    .Attr("output_shapes: list(shape) >= 1")
+    .SetShapeFn(shape_inference::ScalarShape)
+    .Doc(R"doc(
+Creates a dataset that applies `f` to the outputs of `input_dataset`.
+
+Like InterleaveDataset, except that an iterator over this dataset gets
+the elements of each of the `cycle_length` results of `f` that it
+interleaves on a separate background thread.
+
+f: A function mapping elements of `input_dataset`, concatenated with
+  `other_arguments`, to a Dataset resource that contains elements matching
+  `output_types` and `output_shapes`.
+cycle_length: The number of results of `f` to interleave, and the number of
+  threads that get their elements.
+block_length: The number of consecutive elements to take from each result
+  of `f`.
+buffer_output_elements: The maximum number of elements of each result of `f`
+  to buffer ahead of time.
+sloppy: If true, the elements are produced in the order in which they are
+  ready, instead of the deterministic order of InterleaveDataset.
+)doc");
+
 REGISTER_OP("GroupByWindowDataset")
     .Input("input_dataset: resource")
     .Input("key_func_other_arguments: Tkey_func_other_arguments")
@@ -199,6 +259,35 @@ key_func: A function mapping an element of `input_dataset`, concatenated
   with `key_func_other_arguments` to a scalar value of type DT_INT64.
 )doc");
 
+REGISTER_OP("GroupByWindowDatasetV2")
+    .Input("input_dataset: resource")
+    .Input("key_func_other_arguments: Tkey_func_other_arguments")
+    .Input("reduce_func_other_arguments: Treduce_func_other_arguments")
+    .Input(
+        "window_size_func_other_arguments: Twindow_size_func_other_arguments")
+    .Output("handle: resource")
+    .Attr("key_func: func")
+    .Attr("reduce_func: func")
+    .Attr("window_size_func: func")
+    .Attr("Tkey_func_other_arguments: list(type) >= 0")
+    .Attr("Treduce_func_other_arguments: list(type) >= 0")
+    .Attr("Twindow_size_func_other_arguments: list(type) >= 0")
+    .Attr("output_types: list(type) >= 1")
+    .Attr("output_shapes: list(shape) >= 1")
+    .SetShapeFn(shape_inference::ScalarShape)
+    .Doc(R"doc(
+Creates a dataset that computes a windowed group-by on `input_dataset`.
+
+Unlike "GroupByWindowDataset", the size of the windows depends on the key.
+
+key_func: A function mapping an element of `input_dataset`, concatenated
+  with `key_func_other_arguments` to a scalar value of type DT_INT64.
+window_size_func: A function mapping a key, concatenated with
+  `window_size_func_other_arguments` to the maximum number of consecutive
+  elements with that key to pass to `reduce_func`, as a positive scalar value
+  of type DT_INT64. It is called once for each distinct key.
+)doc");
+
 REGISTER_OP("FilterDataset")
     .Input("input_dataset: resource")
     .Input("other_arguments: Targuments")
@@ -236,6 +325,29 @@ batch_size: A scalar representing the number of elements to accumulate in a
   batch.
 )doc");
 
+REGISTER_OP("MapAndBatchDataset")
+    .Input("input_dataset: resource")
+    .Input("other_arguments: Targuments")
+    .Input("batch_size: int64")
+    .Output("handle: resource")
+    .Attr("f: func")
+    .Attr("Targuments: list(type) >= 0")
+    .Attr("output_types: list(type) >= 1")
+    .Attr("output_shapes: list(shape) >= 1")
+    .SetShapeFn(shape_inference::ScalarShape)
+    .Doc(R"doc(
+Creates a dataset that applies `f` to the outputs of `input_dataset` and then
+batches `batch_size` of them.
+
+Unlike a "MapDataset" followed by a "BatchDataset", this dataset copies each
+result of `f` into its slice of the batch as soon as it has been computed.
+
+f: A function mapping elements of `input_dataset`, concatenated with
+  `other_arguments`, to the components of an element of the batch.
+batch_size: A scalar representing the number of elements to accumulate in a
+  batch.
+)doc");
+
 REGISTER_OP("PaddedBatchDataset")
     .Input("input_dataset: resource")
     .Input("batch_size: int64")
@@ -326,6 +438,72 @@ seed: A scalar seed for the random number generator. If either seed or
 seed2: A second scalar seed to avoid seed collision.
 )doc");
 
+REGISTER_OP("PrefetchDataset")
+    .Input("input_dataset: resource")
+    .Input("buffer_size: int64")
+    .Output("handle: resource")
+    .Attr("shared_name: string = ''")
+    .Attr("output_types: list(type) >= 1")
+    .Attr("output_shapes: list(shape) >= 1")
+    .SetShapeFn(shape_inference::ScalarShape)
+    .Doc(R"doc(
+Creates a dataset that asynchronously prefetches elements from `input_dataset`.
+
+An iterator over this dataset gets elements from `input_dataset` on a
+background thread, ahead of the calls to get its next element.
+
+buffer_size: The maximum number of elements to buffer in an iterator over
+  this dataset.
+shared_name: If non-empty, the iterators over this dataset record the
+  occupancy of their buffers in the statistics with this name, which
+  "PrefetchDatasetStats" reads. The statistics are reset when an iterator
+  over this dataset is created, and only that iterator updates them. The name
+  should be unique across the clients of a server.
+)doc");
+
+REGISTER_OP("PrefetchDatasetStats")
+    .Output("buffered: int64")
+    .Output("num_get_next: int64")
+    .Output("num_waits: int64")
+    .Output("buffered_sum: int64")
+    .Attr("shared_name: string")
+    .SetIsStateful()
+    .SetShapeFn([](shape_inference::InferenceContext* c) {
+      for (int i = 0; i < c->num_outputs(); ++i) {
+        c->set_output(i, c->Scalar());
+      }
+      return Status::OK();
+    })
+    .Doc(R"doc(
+Returns the buffer occupancy statistics of the iterators over a "PrefetchDataset".
+
+buffered: The number of elements currently buffered.
+num_get_next: The number of elements that were requested.
+num_waits: The number of requests that found the buffer empty and had to wait
+  for `input_dataset`.
+buffered_sum: The sum of the number of buffered elements seen by the requests.
+shared_name: The `shared_name` of the "PrefetchDataset".
+)doc");
+
+REGISTER_OP("CacheDataset")
+    .Input("input_dataset: resource")
+    .Input("filename: string")
+    .Output("handle: resource")
+    .Attr("output_types: list(type) >= 1")
+    .Attr("output_shapes: list(shape) >= 1")
+    .SetShapeFn(shape_inference::ScalarShape)
+    .Doc(R"doc(
+Creates a dataset that caches elements from `input_dataset`.
+
+The first iterator over this dataset that reaches the end of `input_dataset`
+stores its elements in the cache, and the iterators created afterwards read
+the elements from the cache instead of `input_dataset`. The elements of an
+iterator that did not reach the end of `input_dataset` are discarded.
+
+filename: A scalar representing the path of the file in which to cache the
+  elements. If it is empty, the elements are cached in memory.
+)doc");
+
 REGISTER_OP("TextLineDataset")
     .Input("filenames: string")
     .Output("handle: resource")
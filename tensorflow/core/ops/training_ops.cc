@@ -1646,4 +1646,188 @@ use_locking: If `True`, updating of the var, mg, ms, and mom tensors is
   contention.
 )doc");
 
+// Shape function of the MultiApply* ops. Their inputs are <num_lists> lists of
+// N variables (the variables, then each of their slots), <num_scalars>
+// scalars and the list of the N gradients.
+static Status MultiApplyShapeFn(InferenceContext* c, int num_lists,
+                                int num_scalars) {
+  int n;
+  TF_RETURN_IF_ERROR(c->GetAttr("N", &n));
+  ShapeHandle unused;
+  const int scalars_idx = num_lists * n;
+  for (int i = 0; i < num_scalars; ++i) {
+    TF_RETURN_IF_ERROR(c->WithRank(c->input(scalars_idx + i), 0, &unused));
+  }
+  const int grads_idx = scalars_idx + num_scalars;
+  for (int i = 0; i < n; ++i) {
+    ShapeHandle s = c->input(i);
+    for (int k = 1; k < num_lists; ++k) {
+      TF_RETURN_IF_ERROR(c->Merge(s, c->input(k * n + i), &s));
+    }
+    TF_RETURN_IF_ERROR(c->Merge(s, c->input(grads_idx + i), &s));
+    c->set_output(i, s);
+  }
+  return Status::OK();
+}
+
+REGISTER_OP("MultiApplyGradientDescent")
+    .Input("var: Ref(N * T)")
+    .Input("alpha: T")
+    .Input("delta: N * T")
+    .Output("out: Ref(N * T)")
+    .Attr("N: int >= 1")
+    .Attr("T: numbertype")
+    .Attr("use_locking: bool = false")
+    .SetShapeFn([](InferenceContext* c) {
+      return MultiApplyShapeFn(c, 1 /* num_lists */, 1 /* num_scalars */);
+    })
+    .Doc(R"doc(
+Update each '*var[i]' by subtracting 'alpha' * 'delta[i]' from it.
+
+Same as running ApplyGradientDescent on each variable, with a single op.
+
+var: Should be from Variable()s.
+alpha: Scaling factor. Must be a scalar.
+delta: The changes, one per variable.
+out: Same as "var".
+use_locking: If `True`, the subtraction will be protected by a lock;
+  otherwise the behavior is undefined, but may exhibit less contention.
+)doc");
+
+REGISTER_OP("MultiApplyMomentum")
+    .Input("var: Ref(N * T)")
+    .Input("accum: Ref(N * T)")
+    .Input("lr: T")
+    .Input("momentum: T")
+    .Input("grad: N * T")
+    .Output("out: Ref(N * T)")
+    .Attr("N: int >= 1")
+    .Attr("T: numbertype")
+    .Attr("use_locking: bool = false")
+    .Attr("use_nesterov: bool = false")
+    .SetShapeFn([](InferenceContext* c) {
+      return MultiApplyShapeFn(c, 2 /* num_lists */, 2 /* num_scalars */);
+    })
+    .Doc(R"doc(
+Update each '*var[i]' according to the momentum scheme.
+
+Same as running ApplyMomentum on each variable, with a single op.
+
+var: Should be from Variable()s.
+accum: Should be from Variable()s, one per variable.
+lr: Scaling factor. Must be a scalar.
+momentum: Momentum. Must be a scalar.
+grad: The gradients, one per variable.
+out: Same as "var".
+use_locking: If `True`, updating of the var and accum tensors will be protected
+  by a lock; otherwise the behavior is undefined, but may exhibit less
+  contention.
+use_nesterov: If `True`, the tensor passed to compute grad will be
+  var - lr * momentum * accum, so in the end, the var you get is actually
+  var - lr * momentum * accum.
+)doc");
+
+REGISTER_OP("MultiApplyAdam")
+    .Input("var: Ref(N * T)")
+    .Input("m: Ref(N * T)")
+    .Input("v: Ref(N * T)")
+    .Input("beta1_power: T")
+    .Input("beta2_power: T")
+    .Input("lr: T")
+    .Input("beta1: T")
+    .Input("beta2: T")
+    .Input("epsilon: T")
+    .Input("grad: N * T")
+    .Output("out: Ref(N * T)")
+    .Attr("N: int >= 1")
+    .Attr("T: numbertype")
+    .Attr("use_locking: bool = false")
+    .Attr("use_nesterov: bool = false")
+    .SetShapeFn([](InferenceContext* c) {
+      return MultiApplyShapeFn(c, 3 /* num_lists */, 6 /* num_scalars */);
+    })
+    .Doc(R"doc(
+Update each '*var[i]' according to the Adam algorithm.
+
+Same as running ApplyAdam on each variable, with a single op.
+
+var: Should be from Variable()s.
+m: Should be from Variable()s, one per variable.
+v: Should be from Variable()s, one per variable.
+beta1_power: Must be a scalar.
+beta2_power: Must be a scalar.
+lr: Scaling factor. Must be a scalar.
+beta1: Momentum factor. Must be a scalar.
+beta2: Momentum factor. Must be a scalar.
+epsilon: Ridge term. Must be a scalar.
+grad: The gradients, one per variable.
+out: Same as "var".
+use_locking: If `True`, updating of the var, m, and v tensors will be protected
+  by a lock; otherwise the behavior is undefined, but may exhibit less
+  contention.
+use_nesterov: If `True`, uses the nesterov update.
+)doc");
+
+REGISTER_OP("MultiApplyRMSProp")
+    .Input("var: Ref(N * T)")
+    .Input("ms: Ref(N * T)")
+    .Input("mom: Ref(N * T)")
+    .Input("lr: T")
+    .Input("rho: T")
+    .Input("momentum: T")
+    .Input("epsilon: T")
+    .Input("grad: N * T")
+    .Output("out: Ref(N * T)")
+    .Attr("N: int >= 1")
+    .Attr("T: numbertype")
+    .Attr("use_locking: bool = false")
+    .SetShapeFn([](InferenceContext* c) {
+      return MultiApplyShapeFn(c, 3 /* num_lists */, 4 /* num_scalars */);
+    })
+    .Doc(R"doc(
+Update each '*var[i]' according to the RMSProp algorithm.
+
+Same as running ApplyRMSProp on each variable, with a single op.
+
+var: Should be from Variable()s.
+ms: Should be from Variable()s, one per variable.
+mom: Should be from Variable()s, one per variable.
+lr: Scaling factor. Must be a scalar.
+rho: Decay rate. Must be a scalar.
+momentum: Momentum. Must be a scalar.
+epsilon: Ridge term. Must be a scalar.
+grad: The gradients, one per variable.
+out: Same as "var".
+use_locking: If `True`, updating of the var, ms, and mom tensors is protected
+  by a lock; otherwise the behavior is undefined, but may exhibit less
+  contention.
+)doc");
+
+REGISTER_OP("MultiApplyAdagrad")
+    .Input("var: Ref(N * T)")
+    .Input("accum: Ref(N * T)")
+    .Input("lr: T")
+    .Input("grad: N * T")
+    .Output("out: Ref(N * T)")
+    .Attr("N: int >= 1")
+    .Attr("T: numbertype")
+    .Attr("use_locking: bool = false")
+    .SetShapeFn([](InferenceContext* c) {
+      return MultiApplyShapeFn(c, 2 /* num_lists */, 1 /* num_scalars */);
+    })
+    .Doc(R"doc(
+Update each '*var[i]' according to the adagrad scheme.
+
+Same as running ApplyAdagrad on each variable, with a single op.
+
+var: Should be from Variable()s.
+accum: Should be from Variable()s, one per variable.
+lr: Scaling factor. Must be a scalar.
+grad: The gradients, one per variable.
+out: Same as "var".
+use_locking: If `True`, updating of the var and accum tensors will be protected
+  by a lock; otherwise the behavior is undefined, but may exhibit less
+  contention.
+)doc");
+
 }  // namespace tensorflow
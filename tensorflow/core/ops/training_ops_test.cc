@@ -14,6 +14,7 @@ limitations under the License.
 ==============================================================================*/
 
 #include "tensorflow/core/framework/graph.pb.h"
+#include "tensorflow/core/framework/node_def_builder.h"
 #include "tensorflow/core/framework/op.h"
 #include "tensorflow/core/framework/shape_inference_testutil.h"
 #include "tensorflow/core/platform/test.h"
@@ -290,6 +291,35 @@ TEST(TrainingOpsTest, ApplyAdam_ShapeFn) {
   INFER_ERROR(err, op, "?;?;?;?;?;?;?;?;[?];?");
 }
 
+TEST(TrainingOpsTest, MultiApplyAdam_ShapeFn) {
+  ShapeInferenceTestOp op("MultiApplyAdam");
+  const int n = 2;
+  std::vector<NodeDefBuilder::NodeOut> refs;
+  std::vector<NodeDefBuilder::NodeOut> grads;
+  for (int i = 0; i < n; ++i) {
+    refs.emplace_back("a", 0, DT_FLOAT_REF);
+    grads.emplace_back("b", 0, DT_FLOAT);
+  }
+  NodeDefBuilder builder("test", "MultiApplyAdam");
+  builder.Input(refs).Input(refs).Input(refs);
+  for (int i = 0; i < 6; ++i) builder.Input("c", 0, DT_FLOAT);
+  TF_ASSERT_OK(builder.Input(grads).Attr("N", n).Finalize(&op.node_def));
+
+  // Output i is a merge of var[i], m[i], v[i] and grad[i].
+  INFER_OK(op, "[1,?];[?];[?,2];?;?;?;[];[];[];[];[];[];?;[3]",
+           "[d0_0,d2_1];[d13_0]");
+  INFER_ERROR("Dimension 0 in both shapes must be equal, but are 1 and 2", op,
+              "[1];?;[2];?;?;?;[];[];[];[];[];[];?;?");
+  INFER_ERROR("Dimension 0 in both shapes must be equal, but are 1 and 2", op,
+              "?;[1];?;?;?;?;[];[];[];[];[];[];?;[2]");
+
+  // The scalars must be scalars.
+  INFER_ERROR("Shape must be rank 0 but is rank 1", op,
+              "?;?;?;?;?;?;[?];?;?;?;?;?;?;?");
+  INFER_ERROR("Shape must be rank 0 but is rank 1", op,
+              "?;?;?;?;?;?;?;?;?;?;?;[?];?;?");
+}
+
 TEST(TrainingOpsTest, ApplyRMSProp_ShapeFn) {
   ShapeInferenceTestOp op("ApplyRMSProp");
 
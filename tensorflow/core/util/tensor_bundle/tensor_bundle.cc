@@ -16,7 +16,10 @@ limitations under the License.
 #include "tensorflow/core/util/tensor_bundle/tensor_bundle.h"
 
 #include <algorithm>
+#include <deque>
+#include <functional>
 #include <memory>
+#include <unordered_set>
 #include <utility>
 
 #include "tensorflow/core/framework/register_types.h"
@@ -33,7 +36,9 @@ limitations under the License.
 #include "tensorflow/core/lib/io/path.h"
 #include "tensorflow/core/lib/io/table_builder.h"
 #include "tensorflow/core/lib/random/random.h"
+#include "tensorflow/core/lib/strings/strcat.h"
 #include "tensorflow/core/lib/strings/stringprintf.h"
+#include "tensorflow/core/platform/mutex.h"
 #include "tensorflow/core/util/saved_tensor_slice_util.h"
 #include "tensorflow/core/util/tensor_slice_util.h"
 
@@ -238,6 +243,117 @@ bool IsFullSlice(const TensorSlice& slice_spec,
   }
 }
 
+// Returns whether "slice_spec" selects whole rows, i.e. a range along the first
+// dimension, of a tensor of shape "full_tensor_shape".  Such a slice is a
+// contiguous range of the elements of the tensor.
+bool IsRowSlice(const TensorSlice& slice_spec,
+                const TensorShape& full_tensor_shape) {
+  if (full_tensor_shape.dims() == 0 ||
+      slice_spec.dims() != full_tensor_shape.dims()) {
+    return false;
+  }
+  for (int d = 1; d < full_tensor_shape.dims(); ++d) {
+    if (!slice_spec.IsFullAt(d) &&
+        (slice_spec.start(d) != 0 ||
+         slice_spec.length(d) != full_tensor_shape.dim_size(d))) {
+      return false;
+    }
+  }
+  return true;
+}
+
+// Returns the range [*start, *end) of rows covered by "slice_spec", a slice of
+// a tensor of shape "full_tensor_shape" with at least one dimension.
+void RowRange(const TensorSlice& slice_spec,
+              const TensorShape& full_tensor_shape, int64* start, int64* end) {
+  if (slice_spec.IsFullAt(0)) {
+    *start = 0;
+    *end = full_tensor_shape.dim_size(0);
+  } else {
+    *start = slice_spec.start(0);
+    *end = slice_spec.end(0);
+  }
+}
+
+// Verifies the checksum of the bytes of "entry" in "file", reading them in
+// chunks of at most "buffer_size" bytes.
+Status VerifyEntryChecksum(const RandomAccessFile* file,
+                           const BundleEntryProto& entry, size_t buffer_size) {
+  const size_t size = entry.size();
+  std::unique_ptr<char[]> buffer(new char[std::min(buffer_size, size) + 1]);
+  uint32 actual_crc32c = 0;
+  size_t bytes_read = 0;
+  StringPiece result;
+  while (bytes_read < size) {
+    const size_t desired_bytes = std::min(buffer_size, size - bytes_read);
+    TF_RETURN_IF_ERROR(file->Read(entry.offset() + bytes_read, desired_bytes,
+                                  &result, buffer.get()));
+    if (result.size() != desired_bytes) {
+      return errors::DataLoss("Requested ", desired_bytes, " bytes but read ",
+                              result.size(), " bytes.");
+    }
+    actual_crc32c = crc32c::Extend(actual_crc32c, result.data(), result.size());
+    bytes_read += desired_bytes;
+  }
+  if (crc32c::Unmask(entry.crc32c()) != actual_crc32c) {
+    return errors::DataLoss(
+        "Checksum does not match: stored ",
+        strings::Printf("%08u", crc32c::Unmask(entry.crc32c())),
+        " vs. calculated on the restored bytes ", actual_crc32c);
+  }
+  return Status::OK();
+}
+
+// Remembers the entries whose checksum was verified for partial reads, so
+// that a tensor read in many pieces, usually by a different BundleReader and
+// thread for each piece, is streamed through once.
+class VerifiedEntries {
+ public:
+  static VerifiedEntries* Global() {
+    static VerifiedEntries* verified = new VerifiedEntries;
+    return verified;
+  }
+
+  // Runs "verify" unless the entry identified by "key" was verified before.
+  // If another thread is verifying it, waits for that verification instead
+  // of starting another one.
+  Status Verify(const string& key, const std::function<Status()>& verify) {
+    {
+      mutex_lock l(mu_);
+      while (verified_.count(key) == 0) {
+        if (in_progress_.count(key) == 0) {
+          in_progress_.insert(key);
+          break;
+        }
+        cv_.wait(l);
+      }
+      if (verified_.count(key) > 0) return Status::OK();
+    }
+    const Status status = verify();
+    mutex_lock l(mu_);
+    in_progress_.erase(key);
+    if (status.ok() && verified_.insert(key).second) {
+      order_.push_back(key);
+      // Only the most recent entries are kept.
+      if (order_.size() > kMaxEntries) {
+        verified_.erase(order_.front());
+        order_.pop_front();
+      }
+    }
+    cv_.notify_all();
+    return status;
+  }
+
+ private:
+  static const size_t kMaxEntries = 4096;
+
+  mutex mu_;
+  condition_variable cv_;
+  std::unordered_set<string> verified_ GUARDED_BY(mu_);
+  std::deque<string> order_ GUARDED_BY(mu_);
+  std::unordered_set<string> in_progress_ GUARDED_BY(mu_);
+};
+
 Status CorruptFileError(const Status& in_status, const string& filename,
                         const string& detail) {
   if (in_status.ok()) {
@@ -725,6 +841,44 @@ Status BundleReader::GetValue(const BundleEntryProto& entry, Tensor* val) {
   return Status::OK();
 }
 
+Status BundleReader::GetRowsValue(const BundleEntryProto& entry,
+                                  int64 first_row, Tensor* val) {
+  const TensorShape stored_shape(entry.shape());
+  const int64 stored_bytes =
+      stored_shape.num_elements() * DataTypeSize(entry.dtype());
+  if (entry.size() != stored_bytes) {
+    return errors::DataLoss("Invalid size in bundle entry: key ", key(),
+                            "; stored size ", entry.size(),
+                            "; expected size ", stored_bytes);
+  }
+  const int64 num_rows = stored_shape.dim_size(0);
+  const int64 row_bytes = num_rows == 0 ? 0 : stored_bytes / num_rows;
+  if (first_row < 0 || val->dims() == 0 ||
+      first_row + val->dim_size(0) > num_rows ||
+      val->TotalBytes() != val->dim_size(0) * row_bytes) {
+    return errors::InvalidArgument("Cannot read ", val->shape().DebugString(),
+                                   " from row ", first_row, " of a tensor of ",
+                                   stored_shape.DebugString());
+  }
+
+  const string filename = DataFilename(prefix_, entry.shard_id(), num_shards_);
+  std::unique_ptr<RandomAccessFile> file;
+  TF_RETURN_IF_ERROR(env_->NewRandomAccessFile(filename, &file));
+  // The checksum covers the whole stored tensor.  It is verified by streaming
+  // through the whole entry the first time part of it is read, which keeps
+  // the memory used by the read bounded by the requested rows.
+  TF_RETURN_IF_ERROR(VerifiedEntries::Global()->Verify(
+      strings::StrCat(filename, ":", entry.offset(), ":", entry.size(), ":",
+                      entry.crc32c()),
+      [&file, &entry]() {
+        return VerifyEntryChecksum(file.get(), entry, 8 << 20 /* 8MB buffer */);
+      }));
+  char* backing_buffer = const_cast<char*>((val->tensor_data().data()));
+  return ReadInputByChunk(file.get(), entry.offset() + first_row * row_bytes,
+                          val->TotalBytes(), 8 << 20 /* 8MB buffer */,
+                          backing_buffer);
+}
+
 Status BundleReader::Lookup(StringPiece key, Tensor* val) {
   CHECK(val != nullptr);
   BundleEntryProto entry;
@@ -837,6 +991,30 @@ Status BundleReader::GetSliceValue(StringPiece full_tensor_key,
       return status_;
     }
 
+    // Reading a range of rows from stored slices that are ranges of rows,
+    // e.g. to restore a large variable in pieces or into a differently
+    // partitioned variable: read just the overlapping rows of each stored
+    // slice, straight into their place in "val".
+    if (DataTypeCanUseMemcpy(stored_slice_entry.dtype()) &&
+        IsRowSlice(stored_slice, full_shape) &&
+        IsRowSlice(slice_spec, full_shape)) {
+      int64 stored_start, stored_end, spec_start, spec_end;
+      RowRange(stored_slice, full_shape, &stored_start, &stored_end);
+      RowRange(slice_spec, full_shape, &spec_start, &spec_end);
+      const int64 start = std::max(stored_start, spec_start);
+      const int64 end = std::min(stored_end, spec_end);
+      Tensor rows = val->Slice(start - spec_start, end - spec_start);
+      if (start == stored_start && end == stored_end) {
+        // All of the stored slice is needed: read it whole, which verifies
+        // its checksum on the way.
+        status_ = GetValue(stored_slice_entry, &rows);
+      } else {
+        status_ = GetRowsValue(stored_slice_entry, start - stored_start, &rows);
+      }
+      if (!status_.ok()) return status_;
+      continue;
+    }
+
     Tensor stored_slice_tensor(stored_slice_entry.dtype(), stored_slice_shape);
     status_ = GetValue(stored_slice_entry, &stored_slice_tensor);
     if (!status_.ok()) return status_;
@@ -892,6 +1070,24 @@ Status BundleReader::LookupTensorShape(StringPiece key, TensorShape* shape) {
   return LookupDtypeAndShape(key, &ignored, shape);
 }
 
+Status BundleReader::LookupDataLocation(StringPiece key, string* filename,
+                                        int64* offset) {
+  BundleEntryProto entry;
+  TF_RETURN_IF_ERROR(GetBundleEntryProto(key, &entry));
+  if (entry.slices_size() > 0) {
+    return errors::InvalidArgument("Tensor ", key,
+                                   " is stored as several slices");
+  }
+  if (!DataTypeCanUseMemcpy(entry.dtype())) {
+    return errors::InvalidArgument("Tensor ", key, " of type ",
+                                   DataTypeString(entry.dtype()),
+                                   " is not stored as raw bytes");
+  }
+  *filename = DataFilename(prefix_, entry.shard_id(), num_shards_);
+  *offset = entry.offset();
+  return Status::OK();
+}
+
 string BundleReader::DebugString() {
   // Format used below emulates that of TensorSliceReader::DebugString().
   string shape_str;
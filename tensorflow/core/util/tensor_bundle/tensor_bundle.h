@@ -227,6 +227,14 @@ class BundleReader {
   Status LookupSlice(StringPiece full_tensor_key, const TensorSlice& slice_spec,
                      Tensor* val) TF_MUST_USE_RESULT;
 
+  // Looks up where the tensor keyed by "key" is stored: its bytes, in the
+  // layout of Tensor::tensor_data(), start at "offset" in the data file
+  // "filename".  Only supported for tensors that are stored whole and whose
+  // dtype can be memcpy'd.
+  // REQUIRES: status().ok()
+  Status LookupDataLocation(StringPiece key, string* filename,
+                            int64* offset) TF_MUST_USE_RESULT;
+
   // Seeks to the first position in the bundle whose key is no less than "key".
   // REQUIRES: status().ok()
   void Seek(StringPiece key) { return iter_->Seek(key); }
@@ -258,6 +266,15 @@ class BundleReader {
   Status GetValue(const BundleEntryProto& entry,
                   Tensor* val) TF_MUST_USE_RESULT;
 
+  // Reads rows [first_row, first_row + val->dim_size(0)) of the tensor
+  // described by the metadata proto "entry", which must have a dtype that can
+  // be memcpy'd, into the pre-allocated "val".  Only the bytes of those rows
+  // are copied.  The checksum of the entry is verified by streaming through
+  // the whole entry the first time this process reads part of it; concurrent
+  // partial reads of the entry wait for that verification.
+  Status GetRowsValue(const BundleEntryProto& entry, int64 first_row,
+                      Tensor* val) TF_MUST_USE_RESULT;
+
   // Reads the slice described by "slice_spec".  The corresponding full tensor
   // has key "ful_tensor_key" and metadata proto "full_tensor_entry".
   // REQUIRES: full_tensor_entry.slices_size() > 0
@@ -24,6 +24,7 @@ limitations under the License.
 #include "tensorflow/core/lib/core/status_test_util.h"
 #include "tensorflow/core/lib/io/path.h"
 #include "tensorflow/core/lib/io/table_builder.h"
+#include "tensorflow/core/lib/core/threadpool.h"
 #include "tensorflow/core/lib/strings/strcat.h"
 #include "tensorflow/core/platform/test.h"
 
@@ -367,6 +368,124 @@ TEST(TensorBundleTest, EquivalentSliceTest) {
   }
 }
 
+TEST(TensorBundleTest, RowSlicesOfFullTensor) {
+  Tensor full(DT_FLOAT, TensorShape({4, 3}));
+  test::FillIota<float>(&full, 0.);
+  {
+    BundleWriter writer(Env::Default(), Prefix("foo"));
+    TF_ASSERT_OK(writer.Add("foo", full));
+    TF_ASSERT_OK(writer.Finish());
+  }
+  BundleReader reader(Env::Default(), Prefix("foo"));
+  TF_ASSERT_OK(reader.status());
+  {
+    Tensor val(DT_FLOAT, TensorShape({2, 3}));
+    TF_ASSERT_OK(
+        reader.LookupSlice("foo", TensorSlice::ParseOrDie("1,2:-"), &val));
+    test::ExpectTensorEqual<float>(
+        val, test::AsTensor<float>({3, 4, 5, 6, 7, 8}, TensorShape({2, 3})));
+  }
+  {
+    Tensor val(DT_FLOAT, TensorShape({1, 3}));
+    TF_ASSERT_OK(
+        reader.LookupSlice("foo", TensorSlice::ParseOrDie("3,1:0,3"), &val));
+    test::ExpectTensorEqual<float>(
+        val, test::AsTensor<float>({9, 10, 11}, TensorShape({1, 3})));
+  }
+  // Not a range of rows.
+  {
+    Tensor val(DT_FLOAT, TensorShape({4, 1}));
+    TF_ASSERT_OK(
+        reader.LookupSlice("foo", TensorSlice::ParseOrDie("-:2,1"), &val));
+    test::ExpectTensorEqual<float>(
+        val, test::AsTensor<float>({2, 5, 8, 11}, TensorShape({4, 1})));
+  }
+}
+
+TEST(TensorBundleTest, RowSlicesAcrossStoredSlices) {
+  const TensorShape kFullShape({4, 3});
+  {
+    BundleWriter writer(Env::Default(), Prefix("foo"));
+    TF_ASSERT_OK(writer.AddSlice(
+        "foo", kFullShape, TensorSlice::ParseOrDie("0,2:-"),
+        test::AsTensor<float>({0, 1, 2, 3, 4, 5}, TensorShape({2, 3}))));
+    TF_ASSERT_OK(writer.AddSlice(
+        "foo", kFullShape, TensorSlice::ParseOrDie("2,2:-"),
+        test::AsTensor<float>({6, 7, 8, 9, 10, 11}, TensorShape({2, 3}))));
+    TF_ASSERT_OK(writer.Finish());
+  }
+  BundleReader reader(Env::Default(), Prefix("foo"));
+  TF_ASSERT_OK(reader.status());
+  Tensor val(DT_FLOAT, TensorShape({2, 3}));
+  TF_ASSERT_OK(
+      reader.LookupSlice("foo", TensorSlice::ParseOrDie("1,2:-"), &val));
+  test::ExpectTensorEqual<float>(
+      val, test::AsTensor<float>({3, 4, 5, 6, 7, 8}, TensorShape({2, 3})));
+  string filename;
+  int64 offset;
+  EXPECT_FALSE(reader.LookupDataLocation("foo", &filename, &offset).ok());
+  // Covers all of the first stored slice and part of the second one.
+  Tensor rows(DT_FLOAT, TensorShape({3, 3}));
+  TF_ASSERT_OK(
+      reader.LookupSlice("foo", TensorSlice::ParseOrDie("0,3:-"), &rows));
+  test::ExpectTensorEqual<float>(
+      rows, test::AsTensor<float>({0, 1, 2, 3, 4, 5, 6, 7, 8},
+                                  TensorShape({3, 3})));
+}
+
+TEST(TensorBundleTest, ConcurrentRowSlices) {
+  Tensor full(DT_FLOAT, TensorShape({8, 3}));
+  test::FillIota<float>(&full, 0.);
+  {
+    BundleWriter writer(Env::Default(), Prefix("concurrent"));
+    TF_ASSERT_OK(writer.Add("foo", full));
+    TF_ASSERT_OK(writer.Finish());
+  }
+  // Like a streaming restore: each piece is read by its own reader, while the
+  // checksum of the entry is verified once for all of them.
+  std::vector<Tensor> pieces(8, Tensor(DT_FLOAT, TensorShape({1, 3})));
+  std::vector<Status> statuses(8);
+  {
+    thread::ThreadPool pool(Env::Default(), "read_rows", 4);
+    for (int i = 0; i < 8; ++i) {
+      pool.Schedule([i, &pieces, &statuses]() {
+        BundleReader reader(Env::Default(), Prefix("concurrent"));
+        statuses[i] = reader.LookupSlice(
+            "foo", TensorSlice::ParseOrDie(strings::StrCat(i, ",1:-")),
+            &pieces[i]);
+      });
+    }
+  }
+  for (int i = 0; i < 8; ++i) {
+    TF_EXPECT_OK(statuses[i]);
+    test::ExpectTensorEqual<float>(
+        pieces[i], test::AsTensor<float>({3.f * i, 3.f * i + 1, 3.f * i + 2},
+                                         TensorShape({1, 3})));
+  }
+}
+
+TEST(TensorBundleTest, LookupDataLocation) {
+  Tensor full(DT_FLOAT, TensorShape({4, 3}));
+  test::FillIota<float>(&full, 0.);
+  {
+    BundleWriter writer(Env::Default(), Prefix("foo"));
+    TF_ASSERT_OK(writer.Add("foo", full));
+    TF_ASSERT_OK(writer.Add("strs", test::AsTensor<string>({"a", "b"})));
+    TF_ASSERT_OK(writer.Finish());
+  }
+  BundleReader reader(Env::Default(), Prefix("foo"));
+  TF_ASSERT_OK(reader.status());
+  string filename;
+  int64 offset;
+  TF_ASSERT_OK(reader.LookupDataLocation("foo", &filename, &offset));
+  string contents;
+  TF_ASSERT_OK(ReadFileToString(Env::Default(), filename, &contents));
+  EXPECT_EQ(full.tensor_data(),
+            StringPiece(contents).substr(offset, full.TotalBytes()));
+  EXPECT_FALSE(reader.LookupDataLocation("strs", &filename, &offset).ok());
+  EXPECT_FALSE(reader.LookupDataLocation("missing", &filename, &offset).ok());
+}
+
 TEST(TensorBundleTest, NonStandardShapes) {
   TestNonStandardShapes<float>();
   TestNonStandardShapes<double>();
@@ -545,6 +664,44 @@ TEST(TensorBundleTest, Checksum) {
     ExpectLookupFails("strings", "foo",
                       "Checksum does not match" /* expected fail msg */, val);
   }
+  // Corrupts a row that a partial read does not return: the checksum of the
+  // whole entry is still verified.
+  {
+    BundleWriter writer(Env::Default(), Prefix("rows"));
+    TF_EXPECT_OK(writer.Add("foo", Constant_2x3(1.f)));
+    TF_ASSERT_OK(writer.Finish());
+
+    FlipByte("rows", 3 * sizeof(float) /* the second row */, true);
+    BundleReader reader(Env::Default(), Prefix("rows"));
+    Tensor val(DT_FLOAT, TensorShape({1, 3}));
+    Status status =
+        reader.LookupSlice("foo", TensorSlice::ParseOrDie("0,1:-"), &val);
+    EXPECT_TRUE(errors::IsDataLoss(status));
+    EXPECT_TRUE(
+        StringPiece(status.ToString()).contains("Checksum does not match"));
+  }
+  // Corrupts a stored slice that a read of rows needs whole: its checksum is
+  // verified while it is read.
+  {
+    const TensorShape kFullShape({4, 3});
+    BundleWriter writer(Env::Default(), Prefix("whole_rows"));
+    TF_ASSERT_OK(writer.AddSlice("foo", kFullShape,
+                                 TensorSlice::ParseOrDie("0,2:-"),
+                                 Constant_2x3(1.f)));
+    TF_ASSERT_OK(writer.AddSlice("foo", kFullShape,
+                                 TensorSlice::ParseOrDie("2,2:-"),
+                                 Constant_2x3(2.f)));
+    TF_ASSERT_OK(writer.Finish());
+
+    FlipByte("whole_rows", 0 /* the first stored slice */, true);
+    BundleReader reader(Env::Default(), Prefix("whole_rows"));
+    Tensor val(DT_FLOAT, TensorShape({3, 3}));
+    Status status =
+        reader.LookupSlice("foo", TensorSlice::ParseOrDie("0,3:-"), &val);
+    EXPECT_TRUE(errors::IsDataLoss(status));
+    EXPECT_TRUE(
+        StringPiece(status.ToString()).contains("Checksum does not match"));
+  }
 }
 
 TEST(TensorBundleTest, Endianness) {
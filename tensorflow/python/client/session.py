@@ -19,6 +19,8 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import collections
+import copy
 import re
 import threading
 
@@ -61,6 +63,18 @@ class SessionInterface(object):
     """Continues the execution with additional feeds and fetches."""
     raise NotImplementedError('partial_run')
 
+
+def _import_futures():
+  """Imports `concurrent.futures`, which is an extra dependency on Python 2."""
+  try:
+    from concurrent import futures  # pylint: disable=g-import-not-at-top
+  except ImportError:
+    raise ImportError('Session.run_async() requires the `concurrent.futures` '
+                      'module. On Python 2, install it with `pip install '
+                      'futures`.')
+  return futures
+
+
 def _get_indexed_slices_value_from_fetches(fetched_vals):
   return ops.IndexedSlicesValue(fetched_vals[0], fetched_vals[1],
                                 fetched_vals[2]
@@ -500,6 +514,165 @@ class _FetchHandler(object):
     assert j == len(tensor_values)
     return self._fetch_mapper.build_results(full_values)
 
+  def with_feeds(self, feeds, feed_handles=None):
+    """Returns a copy of this handler that builds results from other feeds.
+
+    The fetch structure is not re-analyzed, so `feeds` must feed exactly the
+    same set of tensors as the feeds this handler was created with.
+
+    Args:
+      feeds: A feed dict where keys are Tensors.
+      feed_handles: A dict from feed Tensors to TensorHandle objects used as
+        direct feeds.
+
+    Returns:
+      A `_FetchHandler` sharing this handler's fetch structure.
+    """
+    handler = copy.copy(self)
+    handler._feeds = feeds  # pylint: disable=protected-access
+    handler._feed_handles = feed_handles or {}  # pylint: disable=protected-access
+    return handler
+
+
+def _run_plan_key(value):
+  """Returns a hashable key describing a `run()` fetch or feed argument.
+
+  Nested lists, tuples, namedtuples and dicts are described by their type and
+  contents; strings are described by their value, and every other leaf (e.g.
+  a `Tensor`, `Operation` or `Variable`) is described by its identity. The
+  caller must therefore keep the leaves alive for as long as the key is used.
+
+  Args:
+    value: An arbitrary fetch structure, or a feed dict key.
+
+  Returns:
+    A hashable object.
+  """
+  if isinstance(value, compat.bytes_or_text_types):
+    return value
+  elif isinstance(value, (list, tuple)):
+    return (type(value),) + tuple(_run_plan_key(v) for v in value)
+  elif isinstance(value, dict):
+    return (type(value),) + tuple(
+        (k, _run_plan_key(v)) for k, v in value.items())
+  else:
+    return id(value)
+
+
+# A compiled plan for a `Session.run()` call, as stored in a `_RunPlanCache`.
+#
+#   fetch_handler: A `_FetchHandler` for the fetches of the call.
+#   feed_tensors: The frozenset of Tensors fed by the call.
+#   resolved_feeds: A dict mapping each feed (or sub-feed, after expansion)
+#     key to the feedable graph Tensor that it names.
+#   arguments: The original fetches and feed keys, which are kept alive so that
+#     the identity-based key of the plan remains valid.
+_RunPlan = collections.namedtuple(
+    '_RunPlan',
+    ['fetch_handler', 'feed_tensors', 'resolved_feeds', 'arguments'])
+
+
+# A snapshot of the statistics of a `_RunPlanCache`, as returned by
+# `BaseSession.run_plan_cache_stats()`.
+_RunPlanCacheStats = collections.namedtuple(
+    '_RunPlanCacheStats',
+    ['size', 'capacity', 'hits', 'misses', 'evictions', 'invalidations',
+     'hit_rate'])
+
+
+class _RunPlanCache(object):
+  """A thread-safe LRU cache of compiled `Session.run()` plans.
+
+  Plans are keyed on the structure of the fetches and the set of feed keys
+  (see `_run_plan_key()`). Every lookup carries a stamp describing the state
+  of the graph; when the stamp changes, e.g. because operations were added to
+  the graph, all cached plans are discarded.
+
+  The `hits`, `misses`, `evictions` and `invalidations` counters, and the
+  derived `hit_rate`, can be used to check whether a workload benefits from
+  the cache.
+  """
+
+  def __init__(self, capacity):
+    """Creates a `_RunPlanCache` holding at most `capacity` plans."""
+    self._capacity = capacity
+    self._plans = collections.OrderedDict()
+    self._stamp = None
+    self._lock = threading.Lock()
+    self.hits = 0
+    self.misses = 0
+    self.evictions = 0
+    self.invalidations = 0
+
+  def __len__(self):
+    return len(self._plans)
+
+  @property
+  def capacity(self):
+    return self._capacity
+
+  @property
+  def hit_rate(self):
+    """The fraction of lookups that returned a cached plan."""
+    lookups = self.hits + self.misses
+    return float(self.hits) / lookups if lookups else 0.0
+
+  def stats(self):
+    """Returns a consistent `_RunPlanCacheStats` snapshot of the counters."""
+    with self._lock:
+      return _RunPlanCacheStats(
+          size=len(self._plans), capacity=self._capacity, hits=self.hits,
+          misses=self.misses, evictions=self.evictions,
+          invalidations=self.invalidations, hit_rate=self.hit_rate)
+
+  def lookup(self, key, stamp):
+    """Returns the plan cached for `key`, or None.
+
+    Args:
+      key: A key built with `_run_plan_key()`.
+      stamp: The current state of the graph. If it differs from the stamp of
+        the cached plans, they are all discarded.
+
+    Returns:
+      A `_RunPlan`, or None on a cache miss.
+    """
+    with self._lock:
+      if stamp != self._stamp:
+        if self._plans:
+          self.invalidations += 1
+          self._plans.clear()
+        self._stamp = stamp
+      plan = self._plans.pop(key, None)
+      if plan is None:
+        self.misses += 1
+        return None
+      # Re-insert the plan to mark it as the most recently used.
+      self._plans[key] = plan
+      self.hits += 1
+      return plan
+
+  def insert(self, key, stamp, plan):
+    """Caches `plan` under `key`, evicting the least recently used plans.
+
+    Args:
+      key: A key built with `_run_plan_key()`.
+      stamp: The state of the graph for which `plan` was compiled. The plan is
+        dropped if the graph changed since the corresponding `lookup()`.
+      plan: A `_RunPlan`.
+    """
+    with self._lock:
+      if stamp != self._stamp:
+        return
+      self._plans[key] = plan
+      while len(self._plans) > self._capacity:
+        self._plans.popitem(last=False)
+        self.evictions += 1
+
+  def clear(self):
+    """Discards all cached plans."""
+    with self._lock:
+      self._plans.clear()
+
 
 def _name_list(tensor_list):
   """Utility function for transitioning to the new session API.
@@ -513,6 +686,60 @@ def _name_list(tensor_list):
   return [compat.as_bytes(t.name) for t in tensor_list]
 
 
+# The alignment, in bytes, that the data of a fed ndarray must have for the
+# runtime to use its buffer directly instead of copying it. This is the largest
+# `EIGEN_MAX_ALIGN_BYTES` of any TensorFlow build, so it is valid for all.
+_ZERO_COPY_ALIGNMENT_BYTES = 64
+
+
+def aligned_empty(shape, dtype=np.float32):
+  """Returns an uninitialized ndarray that `Session.run()` can feed in place.
+
+  Large arrays allocated by NumPy are typically only aligned to 16 bytes,
+  which forces the runtime to copy them into an aligned buffer when they are
+  fed. Arrays returned by this function are aligned for every TensorFlow
+  build, so feeding them (to a tensor of the same dtype) aliases their memory
+  for the duration of the step.
+
+  Args:
+    shape: An int or sequence of ints, the shape of the array.
+    dtype: (Optional.) A numeric NumPy dtype. Defaults to `np.float32`.
+
+  Returns:
+    A C-contiguous `np.ndarray` for which `is_zero_copy_feedable()` is `True`.
+
+  Raises:
+    TypeError: If `dtype` is not a numeric dtype.
+  """
+  dtype = np.dtype(dtype)
+  if dtype.kind not in 'biufc':
+    raise TypeError('aligned_empty() requires a numeric dtype, got %s' % dtype)
+  shape = tuple(int(dim) for dim in np.atleast_1d(shape))
+  nbytes = int(np.prod(shape, dtype=np.int64)) * dtype.itemsize
+  buf = np.empty(nbytes + _ZERO_COPY_ALIGNMENT_BYTES, dtype=np.uint8)
+  offset = -buf.ctypes.data % _ZERO_COPY_ALIGNMENT_BYTES
+  return buf[offset:offset + nbytes].view(dtype).reshape(shape)
+
+
+def is_zero_copy_feedable(value):
+  """Returns `True` if `Session.run()` can feed `value` without copying it.
+
+  This holds for C-contiguous numeric ndarrays whose data is suitably aligned
+  (see `aligned_empty()`), provided that the fed tensor has the same dtype.
+  Read-only arrays, such as read-only memory maps, qualify as well: the
+  runtime never writes into the buffer of a fed value.
+
+  Args:
+    value: A candidate feed value.
+
+  Returns:
+    A boolean.
+  """
+  return (isinstance(value, np.ndarray) and value.dtype.kind in 'biufc' and
+          value.flags.c_contiguous and value.flags.aligned and
+          value.ctypes.data % _ZERO_COPY_ALIGNMENT_BYTES == 0)
+
+
 class _DeviceAttributes(object):
   """Struct-like object describing a device's attributes.
 
@@ -553,7 +780,8 @@ class BaseSession(SessionInterface):
   execution of Operations and evaluation of Tensors.
   """
 
-  def __init__(self, target='', graph=None, config=None):
+  def __init__(self, target='', graph=None, config=None,
+               run_plan_cache_capacity=None):
     """Constructs a new TensorFlow session.
 
     Args:
@@ -561,6 +789,9 @@ class BaseSession(SessionInterface):
       graph: (Optional) The graph to be used. If this argument is None,
         the default graph will be used.
       config: (Optional) ConfigProto proto used to configure the session.
+      run_plan_cache_capacity: (Optional) The maximum number of compiled
+        `run()` plans to cache. Defaults to 64; 0 disables the cache. See
+        `run_plan_cache_stats()`.
 
     Raises:
       tf.errors.OpError: Or one of its subclasses if an error occurs while
@@ -590,6 +821,25 @@ class BaseSession(SessionInterface):
     self._delete_lock = threading.Lock()
     self._dead_handles = []
 
+    # State for run_async(): the executor running the steps, the futures of
+    # the steps that it has not completed yet, and their number.
+    self._async_cond = threading.Condition()
+    self._async_executor = None
+    self._async_executor_workers = 0
+    self._async_futures = set()
+    self._async_in_flight = 0
+    self._max_in_flight_steps = BaseSession._DEFAULT_MAX_IN_FLIGHT_STEPS
+
+    if run_plan_cache_capacity is None:
+      run_plan_cache_capacity = BaseSession._DEFAULT_RUN_PLAN_CACHE_CAPACITY
+    if run_plan_cache_capacity < 0:
+      raise ValueError('run_plan_cache_capacity must be non-negative, got %d'
+                       % run_plan_cache_capacity)
+    if run_plan_cache_capacity > 0:
+      self._run_plan_cache = _RunPlanCache(run_plan_cache_capacity)
+    else:
+      self._run_plan_cache = None
+
     if config is not None:
       if not isinstance(config, config_pb2.ConfigProto):
         raise TypeError('config must be a tf.ConfigProto, but got %s'
@@ -658,11 +908,48 @@ class BaseSession(SessionInterface):
       tf_session.TF_DeleteDeviceList(raw_device_list)
       return device_list
 
+  def run_plan_cache_stats(self):
+    """Returns statistics of the cache of compiled `run()` plans.
+
+    `run()` caches the plan compiled for each structure of fetches and set of
+    fed keys, so that repeated steps skip re-parsing their arguments. These
+    statistics can be used to check whether a workload benefits from the cache,
+    e.g. to tune `run_plan_cache_capacity`:
+
+    ```python
+    stats = sess.run_plan_cache_stats()
+    print('%d hits, %d misses (%.0f%%)' % (stats.hits, stats.misses,
+                                           100 * stats.hit_rate))
+    ```
+
+    Returns:
+      A namedtuple with the following fields:
+       - `size`: The number of cached plans.
+       - `capacity`: The maximum number of cached plans, 0 if the cache is
+            disabled.
+       - `hits`: The number of `run()` calls that reused a cached plan.
+       - `misses`: The number of `run()` calls that compiled a plan.
+       - `evictions`: The number of plans discarded to make room for others.
+       - `invalidations`: The number of times all plans were discarded because
+            the graph changed.
+       - `hit_rate`: The fraction of `hits` among the lookups, 0.0 if there
+            were none.
+      When the cache is disabled, all the fields are zero.
+    """
+    if self._run_plan_cache is None:
+      return _RunPlanCacheStats(size=0, capacity=0, hits=0, misses=0,
+                                evictions=0, invalidations=0, hit_rate=0.0)
+    return self._run_plan_cache.stats()
+
   def close(self):
     """Closes this session.
 
     Calling this method frees all resources associated with the session.
 
+    The pending steps started by `run_async()` are cancelled: the futures of
+    the steps that have not started running are cancelled, and the steps that
+    are running fail with `tf.errors.CancelledError`.
+
     Raises:
       tf.errors.OpError: Or one of its subclasses if an error occurs while
         closing the TensorFlow session.
@@ -680,6 +967,20 @@ class BaseSession(SessionInterface):
           with errors.raise_exception_on_not_ok_status() as status:
             tf_session.TF_CloseDeprecatedSession(self._session, status)
 
+    # Closing the session cancels the running asynchronous steps, and the
+    # steps that have not started are cancelled here, so the executor threads
+    # can be released without waiting for them.
+    with self._async_cond:
+      executor = self._async_executor
+      pending_futures = list(self._async_futures)
+      self._async_executor = None
+      self._async_executor_workers = 0
+      self._async_cond.notify_all()
+    for future in pending_futures:
+      future.cancel()
+    if executor is not None:
+      executor.shutdown(wait=False)
+
   def __del__(self):
     # cleanly ignore all exceptions
     try:
@@ -852,6 +1153,21 @@ class BaseSession(SessionInterface):
     Each value in `feed_dict` must be convertible to a numpy array of the dtype
     of the corresponding key.
 
+    Feeding and fetching large numeric arrays avoids copies where possible:
+
+    * A fed numpy ndarray that already has the dtype of its key, is
+      C-contiguous and is suitably aligned is used in place by the runtime
+      for the duration of the step (see `is_zero_copy_feedable()`; arrays
+      allocated with `aligned_empty()` always qualify). The runtime never
+      writes into it, but the caller must not modify it until `run()`
+      returns.
+    * A fetched numeric tensor whose buffer is not shared with other state
+      (e.g. the result of a computation, rather than the value of a
+      variable) is returned as an ndarray that views the output buffer
+      directly. The array owns that buffer: it remains valid for as long as
+      the array (or any view of it) is alive, and is never modified by
+      subsequent steps. All other fetched values are copied.
+
     The optional `options` argument expects a [`RunOptions`] proto. The options
     allow controlling the behavior of this particular step (e.g. turning tracing
     on).
@@ -901,6 +1217,168 @@ class BaseSession(SessionInterface):
         tf_session.TF_DeleteBuffer(options_ptr)
     return result
 
+  @property
+  def max_in_flight_steps(self):
+    """The maximum number of steps started by `run_async()` at once.
+
+    Once this many asynchronous steps are in flight, `run_async()` blocks
+    until one of them completes, which applies backpressure to the caller.
+    The limit can be changed at any time.
+    """
+    return self._max_in_flight_steps
+
+  @max_in_flight_steps.setter
+  def max_in_flight_steps(self, value):
+    if value < 1:
+      raise ValueError('max_in_flight_steps must be at least 1, got %d' % value)
+    with self._async_cond:
+      self._max_in_flight_steps = value
+      self._async_cond.notify_all()
+
+  def run_async(self, fetches, feed_dict=None, options=None, run_metadata=None):
+    """Starts running a step, and returns a future for its results.
+
+    This method runs the same step as `run()` on a background thread, so that
+    the caller can overlap e.g. preprocessing of the next batch with the
+    execution of this step:
+
+    ```python
+    future = sess.run_async(train_op, feed_dict={x: batch})
+    next_batch = preprocess(...)
+    future.result()  # Wait for the step, and raise any error it produced.
+    ```
+
+    At most `max_in_flight_steps` asynchronous steps are in flight at once;
+    when that many steps are pending, this method blocks until one of them
+    completes. The values in `feed_dict` must not be modified until the
+    returned future is done.
+
+    On Python 2, this method requires the `futures` package.
+
+    Args:
+      fetches: A single graph element, a list of graph elements,
+        or a dictionary whose values are graph elements or lists of graph
+        elements (see documentation for `run`).
+      feed_dict: A dictionary that maps graph elements to values
+        (see documentation for `run`).
+      options: A [`RunOptions`] protocol buffer
+      run_metadata: A [`RunMetadata`] protocol buffer, which is filled in
+        when the step completes.
+
+    Returns:
+      A `concurrent.futures.Future` whose result is the value that `run()`
+      would have returned. If the step fails, the future holds the same
+      exception (e.g. a `tf.errors.OpError` subclass) that `run()` raises.
+
+    Raises:
+      RuntimeError: If this `Session` is closed, or is closed while waiting
+        for a step to complete.
+    """
+    executor = self._acquire_async_slot()
+    if feed_dict is not None:
+      feed_dict = dict(feed_dict)
+    try:
+      future = executor.submit(self.run, fetches, feed_dict, options,
+                               run_metadata)
+    except Exception:
+      self._release_async_slot()
+      raise
+    with self._async_cond:
+      self._async_futures.add(future)
+    future.add_done_callback(self._release_async_slot)
+    return future
+
+  def run_awaitable(self, fetches, feed_dict=None, options=None,
+                    run_metadata=None, loop=None):
+    """Starts running a step, and returns an `asyncio` future for its results.
+
+    This is the `asyncio` counterpart of `run_async()`:
+
+    ```python
+    async def train_step(sess, batch):
+      return await sess.run_awaitable(train_op, feed_dict={x: batch})
+    ```
+
+    Unlike `run_async()`, this method never blocks the event loop: when
+    `max_in_flight_steps` steps are already in flight, the step is started
+    once one of them completes, and the returned future waits for it.
+
+    This method requires Python 3.
+
+    Args:
+      fetches: A single graph element, a list of graph elements,
+        or a dictionary whose values are graph elements or lists of graph
+        elements (see documentation for `run`).
+      feed_dict: A dictionary that maps graph elements to values
+        (see documentation for `run`).
+      options: A [`RunOptions`] protocol buffer
+      run_metadata: A [`RunMetadata`] protocol buffer, which is filled in
+        when the step completes.
+      loop: (Optional.) The `asyncio` event loop of the returned future.
+        Defaults to the current event loop.
+
+    Returns:
+      An `asyncio.Future` whose result is the value that `run()` would have
+      returned, or which holds the exception that `run()` raises.
+    """
+    import asyncio  # pylint: disable=g-import-not-at-top
+    if loop is None:
+      loop = asyncio.get_event_loop()
+    if feed_dict is not None:
+      feed_dict = dict(feed_dict)
+    result = loop.create_future()
+
+    def _copy_state(source):
+      if result.cancelled():
+        return
+      if source.cancelled():
+        result.cancel()
+      elif source.exception() is not None:
+        result.set_exception(source.exception())
+      else:
+        result.set_result(source.result())
+
+    def _on_started(started):
+      if started.cancelled() or started.exception() is not None:
+        _copy_state(started)
+      else:
+        asyncio.wrap_future(started.result(), loop=loop).add_done_callback(
+            _copy_state)
+
+    # Waiting for a free slot may block, so it happens off the event loop.
+    started = loop.run_in_executor(
+        None, self.run_async, fetches, feed_dict, options, run_metadata)
+    started.add_done_callback(_on_started)
+    return result
+
+  def _acquire_async_slot(self):
+    """Waits for an in-flight slot, and returns the executor to run in it."""
+    futures = _import_futures()
+    with self._async_cond:
+      while True:
+        if self._closed:
+          raise RuntimeError('Attempted to use a closed Session.')
+        if self._async_in_flight < self._max_in_flight_steps:
+          break
+        self._async_cond.wait()
+      self._async_in_flight += 1
+      if self._async_executor_workers < self._max_in_flight_steps:
+        # (Re)create the executor, so that it has a thread for each step that
+        # may be in flight. Steps running on a previous executor still
+        # complete, after which its threads exit.
+        if self._async_executor is not None:
+          self._async_executor.shutdown(wait=False)
+        self._async_executor = futures.ThreadPoolExecutor(
+            max_workers=self._max_in_flight_steps)
+        self._async_executor_workers = self._max_in_flight_steps
+      return self._async_executor
+
+  def _release_async_slot(self, future=None):
+    with self._async_cond:
+      self._async_futures.discard(future)
+      self._async_in_flight -= 1
+      self._async_cond.notify()
+
   def partial_run(self, handle, fetches, feed_dict=None):
     """Continues the execution with more feeds and fetches.
 
@@ -1031,10 +1509,27 @@ class BaseSession(SessionInterface):
     # Check session.
     if self._closed:
       raise RuntimeError('Attempted to use a closed Session.')
-    if self.graph.version == 0:
+    graph_version = self.graph.version
+    if graph_version == 0:
       raise RuntimeError('The Session graph is empty.  Add operations to the '
                          'graph before calling run().')
 
+    # Look for a plan compiled by a previous run() with the same fetch
+    # structure and feed keys.
+    plan = None
+    plan_key = None
+    if handle is None and self._run_plan_cache is not None:
+      # pylint: disable=protected-access
+      plan_stamp = (graph_version, len(self._graph._unfeedable_tensors),
+                    len(self._graph._unfetchable_ops))
+      # pylint: enable=protected-access
+      plan_key = (_run_plan_key(fetches),
+                  frozenset(_run_plan_key(feed) for feed in feed_dict or ()))
+      plan = self._run_plan_cache.lookup(plan_key, plan_stamp)
+    # Cached plans are shared by concurrent runs (e.g. from run_async()), so
+    # they are never modified: feeds resolved by this run go into a copy.
+    resolved_feeds = dict(plan.resolved_feeds) if plan is not None else {}
+
     # Create request.
     feed_dict_tensor = {}
     feed_map = {}
@@ -1042,15 +1537,19 @@ class BaseSession(SessionInterface):
     # Validate and process feed_dict.
     feed_handles = {}
     if feed_dict:
+      feed_keys = list(feed_dict)
       feed_dict = nest.flatten_dict_items(feed_dict)
       for feed, feed_val in feed_dict.items():
         for subfeed, subfeed_val in _feed_fn(feed, feed_val):
-          try:
-            subfeed_t = self.graph.as_graph_element(subfeed, allow_tensor=True,
-                                                    allow_operation=False)
-          except Exception as e:
-            raise TypeError('Cannot interpret feed_dict key as Tensor: '
-                            + e.args[0])
+          subfeed_t = resolved_feeds.get(subfeed)
+          is_resolved = subfeed_t is not None
+          if not is_resolved:
+            try:
+              subfeed_t = self.graph.as_graph_element(
+                  subfeed, allow_tensor=True, allow_operation=False)
+            except Exception as e:
+              raise TypeError('Cannot interpret feed_dict key as Tensor: '
+                              + e.args[0])
 
           if isinstance(subfeed_val, ops.Tensor):
             raise TypeError('The value of a feed cannot be a tf.Tensor object. '
@@ -1080,15 +1579,31 @@ class BaseSession(SessionInterface):
                 'Cannot feed value of shape %r for Tensor %r, '
                 'which has shape %r'
                 % (np_val.shape, subfeed_t.name, str(subfeed_t.get_shape())))
-          if not self.graph.is_feedable(subfeed_t):
-            raise ValueError('Tensor %s may not be fed.' % subfeed_t)
+          if not is_resolved:
+            if not self.graph.is_feedable(subfeed_t):
+              raise ValueError('Tensor %s may not be fed.' % subfeed_t)
+            if plan_key is not None:
+              resolved_feeds[subfeed] = subfeed_t
 
           feed_dict_tensor[subfeed_t] = np_val
           feed_map[compat.as_bytes(subfeed_t.name)] = (subfeed_t, subfeed_val)
-
-    # Create a fetch handler to take care of the structure of fetches.
-    fetch_handler = _FetchHandler(
-        self._graph, fetches, feed_dict_tensor, feed_handles=feed_handles)
+    else:
+      feed_keys = []
+
+    # Create a fetch handler to take care of the structure of fetches, reusing
+    # the cached one if it was built for the same set of fed tensors.
+    feed_tensors = frozenset(feed_dict_tensor)
+    if plan is not None and plan.feed_tensors == feed_tensors:
+      fetch_handler = plan.fetch_handler.with_feeds(
+          feed_dict_tensor, feed_handles=feed_handles)
+    else:
+      fetch_handler = _FetchHandler(
+          self._graph, fetches, feed_dict_tensor, feed_handles=feed_handles)
+      if plan_key is not None:
+        self._run_plan_cache.insert(
+            plan_key, plan_stamp,
+            _RunPlan(fetch_handler, feed_tensors, resolved_feeds,
+                     (fetches, feed_keys)))
 
     # Run request and get response.
     # We need to keep the returned movers alive for the following _do_run().
@@ -1299,6 +1814,12 @@ class BaseSession(SessionInterface):
   # The threshold to run garbage collection to delete dead tensors.
   _DEAD_HANDLES_THRESHOLD = 10
 
+  # The default maximum number of steps started by run_async() at once.
+  _DEFAULT_MAX_IN_FLIGHT_STEPS = 4
+
+  # The default maximum number of compiled run() plans cached by each session.
+  _DEFAULT_RUN_PLAN_CACHE_CAPACITY = 64
+
   def _register_dead_handle(self, handle):
     # Register a dead handle in the session. Delete the dead tensors when
     # the number of dead tensors exceeds certain threshold.
@@ -1400,7 +1921,8 @@ class Session(BaseSession):
   ```
   """
 
-  def __init__(self, target='', graph=None, config=None):
+  def __init__(self, target='', graph=None, config=None,
+               run_plan_cache_capacity=None):
     """Creates a new TensorFlow session.
 
     If no `graph` argument is specified when constructing the session,
@@ -1419,9 +1941,14 @@ class Session(BaseSession):
       graph: (Optional.) The `Graph` to be launched (described above).
       config: (Optional.) A [`ConfigProto`](https://www.tensorflow.org/code/tensorflow/core/protobuf/config.proto)
         protocol buffer with configuration options for the session.
+      run_plan_cache_capacity: (Optional.) The maximum number of compiled
+        `run()` plans, keyed on the structure of the fetches and the feed
+        keys, to cache. Defaults to 64; 0 disables the cache.
 
     """
-    super(Session, self).__init__(target, graph, config=config)
+    super(Session, self).__init__(
+        target, graph, config=config,
+        run_plan_cache_capacity=run_plan_cache_capacity)
     # NOTE(mrry): Create these on first `__enter__` to avoid a reference cycle.
     self._default_graph_context_manager = None
     self._default_session_context_manager = None
@@ -1524,7 +2051,8 @@ class InteractiveSession(BaseSession):
   ```
   """
 
-  def __init__(self, target='', graph=None, config=None):
+  def __init__(self, target='', graph=None, config=None,
+               run_plan_cache_capacity=None):
     """Creates a new interactive TensorFlow session.
 
     If no `graph` argument is specified when constructing the session,
@@ -1540,6 +2068,8 @@ class InteractiveSession(BaseSession):
         Defaults to using an in-process engine.
       graph: (Optional.) The `Graph` to be launched (described above).
       config: (Optional) `ConfigProto` proto used to configure the session.
+      run_plan_cache_capacity: (Optional.) The maximum number of compiled
+        `run()` plans to cache. Defaults to 64; 0 disables the cache.
     """
     if not config:
       # If config is not provided, choose some reasonable defaults for
@@ -1551,7 +2081,9 @@ class InteractiveSession(BaseSession):
     # Interactive sessions always place pruned graphs.
     config.graph_options.place_pruned_graph = True
 
-    super(InteractiveSession, self).__init__(target, graph, config)
+    super(InteractiveSession, self).__init__(
+        target, graph, config,
+        run_plan_cache_capacity=run_plan_cache_capacity)
     self._default_session = self.as_default()
     self._default_session.enforce_nesting = False
     self._default_session.__enter__()
@@ -121,6 +121,75 @@ class SessionBenchmark(test.Benchmark):
     print("%s %d %f" % (name, size, np.median(times)))
     self.report_benchmark(iters=1, wall_time=np.median(times), name=name)
 
+  def _benchmarkFeedBandwidth(self, name, target, size, iters, aligned):
+    """Runs a microbenchmark to measure the bandwidth of feeding a tensor.
+
+    Reports the median cost and the corresponding bandwidth of feeding a
+    tensor of `size` * `sizeof(float)` bytes.
+
+    Args:
+      name: A human-readable name for logging the output.
+      target: The session target to use for the benchmark.
+      size: The number of floating-point numbers to be fed.
+      iters: The number of iterations to perform.
+      aligned: If True, the fed array is allocated with
+        `session.aligned_empty()`, so that it can be fed without a copy.
+        Otherwise it is allocated by NumPy.
+    """
+    if aligned:
+      feed_val = session.aligned_empty([size], np.float32)
+    else:
+      feed_val = np.empty([size], np.float32)
+    feed_val[:] = np.random.rand(size)
+    times = []
+    with ops.Graph().as_default():
+      p = array_ops.placeholder(dtypes.float32, shape=[size])
+      # Fetch the operation rather than the tensor, to avoid measuring the time
+      # to fetch back the value.
+      no_op = array_ops.identity(p).op
+      with session.Session(target) as sess:
+        sess.run(no_op, feed_dict={p: feed_val})  # Warm-up run.
+        for _ in xrange(iters):
+          start_time = time.time()
+          sess.run(no_op, feed_dict={p: feed_val})
+          end_time = time.time()
+          times.append(end_time - start_time)
+    self._reportBandwidth(name, size, times)
+
+  def _benchmarkFetchBandwidth(self, name, target, size, iters):
+    """Runs a microbenchmark to measure the bandwidth of fetching a tensor.
+
+    Reports the median cost and the corresponding bandwidth of fetching a
+    freshly computed tensor of `size` * `sizeof(float)` bytes, which is
+    returned without a copy.
+
+    Args:
+      name: A human-readable name for logging the output.
+      target: The session target to use for the benchmark.
+      size: The number of floating-point numbers to be fetched.
+      iters: The number of iterations to perform.
+    """
+    times = []
+    with ops.Graph().as_default():
+      # Feed the dimensions of the fetched tensor, to avoid constant-folding.
+      dims = array_ops.placeholder(dtypes.int32, shape=[1])
+      fetch = array_ops.fill(dims, 1.0)
+      with session.Session(target) as sess:
+        sess.run(fetch, feed_dict={dims: [size]})  # Warm-up run.
+        for _ in xrange(iters):
+          start_time = time.time()
+          sess.run(fetch, feed_dict={dims: [size]})
+          end_time = time.time()
+          times.append(end_time - start_time)
+    self._reportBandwidth(name, size, times)
+
+  def _reportBandwidth(self, name, size, times):
+    median_time = np.median(times)
+    bytes_per_second = 4 * size / median_time
+    print("%s %d %f %f" % (name, size, median_time, bytes_per_second / 1e6))
+    self.report_benchmark(iters=1, wall_time=median_time, name=name,
+                          extras={"bytes_per_second": bytes_per_second})
+
   def _benchmarkRunOp(self, name, target, iters):
     """Runs a microbenchmark to measure the cost of running an op.
 
@@ -214,6 +283,21 @@ class SessionBenchmark(test.Benchmark):
     self._benchmarkRunOpPrebuilt("benchmark_session_runopprebuilt_direct", "",
                                  200000)
 
+  def benchmarkDirectSessionBandwidth(self):
+    for label, size, iters in [("4KB", 1 << 10, 10000),
+                               ("4MB", 1 << 20, 1000),
+                               ("64MB", 1 << 24, 100),
+                               ("256MB", 1 << 26, 20)]:
+      self._benchmarkFeedBandwidth(
+          "benchmark_session_feed_bandwidth_direct_%s" % label, "", size,
+          iters, aligned=False)
+      self._benchmarkFeedBandwidth(
+          "benchmark_session_feed_bandwidth_aligned_direct_%s" % label, "",
+          size, iters, aligned=True)
+      self._benchmarkFetchBandwidth(
+          "benchmark_session_fetch_bandwidth_direct_%s" % label, "", size,
+          iters)
+
 
 if __name__ == "__main__":
   test.main()
@@ -1029,6 +1029,214 @@ class SessionTest(test_util.TensorFlowTestCase):
       self.assertAllEqual(result_value[1], 2 * np.array([2, 2]))
       self.assertAllEqual(result_value[2], 2 * np.array([3, 3]))
 
+  def testRunPlanCacheReusesPlans(self):
+    with session.Session() as s:
+      a = constant_op.constant(1.0)
+      p = array_ops.placeholder(dtypes.float32, shape=[])
+      b = a + p
+      for i in range(3):
+        res = s.run({'a': a, 'ab': [a, b]}, feed_dict={p: float(i)})
+        self.assertEqual(1.0, res['a'])
+        self.assertEqual([1.0, 1.0 + i], res['ab'])
+      stats = s.run_plan_cache_stats()
+      self.assertEqual(1, stats.misses)
+      self.assertEqual(2, stats.hits)
+      self.assertAllClose(2.0 / 3.0, stats.hit_rate)
+
+      # A different fetch structure or feed key set is a different plan.
+      self.assertEqual((1.0, 3.0), s.run((a, b), feed_dict={p: 2.0}))
+      self.assertEqual(1.0, s.run(b, feed_dict={a: 0.0, p: 1.0}))
+      stats = s.run_plan_cache_stats()
+      self.assertEqual(3, stats.misses)
+      self.assertEqual(3, stats.size)
+
+  def testRunPlanCacheFetchOfFedTensor(self):
+    with session.Session() as s:
+      p = array_ops.placeholder(dtypes.float32, shape=[])
+      q = p * 2.0
+      for value in [1.0, 2.0]:
+        self.assertEqual([value, 2.0 * value],
+                         s.run([p, q], feed_dict={p: value}))
+      self.assertEqual(1, s.run_plan_cache_stats().hits)
+
+  def testRunPlanCacheInvalidatedByGraphChange(self):
+    with session.Session() as s:
+      a = constant_op.constant(1.0)
+      s.run(a)
+      s.run(a)
+      self.assertEqual(1, s.run_plan_cache_stats().hits)
+      b = a + 1.0
+      s.run(a)
+      stats = s.run_plan_cache_stats()
+      self.assertEqual(1, stats.hits)
+      self.assertEqual(1, stats.invalidations)
+      self.assertEqual(2.0, s.run(b))
+
+      # Marking a tensor as unfeedable must be honored by cached plans.
+      p = array_ops.placeholder(dtypes.float32, shape=[])
+      c = p + 1.0
+      self.assertEqual(2.0, s.run(c, feed_dict={p: 1.0}))
+      s.graph.prevent_feeding(p)
+      with self.assertRaisesRegexp(ValueError, 'may not be fed'):
+        s.run(c, feed_dict={p: 1.0})
+
+  def testRunPlanCacheEviction(self):
+    with session.Session(run_plan_cache_capacity=2) as s:
+      a = constant_op.constant(1.0)
+      b = constant_op.constant(2.0)
+      c = constant_op.constant(3.0)
+      self.assertEqual(2, s.run_plan_cache_stats().capacity)
+      s.run(a)
+      s.run(b)
+      s.run(a)
+      s.run(c)
+      stats = s.run_plan_cache_stats()
+      self.assertEqual(2, stats.size)
+      self.assertEqual(1, stats.evictions)
+      # `b` was the least recently used plan.
+      s.run(a)
+      self.assertEqual(2, s.run_plan_cache_stats().hits)
+      s.run(b)
+      self.assertEqual(4, s.run_plan_cache_stats().misses)
+
+  def testRunPlanCacheDisabled(self):
+    with session.Session(run_plan_cache_capacity=0) as s:
+      a = constant_op.constant(1.0)
+      self.assertEqual(1.0, s.run(a))
+      self.assertEqual(1.0, s.run(a))
+      stats = s.run_plan_cache_stats()
+      self.assertEqual(0, stats.capacity)
+      self.assertEqual(0, stats.hits)
+      self.assertEqual(0, stats.misses)
+      self.assertEqual(0.0, stats.hit_rate)
+    with self.assertRaisesRegexp(ValueError, 'must be non-negative'):
+      session.Session(run_plan_cache_capacity=-1)
+
+  def testAlignedEmpty(self):
+    for dtype in [np.float32, np.float64, np.int8, np.complex64]:
+      for shape in [(), 1, [3], (7, 5)]:
+        value = session.aligned_empty(shape, dtype)
+        self.assertEqual(np.dtype(dtype), value.dtype)
+        self.assertEqual(tuple(np.atleast_1d(shape)), value.shape)
+        self.assertTrue(session.is_zero_copy_feedable(value))
+    with self.assertRaisesRegexp(TypeError, 'numeric dtype'):
+      session.aligned_empty([2], np.object)
+
+  def testIsZeroCopyFeedable(self):
+    value = session.aligned_empty([16, 16], np.float32)
+    self.assertFalse(session.is_zero_copy_feedable(value.T))
+    self.assertFalse(session.is_zero_copy_feedable(value[:, 1:]))
+    self.assertFalse(session.is_zero_copy_feedable(value.tolist()))
+    self.assertFalse(
+        session.is_zero_copy_feedable(np.array([b'a', b'b'], dtype=np.object)))
+
+  def testFeedAlignedAndReadOnlyArrays(self):
+    with session.Session() as s:
+      p = array_ops.placeholder(dtypes.float32, shape=[4, 3])
+      doubled = p * 2.0
+      aligned = session.aligned_empty([4, 3], np.float32)
+      aligned[:] = np.arange(12, dtype=np.float32).reshape(4, 3)
+      self.assertAllEqual(2 * aligned, s.run(doubled, feed_dict={p: aligned}))
+      # The runtime must not write into a fed buffer.
+      self.assertAllEqual(np.arange(12).reshape(4, 3), aligned)
+
+      read_only = np.frombuffer(aligned.tobytes(), dtype=np.float32)
+      read_only = read_only.reshape(4, 3)
+      self.assertFalse(read_only.flags.writeable)
+      self.assertAllEqual(2 * aligned,
+                          s.run(doubled, feed_dict={p: read_only}))
+
+  def testFetchedArraysOutliveLaterSteps(self):
+    with session.Session() as s:
+      p = array_ops.placeholder(dtypes.float32, shape=[1024])
+      doubled = p * 2.0
+      first = s.run(doubled, feed_dict={p: np.ones(1024, dtype=np.float32)})
+      second = s.run(doubled, feed_dict={p: np.zeros(1024, dtype=np.float32)})
+      self.assertAllEqual(2 * np.ones(1024), first)
+      self.assertAllEqual(np.zeros(1024), second)
+
+  def testRunAsync(self):
+    with session.Session() as s:
+      p = array_ops.placeholder(dtypes.float32, shape=[])
+      q = p * 2.0
+      futures = [s.run_async([p, q], feed_dict={p: float(i)})
+                 for i in range(10)]
+      for i, future in enumerate(futures):
+        self.assertEqual([i, 2.0 * i], future.result())
+
+  def testRunAsyncRaisesOpError(self):
+    with session.Session() as s:
+      p = array_ops.placeholder(dtypes.float32, shape=[])
+      future = s.run_async(p * 2.0)
+      with self.assertRaisesOpError('You must feed a value'):
+        future.result()
+      self.assertTrue(
+          isinstance(future.exception(), errors.InvalidArgumentError))
+
+  def testRunAsyncBoundsStepsInFlight(self):
+    with session.Session() as s:
+      q = data_flow_ops.FIFOQueue(10, dtypes.float32, shapes=[])
+      dequeue = q.dequeue()
+      enqueue = q.enqueue(1.0)
+      s.max_in_flight_steps = 2
+      pending = [s.run_async(dequeue) for _ in range(2)]
+
+      started = threading.Event()
+      third = []
+      def _start_third():
+        third.append(s.run_async(dequeue))
+        started.set()
+      thread = self.checkedThread(target=_start_third)
+      thread.start()
+      # The third step may only start once one of the pending steps completes.
+      self.assertFalse(started.wait(0.5))
+      s.run(enqueue)
+      self.assertTrue(started.wait(10.0))
+      s.run(enqueue)
+      s.run(enqueue)
+      thread.join()
+      for future in pending + third:
+        self.assertEqual(1.0, future.result())
+
+    with self.assertRaisesRegexp(ValueError, 'at least 1'):
+      s.max_in_flight_steps = 0
+
+  def testRunAsyncCancelledByClose(self):
+    s = session.Session()
+    started = data_flow_ops.FIFOQueue(10, dtypes.float32, shapes=[])
+    q = data_flow_ops.FIFOQueue(10, dtypes.float32, shapes=[])
+    with ops.control_dependencies([started.enqueue(1.0)]):
+      blocked = q.dequeue()
+    future = s.run_async(blocked)
+    # Wait until the step is running and blocked on `q`, so that closing the
+    # session cancels it.
+    s.run(started.dequeue())
+    s.close()
+    with self.assertRaises(errors.CancelledError):
+      future.result()
+    with self.assertRaisesRegexp(RuntimeError, 'closed Session'):
+      s.run_async(q.size())
+
+  def testRunAwaitable(self):
+    if sys.version_info[0] < 3:
+      return
+    import asyncio  # pylint: disable=g-import-not-at-top
+    with session.Session() as s:
+      p = array_ops.placeholder(dtypes.float32, shape=[])
+      q = p * 2.0
+      s.max_in_flight_steps = 2
+      loop = asyncio.new_event_loop()
+      try:
+        steps = [s.run_awaitable(q, feed_dict={p: float(i)}, loop=loop)
+                 for i in range(5)]
+        results = loop.run_until_complete(asyncio.gather(*steps))
+        self.assertEqual([0.0, 2.0, 4.0, 6.0, 8.0], results)
+        failed = s.run_awaitable(q, loop=loop)
+        with self.assertRaises(errors.InvalidArgumentError):
+          loop.run_until_complete(failed)
+      finally:
+        loop.close()
+
   def testGraphDef(self):
     with session.Session() as sess:
       self.assertProtoEquals(
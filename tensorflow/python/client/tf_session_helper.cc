@@ -402,8 +402,13 @@ Status PyArrayToTFTensor(PyObject* ndarray, Safe_TF_TensorPtr* out_tensor,
   *resource_handle = nullptr;
 
   // Make sure we dereference this array object in case of error, etc.
+  //
+  // Only contiguity and alignment are requested, so that read-only arrays
+  // (e.g. from `np.frombuffer()` or a read-only `np.memmap`) are aliased
+  // rather than copied. The runtime never writes into a fed buffer, because
+  // TF_NewTensor() marks it as not owned, which disables input forwarding.
   Safe_PyObjectPtr array_safe(make_safe(
-      PyArray_FromAny(ndarray, nullptr, 0, 0, NPY_ARRAY_CARRAY, nullptr)));
+      PyArray_FromAny(ndarray, nullptr, 0, 0, NPY_ARRAY_IN_ARRAY, nullptr)));
   if (!array_safe) return errors::InvalidArgument(kFeedDictErrorMsg);
   PyArrayObject* array = reinterpret_cast<PyArrayObject*>(array_safe.get());
 
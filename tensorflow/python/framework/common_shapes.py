@@ -553,6 +553,40 @@ def broadcast_shape(shape_x, shape_y):
   return tensor_shape.TensorShape(return_dims)
 
 
+class _TensorShapeCache(object):
+  """Shares the `TensorShape`s built from equal `TensorShapeProto`s.
+
+  Most outputs of a graph have one of a few shapes, so the shapes returned by
+  the C++ shape functions are looked up here instead of building a new
+  `TensorShape` and `Dimension`s for every output. `TensorShape` is
+  immutable, so the same object can be the shape of many tensors.
+  """
+
+  # The cache is cleared when it reaches this size, so that graphs with many
+  # distinct shapes do not keep all of them alive.
+  _MAX_ENTRIES = 4096
+
+  def __init__(self):
+    self._shapes = {}
+
+  def get(self, proto):
+    """Returns the `TensorShape` for a `TensorShapeProto`."""
+    if proto.unknown_rank:
+      key = None
+    else:
+      key = tuple(dim.size for dim in proto.dim)
+    shape = self._shapes.get(key)
+    if shape is None:
+      if len(self._shapes) >= self._MAX_ENTRIES:
+        self._shapes.clear()
+      shape = tensor_shape.TensorShape(proto)
+      self._shapes[key] = shape
+    return shape
+
+
+_tensor_shape_cache = _TensorShapeCache()
+
+
 def call_cpp_shape_fn(op, require_shape_fn=True):
   """A shape function that delegates to the registered C++ shape function.
 
@@ -582,7 +616,7 @@ def call_cpp_shape_fn(op, require_shape_fn=True):
     # here, even though it has a C++ shape function.  When Python
     # calls the C / C-API directly, we should be able to remove this.
     return {
-        "shapes": [tensor_shape.TensorShape(op.get_attr("value").tensor_shape)],
+        "shapes": [_tensor_shape_cache.get(op.get_attr("value").tensor_shape)],
         "handle_data": [None]
     }
 
@@ -615,21 +649,23 @@ def call_cpp_shape_fn(op, require_shape_fn=True):
       return res
 
 
+def _tensor_to_inference_result(t):
+  """Returns the shape of `t` as a serialized `CppShapeInferenceResult`."""
+  r = cpp_shape_inference_pb2.CppShapeInferenceResult()
+  r.shape.CopyFrom(t.get_shape().as_proto())
+  # pylint: disable=protected-access
+  if t._handle_data is not None:
+    r.handle_data.CopyFrom(t._handle_data)
+  # pylint: enable=protected-access
+  return r.SerializeToString()
+
+
 def _call_cpp_shape_fn_impl(
     op, input_tensors_needed, input_tensors_as_shapes_needed, require_shape_fn):
   """Core implementaton of call_cpp_shape_fn."""
   graph_def_version = op.graph.graph_def_versions.producer
   node_def_str = op.node_def.SerializeToString()
-
-  def tensor_to_inference_result(t):
-    r = cpp_shape_inference_pb2.CppShapeInferenceResult()
-    r.shape.CopyFrom(t.get_shape().as_proto())
-    # pylint: disable=protected-access
-    if t._handle_data is not None:
-      r.handle_data.CopyFrom(t._handle_data)
-    # pylint: enable=protected-access
-    return r.SerializeToString()
-  input_shapes = [tensor_to_inference_result(i) for i in op.inputs]
+  input_shapes = [_tensor_to_inference_result(i) for i in op.inputs]
 
   input_tensors = [None for i in input_shapes]
   for idx in input_tensors_needed:
@@ -671,7 +707,7 @@ def _call_cpp_shape_fn_impl(
       cpp_shape_inference_pb2.CppShapeInferenceResult().FromString(s)
       for s in output_shapes
   ]
-  result = [r.shape for r in result_protos]
+  result = [_tensor_shape_cache.get(r.shape) for r in result_protos]
   result_handle_data = [
       r.handle_data if r.handle_data.is_set else None for r in result_protos
   ]
@@ -682,6 +718,94 @@ def _call_cpp_shape_fn_impl(
       "inputs_needed": output[-1]
   }
 
+
+def call_cpp_shape_fn_batch(op_list):
+  """Runs the C++ shape functions of many ops with a single call into C++.
+
+  `call_cpp_shape_fn()` serializes the shapes of an op's inputs and crosses
+  into C++ once per op. This function sends the `NodeDef`s of all the ops in
+  `op_list` together, and the shapes computed for each op are passed to the
+  ops consuming them within C++, so only the inputs that come from outside of
+  `op_list` are serialized.
+
+  Constant input values are not available in a batch. Inference stops before
+  the first op whose shape function needs one, fails, or is missing; that op
+  must be passed to `call_cpp_shape_fn()`, which also produces the error
+  messages.
+
+  Args:
+    op_list: A list of ops of the same graph, such that every input of an op
+      is either produced by an earlier op in the list or has its final
+      shape set already.
+
+  Returns:
+    A list with a dictionary of the `shapes` and `handle_data` that
+    `call_cpp_shape_fn()` would return for each op in a prefix of `op_list`.
+    The shapes are not set on the outputs of the ops.
+
+  Raises:
+    ValueError: If the batch could not be processed.
+  """
+  if not op_list:
+    return []
+  graph_def_version = op_list[0].graph.graph_def_versions.producer
+  batch = cpp_shape_inference_pb2.CppShapeInferenceBatch()
+  # Maps the ids of ops inferred in C++ to their index in `batch`.
+  batch_indices = {}
+  # Maps the ids of Const ops to their shape, see `call_cpp_shape_fn()`.
+  const_shapes = {}
+  # The index in `op_list` of the op added as each node of `batch`.
+  op_indices = []
+  results = [None] * len(op_list)
+  for i, op in enumerate(op_list):
+    # pylint: disable=protected-access
+    if op.type == "Const":
+      results[i] = call_cpp_shape_fn(op)
+      const_shapes[op._id] = results[i]["shapes"][0]
+      continue
+    node = batch.node.add()
+    node.node_def = op.node_def.SerializeToString()
+    for t in op.inputs:
+      node_input = node.input.add()
+      index = batch_indices.get(t.op._id)
+      if index is not None:
+        node_input.node = index
+        node_input.output = t.value_index
+        continue
+      node_input.node = -1
+      const_shape = const_shapes.get(t.op._id)
+      if const_shape is not None:
+        r = cpp_shape_inference_pb2.CppShapeInferenceResult()
+        r.shape.CopyFrom(const_shape.as_proto())
+        node_input.shape = r.SerializeToString()
+      else:
+        node_input.shape = _tensor_to_inference_result(t)
+    batch_indices[op._id] = len(op_indices)
+    op_indices.append(i)
+    # pylint: enable=protected-access
+
+  if op_indices:
+    try:
+      with errors.raise_exception_on_not_ok_status() as status:
+        output = pywrap_tensorflow.RunCppShapeInferenceBatch(
+            graph_def_version, batch.SerializeToString(), status)
+    except errors.InvalidArgumentError as err:
+      raise ValueError(err.message)
+    for i, s in zip(op_indices, output):
+      result_protos = (
+          cpp_shape_inference_pb2.CppShapeInferenceNodeResult.FromString(
+              s).output)
+      results[i] = {
+          "shapes": [_tensor_shape_cache.get(r.shape) for r in result_protos],
+          "handle_data": [r.handle_data if r.handle_data.is_set else None
+                          for r in result_protos]
+      }
+    if len(output) < len(op_indices):
+      # Const ops after the op that stopped inference are not returned.
+      return results[:op_indices[len(output)]]
+  return results
+
 # pylint: disable=protected-access
 ops._set_call_cpp_shape_fn(call_cpp_shape_fn)
+ops._set_call_cpp_shape_fn_batch(call_cpp_shape_fn_batch)
 # pylint: enable=protected-access
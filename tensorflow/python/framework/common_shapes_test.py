@@ -21,8 +21,12 @@ from __future__ import print_function
 import numpy as np
 
 from tensorflow.python.framework import common_shapes
+from tensorflow.python.framework import constant_op
+from tensorflow.python.framework import ops
 from tensorflow.python.framework import tensor_shape
 from tensorflow.python.framework import test_util
+from tensorflow.python.ops import array_ops
+from tensorflow.python.ops import math_ops
 from tensorflow.python.platform import googletest
 
 
@@ -202,6 +206,35 @@ class CommonShapesTest(test_util.TensorFlowTestCase):
     self._assert_broadcast_with_unknown_dims(
         expected=shape_4x4, shape1=shape_4xU, shape2=shape_Ux4)
 
+  def testCallCppShapeFnSharesTensorShapes(self):
+    with ops.Graph().as_default():
+      a = constant_op.constant([[1.0, 2.0]])
+      b = constant_op.constant([[3.0, 4.0]])
+      c = a + b
+    self.assertEqual([1, 2], c.get_shape().as_list())
+    self.assertIs(a.get_shape(), b.get_shape())
+    self.assertIs(a.get_shape(), c.get_shape())
+
+  def testCallCppShapeFnBatch(self):
+    with ops.Graph().as_default():
+      a = constant_op.constant([[1.0, 2.0]])
+      b = constant_op.constant([[3.0], [4.0]])
+      c = math_ops.matmul(a, b)
+      d = math_ops.matmul(b, c)
+    results = common_shapes.call_cpp_shape_fn_batch([a.op, c.op, d.op])
+    self.assertEqual([[[1, 2]], [[1, 1]], [[2, 1]]],
+                     [[s.as_list() for s in r["shapes"]] for r in results])
+    self.assertEqual([[None]] * 3, [r["handle_data"] for r in results])
+
+  def testCallCppShapeFnBatchStopsAtOpNeedingInputValues(self):
+    with ops.Graph().as_default():
+      a = constant_op.constant([[1.0, 2.0]])
+      b = array_ops.reshape(a, [2])
+      c = math_ops.add(b, b)
+    results = common_shapes.call_cpp_shape_fn_batch([a.op, b.op, c.op])
+    self.assertEqual(1, len(results))
+    self.assertEqual([1, 2], results[0]["shapes"][0].as_list())
+
 
 if __name__ == "__main__":
   googletest.main()
@@ -15,6 +15,8 @@ limitations under the License.
 
 #include "tensorflow/python/framework/cpp_shape_inference.h"
 
+#include <utility>
+
 #include "tensorflow/core/framework/graph.pb.h"
 #include "tensorflow/core/framework/op.h"
 #include "tensorflow/core/framework/shape_inference.h"
@@ -202,5 +204,70 @@ std::vector<string> RunCppShapeInference(
   return output;
 }
 
+std::vector<string> RunCppShapeInferenceBatch(int graph_def_version,
+                                              const string& serialized_batch,
+                                              TF_Status* out_status) {
+  CppShapeInferenceBatch batch;
+  if (!batch.ParseFromString(serialized_batch)) {
+    TF_SetStatus(out_status, TF_INVALID_ARGUMENT,
+                 "Error parsing batch during cpp shape inference");
+    return std::vector<string>();
+  }
+
+  TensorShapeProto unknown_shape;
+  unknown_shape.set_unknown_rank(true);
+  const string serialized_unknown_shape = unknown_shape.SerializeAsString();
+
+  // The serialized CppShapeInferenceResults of the outputs of each node
+  // inferred so far.
+  std::vector<std::vector<string>> node_outputs;
+  std::vector<string> output;
+  CppShapeInferenceNodeResult node_result;
+  for (const auto& node : batch.node()) {
+    std::vector<string> input_serialized_shapes;
+    input_serialized_shapes.reserve(node.input_size());
+    for (const auto& input : node.input()) {
+      if (input.node() < 0) {
+        input_serialized_shapes.push_back(input.shape());
+        continue;
+      }
+      if (input.node() >= static_cast<int>(node_outputs.size()) ||
+          input.output() < 0 ||
+          input.output() >=
+              static_cast<int>(node_outputs[input.node()].size())) {
+        TF_SetStatus(out_status, TF_INVALID_ARGUMENT,
+                     "Invalid input reference during cpp shape inference");
+        return std::vector<string>();
+      }
+      input_serialized_shapes.push_back(
+          node_outputs[input.node()][input.output()]);
+    }
+
+    // Constant input values are not available in a batch; nodes that ask for
+    // them end it.
+    const std::vector<PyObject*> input_constant_tensor_values(
+        input_serialized_shapes.size(), Py_None);
+    const std::vector<string> input_constant_tensor_as_shape_values(
+        input_serialized_shapes.size(), serialized_unknown_shape);
+    std::vector<string> output_tensor_shape_protos;
+    string input_tensors_needed_out;
+    tensorflow::Status status = RunCppShapeInferenceImpl(
+        graph_def_version, node.node_def(), input_serialized_shapes,
+        input_constant_tensor_values, input_constant_tensor_as_shape_values,
+        &output_tensor_shape_protos, &input_tensors_needed_out);
+    if (!status.ok() || !input_tensors_needed_out.empty()) {
+      break;
+    }
+
+    node_result.Clear();
+    for (const string& s : output_tensor_shape_protos) {
+      CHECK(node_result.add_output()->ParseFromString(s));
+    }
+    output.push_back(node_result.SerializeAsString());
+    node_outputs.push_back(std::move(output_tensor_shape_protos));
+  }
+  return output;
+}
+
 }  // namespace swig
 }  // namespace tensorflow
@@ -48,6 +48,24 @@ std::vector<string> RunCppShapeInference(
     const std::vector<string>& input_constant_tensor_as_shape_values,
     TF_Status* out_status);
 
+// Calls the registered C++ shape inference functions for the nodes of
+// <serialized_batch> (a serialized CppShapeInferenceBatch) in order, passing
+// the inferred output shapes of each node to the nodes in the batch that
+// consume them.
+//
+// Inference stops before the first node that has no shape function, whose
+// shape function fails, or whose shape function asks for the value of an
+// input tensor. Such nodes must be passed to RunCppShapeInference, which
+// reports the error or accepts the constant input values.
+//
+// Returns a vector with a serialized CppShapeInferenceNodeResult for each
+// node that was inferred, which is shorter than the batch if inference
+// stopped early. An error is returned in <out_status> only if the batch
+// itself is malformed.
+std::vector<string> RunCppShapeInferenceBatch(int graph_def_version,
+                                              const string& serialized_batch,
+                                              TF_Status* out_status);
+
 }  // namespace swig
 }  // namespace tensorflow
 
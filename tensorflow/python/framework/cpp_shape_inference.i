@@ -24,6 +24,7 @@ limitations under the License.
 %unignore tensorflow;
 %unignore tensorflow::swig;
 %unignore tensorflow::swig::RunCppShapeInference;
+%unignore tensorflow::swig::RunCppShapeInferenceBatch;
 %include "tensorflow/python/framework/cpp_shape_inference.h"
 
 %unignoreall
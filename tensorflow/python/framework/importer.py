@@ -20,15 +20,23 @@ from __future__ import print_function
 
 import contextlib
 import copy
+import hashlib
+import os
 
 from tensorflow.core.framework import attr_value_pb2
 from tensorflow.core.framework import graph_pb2
 from tensorflow.core.framework import types_pb2
+from tensorflow.python.framework import cpp_shape_inference_pb2
 from tensorflow.python.framework import dtypes
+from tensorflow.python.framework import errors
 from tensorflow.python.framework import function
 from tensorflow.python.framework import op_def_registry
 from tensorflow.python.framework import ops
 from tensorflow.python.framework import tensor_shape
+from tensorflow.python.framework import tensor_util
+from tensorflow.python.framework import versions
+from tensorflow.python.lib.io import file_io
+from tensorflow.python.platform import tf_logging as logging
 from tensorflow.python.util import compat
 
 
@@ -151,8 +159,191 @@ def _FindAttrInOpDef(attr_name, op_def):
   return None
 
 
+# Suffix of the files written to the `cache_dir` of `import_graph_def()`.
+_IMPORT_CACHE_SUFFIX = '.import_cache'
+
+
+def _SerializeDeterministically(message):
+  try:
+    return message.SerializeToString(deterministic=True)
+  except TypeError:
+    # Older protobuf releases cannot order map entries. The key may then differ
+    # between processes, which only costs a cache miss.
+    return message.SerializeToString()
+
+
+def _ImportCacheKey(graph_def, input_map, op_dict, producer_op_list):
+  """Returns the import cache key for `graph_def`, or None if uncacheable.
+
+  The key covers everything the types and inferred shapes of the imported
+  ops depend on: the TensorFlow version, the `GraphDef` itself, the `OpDef`s
+  of the op types it uses, `producer_op_list` and the type, shape, shape
+  inference handle data and partially known value of each tensor in
+  `input_map`, which shape functions read as a shape.
+
+  Args:
+    graph_def: The `GraphDef` being imported, before default attrs are added.
+    input_map: A dictionary from canonical input names to `Tensor`s.
+    op_dict: A dictionary mapping op type names to `OpDef` protos.
+    producer_op_list: An `OpList` proto, or None.
+
+  Returns:
+    A hexadecimal digest, or None if the shapes inferred for the graph may
+    depend on the values of the tensors in `input_map`.
+  """
+  hasher = hashlib.sha256()
+  hasher.update(compat.as_bytes(versions.__version__))
+  hasher.update(compat.as_bytes(str(versions.GRAPH_DEF_VERSION)))
+  hasher.update(_SerializeDeterministically(graph_def))
+  for op_type in sorted(set(node.op for node in graph_def.node)):
+    if op_type in op_dict:
+      hasher.update(compat.as_bytes(op_type))
+      hasher.update(_SerializeDeterministically(op_dict[op_type]))
+  if producer_op_list is not None:
+    hasher.update(_SerializeDeterministically(producer_op_list))
+  for input_name in sorted(input_map):
+    tensor = input_map[input_name]
+    if tensor_util.constant_value(tensor) is not None:
+      return None
+    hasher.update(compat.as_bytes(input_name))
+    hasher.update(compat.as_bytes(str(tensor.dtype.as_datatype_enum)))
+    hasher.update(tensor.get_shape().as_proto().SerializeToString())
+    # pylint: disable=protected-access
+    if tensor._handle_data is not None:
+      hasher.update(tensor._handle_data.SerializeToString())
+    # pylint: enable=protected-access
+    if (tensor.dtype.base_dtype in (dtypes.int32, dtypes.int64) and
+        tensor.get_shape().ndims in (None, 1)):
+      try:
+        value_as_shape = tensor_util.constant_value_as_shape(tensor)
+      except (TypeError, ValueError):
+        return None
+      hasher.update(value_as_shape.as_proto().SerializeToString())
+  return hasher.hexdigest()
+
+
+class _ImportCacheEntry(object):
+  """The per-node results of importing a `GraphDef`, in `graph_def` order.
+
+  For every node the entry records its output types, its (non-control)
+  input types, and the shape and shape inference handle data of each output
+  after import. An entry is stored as an `AttrValue.ListValue` per field in a
+  `NameAttrList`, so that it can be read without running any Python code
+  from the file.
+  """
+
+  def __init__(self, output_types, input_types, output_shapes, handle_data):
+    self.output_types = output_types
+    self.input_types = input_types
+    self.output_shapes = output_shapes
+    self.handle_data = handle_data
+
+  @classmethod
+  def FromImportedOps(cls, imported_ops, input_types):
+    output_types = []
+    output_shapes = []
+    handle_data = []
+    for op in imported_ops:
+      output_types.append([t.dtype.as_datatype_enum for t in op.outputs])
+      output_shapes.append([t.get_shape().as_proto() for t in op.outputs])
+      # pylint: disable=protected-access
+      handle_data.append([
+          b'' if t._handle_data is None else t._handle_data.SerializeToString()
+          for t in op.outputs])
+      # pylint: enable=protected-access
+    return cls(output_types, input_types, output_shapes, handle_data)
+
+  @classmethod
+  def FromProto(cls, proto, num_nodes):
+    """Returns the entry stored in `proto`, or None if it is not valid."""
+    attr = proto.attr
+    num_outputs = list(attr['num_outputs'].list.i)
+    num_inputs = list(attr['num_inputs'].list.i)
+    flat_output_types = list(attr['output_types'].list.type)
+    flat_input_types = list(attr['input_types'].list.type)
+    flat_shapes = list(attr['output_shapes'].list.shape)
+    flat_handle_data = list(attr['handle_data'].list.s)
+    if (len(num_outputs) != num_nodes or len(num_inputs) != num_nodes or
+        len(flat_output_types) != sum(num_outputs) or
+        len(flat_shapes) != sum(num_outputs) or
+        len(flat_handle_data) != sum(num_outputs) or
+        len(flat_input_types) != sum(num_inputs)):
+      return None
+
+    def _Split(flat, counts):
+      result = []
+      start = 0
+      for count in counts:
+        result.append(flat[start:start + count])
+        start += count
+      return result
+
+    return cls(_Split(flat_output_types, num_outputs),
+               _Split(flat_input_types, num_inputs),
+               _Split(flat_shapes, num_outputs),
+               _Split(flat_handle_data, num_outputs))
+
+  def ToProto(self, key):
+    proto = attr_value_pb2.NameAttrList(name=key)
+    attr = proto.attr
+    attr['num_outputs'].list.i.extend(len(x) for x in self.output_types)
+    attr['num_inputs'].list.i.extend(len(x) for x in self.input_types)
+    for types in self.output_types:
+      attr['output_types'].list.type.extend(types)
+    for types in self.input_types:
+      attr['input_types'].list.type.extend(types)
+    for shapes in self.output_shapes:
+      attr['output_shapes'].list.shape.extend(shapes)
+    for handle_data in self.handle_data:
+      attr['handle_data'].list.s.extend(handle_data)
+    return proto
+
+  def SetOutputShapes(self, index, op):
+    """Sets the shapes of `op`, the `index`th node, from the entry."""
+    for output, shape, handle_data in zip(
+        op.outputs, self.output_shapes[index], self.handle_data[index]):
+      output.set_shape(tensor_shape.TensorShape(shape))
+      if handle_data:
+        # pylint: disable=protected-access
+        output._handle_data = (
+            cpp_shape_inference_pb2.CppShapeInferenceResult.HandleData
+            .FromString(handle_data))
+        # pylint: enable=protected-access
+
+
+def _ImportCachePath(cache_dir, key):
+  return os.path.join(cache_dir, key + _IMPORT_CACHE_SUFFIX)
+
+
+def _ReadImportCache(cache_dir, key, num_nodes):
+  """Returns the `_ImportCacheEntry` for `key`, or None on a cache miss."""
+  path = _ImportCachePath(cache_dir, key)
+  try:
+    if not file_io.file_exists(path):
+      return None
+    proto = attr_value_pb2.NameAttrList.FromString(
+        file_io.read_file_to_string(path, binary_mode=True))
+  except Exception as e:  # pylint: disable=broad-except
+    logging.warning('Ignoring unreadable import cache entry %s: %s', path, e)
+    return None
+  if proto.name != key:
+    return None
+  return _ImportCacheEntry.FromProto(proto, num_nodes)
+
+
+def _WriteImportCache(cache_dir, key, entry):
+  path = _ImportCachePath(cache_dir, key)
+  try:
+    file_io.recursive_create_dir(cache_dir)
+    file_io.atomic_write_string_to_file(
+        path, entry.ToProto(key).SerializeToString())
+  except errors.OpError as e:
+    logging.warning('Failed to write import cache entry %s: %s', path, e)
+
+
 def import_graph_def(graph_def, input_map=None, return_elements=None,
-                     name=None, op_dict=None, producer_op_list=None):
+                     name=None, op_dict=None, producer_op_list=None,
+                     cache_dir=None):
   """Imports the graph from `graph_def` into the current default `Graph`.
 
   This function provides a way to import a serialized TensorFlow
@@ -184,6 +375,12 @@ def import_graph_def(graph_def, input_map=None, return_elements=None,
       value according to `producer_op_list` will be removed. This will allow
       some more `GraphDef`s produced by later binaries to be accepted by
       earlier binaries.
+    cache_dir: (Optional.) A directory in which to cache the output types and
+      inferred shapes of the imported operations. The cache is keyed by a
+      digest of `graph_def` and the TensorFlow version, so importing the same
+      `GraphDef` again, for example in a new process, skips type resolution
+      and shape inference. Imports whose `input_map` contains tensors with
+      constant values are not cached.
 
   Returns:
     A list of `Operation` and/or `Tensor` objects from the imported graph,
@@ -270,11 +467,20 @@ def import_graph_def(graph_def, input_map=None, return_elements=None,
       with ops.name_scope('_inputs'):
         input_map = {k: ops.convert_to_tensor(v) for k, v in input_map.items()}
 
+    cache_key = None
+    cache_entry = None
+    if cache_dir is not None:
+      cache_key = _ImportCacheKey(graph_def, input_map, op_dict,
+                                  producer_op_list)
+      if cache_key is not None:
+        cache_entry = _ReadImportCache(cache_dir, cache_key,
+                                       len(graph_def.node))
+
     # NOTE(mrry): We do this in two passes, because there may be a cycle in
     # `graph_def`.
 
     # 1. Add operations without their inputs.
-    for node in graph_def.node:
+    for node_index, node in enumerate(graph_def.node):
       # Check to see if this op's name matches a previously seen op
       if node.name in name_to_op:
         raise ValueError('Duplicate name \'%s\' in GraphDef.' % node.name)
@@ -304,16 +510,24 @@ def import_graph_def(graph_def, input_map=None, return_elements=None,
                 # so it can be understood by consumer.
                 del node.attr[key]
 
-      output_types = _OutputTypes(node, op_dict)
+      if cache_entry is None:
+        output_types = _OutputTypes(node, op_dict)
+      else:
+        output_types = cache_entry.output_types[node_index]
       name_to_op[node.name] = g.create_op(
           node.op, [], output_types, name=node.name, attrs=node.attr,
           compute_shapes=False, compute_device=False,
           op_def=op_def)
 
     # 2. Add inputs to the operations.
-    for node in graph_def.node:
+    imported_input_types = []
+    for node_index, node in enumerate(graph_def.node):
       op = name_to_op[node.name]
-      input_types = _InputTypes(node, op_dict)
+      if cache_entry is None:
+        input_types = _InputTypes(node, op_dict)
+      else:
+        input_types = cache_entry.input_types[node_index]
+      imported_input_types.append(input_types)
 
       # Rewrite the colocation attributes in the graph, since the
       # names of new ops may have changed.
@@ -400,7 +614,12 @@ def import_graph_def(graph_def, input_map=None, return_elements=None,
                    ', '.join(x.name for x in op._input_dtypes))))
       # pylint: enable=protected-access
 
-      if not g._is_function(op.type):  # pylint: disable=protected-access
+      if cache_entry is not None:
+        # The cached shapes were recorded after merging `_output_shapes`.
+        cache_entry.SetOutputShapes(node_index, op)
+        if '_output_shapes' in op.node_def.attr:
+          del op.node_def.attr['_output_shapes']
+      elif not g._is_function(op.type):  # pylint: disable=protected-access
         # Execute shape inference for this op.
         # NOTE(mrry): If the graph contains a cycle, the full shape information
         # may not be available for this op's inputs.
@@ -465,6 +684,13 @@ def import_graph_def(graph_def, input_map=None, return_elements=None,
           'Attempted to map inputs that were not found in graph_def: [%s]'
           % ', '.join(unused_input_keys))
 
+    if cache_key is not None and cache_entry is None:
+      _WriteImportCache(
+          cache_dir, cache_key,
+          _ImportCacheEntry.FromImportedOps(
+              [name_to_op[node.name] for node in graph_def.node],
+              imported_input_types))
+
     if return_elements is None:
       return None
     else:
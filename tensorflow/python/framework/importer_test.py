@@ -18,6 +18,9 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import os
+import time
+
 import numpy as np
 
 from google.protobuf import text_format
@@ -1044,6 +1047,125 @@ class ImportGraphDefTest(test.TestCase):
       z1_val, z2_val = sess.run((z1, z2))
       self.assertAllEqual(z1_val, z2_val)
 
+  def _BuildGraphDefForImportCache(self):
+    with ops.Graph().as_default() as g:
+      x = array_ops.placeholder(dtypes.float32, shape=[None, 3], name="x")
+      w = constant_op.constant(np.ones([3, 4], dtype=np.float32), name="w")
+      y = math_ops.matmul(x, w, name="y")
+      array_ops.reshape(y, [-1, 2, 2], name="z")
+    return g.as_graph_def()
+
+  def testImportCache(self):
+    cache_dir = os.path.join(self.get_temp_dir(), "import_cache")
+    gdef = self._BuildGraphDefForImportCache()
+
+    with ops.Graph().as_default():
+      cold_y, cold_z = importer.import_graph_def(
+          gdef, return_elements=["y:0", "z:0"], cache_dir=cache_dir)
+    self.assertEqual(1, len(os.listdir(cache_dir)))
+
+    with ops.Graph().as_default():
+      with test.mock.patch.object(ops, "set_shapes_for_outputs") as infer:
+        warm_y, warm_z = importer.import_graph_def(
+            gdef, return_elements=["y:0", "z:0"], cache_dir=cache_dir)
+      self.assertFalse(infer.called)
+    self.assertEqual(1, len(os.listdir(cache_dir)))
+    self.assertEqual([None, 4], cold_y.get_shape().as_list())
+    self.assertEqual(cold_y.get_shape().as_list(),
+                     warm_y.get_shape().as_list())
+    self.assertEqual(cold_z.get_shape().as_list(),
+                     warm_z.get_shape().as_list())
+    self.assertEqual(cold_z.dtype, warm_z.dtype)
+
+  def testImportCacheKeyedByInputMap(self):
+    cache_dir = os.path.join(self.get_temp_dir(), "import_cache_input_map")
+    gdef = self._BuildGraphDefForImportCache()
+    for batch_size in [2, 8, 2]:
+      with ops.Graph().as_default():
+        x = array_ops.placeholder(dtypes.float32, shape=[batch_size, 3])
+        y, = importer.import_graph_def(
+            gdef, input_map={"x:0": x}, return_elements=["y:0"],
+            cache_dir=cache_dir)
+        self.assertEqual([batch_size, 4], y.get_shape().as_list())
+    self.assertEqual(2, len(os.listdir(cache_dir)))
+
+    # Shapes inferred from constant inputs are not cached.
+    with ops.Graph().as_default():
+      x = constant_op.constant(np.zeros([5, 3], dtype=np.float32))
+      y, = importer.import_graph_def(
+          gdef, input_map={"x:0": x}, return_elements=["y:0"],
+          cache_dir=cache_dir)
+      self.assertEqual([5, 4], y.get_shape().as_list())
+    self.assertEqual(2, len(os.listdir(cache_dir)))
+
+  def testImportCacheKeyedByPartialValueOfInputMap(self):
+    cache_dir = os.path.join(self.get_temp_dir(), "import_cache_partial")
+    with ops.Graph().as_default() as g:
+      data = array_ops.placeholder(dtypes.float32, name="data")
+      shape = array_ops.placeholder(dtypes.int32, shape=[3], name="shape")
+      array_ops.reshape(data, shape, name="r")
+    gdef = g.as_graph_def()
+
+    # The mapped shapes are not constant, but reshape reads their known
+    # dimensions.
+    for first_dim in [2, 4, 2]:
+      with ops.Graph().as_default():
+        unknown = array_ops.placeholder(dtypes.int32, shape=[])
+        shape = array_ops.stack([first_dim, unknown, 5])
+        r, = importer.import_graph_def(
+            gdef, input_map={"shape:0": shape}, return_elements=["r:0"],
+            cache_dir=cache_dir)
+        self.assertEqual([first_dim, None, 5], r.get_shape().as_list())
+    self.assertEqual(2, len(os.listdir(cache_dir)))
+
+  def testImportCacheIgnoresInvalidEntries(self):
+    cache_dir = os.path.join(self.get_temp_dir(), "import_cache_invalid")
+    gdef = self._BuildGraphDefForImportCache()
+    with ops.Graph().as_default():
+      importer.import_graph_def(gdef, cache_dir=cache_dir)
+    cache_file, = os.listdir(cache_dir)
+    with open(os.path.join(cache_dir, cache_file), "wb") as f:
+      f.write(b"not a cache entry")
+
+    with ops.Graph().as_default():
+      y, = importer.import_graph_def(
+          gdef, return_elements=["y:0"], cache_dir=cache_dir)
+      self.assertEqual([None, 4], y.get_shape().as_list())
+
+
+class ImportGraphDefBenchmark(test.Benchmark):
+
+  def _BuildGraphDef(self, num_layers):
+    with ops.Graph().as_default() as g:
+      x = array_ops.placeholder(dtypes.float32, shape=[None, 64])
+      for _ in range(num_layers):
+        w = constant_op.constant(np.ones([64, 64], dtype=np.float32))
+        b = constant_op.constant(np.zeros([64], dtype=np.float32))
+        x = nn_ops.relu(nn_ops.bias_add(math_ops.matmul(x, w), b))
+    return g.as_graph_def()
+
+  def _TimeImport(self, graph_def, cache_dir):
+    with ops.Graph().as_default():
+      start_time = time.time()
+      importer.import_graph_def(graph_def, cache_dir=cache_dir)
+      return time.time() - start_time
+
+  def benchmarkColdAndWarmImport(self):
+    for num_layers in [100, 1000]:
+      graph_def = self._BuildGraphDef(num_layers)
+      cache_dir = os.path.join(test.get_temp_dir(),
+                               "import_cache_%d" % num_layers)
+      name = "import_graph_def_%d_nodes" % len(graph_def.node)
+      uncached = self._TimeImport(graph_def, None)
+      cold = self._TimeImport(graph_def, cache_dir)
+      warm = self._TimeImport(graph_def, cache_dir)
+      print("%s uncached %f cold %f warm %f" % (name, uncached, cold, warm))
+      self.report_benchmark(iters=1, wall_time=uncached,
+                            name=name + "_uncached")
+      self.report_benchmark(iters=1, wall_time=cold, name=name + "_cold")
+      self.report_benchmark(iters=1, wall_time=warm, name=name + "_warm",
+                            extras={"speedup_over_uncached": uncached / warm})
+
 
 if __name__ == "__main__":
   test.main()
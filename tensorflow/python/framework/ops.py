@@ -25,6 +25,7 @@ import linecache
 import re
 import sys
 import threading
+import time
 
 import six
 from tensorflow.core.framework import attr_value_pb2
@@ -260,6 +261,18 @@ class Tensor(_TensorLike):
     # If set, will be a HandleData object from cpp_shape_inference.proto.
     self._handle_data = None
 
+  def _ensure_shape_inferred(self):
+    """Runs the shape inference still pending for this tensor's op, if any.
+
+    Shape inference is deferred for ops created inside
+    `Graph.bulk_construction()`. `_shape` and `_handle_data` are plain
+    attributes, so the public shape accessors call this before using them.
+    """
+    # pylint: disable=protected-access
+    if self._op._shape_inference_pending:
+      self._op.graph._run_pending_shape_inference(self._op)
+    # pylint: enable=protected-access
+
   @property
   def op(self):
     """The `Operation` that produces this tensor as an output."""
@@ -331,9 +344,11 @@ class Tensor(_TensorLike):
       A `TensorShape` representing the shape of this tensor.
 
     """
+    self._ensure_shape_inferred()
     return self._shape
 
   def _shape_as_list(self):
+    self._ensure_shape_inferred()
     if self._shape.ndims is not None:
       return [dim.value for dim in self._shape.dims]
     else:
@@ -374,6 +389,7 @@ class Tensor(_TensorLike):
       ValueError: If `shape` is not compatible with the current shape of
         this tensor.
     """
+    self._ensure_shape_inferred()
     self._shape = self._shape.merge_with(shape)
 
   @property
@@ -1157,6 +1173,8 @@ class Operation(object):
       raise TypeError("g needs to be a Graph: %s" % g)
     self._node_def = copy.deepcopy(node_def)
     self._graph = g
+    # True while shape inference for this op is deferred by the graph.
+    self._shape_inference_pending = False
     if inputs is None:
       inputs = []
     elif not isinstance(inputs, list):
@@ -1375,7 +1393,10 @@ class Operation(object):
       device: string or device..  The device to set.
     """
     assert not _USE_C_API, "Operation._set_device doesn't work with C API"
+    old_device = self._node_def.device
     self._node_def.device = _device_string(device)
+    if self._node_def.device != old_device:
+      self._graph._update_device_index(self, old_device)  # pylint: disable=protected-access
 
   def _add_input(self, tensor, dtype=None):
     """Add a new input to this operation.
@@ -1745,6 +1766,7 @@ _default_shape_function_registry = registry.Registry("default shape functions")
 # It is set outside ops.py to avoid a circular dependency.
 _call_cpp_shape_fn = None
 _call_cpp_shape_fn_and_require_op = None
+_call_cpp_shape_fn_batch = None
 
 
 def _set_call_cpp_shape_fn(call_cpp_shape_fn):
@@ -1764,6 +1786,12 @@ def _set_call_cpp_shape_fn(call_cpp_shape_fn):
   _call_cpp_shape_fn_and_require_op = call_with_requiring
 
 
+def _set_call_cpp_shape_fn_batch(call_cpp_shape_fn_batch):
+  """Sets the batch shape fn to common_shapes.call_cpp_shape_fn_batch."""
+  global _call_cpp_shape_fn_batch
+  _call_cpp_shape_fn_batch = call_cpp_shape_fn_batch
+
+
 class RegisterShape(object):
   """No longer used.  Was: A decorator for registering a shape function.
 
@@ -1799,17 +1827,25 @@ class RegisterShape(object):
     return f
 
 
-def set_shapes_for_outputs(op):
-  """Uses the registered shape functions to set the shapes for op's outputs."""
+def _get_shape_function(op):
+  """Returns the shape function registered for the type of `op`."""
   try:
-    shape_func = _shape_registry.lookup(op.type)
+    return _shape_registry.lookup(op.type)
   except LookupError:
     try:
-      shape_func = _default_shape_function_registry.lookup(op.type)
+      return _default_shape_function_registry.lookup(op.type)
     except LookupError:
-      shape_func = _call_cpp_shape_fn_and_require_op
+      return _call_cpp_shape_fn_and_require_op
+
+
+def set_shapes_for_outputs(op):
+  """Uses the registered shape functions to set the shapes for op's outputs."""
+  shape_func = _get_shape_function(op)
+  _set_shapes_from_shape_function(op, shape_func(op), shape_func)
+
 
-  shapes = shape_func(op)
+def _set_shapes_from_shape_function(op, shapes, shape_func):
+  """Sets the shapes returned by `shape_func` for op's outputs."""
   if shapes is None:
     raise RuntimeError(
         "Shape function for op %s did not return any shapes" % op)
@@ -1831,6 +1867,57 @@ def set_shapes_for_outputs(op):
     output.set_shape(s)
 
 
+def _set_shapes_for_outputs_in_batches(op_list):
+  """Sets the shapes for the outputs of the ops in `op_list`, in order.
+
+  Consecutive ops that use the C++ shape functions are inferred with one call
+  of `common_shapes.call_cpp_shape_fn_batch()`; the others, and the ops it
+  does not infer, go through `set_shapes_for_outputs()`.
+
+  Args:
+    op_list: A list of ops, in which every op comes after the ops producing
+      its inputs.
+
+  Yields:
+    Each op of `op_list` once its shapes have been set, so that callers can
+    tell which op raised an error.
+  """
+  cpp_shape_fns = (_call_cpp_shape_fn, _call_cpp_shape_fn_and_require_op)
+  start = 0
+  while start < len(op_list):
+    end = start
+    if _call_cpp_shape_fn_batch is not None:
+      while (end < len(op_list) and
+             _get_shape_function(op_list[end]) in cpp_shape_fns):
+        end += 1
+    if end - start > 1:
+      batch = op_list[start:end]
+      for op, shapes_dict in zip(batch, _call_cpp_shape_fn_batch(batch)):
+        _set_shapes_from_shape_function(op, shapes_dict,
+                                        _get_shape_function(op))
+        start += 1
+        yield op
+    if start < len(op_list):
+      set_shapes_for_outputs(op_list[start])
+      start += 1
+      yield op_list[start - 1]
+
+
+def set_shapes_for_outputs_batch(op_list):
+  """Sets the shapes for the outputs of many ops at once.
+
+  This is equivalent to calling `set_shapes_for_outputs()` on each op in
+  turn, but the C++ shape functions of the ops are run with one call into
+  C++ for each run of consecutive ops that use them, instead of one per op.
+
+  Args:
+    op_list: A list of ops, in which every op comes after the ops producing
+      its inputs.
+  """
+  for _ in _set_shapes_for_outputs_in_batches(list(op_list)):
+    pass
+
+
 class OpStats(object):
   """A holder for statistics about an operator.
 
@@ -1979,6 +2066,139 @@ def _name_from_scope_name(name):
   return name[:-1] if name[-1] == "/" else name
 
 
+# Characters that give a `scope` argument of `get_collection()` a meaning other
+# than a plain name prefix, when it is interpreted as a regular expression.
+_REGEX_SPECIAL_CHARACTERS = frozenset("\\.^$*+?{}[]|()")
+
+
+def _is_literal_prefix(pattern):
+  """Returns True if `re.match(pattern, s)` is `s.startswith(pattern)`."""
+  return not _REGEX_SPECIAL_CHARACTERS.intersection(pattern)
+
+
+class _NamePrefixIndex(object):
+  """An index of named values, supporting fast lookups by name prefix.
+
+  Names are split into their "/"-separated components and stored in a trie, so
+  that looking up a name prefix (e.g. a name scope) only visits the values
+  whose name starts with that prefix, instead of every value in the index.
+  """
+
+  def __init__(self):
+    # Each node is a pair `(children, values)`, where `children` maps a name
+    # component to the child node, and `values` is a list of
+    # `(sequence_number, value)` pairs for the values that have that name.
+    self._root = ({}, [])
+    self._next_sequence_number = 0
+
+  def add(self, name, value):
+    """Adds `value` to the index under `name`."""
+    node = self._root
+    for component in name.split("/"):
+      child = node[0].get(component)
+      if child is None:
+        child = ({}, [])
+        node[0][component] = child
+      node = child
+    node[1].append((self._next_sequence_number, value))
+    self._next_sequence_number += 1
+
+  def lookup(self, prefix):
+    """Returns the values whose name starts with `prefix`.
+
+    Args:
+      prefix: A string.
+
+    Returns:
+      A list of values, in the order in which they were added to the index.
+    """
+    components = prefix.split("/")
+    node = self._root
+    for component in components[:-1]:
+      node = node[0].get(component)
+      if node is None:
+        return []
+    last_component = components[-1]
+    pending = [child for component, child in six.iteritems(node[0])
+               if component.startswith(last_component)]
+    values = []
+    while pending:
+      children, node_values = pending.pop()
+      values.extend(node_values)
+      pending.extend(six.itervalues(children))
+    values.sort(key=lambda pair: pair[0])
+    return [value for _, value in values]
+
+
+class GraphConstructionStats(object):
+  """Time spent building a graph inside `Graph.bulk_construction()`.
+
+  `Graph.create_op()` runs in phases: name uniquification (`"naming"`),
+  `NodeDef` attribute scopes (`"node_def"`), control dependencies
+  (`"control_dependencies"`), `Operation` construction (`"operation"`),
+  shape inference (`"shape_inference"`), registering the op with the graph
+  (`"add_op"`) and device and colocation placement (`"device"`).
+  """
+
+  def __init__(self):
+    self._phase_times = collections.defaultdict(float)
+    self._num_ops = 0
+
+  @property
+  def num_ops(self):
+    """The number of operations created while these stats were recorded."""
+    return self._num_ops
+
+  @property
+  def phase_times(self):
+    """A dictionary from phase name to the total time in seconds spent in it."""
+    return dict(self._phase_times)
+
+  @property
+  def total_time(self):
+    """The total time in seconds spent in all phases."""
+    return sum(six.itervalues(self._phase_times))
+
+  def __repr__(self):
+    phases = ", ".join("%s=%.6fs" % (phase, seconds)
+                       for phase, seconds in sorted(self._phase_times.items()))
+    return "<GraphConstructionStats num_ops=%d %s>" % (self._num_ops, phases)
+
+
+class _ConstructionPhaseTimer(object):
+  """Charges the time between successive laps to `GraphConstructionStats`."""
+
+  def __init__(self, stats_stack):
+    self._stats_stack = stats_stack
+    self._last_time = time.time()
+
+  def lap(self, phase):
+    now = time.time()
+    elapsed = now - self._last_time
+    self._last_time = now
+    # pylint: disable=protected-access
+    for stats in self._stats_stack:
+      stats._phase_times[phase] += elapsed
+    # pylint: enable=protected-access
+
+  def done(self):
+    for stats in self._stats_stack:
+      stats._num_ops += 1  # pylint: disable=protected-access
+
+
+class _NullConstructionPhaseTimer(object):
+  """A `_ConstructionPhaseTimer` that records nothing."""
+
+  def lap(self, phase):
+    pass
+
+  def done(self):
+    pass
+
+
+_NULL_CONSTRUCTION_PHASE_TIMER = _NullConstructionPhaseTimer()
+
+
 class _ScopedTF_Graph(object):
 
   def __init__(self):
@@ -2088,10 +2308,25 @@ class Graph(object):
     self._building_function = False
     # Stack of colocate_with ops
     self._colocation_stack = []
+    # Secondary indexes of the operations in the graph, maintained as they are
+    # added. The device index maps a device string to a dict from op id to op.
+    self._ops_by_type = {}  # GUARDED_BY(self._lock)
+    self._ops_by_device = {}  # GUARDED_BY(self._lock)
+    self._op_name_index = _NamePrefixIndex()  # GUARDED_BY(self._lock)
+    # Name indexes for the collections, built on their first scoped lookup.
+    # Collections whose list has been returned by `get_collection_ref()` may be
+    # modified behind the graph's back, so they are never indexed.
+    self._collection_name_indexes = {}  # GUARDED_BY(self._lock)
+    self._unindexed_collections = set()  # GUARDED_BY(self._lock)
     # Set of tensors that are dangerous to feed!
     self._unfeedable_tensors = set()
     # Set of operations that are dangerous to fetch!
     self._unfetchable_ops = set()
+    # Ops created inside `bulk_construction()` whose shape inference has not
+    # run yet, in creation order.
+    self._pending_shape_inference = collections.deque()
+    # `GraphConstructionStats` of the active `bulk_construction()` blocks.
+    self._construction_stats_stack = []
     # A map of tensor handle placeholder to tensor dtype.
     self._handle_feeders = {}
     # A map from tensor handle to its read op.
@@ -2214,6 +2449,25 @@ class Graph(object):
       self._nodes_by_id[op._id] = op
       self._nodes_by_name[op.name] = op
       self._version = max(self._version, op._id)
+      if isinstance(op, Operation):
+        self._ops_by_type.setdefault(op.type, []).append(op)
+        self._ops_by_device.setdefault(op.device, {})[op._id] = op
+        self._op_name_index.add(op.name, op)
+      # pylint: enable=protected-access
+
+  def _update_device_index(self, op, old_device):
+    """Moves `op` from `old_device` to its current device in the index."""
+    with self._lock:
+      # pylint: disable=protected-access
+      if self._nodes_by_id.get(op._id) is not op:
+        # `op` has not been added to the graph yet.
+        return
+      old_device_ops = self._ops_by_device.get(old_device)
+      if old_device_ops is not None:
+        old_device_ops.pop(op._id, None)
+        if not old_device_ops:
+          del self._ops_by_device[old_device]
+      self._ops_by_device.setdefault(op.device, {})[op._id] = op
       # pylint: enable=protected-access
 
   @property
@@ -2271,6 +2525,7 @@ class Graph(object):
     to a graph when it is shared between multiple threads, for example
     when using a @{tf.train.QueueRunner}.
     """
+    self._run_pending_shape_inference()
     self._finalized = True
 
   def _unsafe_unfinalize(self):
@@ -2327,6 +2582,10 @@ class Graph(object):
 
     """
     # pylint: enable=line-too-long
+    if add_shapes:
+      # Shape inference may need the lock, so it must not run while the
+      # nodes are serialized below.
+      self._run_pending_shape_inference()
     with self._lock:
       graph = graph_pb2.GraphDef()
       graph.versions.CopyFrom(self._graph_def_versions)
@@ -2481,6 +2740,10 @@ class Graph(object):
     for idx, a in enumerate(inputs):
       if not isinstance(a, Tensor):
         raise TypeError("Input #%d is not a tensor: %s" % (idx, a))
+    if self._construction_stats_stack:
+      timer = _ConstructionPhaseTimer(self._construction_stats_stack)
+    else:
+      timer = _NULL_CONSTRUCTION_PHASE_TIMER
     if name is None:
       name = op_type
     # If a names ends with a '/' it is a "name scope" and we use it as-is,
@@ -2489,6 +2752,7 @@ class Graph(object):
       name = _name_from_scope_name(name)
     else:
       name = self.unique_name(name)
+    timer.lap("naming")
 
     node_def = _NodeDef(op_type, name, device=None, attrs=attrs)
 
@@ -2521,15 +2785,24 @@ class Graph(object):
           attr_value_pb2.AttrValue(s=compat.as_bytes(mapped_op_type)))
     except KeyError:
       pass
+    timer.lap("node_def")
 
     control_inputs = self._control_dependencies_for_inputs(inputs)
+    timer.lap("control_dependencies")
     ret = Operation(node_def, self, inputs=inputs, output_types=dtypes,
                     control_inputs=control_inputs, input_types=input_types,
                     original_op=self._default_original_op, op_def=op_def)
+    timer.lap("operation")
     if compute_shapes:
-      set_shapes_for_outputs(ret)
+      if self._construction_stats_stack:
+        ret._shape_inference_pending = True  # pylint: disable=protected-access
+        self._pending_shape_inference.append(ret)
+      else:
+        set_shapes_for_outputs(ret)
+        timer.lap("shape_inference")
     self._add_op(ret)
     self._record_op_seen_by_control_dependencies(ret)
+    timer.lap("add_op")
 
     if compute_device:
       self._apply_device_functions(ret)
@@ -2567,9 +2840,90 @@ class Graph(object):
         not ret.node_def.attr["container"].s):
       ret.node_def.attr["container"].CopyFrom(
           attr_value_pb2.AttrValue(s=compat.as_bytes(self._container)))
+    timer.lap("device")
+    timer.done()
 
     return ret
 
+  @tf_contextlib.contextmanager
+  def bulk_construction(self):
+    """Returns a context manager that batches the construction of many ops.
+
+    Inside the block, shape inference for the ops created by `create_op()`
+    is queued instead of run immediately. The queue is processed in creation
+    order when the block exits, or earlier when the shape of a queued op's
+    output is needed, so shapes read inside the block are the same as
+    without it. Queued ops that use C++ shape functions are inferred
+    together, as by `set_shapes_for_outputs_batch()`, crossing into C++ once
+    per batch instead of once per op. Errors that shape inference would have
+    raised from `create_op()` are raised when the shape is first needed or
+    when the block exits.
+
+    The context manager yields a `GraphConstructionStats` that records how
+    much time the ops created in the block spent in each phase of
+    `create_op()`:
+
+    ```python
+    with g.bulk_construction() as stats:
+      logits = build_model(images)
+    print(stats.num_ops, stats.phase_times["shape_inference"])
+    ```
+
+    Blocks may be nested; the stats of every enclosing block include the
+    ops created in the inner ones, and the queue is processed when the
+    outermost block exits.
+
+    Yields:
+      A `GraphConstructionStats` for the ops created inside the block.
+    """
+    stats = GraphConstructionStats()
+    self._construction_stats_stack.append(stats)
+    try:
+      yield stats
+      if len(self._construction_stats_stack) == 1:
+        self._run_pending_shape_inference()
+    finally:
+      self._construction_stats_stack.remove(stats)
+
+  def _run_pending_shape_inference(self, op=None):
+    """Runs the shape inference deferred by `bulk_construction()`.
+
+    Args:
+      op: (Optional.) If set, only the queued ops up to and including `op`
+        are processed. Inputs are always created before the ops that consume
+        them, so this covers everything `op`'s shape functions may read.
+    """
+    if not self._pending_shape_inference:
+      return
+    if self._construction_stats_stack:
+      timer = _ConstructionPhaseTimer(self._construction_stats_stack)
+    else:
+      timer = _NULL_CONSTRUCTION_PHASE_TIMER
+    pending = self._pending_shape_inference
+    op_list = []
+    while pending:
+      pending_op = pending.popleft()
+      # pylint: disable=protected-access
+      pending_op._shape_inference_pending = False
+      # pylint: enable=protected-access
+      op_list.append(pending_op)
+      if pending_op is op:
+        break
+    num_done = 0
+    try:
+      for _ in _set_shapes_for_outputs_in_batches(op_list):
+        num_done += 1
+    finally:
+      timer.lap("shape_inference")
+      # If shape inference raised, the op that raised keeps the shapes it
+      # has, as when shape inference is not deferred. The ops after it are
+      # queued again.
+      for pending_op in reversed(op_list[num_done + 1:]):
+        # pylint: disable=protected-access
+        pending_op._shape_inference_pending = True
+        # pylint: enable=protected-access
+        pending.appendleft(pending_op)
+
   def as_graph_element(self, obj, allow_tensor=True, allow_operation=True):
     """Returns the object referred to by `obj`, as an `Operation` or `Tensor`.
 
@@ -2712,6 +3066,77 @@ class Graph(object):
     with self._lock:
       return list(self._nodes_by_id.values())
 
+  def get_operations_by_type(self, op_type):
+    """Returns the operations of the given type in the graph.
+
+    This method uses an index of the operations, so its cost depends on the
+    number of matching operations rather than on the size of the graph.
+
+    This method may be called concurrently from multiple threads.
+
+    Args:
+      op_type: The type of the operations, e.g. `"VariableV2"`.
+
+    Returns:
+      A list of Operations, in the order in which they were created.
+    """
+    if self._finalized:
+      return list(self._ops_by_type.get(op_type, ()))
+
+    with self._lock:
+      return list(self._ops_by_type.get(op_type, ()))
+
+  def get_operations_on_device(self, device):
+    """Returns the operations that are assigned to the given device.
+
+    An operation matches if its `device` property is equal to `device`, so an
+    empty string returns the operations that have no assigned device. This
+    method uses an index of the operations, so its cost depends on the number
+    of matching operations rather than on the size of the graph.
+
+    This method may be called concurrently from multiple threads.
+
+    Args:
+      device: A device name string or `DeviceSpec`.
+
+    Returns:
+      A list of Operations, in the order in which they were created.
+    """
+    device = _device_string(device)
+    with self._lock:
+      device_ops = self._ops_by_device.get(device, {})
+      return [device_ops[op_id] for op_id in sorted(device_ops)]
+
+  def get_operations_in_name_scope(self, scope):
+    """Returns the operations in the given name scope.
+
+    The operations in name scope `"a/b"` are the operation named `"a/b"` (if
+    any) and all the operations whose name starts with `"a/b/"`. This method
+    uses an index of the operation names, so its cost depends on the number
+    of matching operations rather than on the size of the graph.
+
+    This method may be called concurrently from multiple threads.
+
+    Args:
+      scope: A name scope, with or without a trailing `/`. The empty string
+        denotes the root scope, which contains every operation.
+
+    Returns:
+      A list of Operations, in the order in which they were created.
+    """
+    if not scope:
+      return self.get_operations()
+    scope = _name_from_scope_name(scope)
+    with self._lock:
+      ops = self._op_name_index.lookup(scope + "/")
+      scope_op = self._nodes_by_name.get(scope)
+    if isinstance(scope_op, Operation):
+      ops.append(scope_op)
+      # pylint: disable=protected-access
+      ops.sort(key=lambda op: op._id)
+      # pylint: enable=protected-access
+    return ops
+
   def get_operation_by_name(self, name):
     """Returns the `Operation` with the given `name`.
 
@@ -2822,6 +3247,9 @@ class Graph(object):
         self._collections[name] = [value]
       else:
         self._collections[name].append(value)
+      index = self._collection_name_indexes.get(name)
+      if index is not None:
+        self._add_to_collection_name_index(index, value)
 
   def add_to_collections(self, names, value):
     """Stores `value` in the collections given by `names`.
@@ -2867,8 +3295,17 @@ class Graph(object):
       if coll_list is None:
         coll_list = []
         self._collections[name] = coll_list
+      # The caller may modify the list, which would invalidate its index.
+      self._unindexed_collections.add(name)
+      self._collection_name_indexes.pop(name, None)
       return coll_list
 
+  def _add_to_collection_name_index(self, index, value):
+    """Adds a collection `value` to `index`, if it has a string name."""
+    value_name = getattr(value, "name", None)
+    if isinstance(value_name, six.string_types):
+      index.add(value_name, value)
+
   def get_collection(self, name, scope=None):
     """Returns a list of values in the collection with the given `name`.
 
@@ -2883,7 +3320,8 @@ class Graph(object):
         to include only items whose `name` attribute matches `scope` using
         `re.match`. Items without a `name` attribute are never returned if a
         scope is supplied. The choice of `re.match` means that a `scope` without
-        special tokens filters by prefix.
+        special tokens filters by prefix; such lookups use an index of the item
+        names instead of matching every item.
 
     Returns:
       The list of values in the collection with the given `name`, or
@@ -2897,6 +3335,15 @@ class Graph(object):
         return []
       if scope is None:
         return list(coll_list)
+      elif (_is_literal_prefix(scope) and
+            name not in self._unindexed_collections):
+        index = self._collection_name_indexes.get(name)
+        if index is None:
+          index = _NamePrefixIndex()
+          for item in coll_list:
+            self._add_to_collection_name_index(index, item)
+          self._collection_name_indexes[name] = index
+        return index.lookup(scope)
       else:
         c = []
         regex = re.compile(scope)
@@ -2921,6 +3368,8 @@ class Graph(object):
     with self._lock:
       if name in self._collections:
         del self._collections[name]
+      self._collection_name_indexes.pop(name, None)
+      self._unindexed_collections.discard(name)
 
   @tf_contextlib.contextmanager
   def _original_op(self, op):
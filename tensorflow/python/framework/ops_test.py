@@ -45,6 +45,7 @@ from tensorflow.python.ops import variable_scope
 from tensorflow.python.ops import variables
 import tensorflow.python.ops.gradients  # pylint: disable=unused-import
 from tensorflow.python.platform import googletest
+from tensorflow.python.platform import test
 from tensorflow.python.util import compat
 
 ops._set_call_cpp_shape_fn(common_shapes.call_cpp_shape_fn)
@@ -951,6 +952,34 @@ class CollectionTest(test_util.TensorFlowTestCase):
     empty_coll_ref3 = g.get_collection_ref("empty")
     self.assertTrue(empty_coll_ref3 is empty_coll_ref)
 
+  def test_get_collection_scope_uses_index(self):
+    g = ops.Graph()
+    a = ObjectWithName("a/x")
+    ab = ObjectWithName("a/b/y")
+    abc = ObjectWithName("a/bc/z")
+    b = ObjectWithName("b/a")
+    for value in [a, 12, ab, abc, b]:
+      g.add_to_collection("key", value)
+    self.assertEqual([a, ab, abc], g.get_collection("key", "a"))
+    self.assertEqual([ab, abc], g.get_collection("key", "a/b"))
+    self.assertEqual([ab], g.get_collection("key", "a/b/"))
+    self.assertEqual([a, ab, abc, b], g.get_collection("key", ""))
+    self.assertEqual([], g.get_collection("key", "c"))
+    # Values added after the index was built are found too, in order.
+    ab2 = ObjectWithName("a/b/w")
+    g.add_to_collection("key", ab2)
+    self.assertEqual([ab, ab2], g.get_collection("key", "a/b/"))
+    # Regular expressions are still supported.
+    self.assertEqual([ab, abc, ab2], g.get_collection("key", "a/b.*/"))
+
+    # Modifications through get_collection_ref() are taken into account.
+    g.get_collection_ref("key").remove(ab)
+    self.assertEqual([abc, ab2], g.get_collection("key", "a/b"))
+    g.clear_collection("key")
+    self.assertEqual([], g.get_collection("key", "a"))
+    g.add_to_collection("key", ab)
+    self.assertEqual([ab], g.get_collection("key", "a"))
+
   def test_add_to_collections_uniquify(self):
     g = ops.Graph()
     g.add_to_collections([1, 2, 1], "key")
@@ -1350,6 +1379,153 @@ class GraphTest(test_util.TensorFlowTestCase):
     with self.assertRaises(TypeError):
       g.as_graph_element(NonConvertibleObj())
 
+  def testGetOperationsByType(self):
+    g = ops.Graph()
+    a = g.create_op("an_op", [], [dtypes.float32], name="a")
+    b = g.create_op("copy", [a.outputs[0]], [dtypes.float32], name="b")
+    c = g.create_op("an_op", [], [dtypes.float32], name="c")
+    self.assertEqual([a, c], g.get_operations_by_type("an_op"))
+    self.assertEqual([b], g.get_operations_by_type("copy"))
+    self.assertEqual([], g.get_operations_by_type("missing"))
+
+  def testGetOperationsOnDevice(self):
+    g = ops.Graph()
+    a = g.create_op("an_op", [], [dtypes.float32], name="a")
+    with g.device("/job:ps/task:0"):
+      b = g.create_op("an_op", [], [dtypes.float32], name="b")
+      c = g.create_op("an_op", [], [dtypes.float32], name="c")
+    self.assertEqual([a], g.get_operations_on_device(""))
+    self.assertEqual([b, c], g.get_operations_on_device("/job:ps/task:0"))
+    self.assertEqual(
+        [b, c],
+        g.get_operations_on_device(pydev.DeviceSpec(job="ps", task=0)))
+    # The index follows device changes.
+    b._set_device("/job:worker")
+    self.assertEqual([c], g.get_operations_on_device("/job:ps/task:0"))
+    self.assertEqual([b], g.get_operations_on_device("/job:worker"))
+
+  def testGetOperationsInNameScope(self):
+    g = ops.Graph()
+    with g.as_default():
+      with ops.name_scope("foo") as scope:
+        a = g.create_op("an_op", [], [dtypes.float32], name="a")
+        foo = g.create_op("an_op", [], [dtypes.float32], name=scope)
+        with ops.name_scope("bar"):
+          b = g.create_op("an_op", [], [dtypes.float32], name="b")
+      foobar = g.create_op("an_op", [], [dtypes.float32], name="foobar")
+    self.assertEqual([a, foo, b], g.get_operations_in_name_scope("foo"))
+    self.assertEqual([a, foo, b], g.get_operations_in_name_scope("foo/"))
+    self.assertEqual([b], g.get_operations_in_name_scope("foo/bar"))
+    self.assertEqual([], g.get_operations_in_name_scope("fo"))
+    self.assertEqual([foobar], g.get_operations_in_name_scope("foobar"))
+    self.assertEqual(g.get_operations(), g.get_operations_in_name_scope(""))
+
+  def testBulkConstructionDefersShapeInference(self):
+    g = ops.Graph()
+    with g.as_default():
+      with g.bulk_construction():
+        a = constant_op.constant([[1.0, 2.0]])
+        b = constant_op.constant([[3.0], [4.0]])
+        c = math_ops.matmul(a, b)
+        self.assertTrue(c.op._shape_inference_pending)
+        # Reading a shape runs the pending inference up to the op producing it.
+        self.assertEqual([1, 2], a.get_shape().as_list())
+        self.assertFalse(a.op._shape_inference_pending)
+        self.assertEqual([1, 1], c.get_shape().as_list())
+        d = math_ops.matmul(b, a)
+        self.assertTrue(d.op._shape_inference_pending)
+      self.assertFalse(d.op._shape_inference_pending)
+      self.assertEqual([2, 2], d.get_shape().as_list())
+      e = math_ops.matmul(a, b)
+      self.assertFalse(e.op._shape_inference_pending)
+
+  def testBulkConstructionStats(self):
+    g = ops.Graph()
+    with g.as_default():
+      with g.bulk_construction() as outer_stats:
+        a = constant_op.constant(1.0)
+        with g.bulk_construction() as inner_stats:
+          b = math_ops.add(a, a)
+        self.assertTrue(b.op._shape_inference_pending)
+      self.assertEqual([], b.get_shape().as_list())
+    self.assertEqual(1, inner_stats.num_ops)
+    self.assertEqual(2, outer_stats.num_ops)
+    self.assertEqual(
+        set(["naming", "node_def", "control_dependencies", "operation",
+             "shape_inference", "add_op", "device"]),
+        set(outer_stats.phase_times))
+    self.assertNotIn("shape_inference", inner_stats.phase_times)
+    self.assertAlmostEqual(sum(outer_stats.phase_times.values()),
+                           outer_stats.total_time)
+
+  def testBulkConstructionRaisesShapeErrorsOnExit(self):
+    g = ops.Graph()
+    with g.as_default():
+      a = constant_op.constant([[1.0, 2.0]])
+      with self.assertRaisesRegexp(ValueError, "must be equal"):
+        with g.bulk_construction():
+          math_ops.matmul(a, a)
+
+  def testBulkConstructionRequeuesOpsAfterShapeError(self):
+    g = ops.Graph()
+    with g.as_default():
+      a = constant_op.constant([[1.0, 2.0]])
+      with self.assertRaisesRegexp(ValueError, "must be equal"):
+        with g.bulk_construction():
+          math_ops.matmul(a, a)
+          b = math_ops.add(a, a)
+      self.assertTrue(b.op._shape_inference_pending)
+      self.assertEqual([1, 2], b.get_shape().as_list())
+
+  def testBulkConstructionBatchesShapeInference(self):
+    g = ops.Graph()
+    with g.as_default():
+      with test.mock.patch.object(
+          ops, "_call_cpp_shape_fn_batch",
+          wraps=common_shapes.call_cpp_shape_fn_batch) as batch_fn:
+        with g.bulk_construction():
+          a = constant_op.constant([[1.0, 2.0]])
+          b = constant_op.constant([[3.0], [4.0]])
+          c = math_ops.matmul(a, b)
+          d = math_ops.matmul(b, c)
+          e = math_ops.add(d, d)
+      self.assertEqual(1, batch_fn.call_count)
+      self.assertEqual([1, 1], c.get_shape().as_list())
+      self.assertEqual([2, 1], e.get_shape().as_list())
+
+  def testSetShapesForOutputsBatch(self):
+    g = ops.Graph()
+    with g.as_default():
+      a = constant_op.constant([[1.0, 2.0]])
+      b = constant_op.constant([[3.0], [4.0]])
+      c = math_ops.matmul(b, a)
+      # Reshape needs the value of its shape input, which ends the batch.
+      d = array_ops.reshape(c, [4])
+      e = math_ops.add(d, d)
+      f = math_ops.matmul(c, c)
+    op_list = [t.op for t in (a, b, c, d, e, f)]
+    expected = [t.get_shape().as_list() for t in (a, b, c, d, e, f)]
+    for op in op_list:
+      op.outputs[0]._shape = tensor_shape.unknown_shape()
+    with test.mock.patch.object(
+        ops, "_call_cpp_shape_fn_batch",
+        wraps=common_shapes.call_cpp_shape_fn_batch) as batch_fn:
+      ops.set_shapes_for_outputs_batch(op_list)
+    self.assertEqual(
+        expected, [op.outputs[0].get_shape().as_list() for op in op_list])
+    self.assertEqual(2, batch_fn.call_count)
+    self.assertEqual(op_list, batch_fn.call_args_list[0][0][0])
+    self.assertEqual(op_list[4:], batch_fn.call_args_list[1][0][0])
+
+  def testBulkConstructionAsGraphDefWithShapes(self):
+    g = ops.Graph()
+    with g.as_default():
+      with g.bulk_construction():
+        constant_op.constant([1.0, 2.0], name="a")
+        gd = g.as_graph_def(add_shapes=True)
+    self.assertProtoEquals(
+        "dim { size: 2 }", gd.node[0].attr["_output_shapes"].list.shape[0])
+
   # Regression test against creating custom __del__ functions in classes
   # involved in cyclic references, e.g. Graph and Operation. (Python won't gc
   # cycles that require calling a __del__ method, because the __del__ method can
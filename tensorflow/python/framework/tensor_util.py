@@ -48,12 +48,32 @@ def SlowAppendFloat16ArrayToTensorProto(tensor_proto, proto_values):
   tensor_proto.half_val.extend([
       ExtractBitsFromFloat16(x) for x in proto_values])
 
+
+def _AppendFloat16ArrayToTensorProto(tensor_proto, proto_values):
+  # half_val holds the raw bits of each fp16 value, so reinterpret the whole
+  # array as uint16 instead of extracting the bits one element at a time.
+  tensor_proto.half_val.extend(
+      np.asarray(proto_values, dtype=np.float16).view(np.uint16).tolist())
+
+
+def _AppendComplex64ArrayToTensorProto(tensor_proto, proto_values):
+  # A complex64 array viewed as float32 is the interleaved (real, imag)
+  # sequence that scomplex_val expects.
+  tensor_proto.scomplex_val.extend(
+      np.ascontiguousarray(proto_values).view(np.float32).tolist())
+
+
+def _AppendComplex128ArrayToTensorProto(tensor_proto, proto_values):
+  tensor_proto.dcomplex_val.extend(
+      np.ascontiguousarray(proto_values).view(np.float64).tolist())
+
+
 if _FAST_TENSOR_UTIL_AVAILABLE:
   _NP_TO_APPEND_FN = {
       # TODO(sesse): We should have a
       # fast_tensor_util.AppendFloat16ArrayToTensorProto,
       # but it seems np.float16_t doesn't exist?
-      np.float16: SlowAppendFloat16ArrayToTensorProto,
+      np.float16: _AppendFloat16ArrayToTensorProto,
       np.float32: fast_tensor_util.AppendFloat32ArrayToTensorProto,
       np.float64: fast_tensor_util.AppendFloat64ArrayToTensorProto,
       np.int32: fast_tensor_util.AppendInt32ArrayToTensorProto,
@@ -80,39 +100,31 @@ if _FAST_TENSOR_UTIL_AVAILABLE:
   }
 else:
 
+  # The pure Python fallbacks hand the whole array to NumPy with tolist(),
+  # which converts every element to a Python scalar in a single C loop.
   def SlowAppendFloat32ArrayToTensorProto(tensor_proto, proto_values):
-    tensor_proto.float_val.extend([np.asscalar(x) for x in proto_values])
+    tensor_proto.float_val.extend(proto_values.tolist())
 
   def SlowAppendFloat64ArrayToTensorProto(tensor_proto, proto_values):
-    tensor_proto.double_val.extend([np.asscalar(x) for x in proto_values])
+    tensor_proto.double_val.extend(proto_values.tolist())
 
   def SlowAppendIntArrayToTensorProto(tensor_proto, proto_values):
-    tensor_proto.int_val.extend([np.asscalar(x) for x in proto_values])
+    tensor_proto.int_val.extend(proto_values.tolist())
 
   def SlowAppendQIntArrayToTensorProto(tensor_proto, proto_values):
     tensor_proto.int_val.extend([np.asscalar(x[0]) for x in proto_values])
 
   def SlowAppendInt64ArrayToTensorProto(tensor_proto, proto_values):
-    tensor_proto.int64_val.extend([np.asscalar(x) for x in proto_values])
-
-  def SlowAppendComplex64ArrayToTensorProto(tensor_proto, proto_values):
-    tensor_proto.scomplex_val.extend([np.asscalar(v)
-                                      for x in proto_values
-                                      for v in [x.real, x.imag]])
-
-  def SlowAppendComplex128ArrayToTensorProto(tensor_proto, proto_values):
-    tensor_proto.dcomplex_val.extend([np.asscalar(v)
-                                      for x in proto_values
-                                      for v in [x.real, x.imag]])
+    tensor_proto.int64_val.extend(proto_values.tolist())
 
   def SlowAppendObjectArrayToTensorProto(tensor_proto, proto_values):
     tensor_proto.string_val.extend([compat.as_bytes(x) for x in proto_values])
 
   def SlowAppendBoolArrayToTensorProto(tensor_proto, proto_values):
-    tensor_proto.bool_val.extend([np.asscalar(x) for x in proto_values])
+    tensor_proto.bool_val.extend(proto_values.tolist())
 
   _NP_TO_APPEND_FN = {
-      np.float16: SlowAppendFloat16ArrayToTensorProto,
+      np.float16: _AppendFloat16ArrayToTensorProto,
       np.float32: SlowAppendFloat32ArrayToTensorProto,
       np.float64: SlowAppendFloat64ArrayToTensorProto,
       np.int32: SlowAppendIntArrayToTensorProto,
@@ -121,8 +133,8 @@ else:
       np.uint16: SlowAppendIntArrayToTensorProto,
       np.int8: SlowAppendIntArrayToTensorProto,
       np.int16: SlowAppendIntArrayToTensorProto,
-      np.complex64: SlowAppendComplex64ArrayToTensorProto,
-      np.complex128: SlowAppendComplex128ArrayToTensorProto,
+      np.complex64: _AppendComplex64ArrayToTensorProto,
+      np.complex128: _AppendComplex128ArrayToTensorProto,
       np.object: SlowAppendObjectArrayToTensorProto,
       np.bool: SlowAppendBoolArrayToTensorProto,
       dtypes.qint8.as_numpy_dtype: SlowAppendQIntArrayToTensorProto,
@@ -302,6 +314,58 @@ def _AssertCompatible(values, dtype):
                       (dtype.name, repr(mismatch), type(mismatch).__name__))
 
 
+def _NumpyKindsCompatibleWith(dtype):
+  """Returns the NumPy dtype kinds `_AssertCompatible` accepts for `dtype`.
+
+  A Python list that NumPy converts to an array of one of these kinds holds
+  only values that the element-wise `_Filter*` checks would accept, so it can
+  skip them. Returns None for dtypes that always take the element-wise path.
+  """
+  if dtype is None:
+    return "biufc"
+  if dtype.is_quantized:
+    return None
+  if dtype.is_integer:
+    return "iu"
+  if dtype.is_floating:
+    return "iuf"
+  if dtype.is_complex:
+    return "iufc"
+  return None
+
+
+def _BulkConvertToNumpy(values, dtype, np_dt):
+  """Converts nested lists of numbers to an ndarray, validating in bulk.
+
+  Args:
+    values: A Python scalar or (nested) list or tuple.
+    dtype: The requested `DType`, or None.
+    np_dt: The numpy dtype matching `dtype`, or None.
+
+  Returns:
+    An ndarray, or None if `values` must be validated element by element.
+  """
+  kinds = _NumpyKindsCompatibleWith(dtype)
+  if kinds is None:
+    return None
+  try:
+    nparray = np.array(values)
+  except (TypeError, ValueError):
+    return None
+  if nparray.dtype.kind not in kinds:
+    return None
+  if (np_dt is not None and nparray.size and nparray.dtype.kind in "iu" and
+      np.dtype(np_dt).kind in "iu"):
+    # `astype` wraps out-of-range integers silently (e.g. uint64 values into
+    # int64), so leave those to the element-wise conversion, which raises.
+    info = np.iinfo(np_dt)
+    if int(nparray.min()) < info.min or int(nparray.max()) > info.max:
+      return None
+  if np_dt is not None:
+    nparray = nparray.astype(np_dt, copy=False)
+  return nparray
+
+
 def make_tensor_proto(values, dtype=None, shape=None, verify_shape=False):
   """Create a TensorProto.
 
@@ -352,7 +416,7 @@ def make_tensor_proto(values, dtype=None, shape=None, verify_shape=False):
   # We first convert value to a numpy array or scalar.
   if isinstance(values, (np.ndarray, np.generic)):
     if dtype:
-      nparray = values.astype(dtype.as_numpy_dtype)
+      nparray = values.astype(dtype.as_numpy_dtype, copy=False)
     else:
       nparray = values
   elif callable(getattr(values, "__array__", None)):
@@ -373,8 +437,10 @@ def make_tensor_proto(values, dtype=None, shape=None, verify_shape=False):
     if shape is not None and np.prod(shape, dtype=np.int64) == 0:
       nparray = np.empty(shape, dtype=np_dt)
     else:
-      _AssertCompatible(values, dtype)
-      nparray = np.array(values, dtype=np_dt)
+      nparray = _BulkConvertToNumpy(values, dtype, np_dt)
+      if nparray is None:
+        _AssertCompatible(values, dtype)
+        nparray = np.array(values, dtype=np_dt)
       # check to them.
       # We need to pass in quantized values as tuples, so don't apply the shape
       if (list(nparray.shape) != _GetDenseDimensions(values) and
@@ -498,7 +564,10 @@ def MakeNdarray(tensor):
   dtype = tensor_dtype.as_numpy_dtype
 
   if tensor.tensor_content:
-    return np.fromstring(tensor.tensor_content, dtype=dtype).reshape(shape)
+    # frombuffer aliases the proto's bytes and is read-only; a single copy
+    # gives callers an array they own and may modify.
+    return np.frombuffer(tensor.tensor_content,
+                         dtype=dtype).copy().reshape(shape)
   elif tensor_dtype == dtypes.float16:
     # the half_val field of the TensorProto stores the binary representation
     # of the fp16: we need to reinterpret this as a proper float16
@@ -507,21 +576,23 @@ def MakeNdarray(tensor):
       tmp.dtype = np.float16
       return np.repeat(tmp, num_elements).reshape(shape)
     else:
-      tmp = np.fromiter(tensor.half_val, dtype=np.uint16)
-      tmp.dtype = np.float16
-      return tmp.reshape(shape)
+      tmp = np.fromiter(tensor.half_val, dtype=np.uint16,
+                        count=len(tensor.half_val))
+      return tmp.view(np.float16).reshape(shape)
   elif tensor_dtype == dtypes.float32:
     if len(tensor.float_val) == 1:
       return np.repeat(np.array(tensor.float_val[0], dtype=dtype),
                        num_elements).reshape(shape)
     else:
-      return np.fromiter(tensor.float_val, dtype=dtype).reshape(shape)
+      return np.fromiter(tensor.float_val, dtype=dtype,
+                         count=len(tensor.float_val)).reshape(shape)
   elif tensor_dtype == dtypes.float64:
     if len(tensor.double_val) == 1:
       return np.repeat(np.array(tensor.double_val[0], dtype=dtype),
                        num_elements).reshape(shape)
     else:
-      return np.fromiter(tensor.double_val, dtype=dtype).reshape(shape)
+      return np.fromiter(tensor.double_val, dtype=dtype,
+                         count=len(tensor.double_val)).reshape(shape)
   elif tensor_dtype in [dtypes.int32, dtypes.uint8, dtypes.uint16, dtypes.int16,
                         dtypes.int8, dtypes.qint32, dtypes.quint8, dtypes.qint8,
                         dtypes.qint16, dtypes.quint16, dtypes.bfloat16]:
@@ -529,13 +600,15 @@ def MakeNdarray(tensor):
       return np.repeat(np.array(tensor.int_val[0], dtype=dtype),
                        num_elements).reshape(shape)
     else:
-      return np.fromiter(tensor.int_val, dtype=dtype).reshape(shape)
+      return np.fromiter(tensor.int_val, dtype=dtype,
+                         count=len(tensor.int_val)).reshape(shape)
   elif tensor_dtype == dtypes.int64:
     if len(tensor.int64_val) == 1:
       return np.repeat(np.array(tensor.int64_val[0], dtype=dtype),
                        num_elements).reshape(shape)
     else:
-      return np.fromiter(tensor.int64_val, dtype=dtype).reshape(shape)
+      return np.fromiter(tensor.int64_val, dtype=dtype,
+                         count=len(tensor.int64_val)).reshape(shape)
   elif tensor_dtype == dtypes.string:
     if len(tensor.string_val) == 1:
       return np.repeat(np.array(tensor.string_val[0], dtype=dtype),
@@ -544,29 +617,32 @@ def MakeNdarray(tensor):
       return np.array([x for x in tensor.string_val],
                       dtype=dtype).reshape(shape)
   elif tensor_dtype == dtypes.complex64:
-    it = iter(tensor.scomplex_val)
     if len(tensor.scomplex_val) == 2:
       return np.repeat(np.array(complex(tensor.scomplex_val[0],
                                         tensor.scomplex_val[1]), dtype=dtype),
                        num_elements).reshape(shape)
     else:
-      return np.array([complex(x[0], x[1]) for x in zip(it, it)],
-                      dtype=dtype).reshape(shape)
+      # The interleaved (real, imag) values are the memory layout of a
+      # complex array, so reinterpret them instead of pairing them in Python.
+      tmp = np.fromiter(tensor.scomplex_val, dtype=np.float32,
+                        count=len(tensor.scomplex_val))
+      return tmp.view(dtype).reshape(shape)
   elif tensor_dtype == dtypes.complex128:
-    it = iter(tensor.dcomplex_val)
     if len(tensor.dcomplex_val) == 2:
       return np.repeat(np.array(complex(tensor.dcomplex_val[0],
                                         tensor.dcomplex_val[1]), dtype=dtype),
                        num_elements).reshape(shape)
     else:
-      return np.array([complex(x[0], x[1]) for x in zip(it, it)],
-                      dtype=dtype).reshape(shape)
+      tmp = np.fromiter(tensor.dcomplex_val, dtype=np.float64,
+                        count=len(tensor.dcomplex_val))
+      return tmp.view(dtype).reshape(shape)
   elif tensor_dtype == dtypes.bool:
     if len(tensor.bool_val) == 1:
       return np.repeat(np.array(tensor.bool_val[0], dtype=dtype),
                        num_elements).reshape(shape)
     else:
-      return np.fromiter(tensor.bool_val, dtype=dtype).reshape(shape)
+      return np.fromiter(tensor.bool_val, dtype=dtype,
+                         count=len(tensor.bool_val)).reshape(shape)
   else:
     raise TypeError("Unsupported tensor type: %s" % tensor.dtype)
 
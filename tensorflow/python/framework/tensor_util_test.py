@@ -215,6 +215,24 @@ class TensorUtilTest(test.TestCase):
     self.assertEquals(np.float16, a.dtype)
     self.assertAllClose(np.array([10.0, 20.0], dtype=np.float16), a)
 
+  def testHalfLarge(self):
+    values = np.linspace(-100.0, 100.0, 1000).astype(np.float16).reshape(
+        [10, 100])
+    t = tensor_util.make_tensor_proto(values)
+    self.assertEquals(1000, len(t.half_val))
+    self.assertAllEqual(values.ravel().view(np.uint16), t.half_val)
+    a = tensor_util.MakeNdarray(t)
+    self.assertEquals(np.float16, a.dtype)
+    self.assertAllEqual(values, a)
+
+  def testHalfNestedList(self):
+    t = tensor_util.make_tensor_proto([[10.0, 20.0], [30, 40]],
+                                      dtype=dtypes.float16)
+    a = tensor_util.MakeNdarray(t)
+    self.assertEquals(np.float16, a.dtype)
+    self.assertAllEqual(
+        np.array([[10.0, 20.0], [30.0, 40.0]], dtype=np.float16), a)
+
   def testInt(self):
     t = tensor_util.make_tensor_proto(10)
     self.assertProtoEquals("""
@@ -238,6 +256,14 @@ class TensorUtilTest(test.TestCase):
     self.assertEquals(np.int64, a.dtype)
     self.assertAllClose(np.array(value, dtype=np.int64), a)
 
+  def testUint64RangeIntToInt64(self):
+    # Lists whose values only fit in uint64 must not wrap around when
+    # converted in bulk.
+    with self.assertRaises((OverflowError, ValueError)):
+      tensor_util.make_tensor_proto([2**63], dtype=dtypes.int64)
+    with self.assertRaises((OverflowError, ValueError)):
+      tensor_util.make_tensor_proto([[1, 2**64 - 1]], dtype=dtypes.int64)
+
   def testLargeNegativeInt(self):
     # We don't use the min np.int64 value here
     # because it breaks np.abs().
@@ -533,6 +559,16 @@ class TensorUtilTest(test.TestCase):
     self.assertEquals(np.complex128, a.dtype)
     self.assertAllEqual(np.array(1 + 2j), a)
 
+  def testComplexLarge(self):
+    for dtype, np_dtype in [(dtypes.complex64, np.complex64),
+                            (dtypes.complex128, np.complex128)]:
+      values = (np.arange(200) + 1j * np.arange(200, 0, -1)).astype(
+          np_dtype).reshape([20, 10])
+      t = tensor_util.make_tensor_proto(values, dtype=dtype)
+      a = tensor_util.MakeNdarray(t)
+      self.assertEquals(np_dtype, a.dtype)
+      self.assertAllEqual(values, a)
+
   def testComplexWithImplicitRepeat(self):
     for dtype, np_dtype in [(dtypes.complex64, np.complex64),
                             (dtypes.complex128, np.complex128)]:
@@ -650,6 +686,25 @@ class TensorUtilTest(test.TestCase):
     with self.assertRaises(ValueError):
       tensor_util.make_tensor_proto(np.array([1, 2]), shape=[1])
 
+  def testIncompatibleNestedListValues(self):
+    with self.assertRaisesRegexp(TypeError, "Expected int32"):
+      tensor_util.make_tensor_proto([[1, 2], [3.5, 4]], dtype=dtypes.int32)
+    with self.assertRaisesRegexp(TypeError, "Expected float32"):
+      tensor_util.make_tensor_proto([[1.0, 2.0], ["a", 4.0]],
+                                    dtype=dtypes.float32)
+    with self.assertRaisesRegexp(TypeError, "Expected float32"):
+      tensor_util.make_tensor_proto([1 + 2j], dtype=dtypes.float32)
+    with self.assertRaises(ValueError):
+      tensor_util.make_tensor_proto([[1, 2], [3]], dtype=dtypes.int32)
+
+  def testMakeNdarrayReturnsWritableArray(self):
+    t = tensor_util.make_tensor_proto(np.arange(6, dtype=np.float32))
+    a = tensor_util.MakeNdarray(t)
+    a[0] = 10.0
+    self.assertAllEqual([10.0, 1.0, 2.0, 3.0, 4.0, 5.0], a)
+    self.assertAllEqual(np.arange(6, dtype=np.float32),
+                        tensor_util.MakeNdarray(t))
+
   def testLowRankSupported(self):
     t = tensor_util.make_tensor_proto(np.array(7))
     self.assertProtoEquals("""
@@ -67,6 +67,7 @@ class IndexedSlicesConditionalAccumulatorTest(test.TestCase):
       attr { key: 'shape' value { shape { unknown_rank: true} } }
       attr { key: 'container' value { s: '' } }
       attr { key: 'shared_name' value { s: '' } }
+      attr { key: 'reduction_type' value { s: 'MEAN' } }
       """, q.accumulator_ref.op.node_def)
 
   def testConstructorWithShape(self):
@@ -86,6 +87,7 @@ class IndexedSlicesConditionalAccumulatorTest(test.TestCase):
       } } }
       attr { key: 'container' value { s: '' } }
       attr { key: 'shared_name' value { s: '' } }
+      attr { key: 'reduction_type' value { s: 'MEAN' } }
       """, q.accumulator_ref.op.node_def)
 
   def testAccumulatorSizeEmpty(self):
@@ -184,6 +186,20 @@ class IndexedSlicesConditionalAccumulatorTest(test.TestCase):
       self.assertAllEqual(val.values, [[0.5, 0.5], [0, 2], [3, 0]])
       self.assertAllEqual(val.dense_shape, [-1, 2])
 
+  def testAccumulatorTakeGradSum(self):
+    with self.test_session() as sess:
+      q = data_flow_ops.SparseConditionalAccumulator(
+          dtypes_lib.float32, name="Q", shape=(), reduction_type="SUM")
+
+      q.apply_grad([0, 1],
+                   np.array([[1, 0], [0, 2]]).astype(np.float32)).run()
+      q.apply_grad([0, 2],
+                   np.array([[0, 1], [3, 0]]).astype(np.float32)).run()
+
+      val = sess.run(q.take_indexed_slices_grad(1))
+      self.assertAllEqual(val.indices, [0, 1, 2])
+      self.assertAllEqual(val.values, [[1, 1], [0, 2], [3, 0]])
+
   def testAccumulatorRepeatedTakeGrad(self):
     with self.test_session() as sess:
       q = data_flow_ops.SparseConditionalAccumulator(
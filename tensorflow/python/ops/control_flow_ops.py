@@ -2361,7 +2361,10 @@ class WhileContext(ControlFlowContext):
         zeros_shape = array_ops.shape_internal(value, optimize=False)
         acc = array_ops.zeros(zeros_shape, grad.dtype)
         if self.outer_context: self.outer_context.Exit()
-      acc._shape = grad.get_shape()  # pylint: disable=protected-access
+      # pylint: disable=protected-access
+      acc._ensure_shape_inferred()
+      acc._shape = grad.get_shape()
+      # pylint: enable=protected-access
 
     self.Enter()
     self.AddName(acc.name)
@@ -3110,7 +3113,10 @@ def case(pred_fn_pairs, default, exclusive=False, strict=False, name="case"):
         else:
           temp_shape = [1 if x.value is None else x.value for x in shape]
           result = array_ops.constant(value, shape=temp_shape, dtype=dtype)
-          result._shape = shape  # pylint: disable=protected-access
+          # pylint: disable=protected-access
+          result._ensure_shape_inferred()
+          result._shape = shape
+          # pylint: enable=protected-access
           return result
 
       def _correct_empty(v):
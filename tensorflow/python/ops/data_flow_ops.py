@@ -1207,15 +1207,19 @@ class SparseConditionalAccumulator(ConditionalAccumulatorBase):
     shared_name: Optional. If non-empty, this accumulator will be shared under
       the given name across multiple sessions.
     name: Optional name for the accumulator.
+    reduction_type: Optional. "MEAN" (the default) extracts the average of the
+      values applied at each index, "SUM" their sum.
   """
 
   def __init__(self,
                dtype,
                shape=None,
                shared_name=None,
-               name="sparse_conditional_accumulator"):
+               name="sparse_conditional_accumulator",
+               reduction_type="MEAN"):
     accumulator_ref = gen_data_flow_ops.sparse_conditional_accumulator(
-        dtype=dtype, shape=shape, shared_name=shared_name, name=name)
+        dtype=dtype, shape=shape, shared_name=shared_name, name=name,
+        reduction_type=reduction_type)
     super(SparseConditionalAccumulator,
           self).__init__(dtype, shape, accumulator_ref)
 
@@ -20,6 +20,7 @@ from __future__ import print_function
 
 # pylint: disable=unused-import
 from tensorflow.python.ops.gradients_impl import AggregationMethod
+from tensorflow.python.ops.gradients_impl import GradientBuilder
 from tensorflow.python.ops.gradients_impl import gradients
 from tensorflow.python.ops.gradients_impl import hessians
 # pylint: enable=unused-import
@@ -28,6 +29,7 @@ from tensorflow.python.util.all_util import remove_undocumented
 _allowed_symbols = [
     # TODO(drpng): find a good place to reference this.
     "AggregationMethod",
+    "GradientBuilder",
     "gradients",  # tf.gradients.gradients.
     "hessians",  # tf.gradients.hessians
 ]
@@ -166,7 +166,25 @@ def _PendingCount(graph, to_ops, from_ops, colocate_gradients_with_ops):
   for op in to_ops:
     reached_ops[op._id] = True
   _MarkReachedOps(from_ops, reached_ops)
+  return _PendingCountFromReachedOps(graph, to_ops, reached_ops,
+                                     colocate_gradients_with_ops)
 
+
+def _PendingCountFromReachedOps(graph, to_ops, reached_ops,
+                                colocate_gradients_with_ops):
+  """Initialize the pending count given the ops reached from the from_ops.
+
+  Args:
+    graph: a Graph.
+    to_ops: list of Operations.
+    reached_ops: list of booleans, indexed by operation id, that is True for
+      the `to_ops` and the operations reached from the from_ops. It is
+      modified by this function.
+    colocate_gradients_with_ops: Python bool.  See docstring of gradients().
+
+  Returns:
+    The same tuple as `_PendingCount()`.
+  """
   # Mark between ops.
   between_ops = [False] * (graph._last_id + 1)
   between_op_list = []
@@ -201,7 +219,7 @@ def _AsList(x):
   return x if isinstance(x, (list, tuple)) else [x]
 
 
-def _DefaultGradYs(grad_ys, ys, colocate_gradients_with_ops):
+def _DefaultGradYs(grad_ys, ys, colocate_gradients_with_ops, builder=None):
   """Fill in default values for grad_ys.
 
   Args:
@@ -209,6 +227,8 @@ def _DefaultGradYs(grad_ys, ys, colocate_gradients_with_ops):
     ys: List of tensors.
     colocate_gradients_with_ops: If True, try colocating gradients with
       the corresponding op.
+    builder: (Optional.) A `GradientBuilder` that reuses the default gradient
+      it built for the same y in an earlier call.
 
   Returns:
     A list of gradients to use, without None.
@@ -228,6 +248,9 @@ def _DefaultGradYs(grad_ys, ys, colocate_gradients_with_ops):
         raise TypeError(
             "Gradients of complex tensors must set grad_ys (y.dtype = %r)" %
             y.dtype)
+      if builder is not None:
+        grad_ys[i] = builder._DefaultGradY(y)  # pylint: disable=protected-access
+        continue
       with _maybe_colocate_with(y.op, colocate_gradients_with_ops):
         grad_ys[i] = array_ops.fill(
             array_ops.shape(y), constant_op.constant(
@@ -414,8 +437,33 @@ def gradients(ys,
     ValueError: if the arguments are invalid.
 
   """
+  return _GradientsHelper(ys, xs, grad_ys, name, colocate_gradients_with_ops,
+                          gate_gradients, aggregation_method)
+
+
+def _GradientsHelper(ys, xs, grad_ys, name, colocate_gradients_with_ops,
+                     gate_gradients, aggregation_method, builder=None):
+  """Implementation of `gradients()` and `GradientBuilder.gradients()`.
+
+  Args:
+    ys: See `gradients()`.
+    xs: See `gradients()`. Ignored if `builder` is set.
+    grad_ys: See `gradients()`.
+    name: See `gradients()`.
+    colocate_gradients_with_ops: See `gradients()`.
+    gate_gradients: See `gradients()`.
+    aggregation_method: See `gradients()`.
+    builder: (Optional.) A `GradientBuilder` whose cached reachability,
+      gradient functions and previously built gradients are reused.
+
+  Returns:
+    A list of `sum(dy/dx)` for each x in `xs`.
+  """
   ys = _AsList(ys)
-  xs = _AsList(xs)
+  if builder is None:
+    xs = _AsList(xs)
+  else:
+    xs = list(builder._xs)  # pylint: disable=protected-access
   if grad_ys is None:
     grad_ys = [None] * len(ys)
   else:
@@ -423,12 +471,14 @@ def gradients(ys,
 
   with ops.name_scope(name, "gradients", ys + xs + grad_ys) as grad_scope:
     ys = ops.convert_n_to_tensor_or_indexed_slices(ys, name="y")
-    xs = [x.handle if isinstance(x, resource_variable_ops.ResourceVariable)
-          else x
-          for x in xs]
-    xs = ops.internal_convert_n_to_tensor_or_indexed_slices(xs, name="x",
-                                                            as_ref=True)
-    grad_ys = _DefaultGradYs(grad_ys, ys, colocate_gradients_with_ops)
+    if builder is None:
+      xs = [x.handle if isinstance(x, resource_variable_ops.ResourceVariable)
+            else x
+            for x in xs]
+      xs = ops.internal_convert_n_to_tensor_or_indexed_slices(xs, name="x",
+                                                              as_ref=True)
+    grad_ys = _DefaultGradYs(grad_ys, ys, colocate_gradients_with_ops,
+                             builder=builder)
 
     # The approach we take here is as follows: Create a list of all ops in the
     # subgraph between the ys and xs.  Visit these ops in reverse order of ids
@@ -443,9 +493,14 @@ def gradients(ys,
       ys = [array_ops.identity(y) if y.consumers() else y for y in ys]
     to_ops = [t.op for t in ys]
     from_ops = [t.op for t in xs]
-    pending_count, loop_state = _PendingCount(ops.get_default_graph(), to_ops,
-                                              from_ops,
-                                              colocate_gradients_with_ops)
+    if builder is None:
+      pending_count, loop_state = _PendingCount(ops.get_default_graph(),
+                                                to_ops, from_ops,
+                                                colocate_gradients_with_ops)
+    else:
+      # pylint: disable=protected-access
+      pending_count, loop_state = builder._PendingCount(to_ops)
+      # pylint: enable=protected-access
 
     # Iterate over the collected ops.
     #
@@ -489,7 +544,8 @@ def gradients(ys,
       with _maybe_colocate_with(op, colocate_gradients_with_ops):
         if loop_state:
           loop_state.EnterGradWhileContext(op, before=True)
-        out_grads = _AggregatedGrads(grads, op, loop_state, aggregation_method)
+        out_grads = _AggregatedGrads(grads, op, loop_state, aggregation_method,
+                                     builder=builder)
         if loop_state:
           loop_state.ExitGradWhileContext(op, before=True)
 
@@ -507,7 +563,10 @@ def gradients(ys,
             # A grad_fn must be defined, either as a function or as None
             # for ops that do not have gradients.
             try:
-              grad_fn = ops.get_gradient_function(op)
+              if builder is None:
+                grad_fn = ops.get_gradient_function(op)
+              else:
+                grad_fn = builder._GradientFunction(op)
             except LookupError:
               raise LookupError(
                   "No gradient defined for operation '%s' (op type: %s)" %
@@ -525,30 +584,47 @@ def gradients(ys,
               # functions should ignore the gradient for other outputs.
               # TODO(apassos) gradients of resource handles might be an
               # issue here because of zeros.
+              # pylint: disable=protected-access
               if loop_state:
                 out_grads[i] = loop_state.ZerosLike(op, i)
+              elif builder is not None:
+                out_grads[i] = builder._ZerosLikeOutsideLoop(op, i)
               else:
                 out_grads[i] = control_flow_ops.ZerosLikeOutsideLoop(op, i)
-          with ops.name_scope(op.name + "_grad"):
-            # pylint: disable=protected-access
-            with ops.get_default_graph()._original_op(op):
               # pylint: enable=protected-access
-              if grad_fn:
-                # If grad_fn was found, do not use SymbolicGradient even for
-                # functions.
-                in_grads = _MaybeCompile(
-                    grad_scope, op, func_call, lambda: grad_fn(op, *out_grads))
-              else:
-                # For function call ops, we add a 'SymbolicGradient'
-                # node to the graph to compute gradients.
-                in_grads = _MaybeCompile(
-                    grad_scope, op, func_call, lambda: _SymGrad(op, out_grads))
-              in_grads = _AsList(in_grads)
-              _VerifyGeneratedGradients(in_grads, op)
-              if gate_gradients and len(
-                  [x for x in in_grads if x is not None]) > 1:
-                in_grads = control_flow_ops.tuple(in_grads)
-          _LogOpGradients(op, out_grads, in_grads)
+          # Output gradients seen by an earlier call of the same builder get
+          # the input gradients built then.
+          # pylint: disable=protected-access
+          memoize = builder is not None and not loop_state
+          in_grads = builder._LookupInGrads(op, out_grads) if memoize else None
+          # pylint: enable=protected-access
+          if in_grads is None:
+            with ops.name_scope(op.name + "_grad"):
+              # pylint: disable=protected-access
+              with ops.get_default_graph()._original_op(op):
+                # pylint: enable=protected-access
+                if grad_fn:
+                  # If grad_fn was found, do not use SymbolicGradient even for
+                  # functions.
+                  in_grads = _MaybeCompile(
+                      grad_scope, op, func_call,
+                      lambda: grad_fn(op, *out_grads))
+                else:
+                  # For function call ops, we add a 'SymbolicGradient'
+                  # node to the graph to compute gradients.
+                  in_grads = _MaybeCompile(
+                      grad_scope, op, func_call,
+                      lambda: _SymGrad(op, out_grads))
+                in_grads = _AsList(in_grads)
+                _VerifyGeneratedGradients(in_grads, op)
+                if gate_gradients and len(
+                    [x for x in in_grads if x is not None]) > 1:
+                  in_grads = control_flow_ops.tuple(in_grads)
+            _LogOpGradients(op, out_grads, in_grads)
+            if memoize:
+              # pylint: disable=protected-access
+              builder._StoreInGrads(op, out_grads, in_grads)
+              # pylint: enable=protected-access
         else:
           # If no grad_fn is defined or none of out_grads is available,
           # just propagate a list of None backwards.
@@ -570,6 +646,185 @@ def gradients(ys,
   return [_GetGrad(grads, x) for x in xs]
 
 
+class GradientBuilder(object):
+  """Builds the gradients of many targets with respect to the same tensors.
+
+  Every call of `tf.gradients(ys, xs)` walks the forward graph downstream of
+  `xs` to find the ops to differentiate. When gradients of several targets
+  are needed with respect to the same `xs`, e.g. per-tower or auxiliary
+  losses, or repeated Hessian-vector products, a `GradientBuilder` does that
+  walk once and only extends it over the ops added to the graph since its
+  previous call. It also caches the gradient function of each op, and when
+  an op receives exactly the same output gradients as in an earlier call, it
+  reuses the gradient ops built then instead of building a duplicate
+  subgraph:
+
+  ```python
+  builder = tf.GradientBuilder(tf.trainable_variables())
+  main_grads = builder.gradients(main_loss)
+  aux_grads = builder.gradients(aux_loss)
+  ```
+
+  Gradient ops are only reused if they would be created under the same
+  device functions, colocation, control dependencies and control flow
+  context, and are never reused inside while loops.
+  """
+
+  def __init__(self, xs, name="gradients", colocate_gradients_with_ops=False,
+               gate_gradients=False, aggregation_method=None):
+    """Creates a `GradientBuilder`.
+
+    Args:
+      xs: A `Tensor` or list of tensors to be used for differentiation.
+      name: Optional name to use for grouping all the gradient ops together.
+        defaults to 'gradients'.
+      colocate_gradients_with_ops: If True, try colocating gradients with
+        the corresponding op.
+      gate_gradients: If True, add a tuple around the gradients returned
+        for an operations.  This avoids some race conditions.
+      aggregation_method: Specifies the method used to combine gradient terms.
+        Accepted values are constants defined in the class `AggregationMethod`.
+    """
+    xs = _AsList(xs)
+    with ops.name_scope(name, "gradients", xs):
+      xs = [x.handle if isinstance(x, resource_variable_ops.ResourceVariable)
+            else x
+            for x in xs]
+      self._xs = ops.internal_convert_n_to_tensor_or_indexed_slices(
+          xs, name="x", as_ref=True)
+      self._graph = ops.get_default_graph()
+    self._name = name
+    self._colocate_gradients_with_ops = colocate_gradients_with_ops
+    self._gate_gradients = gate_gradients
+    self._aggregation_method = aggregation_method
+    # Indexed by operation id: True for the ops reached from the xs. Built on
+    # the first call and extended to newer ops on the following ones.
+    self._reached_ops = None
+    # Maps operation ids to their gradient functions.
+    self._grad_fns = {}
+    # Gradient ops built by earlier calls, keyed by what they were built from
+    # and by `_ConstructionContext()`.
+    self._default_grad_ys = {}
+    self._zeros = {}
+    self._aggregated_grads = {}
+    self._in_grads = {}
+
+  @property
+  def xs(self):
+    """The tensors with respect to which gradients are built."""
+    return list(self._xs)
+
+  def gradients(self, ys, grad_ys=None):
+    """Constructs symbolic partial derivatives of sum of `ys` w.r.t. `xs`.
+
+    Args:
+      ys: A `Tensor` or list of tensors to be differentiated.
+      grad_ys: Optional. A `Tensor` or list of tensors the same size as
+        `ys` and holding the gradients computed for each y in `ys`.
+
+    Returns:
+      A list of `sum(dy/dx)` for each x in `xs`.
+
+    Raises:
+      LookupError: if one of the operations between `x` and `y` does not
+        have a registered gradient function.
+      ValueError: if the arguments are invalid.
+    """
+    return _GradientsHelper(ys, None, grad_ys, self._name,
+                            self._colocate_gradients_with_ops,
+                            self._gate_gradients, self._aggregation_method,
+                            builder=self)
+
+  # pylint: disable=protected-access
+  def _ReachedOps(self):
+    """Returns a new list marking the ops reached from the xs."""
+    graph = self._graph
+    if self._reached_ops is None:
+      self._reached_ops = [False] * (graph._last_id + 1)
+      _MarkReachedOps([x.op for x in self._xs], self._reached_ops)
+    reached_ops = self._reached_ops
+    first_new_id = len(reached_ops)
+    if graph._last_id >= first_new_id:
+      reached_ops.extend([False] * (graph._last_id + 1 - first_new_id))
+      # An op added since the last call is reached iff one of its inputs is.
+      # Marking from it also covers older ops that it feeds, like the Merge
+      # of a while loop.
+      for op_id in xrange(first_new_id, graph._last_id + 1):
+        op = graph._nodes_by_id.get(op_id)
+        if (op is not None and not reached_ops[op_id] and
+            any(reached_ops[t.op._id] for t in op.inputs)):
+          _MarkReachedOps([op], reached_ops)
+    return list(reached_ops)
+
+  def _PendingCount(self, to_ops):
+    """Returns the result of `_PendingCount()` for `to_ops` and the xs."""
+    from_ops = [x.op for x in self._xs]
+    if any(op._get_control_flow_context() is not None for op in to_ops):
+      # `_PendingCount()` stops walking from the xs at the to_ops, which only
+      # makes a difference when a to_op lies on a cycle. Cycles exist only in
+      # while loops, so take the uncached path for targets in control flow.
+      return _PendingCount(self._graph, to_ops, from_ops,
+                           self._colocate_gradients_with_ops)
+    reached_ops = self._ReachedOps()
+    for op in to_ops:
+      reached_ops[op._id] = True
+    return _PendingCountFromReachedOps(self._graph, to_ops, reached_ops,
+                                       self._colocate_gradients_with_ops)
+
+  def _GradientFunction(self, op):
+    grad_fn = self._grad_fns.get(op._id, self._grad_fns)
+    if grad_fn is self._grad_fns:
+      grad_fn = ops.get_gradient_function(op)
+      self._grad_fns[op._id] = grad_fn
+    return grad_fn
+
+  def _ConstructionContext(self):
+    """Returns a key for the graph state that affects newly created ops."""
+    graph = self._graph
+    return (tuple(graph._device_function_stack),
+            tuple(graph._colocation_stack),
+            tuple(graph._control_dependencies_stack),
+            graph._get_control_flow_context())
+  # pylint: enable=protected-access
+
+  def _DefaultGradY(self, y):
+    key = (y, self._ConstructionContext())
+    grad_y = self._default_grad_ys.get(key)
+    if grad_y is None:
+      with _maybe_colocate_with(y.op, self._colocate_gradients_with_ops):
+        grad_y = array_ops.fill(
+            array_ops.shape(y), constant_op.constant(1, dtype=y.dtype))
+      self._default_grad_ys[key] = grad_y
+    return grad_y
+
+  def _ZerosLikeOutsideLoop(self, op, index):
+    key = (op, index, self._ConstructionContext())
+    zeros = self._zeros.get(key)
+    if zeros is None:
+      zeros = control_flow_ops.ZerosLikeOutsideLoop(op, index)
+      self._zeros[key] = zeros
+    return zeros
+
+  def _LookupAggregatedGrads(self, op, out_grads):
+    key = (op, tuple(tuple(g) for g in out_grads), self._ConstructionContext())
+    return self._aggregated_grads.get(key)
+
+  def _StoreAggregatedGrads(self, op, out_grads, aggregated):
+    # Only sums of several gradients create ops that are worth reusing.
+    if any(len(g) > 1 for g in out_grads):
+      key = (op, tuple(tuple(g) for g in out_grads),
+             self._ConstructionContext())
+      self._aggregated_grads[key] = list(aggregated)
+
+  def _LookupInGrads(self, op, out_grads):
+    key = (op, tuple(out_grads), self._ConstructionContext())
+    return self._in_grads.get(key)
+
+  def _StoreInGrads(self, op, out_grads, in_grads):
+    key = (op, tuple(out_grads), self._ConstructionContext())
+    self._in_grads[key] = in_grads
+
+
 def _HasAnyNotNoneGrads(grads, op):
   """Return true iff op has real gradient."""
   out_grads = _GetGrads(grads, op)
@@ -739,7 +994,8 @@ class AggregationMethod(object):
   EXPERIMENTAL_ACCUMULATE_N = 2
 
 
-def _AggregatedGrads(grads, op, loop_state, aggregation_method=None):
+def _AggregatedGrads(grads, op, loop_state, aggregation_method=None,
+                     builder=None):
   """Get the aggregated gradients for op.
 
   Args:
@@ -750,6 +1006,8 @@ def _AggregatedGrads(grads, op, loop_state, aggregation_method=None):
                 contains no while loops.
     aggregation_method: Specifies the method used to combine gradient terms.
       Accepted values are constants defined in the class `AggregationMethod`.
+    builder: (Optional.) A `GradientBuilder` that reuses the sums it built
+      for the same gradients in an earlier call.
 
   Returns:
     A list of gradients, one per each output of `op`. If the gradients
@@ -770,6 +1028,14 @@ def _AggregatedGrads(grads, op, loop_state, aggregation_method=None):
     raise ValueError("Invalid aggregation_method specified %s." %
                      aggregation_method)
   out_grads = _GetGrads(grads, op)
+  if builder is not None and not loop_state:
+    # pylint: disable=protected-access
+    aggregated = builder._LookupAggregatedGrads(op, out_grads)
+    if aggregated is not None:
+      out_grads[:] = aggregated
+      return out_grads
+    unaggregated = list(out_grads)
+    # pylint: enable=protected-access
   for i, out_grad in enumerate(out_grads):
     if loop_state:
       if isinstance(out_grad, (ops.Tensor, ops.IndexedSlices)):
@@ -836,6 +1102,10 @@ def _AggregatedGrads(grads, op, loop_state, aggregation_method=None):
     else:  # not out_grad
       # out_grads[i] is [], thus its aggregation is simply None.
       out_grads[i] = None
+  if builder is not None and not loop_state:
+    # pylint: disable=protected-access
+    builder._StoreAggregatedGrads(op, unaggregated, out_grads)
+    # pylint: enable=protected-access
   return out_grads
 
 
@@ -350,6 +350,73 @@ class GradientsTest(test_util.TensorFlowTestCase):
       self.assertAllClose(17502.0, g[0].eval())
 
 
+class GradientBuilderTest(test_util.TensorFlowTestCase):
+
+  def testMatchesGradients(self):
+    with self.test_session():
+      x = constant_op.constant([1.0, 2.0])
+      w = constant_op.constant([3.0, 4.0])
+      y = math_ops.reduce_sum(math_ops.square(x) * w)
+      z = math_ops.reduce_sum(x * w + w)
+      builder = gradients.GradientBuilder([x, w])
+      self.assertEqual([x, w], builder.xs)
+      for target in [y, z, [y, z]]:
+        expected = gradients.gradients(target, [x, w])
+        actual = builder.gradients(target)
+        self.assertEqual(len(expected), len(actual))
+        for e, a in zip(expected, actual):
+          self.assertAllClose(e.eval(), a.eval())
+
+  def testReusesGradientOps(self):
+    with ops.Graph().as_default() as g:
+      inp = constant(1.0, shape=[32, 100], name="in")
+      w = constant(1.0, shape=[100, 10], name="w")
+      h = math_ops.tanh(math_ops.matmul(inp, w))
+      loss = math_ops.reduce_sum(h)
+      builder = gradients.GradientBuilder([w])
+      w_grad = builder.gradients(loss)[0]
+      num_ops = len(g.get_operations())
+      self.assertIs(w_grad, builder.gradients(loss)[0])
+      self.assertEqual(num_ops, len(g.get_operations()))
+      # A different target only needs gradient ops for the ops it does not
+      # share with the first one.
+      aux_loss = math_ops.reduce_sum(h, name="aux_loss")
+      aux_grad = builder.gradients([loss, aux_loss])[0]
+      self.assertIsNot(w_grad, aux_grad)
+
+  def testDoesNotReuseAcrossDevices(self):
+    with ops.Graph().as_default():
+      x = constant(1.0, shape=[10])
+      loss = math_ops.reduce_sum(math_ops.square(x))
+      builder = gradients.GradientBuilder([x])
+      with ops.device("/cpu:0"):
+        cpu_grad = builder.gradients(loss)[0]
+      with ops.device("/gpu:0"):
+        gpu_grad = builder.gradients(loss)[0]
+      self.assertIsNot(cpu_grad, gpu_grad)
+      self.assertDeviceEqual("/device:GPU:0", gpu_grad.device)
+
+  def testOpsAddedAfterFirstCall(self):
+    with self.test_session():
+      x = constant_op.constant(3.0)
+      y = math_ops.square(x)
+      builder = gradients.GradientBuilder(x)
+      self.assertAllClose(6.0, builder.gradients(y)[0].eval())
+      y2 = math_ops.square(y) + x
+      self.assertAllClose(109.0, builder.gradients(y2)[0].eval())
+      self.assertIsNone(
+          builder.gradients(constant_op.constant(1.0) * 2.0)[0])
+
+  def testWhileLoop(self):
+    with self.test_session():
+      x = constant_op.constant(2.0)
+      builder = gradients.GradientBuilder(x)
+      r = control_flow_ops.while_loop(
+          lambda i, v: i < 3, lambda i, v: (i + 1, v * x), [0, x])[1]
+      self.assertAllClose(32.0, builder.gradients(r)[0].eval())
+      self.assertAllClose(32.0, builder.gradients(r)[0].eval())
+
+
 class FunctionGradientsTest(test_util.TensorFlowTestCase):
 
   @classmethod
@@ -213,6 +213,7 @@ _allowed_symbols_gradients = [
     # Documented in training.py:
     # Not importing training.py to avoid complex graph dependencies.
     "AggregationMethod",
+    "GradientBuilder",
     "gradients",  # tf.gradients = gradients.gradients
     "hessians",
 ]
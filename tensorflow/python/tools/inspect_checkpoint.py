@@ -35,7 +35,9 @@ def print_tensors_in_checkpoint_file(file_name, tensor_name, all_tensors):
   If no `tensor_name` is provided, prints the tensor names and shapes
   in the checkpoint file.
 
-  If `tensor_name` is provided, prints the content of the tensor.
+  If `tensor_name` is provided, prints the content of the tensor. Tensors are
+  memory-mapped where possible, so that only the part of a large tensor that
+  is printed is read.
 
   Args:
     file_name: Name of the checkpoint file.
@@ -48,12 +50,12 @@ def print_tensors_in_checkpoint_file(file_name, tensor_name, all_tensors):
       var_to_shape_map = reader.get_variable_to_shape_map()
       for key in sorted(var_to_shape_map):
         print("tensor_name: ", key)
-        print(reader.get_tensor(key))
+        print(reader.get_tensor_view(key))
     elif not tensor_name:
       print(reader.debug_string().decode("utf-8"))
     else:
       print("tensor_name: ", tensor_name)
-      print(reader.get_tensor(tensor_name))
+      print(reader.get_tensor_view(tensor_name))
   except Exception as e:  # pylint: disable=broad-except
     print(str(e))
     if "corrupted compressed block contents" in str(e):
@@ -34,7 +34,7 @@ class AdagradOptimizer(optimizer.Optimizer):
   """
 
   def __init__(self, learning_rate, initial_accumulator_value=0.1,
-               use_locking=False, name="Adagrad"):
+               use_locking=False, name="Adagrad", fused=False):
     """Construct a new Adagrad optimizer.
 
     Args:
@@ -44,6 +44,10 @@ class AdagradOptimizer(optimizer.Optimizer):
       use_locking: If `True` use locks for update operations.
       name: Optional name prefix for the operations created when applying
         gradients.  Defaults to "Adagrad".
+      fused: If `True`, dense gradients of (non-resource) variables are applied
+        with a single op for each group of variables that share a dtype and a
+        device, instead of one op per variable. The slots are the same either
+        way, so checkpoints can be shared with `fused=False`.
 
     Raises:
       ValueError: If the `initial_accumulator_value` is invalid.
@@ -52,6 +56,7 @@ class AdagradOptimizer(optimizer.Optimizer):
       raise ValueError("initial_accumulator_value must be positive: %s" %
                        initial_accumulator_value)
     super(AdagradOptimizer, self).__init__(use_locking, name)
+    self._fused = fused
     self._learning_rate = learning_rate
     self._initial_accumulator_value = initial_accumulator_value
     # Created in Initialize.
@@ -79,6 +84,14 @@ class AdagradOptimizer(optimizer.Optimizer):
         grad,
         use_locking=self._use_locking)
 
+  def _apply_dense_fused(self, grads, var_list):
+    return training_ops.multi_apply_adagrad(
+        var_list,
+        [self.get_slot(var, "accumulator") for var in var_list],
+        math_ops.cast(self._learning_rate_tensor, var_list[0].dtype.base_dtype),
+        grads,
+        use_locking=self._use_locking)[0].op
+
   def _resource_apply_dense(self, grad, var):
     acc = self.get_slot(var, "accumulator")
     return training_ops.resource_apply_adagrad(
@@ -33,7 +33,7 @@ from tensorflow.python.training import adagrad
 
 class AdagradOptimizerTest(test.TestCase):
 
-  def doTestBasic(self, use_locking=False, use_resource=False):
+  def doTestBasic(self, use_locking=False, use_resource=False, fused=False):
     for dtype in [dtypes.half, dtypes.float32, dtypes.float64]:
       with self.test_session():
         if use_resource:
@@ -45,7 +45,8 @@ class AdagradOptimizerTest(test.TestCase):
         grads0 = constant_op.constant([0.1, 0.1], dtype=dtype)
         grads1 = constant_op.constant([0.01, 0.01], dtype=dtype)
         ada_opt = adagrad.AdagradOptimizer(
-            3.0, initial_accumulator_value=0.1, use_locking=use_locking)
+            3.0, initial_accumulator_value=0.1, use_locking=use_locking,
+            fused=fused)
         ada_update = ada_opt.apply_gradients(
             zip([grads0, grads1], [var0, var1]))
         variables.global_variables_initializer().run()
@@ -70,6 +71,12 @@ class AdagradOptimizerTest(test.TestCase):
   def testBasicLocked(self):
     self.doTestBasic(use_locking=True)
 
+  def testFusedBasic(self):
+    self.doTestBasic(use_locking=False, fused=True)
+
+  def testFusedBasicLocked(self):
+    self.doTestBasic(use_locking=True, fused=True)
+
   def testMinimizeSparseResourceVariable(self):
     for dtype in [dtypes.half, dtypes.float32, dtypes.float64]:
       with self.test_session():
@@ -36,7 +36,7 @@ class AdamOptimizer(optimizer.Optimizer):
   """
 
   def __init__(self, learning_rate=0.001, beta1=0.9, beta2=0.999, epsilon=1e-8,
-               use_locking=False, name="Adam"):
+               use_locking=False, name="Adam", fused=False):
     """Construct a new Adam optimizer.
 
     Initialization:
@@ -87,8 +87,13 @@ class AdamOptimizer(optimizer.Optimizer):
       use_locking: If True use locks for update operations.
       name: Optional name for the operations created when applying gradients.
         Defaults to "Adam".
+      fused: If `True`, dense gradients of (non-resource) variables are applied
+        with a single op for each group of variables that share a dtype and a
+        device, instead of one op per variable. The slots are the same either
+        way, so checkpoints can be shared with `fused=False`.
     """
     super(AdamOptimizer, self).__init__(use_locking, name)
+    self._fused = fused
     self._lr = learning_rate
     self._beta1 = beta1
     self._beta2 = beta2
@@ -147,6 +152,21 @@ class AdamOptimizer(optimizer.Optimizer):
         math_ops.cast(self._epsilon_t, var.dtype.base_dtype),
         grad, use_locking=self._use_locking).op
 
+  def _apply_dense_fused(self, grads, var_list, use_nesterov=False):
+    dtype = var_list[0].dtype.base_dtype
+    return training_ops.multi_apply_adam(
+        var_list,
+        [self.get_slot(var, "m") for var in var_list],
+        [self.get_slot(var, "v") for var in var_list],
+        math_ops.cast(self._beta1_power, dtype),
+        math_ops.cast(self._beta2_power, dtype),
+        math_ops.cast(self._lr_t, dtype),
+        math_ops.cast(self._beta1_t, dtype),
+        math_ops.cast(self._beta2_t, dtype),
+        math_ops.cast(self._epsilon_t, dtype),
+        grads, use_locking=self._use_locking,
+        use_nesterov=use_nesterov)[0].op
+
   def _resource_apply_dense(self, grad, var):
     m = self.get_slot(var, "m")
     v = self.get_slot(var, "v")
@@ -29,7 +29,10 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import collections
 import os
+import sys
+import threading
 import time
 
 import numpy as np
@@ -37,8 +40,12 @@ import six
 
 from tensorflow.core.framework.summary_pb2 import Summary
 from tensorflow.core.util.event_pb2 import SessionLog
+from tensorflow.python.framework import device as pydev
 from tensorflow.python.framework import meta_graph
 from tensorflow.python.framework import ops
+from tensorflow.python.ops import array_ops
+from tensorflow.python.ops import control_flow_ops
+from tensorflow.python.ops import state_ops
 from tensorflow.python.platform import tf_logging as logging
 from tensorflow.python.training import saver as saver_lib
 from tensorflow.python.training import session_run_hook
@@ -116,6 +123,50 @@ class SecondOrStepTimer(object):
   def last_triggered_step(self):
     return self._last_triggered_step
 
+  def steps_until_trigger(self, step):
+    """Returns how many steps from `step` on certainly do not trigger.
+
+    Only a timer that triggers every N steps knows it, in advance.
+
+    Args:
+      step: Training step to start from.
+
+    Returns:
+      The number of steps, starting with `step`, for which
+      `should_trigger_for_step()` returns False, or 0 if it is not known.
+    """
+    if self._every_steps is None or self._last_triggered_step is None:
+      return 0
+    return max(0, self._last_triggered_step + self._every_steps - step)
+
+
+def _runs_until_trigger(timer, next_step, steps_per_run):
+  """Returns how many runs, starting with the next, certainly do not trigger.
+
+  Args:
+    timer: A `SecondOrStepTimer`.
+    next_step: The global step expected after the next run.
+    steps_per_run: By how many steps the global step advances per run.
+
+  Returns:
+    The number of runs.
+  """
+  steps = timer.steps_until_trigger(next_step)
+  return (steps + steps_per_run - 1) // steps_per_run
+
+
+def _steps_per_run(last_step, global_step, runs):
+  """Returns by how many steps the global step advanced per run, at least 1.
+
+  The global step is shared by all the workers, so it can advance by any
+  number of steps per run. The rate is rounded up, which skips fewer runs.
+
+  Returns None if `last_step` is None, as the rate is not known yet.
+  """
+  if last_step is None:
+    return None
+  return max(1, -(-(global_step - last_step) // runs))
+
 
 class LoggingTensorHook(session_run_hook.SessionRunHook):
   """Prints the given tensors once every N local steps or once every N seconds.
@@ -188,6 +239,11 @@ class LoggingTensorHook(session_run_hook.SessionRunHook):
       np.set_printoptions(**original)
     self._iter_count += 1
 
+  def runs_to_skip(self):
+    skipped = self._timer.steps_until_trigger(self._iter_count)
+    self._iter_count += skipped
+    return skipped
+
 
 class StopAtStepHook(session_run_hook.SessionRunHook):
   """Hook that requests stop at a specified step."""
@@ -222,6 +278,9 @@ class StopAtStepHook(session_run_hook.SessionRunHook):
     self._global_step_tensor = training_util.get_global_step()
     if self._global_step_tensor is None:
       raise RuntimeError("Global step should be created to use StopAtStepHook.")
+    self._seen_step = None
+    self._steps_per_run = None
+    self._skipped_runs = 0
 
   def after_create_session(self, session, coord):
     if self._last_step is None:
@@ -233,9 +292,22 @@ class StopAtStepHook(session_run_hook.SessionRunHook):
 
   def after_run(self, run_context, run_values):
     global_step = run_values.results
+    self._steps_per_run = _steps_per_run(self._seen_step, global_step,
+                                         self._skipped_runs + 1)
+    self._seen_step = global_step
     if global_step >= self._last_step:
       run_context.request_stop()
 
+  def runs_to_skip(self):
+    if self._steps_per_run is None:
+      return 0
+    # Only half of the runs that should not reach the last step are skipped,
+    # so that it is not overshot unless the global step advances twice as
+    # fast, e.g. because more workers joined.
+    runs = (self._last_step - self._seen_step - 1) // self._steps_per_run
+    self._skipped_runs = max(0, runs // 2)
+    return self._skipped_runs
+
 
 class CheckpointSaverListener(object):
   """Interface for listeners that take action before or after checkpoint save.
@@ -295,8 +367,78 @@ class CheckpointSaverListener(object):
     pass
 
 
+def _host_device(device):
+  """Returns the CPU device of the task that `device` belongs to."""
+  spec = pydev.DeviceSpec.from_string(device or "")
+  spec.device_type = "CPU"
+  spec.device_index = 0
+  return spec.to_string()
+
+
+class _SnapshotSaveable(saver_lib.BaseSaverBuilder.SaveableObject):
+  """Saves host-side copies of the tensors described by `specs`.
+
+  Every spec gets a buffer variable on the CPU of the task holding the tensor.
+  `snapshot_op` copies the current values into the buffers; saving the
+  `_SnapshotSaveable` then writes the buffers under the original names and
+  slices, so the checkpoint is indistinguishable from one written directly.
+  `release_op` replaces the copies with empty tensors once they are written.
+  """
+
+  def __init__(self, specs, name):
+    self.buffers = []
+    snapshot_ops = []
+    release_ops = []
+    buffer_specs = []
+    for spec in specs:
+      value = ops.convert_to_tensor(spec.tensor)
+      with ops.device(_host_device(value.device)):
+        buf = state_ops.variable_op_v2(
+            value.get_shape(), value.dtype.base_dtype, name="buffer")
+        snapshot_ops.append(
+            state_ops.assign(buf, value, validate_shape=False))
+        release_ops.append(
+            state_ops.assign(buf, array_ops.zeros([0], value.dtype.base_dtype),
+                             validate_shape=False))
+      self.buffers.append(buf)
+      buffer_specs.append(
+          saver_lib.BaseSaverBuilder.SaveSpec(buf, spec.slice_spec, spec.name))
+    self.snapshot_op = control_flow_ops.group(*snapshot_ops)
+    self.release_op = control_flow_ops.group(*release_ops)
+    super(_SnapshotSaveable, self).__init__(self.buffers[0], buffer_specs, name)
+
+  def restore(self, restored_tensors, restored_shapes):
+    # pylint: disable=unused-argument
+    return control_flow_ops.group(*[
+        state_ops.assign(buf, tensor, validate_shape=False)
+        for buf, tensor in zip(self.buffers, restored_tensors)])
+
+
+class _PendingSave(object):
+  """Bookkeeping for a checkpoint being written by a background thread."""
+
+  def __init__(self, step, blocked_secs):
+    self.step = step
+    self.blocked_secs = blocked_secs
+    self.checkpoint_path = None
+    self.write_secs = None
+    self.exc_info = None
+    self.thread = None
+
+
 class CheckpointSaverHook(session_run_hook.SessionRunHook):
-  """Saves checkpoints every N steps or seconds."""
+  """Saves checkpoints every N steps or seconds.
+
+  By default the training loop is blocked for as long as the checkpoint takes
+  to write. With `async_save=True` the hook instead copies the saved tensors
+  into host-side buffers with a single `Session.run` and writes them to disk
+  from a background thread while training continues. At most one save is in
+  flight: a save that triggers while the previous one is still being written
+  waits for it first. `CheckpointSaverListener.after_save` and the
+  `SessionLog.CHECKPOINT` event are emitted on the training thread once the
+  files have been written, from the first `after_run` (or `end`) that observes
+  the finished write.
+  """
 
   def __init__(self,
                checkpoint_dir,
@@ -305,7 +447,8 @@ class CheckpointSaverHook(session_run_hook.SessionRunHook):
                saver=None,
                checkpoint_basename="model.ckpt",
                scaffold=None,
-               listeners=None):
+               listeners=None,
+               async_save=False):
     """Initializes a `CheckpointSaverHook`.
 
     Args:
@@ -318,6 +461,10 @@ class CheckpointSaverHook(session_run_hook.SessionRunHook):
       listeners: List of `CheckpointSaverListener` subclass instances.
         Used for callbacks that run immediately before or after this hook saves
         the checkpoint.
+      async_save: `bool`. If `True`, snapshot the variables into host memory
+        and write the checkpoint from a background thread instead of blocking
+        the training loop for the whole write. Requires a `Saver` built from a
+        list of variables rather than from a `SaverDef`.
 
     Raises:
       ValueError: One of `save_steps` or `save_secs` should be set.
@@ -335,6 +482,10 @@ class CheckpointSaverHook(session_run_hook.SessionRunHook):
     self._timer = SecondOrStepTimer(every_secs=save_secs,
                                     every_steps=save_steps)
     self._listeners = listeners or []
+    self._async_save = async_save
+    self._snapshot_op = None
+    self._snapshot_saver = None
+    self._pending_save = None
 
   def begin(self):
     self._summary_writer = SummaryWriterCache.get(self._checkpoint_dir)
@@ -342,6 +493,11 @@ class CheckpointSaverHook(session_run_hook.SessionRunHook):
     if self._global_step_tensor is None:
       raise RuntimeError(
           "Global step should be created to use CheckpointSaverHook.")
+    self._last_step = None
+    self._steps_per_run = None
+    self._skipped_runs = 0
+    if self._async_save:
+      self._build_snapshot()
     for l in self._listeners:
       l.begin()
 
@@ -365,20 +521,40 @@ class CheckpointSaverHook(session_run_hook.SessionRunHook):
     return SessionRunArgs(self._global_step_tensor)
 
   def after_run(self, run_context, run_values):
+    self._finish_pending_save(run_context.session, block=False)
     global_step = run_values.results
+    self._steps_per_run = _steps_per_run(self._last_step, global_step,
+                                         self._skipped_runs + 1)
+    self._last_step = global_step
     if self._timer.should_trigger_for_step(global_step):
       self._timer.update_last_triggered_step(global_step)
       self._save(global_step, run_context.session)
 
+  def runs_to_skip(self):
+    # A hook that saves every N seconds sees every run, and an asynchronous
+    # save is reported by the first run that sees it written.
+    if self._steps_per_run is None or self._pending_save is not None:
+      self._skipped_runs = 0
+      return 0
+    self._skipped_runs = _runs_until_trigger(
+        self._timer, self._last_step + self._steps_per_run,
+        self._steps_per_run)
+    return self._skipped_runs
+
   def end(self, session):
     last_step = session.run(training_util.get_global_step())
     if last_step != self._timer.last_triggered_step():
       self._save(last_step, session)
+    self._finish_pending_save(session, block=True)
     for l in self._listeners:
       l.end(session, last_step)
 
   def _save(self, step, session):
     """Saves the latest checkpoint."""
+    if self._snapshot_saver is not None:
+      self._save_async(step, session)
+      return
+
     logging.info("Saving checkpoints for %d into %s.", step, self._save_path)
 
     for l in self._listeners:
@@ -393,6 +569,128 @@ class CheckpointSaverHook(session_run_hook.SessionRunHook):
     for l in self._listeners:
       l.after_save(session, step)
 
+  def _build_snapshot(self):
+    """Adds the ops that copy the saved tensors into host buffers.
+
+    The checkpoint is written by a second `Saver` over the buffers that mirrors
+    the file format of the hook's saver. The hook's saver then records the
+    checkpoint, so `last_checkpoints`, `max_to_keep` and the checkpoint state
+    file are kept as by a synchronous save.
+
+    Raises:
+      ValueError: If the saver was created from a `SaverDef`.
+    """
+    saver = self._get_saver()
+    if saver is None:
+      # The scaffold creates its default saver when it is finalized, which is
+      # too late to add the snapshot ops. Create it now so that the scaffold
+      # picks the same one up from the SAVERS collection.
+      saver = saver_lib._get_saver_or_default()  # pylint: disable=protected-access
+    # pylint: disable=protected-access
+    saver.build()
+    if saver._is_empty:
+      return
+    if saver._var_list is None:
+      raise ValueError(
+          "async_save requires a Saver built from a list of variables, not "
+          "from a SaverDef.")
+    saveables = saver_lib.BaseSaverBuilder()._ValidateAndSliceInputs(
+        saver._var_list)
+    # Slices of a partitioned variable share their name and have to end up in
+    # one saveable.
+    specs_by_name = collections.OrderedDict()
+    for saveable in saveables:
+      specs_by_name.setdefault(saveable.name, []).extend(saveable.specs)
+    with ops.name_scope("checkpoint_snapshot") as scope:
+      snapshots = [_SnapshotSaveable(specs, name)
+                   for name, specs in specs_by_name.items()]
+      self._snapshot_op = control_flow_ops.group(
+          *[s.snapshot_op for s in snapshots])
+      self._release_op = control_flow_ops.group(
+          *[s.release_op for s in snapshots])
+      self._snapshot_saver = saver_lib.Saver(
+          snapshots,
+          sharded=saver._sharded,
+          name=scope,
+          write_version=saver._write_version,
+          pad_step_number=saver._pad_step_number)
+    # pylint: enable=protected-access
+
+  def _save_async(self, step, session):
+    """Snapshots the variables and starts writing them in the background."""
+    start = time.time()
+    # Only one save is in flight: the buffers are reused by the next snapshot.
+    self._finish_pending_save(session, block=True)
+
+    logging.info("Saving checkpoints for %d into %s.", step, self._save_path)
+
+    for l in self._listeners:
+      l.before_save(session, step)
+
+    session.run(self._snapshot_op)
+    pending = _PendingSave(step, time.time() - start)
+    pending.thread = threading.Thread(
+        target=self._write_snapshot, args=(session, pending))
+    pending.thread.daemon = True
+    self._pending_save = pending
+    pending.thread.start()
+
+  def _write_snapshot(self, session, pending):
+    """Writes the snapshot taken for `pending`; runs on a background thread."""
+    start = time.time()
+    try:
+      try:
+        pending.checkpoint_path = self._snapshot_saver.save(
+            session, self._save_path, global_step=pending.step,
+            write_meta_graph=False, write_state=False)
+      finally:
+        session.run(self._release_op)
+      # The meta graph carries the SaverDef of the hook's saver so that it can
+      # be used to restore the checkpoint into the original variables.
+      saver = self._get_saver()
+      meta_graph_filename = saver._MetaGraphFilename(pending.checkpoint_path)  # pylint: disable=protected-access
+      with session.graph.as_default():
+        saver.export_meta_graph(meta_graph_filename)
+    except Exception:  # pylint: disable=broad-except
+      pending.exc_info = sys.exc_info()
+    finally:
+      pending.write_secs = time.time() - start
+
+  def _finish_pending_save(self, session, block):
+    """Reports the in-flight save once its files have been written.
+
+    Args:
+      session: The session the checkpoint was saved from.
+      block: If `True`, waits for the write to finish. Otherwise returns
+        immediately if it is still in progress.
+
+    Raises:
+      Exception: Any exception raised while writing the checkpoint.
+    """
+    pending = self._pending_save
+    if pending is None or (not block and pending.thread.is_alive()):
+      return
+    pending.thread.join()
+    self._pending_save = None
+    if pending.exc_info is not None:
+      six.reraise(*pending.exc_info)
+    # Recorded here rather than by the writing thread so that the hook's
+    # saver is only used from the training thread.
+    self._get_saver()._RecordCheckpoint(  # pylint: disable=protected-access
+        pending.checkpoint_path, os.path.dirname(self._save_path))
+
+    logging.info(
+        "Checkpoint for step %d written to %s: training was blocked for "
+        "%.3f secs, writing took %.3f secs.", pending.step, self._save_path,
+        pending.blocked_secs, pending.write_secs)
+    self._summary_writer.add_session_log(
+        SessionLog(
+            status=SessionLog.CHECKPOINT, checkpoint_path=self._save_path),
+        pending.step)
+
+    for l in self._listeners:
+      l.after_save(session, pending.step)
+
   def _get_saver(self):
     if self._saver is not None:
       return self._saver
@@ -427,6 +725,9 @@ class StepCounterHook(session_run_hook.SessionRunHook):
       raise RuntimeError(
           "Global step should be created to use StepCounterHook.")
     self._summary_tag = self._global_step_tensor.op.name + "/sec"
+    self._last_step = None
+    self._steps_per_run = None
+    self._skipped_runs = 0
 
   def before_run(self, run_context):  # pylint: disable=unused-argument
     return SessionRunArgs(self._global_step_tensor)
@@ -435,6 +736,9 @@ class StepCounterHook(session_run_hook.SessionRunHook):
     _ = run_context
 
     global_step = run_values.results
+    self._steps_per_run = _steps_per_run(self._last_step, global_step,
+                                         self._skipped_runs + 1)
+    self._last_step = global_step
     if self._timer.should_trigger_for_step(global_step):
       elapsed_time, elapsed_steps = self._timer.update_last_triggered_step(
           global_step)
@@ -446,6 +750,16 @@ class StepCounterHook(session_run_hook.SessionRunHook):
           self._summary_writer.add_summary(summary, global_step)
         logging.info("%s: %g", self._summary_tag, steps_per_sec)
 
+  def runs_to_skip(self):
+    if self._steps_per_run is None:
+      return 0
+    # Assumes that the global step keeps advancing by the same number of steps
+    # per run() call, e.g. with `repeat_train_step`.
+    self._skipped_runs = _runs_until_trigger(
+        self._timer, self._last_step + self._steps_per_run,
+        self._steps_per_run)
+    return self._skipped_runs
+
 
 class NanLossDuringTrainingError(RuntimeError):
 
@@ -530,6 +844,9 @@ class SummarySaverHook(session_run_hook.SessionRunHook):
     if self._summary_writer is None and self._output_dir:
       self._summary_writer = SummaryWriterCache.get(self._output_dir)
     self._next_step = None
+    self._last_step = None
+    self._steps_per_run = None
+    self._skipped_runs = 0
     self._global_step_tensor = training_util.get_global_step()
     if self._global_step_tensor is None:
       raise RuntimeError(
@@ -563,7 +880,20 @@ class SummarySaverHook(session_run_hook.SessionRunHook):
         for summary in run_values.results["summary"]:
           self._summary_writer.add_summary(summary, global_step)
 
-    self._next_step = global_step + 1
+    self._steps_per_run = _steps_per_run(self._last_step, global_step,
+                                         self._skipped_runs + 1)
+    self._last_step = global_step
+    self._next_step = global_step + (self._steps_per_run or 1)
+
+  def runs_to_skip(self):
+    if not self._summary_writer or self._steps_per_run is None:
+      return 0
+    # Assumes that the global step keeps advancing by the same number of steps
+    # per run() call, e.g. with `repeat_train_step`.
+    self._skipped_runs = _runs_until_trigger(
+        self._timer, self._next_step, self._steps_per_run)
+    self._next_step += self._skipped_runs * self._steps_per_run
+    return self._skipped_runs
 
   def end(self, session=None):
     if self._summary_writer:
@@ -19,6 +19,7 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import os
 import shutil
 import tempfile
 import threading
@@ -38,12 +39,14 @@ from tensorflow.python.ops import state_ops
 from tensorflow.python.ops import variable_scope
 from tensorflow.python.ops import variables as variables_lib
 import tensorflow.python.ops.nn_grad  # pylint: disable=unused-import
+from tensorflow.python.platform import gfile
 from tensorflow.python.platform import test
 from tensorflow.python.platform import tf_logging
 from tensorflow.python.summary import summary as summary_lib
 from tensorflow.python.summary.writer import writer_cache
 from tensorflow.python.training import basic_session_run_hooks
 from tensorflow.python.training import monitored_session
+from tensorflow.python.training import saver as saver_lib
 from tensorflow.python.training import session_run_hook
 
 
@@ -109,6 +112,21 @@ class SecondOrStepTimerTest(test.TestCase):
     self.assertFalse(timer.should_trigger_for_step(3))
     self.assertTrue(timer.should_trigger_for_step(4))
 
+  def test_steps_until_trigger(self):
+    timer = basic_session_run_hooks.SecondOrStepTimer(every_steps=3)
+    self.assertEqual(0, timer.steps_until_trigger(1))
+
+    timer.update_last_triggered_step(1)
+    self.assertEqual(2, timer.steps_until_trigger(2))
+    self.assertEqual(1, timer.steps_until_trigger(3))
+    self.assertEqual(0, timer.steps_until_trigger(4))
+    self.assertEqual(0, timer.steps_until_trigger(10))
+
+  def test_steps_until_trigger_every_secs(self):
+    timer = basic_session_run_hooks.SecondOrStepTimer(every_secs=1.0)
+    timer.update_last_triggered_step(1)
+    self.assertEqual(0, timer.steps_until_trigger(2))
+
   def test_update_last_triggered_step(self):
     timer = basic_session_run_hooks.SecondOrStepTimer(every_steps=1)
 
@@ -198,6 +216,27 @@ class StopAtStepTest(test.TestCase):
         mon_sess.run(no_op)
         self.assertTrue(mon_sess.should_stop())
 
+  def test_skips_runs_before_last_step(self):
+    h = basic_session_run_hooks.StopAtStepHook(last_step=100)
+    with ops.Graph().as_default():
+      global_step = variables.get_or_create_global_step()
+      train_op = state_ops.assign_add(global_step, 1)
+      other_worker_op = state_ops.assign_add(global_step, 1)
+      h.begin()
+      with session_lib.Session() as sess:
+        sess.run(variables_lib.global_variables_initializer())
+        mon_sess = monitored_session._HookedSession(sess, [h])
+        h.after_create_session(sess, None)
+        mon_sess.run(train_op)
+        mon_sess.run(train_op)
+        self.assertGreater(mon_sess._runs_to_skip[0], 40)
+        # The global step now advances twice as fast, and the last step is
+        # still not overshot.
+        while not mon_sess.should_stop():
+          sess.run(other_worker_op)
+          mon_sess.run(train_op)
+        self.assertLessEqual(sess.run(global_step), 102)
+
 
 class LoggingTensorHookTest(test.TestCase):
 
@@ -583,6 +622,37 @@ class CheckpointSaverHookTest(test.TestCase):
                          checkpoint_utils.load_variable(self.model_dir,
                                                         self.global_step.name))
 
+  def test_save_steps_skips_runs(self):
+    with self.graph.as_default():
+      hook = basic_session_run_hooks.CheckpointSaverHook(
+          self.model_dir, save_steps=10, scaffold=self.scaffold)
+      hook.begin()
+      self.scaffold.finalize()
+      with session_lib.Session() as sess:
+        sess.run(self.scaffold.init_op)
+        mon_sess = monitored_session._HookedSession(sess, [hook])
+        mon_sess.run(self.train_op)
+        mon_sess.run(self.train_op)
+        self.assertGreater(mon_sess._runs_to_skip[0], 0)
+        for _ in range(23):
+          mon_sess.run(self.train_op)
+        self.assertGreaterEqual(
+            checkpoint_utils.load_variable(self.model_dir,
+                                           self.global_step.name), 20)
+
+  def test_save_secs_does_not_skip_runs(self):
+    with self.graph.as_default():
+      hook = basic_session_run_hooks.CheckpointSaverHook(
+          self.model_dir, save_secs=2, scaffold=self.scaffold)
+      hook.begin()
+      self.scaffold.finalize()
+      with session_lib.Session() as sess:
+        sess.run(self.scaffold.init_op)
+        mon_sess = monitored_session._HookedSession(sess, [hook])
+        mon_sess.run(self.train_op)
+        mon_sess.run(self.train_op)
+        self.assertEqual([0], mon_sess._runs_to_skip)
+
   def test_save_saves_at_end(self):
     with self.graph.as_default():
       hook = basic_session_run_hooks.CheckpointSaverHook(
@@ -599,6 +669,147 @@ class CheckpointSaverHookTest(test.TestCase):
                          checkpoint_utils.load_variable(self.model_dir,
                                                         self.global_step.name))
 
+  def test_async_save_saves_at_end(self):
+    with self.graph.as_default():
+      listener = MockCheckpointSaverListener()
+      hook = basic_session_run_hooks.CheckpointSaverHook(
+          self.model_dir,
+          save_secs=2,
+          scaffold=self.scaffold,
+          listeners=[listener],
+          async_save=True)
+      hook.begin()
+      self.scaffold.finalize()
+      with session_lib.Session() as sess:
+        sess.run(self.scaffold.init_op)
+        mon_sess = monitored_session._HookedSession(sess, [hook])
+        mon_sess.run(self.train_op)
+        mon_sess.run(self.train_op)
+        hook.end(sess)
+        self.assertEqual(2,
+                         checkpoint_utils.load_variable(self.model_dir,
+                                                        self.global_step.name))
+      self.assertEqual({
+          'begin': 1,
+          'before_save': 2,
+          'after_save': 2,
+          'end': 1
+      }, listener.get_counts())
+
+  def test_async_save_writes_snapshot_of_save_step(self):
+    with self.graph.as_default():
+      hook = basic_session_run_hooks.CheckpointSaverHook(
+          self.model_dir,
+          save_steps=10,
+          scaffold=self.scaffold,
+          async_save=True)
+      hook.begin()
+      self.scaffold.finalize()
+      with session_lib.Session() as sess:
+        sess.run(self.scaffold.init_op)
+        mon_sess = monitored_session._HookedSession(sess, [hook])
+        for _ in range(5):
+          mon_sess.run(self.train_op)
+        hook.end(sess)
+      # The first save was triggered after step 1 and must not see the updates
+      # made by the steps that ran while it was being written.
+      self.assertEqual(1,
+                       checkpoint_utils.load_variable(
+                           os.path.join(self.model_dir, 'model.ckpt-1'),
+                           self.global_step.name))
+      self.assertEqual(5,
+                       checkpoint_utils.load_variable(self.model_dir,
+                                                      self.global_step.name))
+      self.assertTrue(
+          gfile.Exists(os.path.join(self.model_dir, 'model.ckpt-1.meta')))
+
+  def test_async_save_calls_after_save_once_written(self):
+    model_dir = self.model_dir
+
+    class CheckingListener(MockCheckpointSaverListener):
+
+      def __init__(self):
+        super(CheckingListener, self).__init__()
+        self.latest_checkpoints = []
+
+      def after_save(self, session, global_step):
+        super(CheckingListener, self).after_save(session, global_step)
+        self.latest_checkpoints.append(saver_lib.latest_checkpoint(model_dir))
+
+    with self.graph.as_default():
+      listener = CheckingListener()
+      hook = basic_session_run_hooks.CheckpointSaverHook(
+          self.model_dir,
+          save_steps=1,
+          scaffold=self.scaffold,
+          listeners=[listener],
+          async_save=True)
+      hook.begin()
+      self.scaffold.finalize()
+      with session_lib.Session() as sess:
+        sess.run(self.scaffold.init_op)
+        mon_sess = monitored_session._HookedSession(sess, [hook])
+        for _ in range(3):
+          mon_sess.run(self.train_op)
+        hook.end(sess)
+      self.assertEqual(3, listener.get_counts()['after_save'])
+      self.assertEqual(
+          [os.path.join(self.model_dir, 'model.ckpt-%d' % step)
+           for step in (1, 2, 3)],
+          listener.latest_checkpoints)
+
+  def test_async_save_keeps_max_to_keep(self):
+    with self.graph.as_default():
+      saver = saver_lib.Saver(max_to_keep=2)
+      hook = basic_session_run_hooks.CheckpointSaverHook(
+          self.model_dir, save_steps=1, saver=saver, async_save=True)
+      hook.begin()
+      with session_lib.Session() as sess:
+        sess.run(variables_lib.global_variables_initializer())
+        mon_sess = monitored_session._HookedSession(sess, [hook])
+        for _ in range(4):
+          mon_sess.run(self.train_op)
+        hook.end(sess)
+        # The snapshot buffers are emptied once the checkpoint is written.
+        for snapshot in hook._snapshot_saver._var_list:
+          for buf in snapshot.buffers:
+            self.assertEqual(0, sess.run(array_ops.size(buf)))
+      expected = [os.path.join(self.model_dir, 'model.ckpt-%d' % step)
+                  for step in (3, 4)]
+      self.assertEqual(expected, saver.last_checkpoints)
+      self.assertEqual(
+          expected,
+          saver_lib.get_checkpoint_state(
+              self.model_dir).all_model_checkpoint_paths)
+      self.assertFalse(saver_lib.checkpoint_exists(
+          os.path.join(self.model_dir, 'model.ckpt-2')))
+
+  def test_async_save_raises_write_errors(self):
+    with self.graph.as_default():
+      hook = basic_session_run_hooks.CheckpointSaverHook(
+          self.model_dir,
+          save_secs=2,
+          scaffold=self.scaffold,
+          async_save=True)
+      hook.begin()
+      self.scaffold.finalize()
+      with session_lib.Session() as sess:
+        sess.run(self.scaffold.init_op)
+        mon_sess = monitored_session._HookedSession(sess, [hook])
+        with test.mock.patch.object(
+            hook._snapshot_saver, 'save', side_effect=ValueError('disk full')):
+          mon_sess.run(self.train_op)
+          with self.assertRaisesRegexp(ValueError, 'disk full'):
+            hook.end(sess)
+
+  def test_async_save_requires_var_list(self):
+    with self.graph.as_default():
+      saver = saver_lib.Saver(saver_def=saver_lib.Saver().saver_def)
+      hook = basic_session_run_hooks.CheckpointSaverHook(
+          self.model_dir, save_secs=2, saver=saver, async_save=True)
+      with self.assertRaisesRegexp(ValueError, 'list of variables'):
+        hook.begin()
+
   def test_summary_writer_defs(self):
     fake_summary_writer.FakeSummaryWriter.install()
     writer_cache.FileWriterCache.clear()
@@ -701,6 +912,22 @@ class StepCounterHookTest(test.TestCase):
         self.assertEqual('global_step/sec', summary_value.tag)
         self.assertGreater(summary_value.simple_value, 0)
 
+  def test_step_counter_multiple_steps_per_run(self):
+    with ops.Graph().as_default() as g, session_lib.Session() as sess:
+      global_step = variables.get_or_create_global_step()
+      train_op = state_ops.assign_add(global_step, 5)
+      summary_writer = fake_summary_writer.FakeSummaryWriter(self.log_dir, g)
+      hook = basic_session_run_hooks.StepCounterHook(
+          summary_writer=summary_writer, every_n_steps=10)
+      hook.begin()
+      sess.run(variables_lib.global_variables_initializer())
+      mon_sess = monitored_session._HookedSession(sess, [hook])
+      for _ in range(10):
+        time.sleep(0.01)
+        mon_sess.run(train_op)
+      hook.end(sess)
+      self.assertEqual(4, len(summary_writer.summaries))
+
   def test_step_counter_every_n_secs(self):
     with ops.Graph().as_default() as g, session_lib.Session() as sess:
       global_step = variables.get_or_create_global_step()
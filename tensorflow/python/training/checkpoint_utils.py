@@ -26,8 +26,8 @@ from tensorflow.python.ops import variable_scope as vs
 from tensorflow.python.ops import variables
 from tensorflow.python.platform import gfile
 from tensorflow.python.platform import tf_logging as logging
+from tensorflow.python.training import delta_checkpoint
 from tensorflow.python.training import saver
-from tensorflow.python.training import training as train
 
 __all__ = [
     "load_checkpoint", "load_variable", "list_variables", "init_from_checkpoint"
@@ -39,6 +39,8 @@ def load_checkpoint(ckpt_dir_or_file):
 
   If `ckpt_dir_or_file` resolves to a directory with multiple checkpoints,
   reader for the latest checkpoint is returned.
+  Delta checkpoints written by a `Saver` with `max_deltas` are resolved
+  against the checkpoints they were written on top of.
 
   Args:
     ckpt_dir_or_file: Directory with checkpoints file or path to checkpoint
@@ -55,7 +57,7 @@ def load_checkpoint(ckpt_dir_or_file):
   if filename is None:
     raise ValueError("Couldn't find 'checkpoint' file or checkpoints in "
                      "given directory %s" % ckpt_dir_or_file)
-  return train.NewCheckpointReader(filename)
+  return delta_checkpoint.load_checkpoint_reader(filename)
 
 
 def load_variable(ckpt_dir_or_file, name):
@@ -72,7 +74,13 @@ def load_variable(ckpt_dir_or_file, name):
   if name.endswith(":0"):
     name = name[:-2]
   reader = load_checkpoint(ckpt_dir_or_file)
-  return reader.get_tensor(name)
+  shape = reader.get_variable_to_shape_map().get(name)
+  if not shape:
+    return reader.get_tensor(name)
+  # Reading the whole tensor as a slice copies the rows of each partition it
+  # was saved in straight into the result, instead of first reading every
+  # partition whole.
+  return reader.get_slice(name, [0] * len(shape), [-1] * len(shape))
 
 
 def list_variables(ckpt_dir_or_file):
@@ -115,7 +123,9 @@ def init_from_checkpoint(ckpt_dir_or_file, assignment_map):
     checkpoint's root (e.g. no scope).
 
   Supports loading into partitioned variables, which are represented as
-  `'<variable>/part_<part #>'`.
+  `'<variable>/part_<part #>'`. Each partition only reads its own rows of a
+  tensor from a V2 checkpoint, whether or not the tensor was saved with the
+  same partitioning.
 
   Example:
 
@@ -0,0 +1,367 @@
+# Copyright 2017 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Incremental ("delta") checkpoints.
+
+A delta checkpoint is a V2 checkpoint that only holds what changed since the
+checkpoint it was written on top of, its parent. The chain of parents always
+ends in a regular, full checkpoint. For every variable a delta stores two
+tensors:
+
+  * `<name>/.DELTA_ROWS`: int64 indices of the rows that changed.
+  * `<name>/.DELTA_VALUES`: the new values of those rows.
+
+Variables of rank 2 or more are tracked row by row, so that only the touched
+rows of an embedding table are written. Other variables are treated as a
+single row and are written whole when they change. Changes are detected by
+comparing per-row fingerprints of the variables against the fingerprints taken
+when the previous checkpoint was written. A fingerprint is a numeric hash of
+the bits of a row, so a changed row is only missed if its new bits collide
+with its old ones under the hash.
+
+`Saver(max_deltas=N)` writes delta checkpoints. `checkpoint_chain()` and
+`load_checkpoint_reader()` resolve them back into full values.
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import os.path
+
+from tensorflow.python import pywrap_tensorflow
+from tensorflow.python.framework import constant_op
+from tensorflow.python.framework import dtypes
+from tensorflow.python.framework import errors
+from tensorflow.python.framework import ops
+from tensorflow.python.framework import tensor_shape
+from tensorflow.python.ops import array_ops
+from tensorflow.python.ops import control_flow_ops
+from tensorflow.python.ops import io_ops
+from tensorflow.python.ops import math_ops
+from tensorflow.python.ops import state_ops
+from tensorflow.python.util import compat
+
+# Key holding the path of the parent checkpoint, relative to the directory of
+# the delta checkpoint.
+_PARENT_KEY = "_CHECKPOINT_DELTA_PARENT"
+_ROWS_SUFFIX = "/.DELTA_ROWS"
+_VALUES_SUFFIX = "/.DELTA_VALUES"
+
+# The fingerprints are computed modulo this prime, which is small enough for
+# the products in `_fingerprints()` to fit in an int64.
+_FINGERPRINT_PRIME = (1 << 31) - 1
+# (multiplier, increment) pairs that derive the per-position coefficients of
+# the two fingerprints of a row.
+_FINGERPRINT_KEYS = [(0x2545F491, 0x4F6CDD1D), (0x5851F42D, 0x14057B7E)]
+
+
+def _int16_bits(value):
+  """Returns the bits of `value` as an int16 tensor with one extra dimension."""
+  dtype = value.dtype.base_dtype
+  if dtype == dtypes.string:
+    raise TypeError("Delta checkpoints do not support string variables: %s" %
+                    value.name)
+  if dtype in (dtypes.bool, dtypes.int8, dtypes.uint8):
+    bits = math_ops.cast(value, dtypes.int16)
+  elif dtype == dtypes.int16:
+    bits = array_ops.identity(value)
+  elif dtype.size % 2 == 0:
+    # Wider types gain a trailing dimension, which the caller flattens.
+    bits = array_ops.bitcast(value, dtypes.int16)
+  else:
+    raise TypeError("Delta checkpoints do not support variables of type %s: "
+                    "%s" % (dtype.name, value.name))
+  return bits
+
+
+def _fingerprints(value, per_row):
+  """Returns an int64 `[rows, 2]` tensor of fingerprints of `value`.
+
+  A row is read as a vector of 16-bit words `w`, and each of its two
+  fingerprints is `sum(w[j] * c[j]) mod p` for the prime
+  `_FINGERPRINT_PRIME` and nonzero coefficients `c[j]` derived from the
+  position `j` and a key. As a word changes by less than `p`, a change of a
+  single word always changes both fingerprints, and other changes leave one
+  unchanged with a probability of about `1 / p`. Everything is computed with
+  integer arithmetic on the bits of `value`.
+
+  Args:
+    value: The tensor to fingerprint.
+    per_row: If `True`, each slice along the first dimension gets its own
+      fingerprint. Otherwise `value` is fingerprinted as a single row.
+
+  Returns:
+    A `Tensor`.
+  """
+  num_rows = array_ops.shape(value)[0] if per_row else 1
+  words = math_ops.cast(
+      array_ops.reshape(_int16_bits(value), [num_rows, -1]), dtypes.int64)
+  positions = math_ops.range(
+      math_ops.cast(array_ops.shape(words)[1], dtypes.int64),
+      dtype=dtypes.int64)
+  fingerprints = []
+  for multiplier, increment in _FINGERPRINT_KEYS:
+    coefficients = math_ops.floormod(
+        positions * multiplier + increment, _FINGERPRINT_PRIME)
+    # Squaring makes the coefficients of neighbouring positions unrelated;
+    # they are kept in [1, p - 1].
+    coefficients = math_ops.floormod(
+        coefficients * coefficients, _FINGERPRINT_PRIME - 1) + 1
+    terms = math_ops.floormod(words * coefficients, _FINGERPRINT_PRIME)
+    fingerprints.append(math_ops.floormod(
+        math_ops.reduce_sum(terms, axis=1), _FINGERPRINT_PRIME))
+  return array_ops.stack(fingerprints, axis=1)
+
+
+class _VariableDelta(object):
+  """The delta ops of one variable."""
+
+  def __init__(self, var, name):
+    self.name = name
+    self.var = var
+    shape = var.get_shape()
+    # Variables of rank 2 or more are tracked per row; anything else is a
+    # single row.
+    self.per_row = shape.ndims is not None and shape.ndims >= 2
+    with ops.colocate_with(var):
+      fingerprints = _fingerprints(var, self.per_row)
+      saved = state_ops.variable_op_v2(
+          tensor_shape.unknown_shape(), dtypes.int64, name="fingerprints")
+      staged = state_ops.variable_op_v2(
+          tensor_shape.unknown_shape(), dtypes.int64,
+          name="staged_fingerprints")
+      self.stage_op = state_ops.assign(
+          staged, fingerprints, validate_shape=False)
+      self.commit_op = state_ops.assign(saved, staged, validate_shape=False)
+      changed = math_ops.reduce_any(
+          math_ops.not_equal(fingerprints, saved), axis=1)
+      self.rows = array_ops.reshape(array_ops.where(changed), [-1])
+      self.values = array_ops.gather(self._as_rows(var), self.rows)
+
+  def _as_rows(self, value):
+    return value if self.per_row else array_ops.expand_dims(value, 0)
+
+  def apply_op(self, filename_tensor):
+    """Returns an op that applies this variable's delta read from a file."""
+    rows, values = io_ops.restore_v2(
+        filename_tensor, [self.name + _ROWS_SUFFIX, self.name + _VALUES_SUFFIX],
+        ["", ""], [dtypes.int64, self.var.dtype.base_dtype])
+    with ops.colocate_with(self.var):
+      if self.per_row:
+        return state_ops.scatter_update(self.var, rows, values)
+      # At most one row: the new value if there is one, else the current one.
+      value = array_ops.concat([self._as_rows(self.var), values], 0)[-1]
+      return state_ops.assign(self.var, value)
+
+
+class DeltaCheckpointOps(object):
+  """Graph ops that write and apply delta checkpoints.
+
+  Saving is split in two steps so that the fingerprints only advance once the
+  checkpoint is on disk: `full_save_op` or `delta_save_op` writes the
+  checkpoint and stages the fingerprints of the values it read, then
+  `commit_op` makes those the reference for the next delta. Fingerprints are
+  taken before the rows are read, so a row updated concurrently with the save
+  is written again by the next delta.
+  """
+
+  def __init__(self, saveables, save_op_fn):
+    """Creates the ops.
+
+    Args:
+      saveables: A list of `BaseSaverBuilder.SaveableObject`, as returned by
+        `BaseSaverBuilder._ValidateAndSliceInputs()`.
+      save_op_fn: A function `(filename_tensor, saveables) -> Operation` that
+        writes a full checkpoint, usually `BaseSaverBuilder.save_op`.
+
+    Raises:
+      ValueError: If one of the saveables is not a whole reference variable.
+    """
+    self._deltas = []
+    for saveable in saveables:
+      var = saveable.op
+      if (len(saveable.specs) != 1 or saveable.specs[0].slice_spec or
+          not isinstance(var, ops.Tensor) or
+          var.op.type not in ("Variable", "VariableV2")):
+        raise ValueError(
+            "Delta checkpoints only support unpartitioned reference variables. "
+            "Got: %s" % saveable.name)
+      self._deltas.append(_VariableDelta(var, saveable.name))
+
+    self.filename_tensor = constant_op.constant("model", name="filename")
+    self.parent_tensor = constant_op.constant("", name="parent")
+    stage_ops = [d.stage_op for d in self._deltas]
+    with ops.control_dependencies(stage_ops):
+      full_save = save_op_fn(self.filename_tensor, saveables)
+    self.full_save_op = control_flow_ops.group(full_save, *stage_ops,
+                                               name="full_save")
+    names = [_PARENT_KEY]
+    tensors = [self.parent_tensor]
+    for d in self._deltas:
+      names.extend([d.name + _ROWS_SUFFIX, d.name + _VALUES_SUFFIX])
+      tensors.extend([d.rows, d.values])
+    delta_save = io_ops.save_v2(self.filename_tensor, names,
+                                [""] * len(names), tensors)
+    self.delta_save_op = control_flow_ops.group(delta_save, *stage_ops,
+                                                name="delta_save")
+    self.commit_op = control_flow_ops.group(
+        *[d.commit_op for d in self._deltas], name="commit")
+    self.apply_op = control_flow_ops.group(
+        *[d.apply_op(self.filename_tensor) for d in self._deltas],
+        name="apply_delta")
+
+  def save(self, sess, checkpoint_file, parent=None):
+    """Writes a full checkpoint, or a delta on top of `parent`."""
+    if parent is None:
+      sess.run(self.full_save_op, {self.filename_tensor: checkpoint_file})
+    else:
+      parent = os.path.relpath(parent, os.path.dirname(checkpoint_file))
+      sess.run(self.delta_save_op, {self.filename_tensor: checkpoint_file,
+                                    self.parent_tensor: parent})
+    sess.run(self.commit_op)
+
+  def apply(self, sess, delta_file):
+    """Applies the delta stored in `delta_file` to the variables."""
+    sess.run(self.apply_op, {self.filename_tensor: delta_file})
+
+
+def _parent(reader, checkpoint_prefix):
+  if not reader.has_tensor(_PARENT_KEY):
+    return None
+  parent = compat.as_str(reader.get_tensor(_PARENT_KEY))
+  return os.path.join(os.path.dirname(checkpoint_prefix), parent)
+
+
+def is_delta_checkpoint(checkpoint_prefix):
+  """Returns whether `checkpoint_prefix` is a delta checkpoint.
+
+  Args:
+    checkpoint_prefix: Path of a checkpoint.
+
+  Returns:
+    `True` if the checkpoint can be read and is a delta checkpoint.
+  """
+  try:
+    reader = pywrap_tensorflow.NewCheckpointReader(checkpoint_prefix)
+  except errors.OpError:
+    return False
+  return reader.has_tensor(_PARENT_KEY)
+
+
+def checkpoint_chain(checkpoint_prefix):
+  """Returns the checkpoints needed to resolve `checkpoint_prefix`.
+
+  Args:
+    checkpoint_prefix: Path of a V2 checkpoint.
+
+  Returns:
+    A list of checkpoint prefixes, starting with a full checkpoint, followed
+    by the delta checkpoints to apply to it in order and ending with
+    `checkpoint_prefix`. For a full checkpoint this is `[checkpoint_prefix]`.
+
+  Raises:
+    NotFoundError: If one of the checkpoints in the chain does not exist.
+  """
+  chain = [checkpoint_prefix]
+  while True:
+    reader = pywrap_tensorflow.NewCheckpointReader(chain[0])
+    parent = _parent(reader, chain[0])
+    if parent is None:
+      return chain
+    chain.insert(0, parent)
+
+
+class _DeltaCheckpointReader(object):
+  """Reads a chain of delta checkpoints as if it were one full checkpoint."""
+
+  def __init__(self, chain):
+    self._readers = [pywrap_tensorflow.NewCheckpointReader(prefix)
+                     for prefix in chain]
+
+  def has_tensor(self, tensor_str):
+    return self._readers[0].has_tensor(tensor_str)
+
+  def get_variable_to_shape_map(self):
+    return self._readers[0].get_variable_to_shape_map()
+
+  def get_variable_to_dtype_map(self):
+    return self._readers[0].get_variable_to_dtype_map()
+
+  def get_slice(self, tensor_str, begin, size):
+    value = self._readers[0].get_slice(tensor_str, begin, size)
+    if value.ndim < 2:
+      # Deltas of tensors of rank 0 and 1 replace them whole.
+      for reader in self._readers[1:]:
+        if not reader.has_tensor(tensor_str + _ROWS_SUFFIX):
+          continue
+        if reader.get_tensor(tensor_str + _ROWS_SUFFIX).size:
+          values = reader.get_tensor(tensor_str + _VALUES_SUFFIX)[-1]
+          value = values[tuple(slice(b, None if s == -1 else b + s)
+                               for b, s in zip(begin, size))].copy()
+      return value
+    # Only the rows of the deltas that fall into the slice are applied.
+    first_row = begin[0]
+    inner = tuple(slice(b, None if s == -1 else b + s)
+                  for b, s in zip(begin[1:], size[1:]))
+    for reader in self._readers[1:]:
+      if not reader.has_tensor(tensor_str + _ROWS_SUFFIX):
+        continue
+      rows = reader.get_tensor(tensor_str + _ROWS_SUFFIX) - first_row
+      in_slice = (rows >= 0) & (rows < value.shape[0])
+      if not in_slice.any():
+        continue
+      values = reader.get_tensor(tensor_str + _VALUES_SUFFIX)
+      value[rows[in_slice]] = values[in_slice][(slice(None),) + inner]
+    return value
+
+  def get_tensor_view(self, tensor_str):
+    # Deltas are applied in memory, so there is nothing to map.
+    value = self.get_tensor(tensor_str)
+    value.flags.writeable = False
+    return value
+
+  def get_tensor(self, tensor_str):
+    value = self._readers[0].get_tensor(tensor_str)
+    for reader in self._readers[1:]:
+      if not reader.has_tensor(tensor_str + _ROWS_SUFFIX):
+        continue
+      rows = reader.get_tensor(tensor_str + _ROWS_SUFFIX)
+      if not rows.size:
+        continue
+      values = reader.get_tensor(tensor_str + _VALUES_SUFFIX)
+      if value.ndim >= 2:
+        value[rows] = values
+      else:
+        value = values[-1]
+    return value
+
+
+def load_checkpoint_reader(checkpoint_prefix):
+  """Returns a reader that resolves delta checkpoints.
+
+  Args:
+    checkpoint_prefix: Path of a checkpoint.
+
+  Returns:
+    A `CheckpointReader` for full checkpoints. For a delta checkpoint, an
+    object with the same `get_tensor`, `get_slice`, `get_tensor_view`,
+    `has_tensor`, `get_variable_to_shape_map` and `get_variable_to_dtype_map`
+    methods that returns the values the variables had when the delta was
+    written.
+  """
+  reader = pywrap_tensorflow.NewCheckpointReader(checkpoint_prefix)
+  if _parent(reader, checkpoint_prefix) is None:
+    return reader
+  return _DeltaCheckpointReader(checkpoint_chain(checkpoint_prefix))
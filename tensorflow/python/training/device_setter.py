@@ -138,7 +138,9 @@ def replica_device_setter(ps_tasks=0, ps_device="/job:ps",
   By default, only Variable ops are placed on ps tasks, and the placement
   strategy is round-robin over all ps tasks. A custom `ps_strategy` may be used
   to do more intelligent placement, such as
-  `tf.contrib.training.GreedyLoadBalancingStrategy`.
+  `tf.contrib.training.GreedyLoadBalancingStrategy`, which balances the ps
+  tasks by variable size or expected traffic and reports the resulting load of
+  each ps task.
 
   For example,
 
@@ -29,7 +29,8 @@ class GradientDescentOptimizer(optimizer.Optimizer):
   """Optimizer that implements the gradient descent algorithm.
   """
 
-  def __init__(self, learning_rate, use_locking=False, name="GradientDescent"):
+  def __init__(self, learning_rate, use_locking=False, name="GradientDescent",
+               fused=False):
     """Construct a new gradient descent optimizer.
 
     Args:
@@ -38,9 +39,14 @@ class GradientDescentOptimizer(optimizer.Optimizer):
       use_locking: If True use locks for update operations.
       name: Optional name prefix for the operations created when applying
         gradients. Defaults to "GradientDescent".
+      fused: If `True`, dense gradients of (non-resource) variables are applied
+        with a single op for each group of variables that share a dtype and a
+        device, instead of one op per variable. The slots are the same either
+        way, so checkpoints can be shared with `fused=False`.
     """
     super(GradientDescentOptimizer, self).__init__(use_locking, name)
     self._learning_rate = learning_rate
+    self._fused = fused
 
   def _apply_dense(self, grad, var):
     return training_ops.apply_gradient_descent(
@@ -49,6 +55,13 @@ class GradientDescentOptimizer(optimizer.Optimizer):
         grad,
         use_locking=self._use_locking).op
 
+  def _apply_dense_fused(self, grads, var_list):
+    return training_ops.multi_apply_gradient_descent(
+        var_list,
+        math_ops.cast(self._learning_rate_tensor, var_list[0].dtype.base_dtype),
+        grads,
+        use_locking=self._use_locking)[0].op
+
   def _resource_apply_dense(self, grad, handle):
     return training_ops.resource_apply_gradient_descent(
         handle.handle, math_ops.cast(self._learning_rate_tensor,
@@ -53,6 +53,39 @@ class GradientDescentOptimizerTest(test.TestCase):
         self.assertAllCloseAccordingToType([3.0 - 3.0 * 0.01, 4.0 - 3.0 * 0.01],
                                            var1.eval())
 
+  def testFused(self):
+    with self.test_session() as sess:
+      var0 = variables.Variable([1.0, 2.0])
+      var1 = variables.Variable([3.0, 4.0])
+      var2 = variables.Variable([5.0, 6.0], dtype=dtypes.float64)
+      var3 = variables.Variable([[7.0, 8.0]])
+      grads0 = constant_op.constant([0.1, 0.1])
+      grads1 = constant_op.constant([0.01, 0.01])
+      grads2 = constant_op.constant([0.1, 0.1], dtype=dtypes.float64)
+      grads3 = ops.IndexedSlices(
+          constant_op.constant([[0.1, 0.1]]), constant_op.constant([0]),
+          constant_op.constant([1, 2]))
+      sgd_op = gradient_descent.GradientDescentOptimizer(
+          3.0, fused=True).apply_gradients(
+              zip([grads0, grads1, grads2, grads3],
+                  [var0, var1, var2, var3]))
+      # One op per dtype for the dense gradients.
+      fused_ops = [op for op in sess.graph.get_operations()
+                   if op.type == "MultiApplyGradientDescent"]
+      self.assertEqual(2, len(fused_ops))
+      self.assertEqual([2, 1],
+                       sorted(op.get_attr("N") for op in fused_ops))
+      variables.global_variables_initializer().run()
+      sgd_op.run()
+      self.assertAllCloseAccordingToType([1.0 - 3.0 * 0.1, 2.0 - 3.0 * 0.1],
+                                         var0.eval())
+      self.assertAllCloseAccordingToType([3.0 - 3.0 * 0.01, 4.0 - 3.0 * 0.01],
+                                         var1.eval())
+      self.assertAllCloseAccordingToType([5.0 - 3.0 * 0.1, 6.0 - 3.0 * 0.1],
+                                         var2.eval())
+      self.assertAllCloseAccordingToType([[7.0 - 3.0 * 0.1, 8.0 - 3.0 * 0.1]],
+                                         var3.eval())
+
   def testBasicResourceVariable(self):
     for dtype in [dtypes.half, dtypes.float32, dtypes.float64]:
       with self.test_session():
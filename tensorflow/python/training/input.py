@@ -1411,3 +1411,151 @@ def maybe_shuffle_batch_join(tensors_list, batch_size, capacity,
       allow_smaller_final_batch=allow_smaller_final_batch,
       shared_name=shared_name,
       name=name)
+
+
+def parallel_read_and_batch(data_files,
+                            reader_class,
+                            batch_size,
+                            parse_fn=None,
+                            num_readers=4,
+                            min_readers=None,
+                            capacity=None,
+                            min_after_dequeue=None,
+                            num_epochs=None,
+                            shuffle=True,
+                            seed=None,
+                            reader_kwargs=None,
+                            allow_smaller_final_batch=False,
+                            metrics_interval_secs=1.0,
+                            name=None):
+  """Reads and batches records with a pool of reader threads.
+
+  This function adds the following to the current `Graph`:
+
+  * A queue of the file names, see `string_input_producer`.
+  * `num_readers` readers, each reading records from a different file and
+    passing them to `parse_fn`, which thus runs in parallel.
+  * A `RandomShuffleQueue` (or, if `shuffle` is `False`, a `FIFOQueue`) into
+    which the parsed records of all the readers are enqueued, interleaving the
+    files.
+  * A `dequeue_many` operation to create batches from the queue.
+  * A `QueueRunner` to `QUEUE_RUNNER` collection, which runs each reader in
+    its own thread.
+
+  If `min_readers` is less than `num_readers`, the pool adapts to the
+  consumer: readers are parked while the queue is mostly full, and woken up
+  again, up to `num_readers`, while it is less than half full. See the
+  autoscaling of `QueueRunner`. Whether the pool is fixed or adaptive, the
+  `QueueRunner` adds scalar summaries of how full the queue is, of the number
+  of running readers and of the records read per second (`fill_fraction`,
+  `running_threads` and `enqueues_per_sec`), sampled every
+  `metrics_interval_secs`.
+
+  For example:
+
+  ```python
+  features = tf.train.parallel_read_and_batch(
+      tf.train.match_filenames_once("/data/train-*"),
+      tf.TFRecordReader,
+      batch_size=128,
+      parse_fn=lambda _, value: tf.parse_single_example(value, feature_spec),
+      num_readers=8,
+      min_readers=2)
+  ```
+
+  Note: this function creates local variables. Use
+  `local_variables_initializer()` to initialize them.
+
+  Args:
+    data_files: A list of file names or a 1-D string `Tensor` of file names,
+      e.g. the output of `match_filenames_once`.
+    reader_class: A `ReaderBase` subclass, e.g. `TFRecordReader`.
+    batch_size: The number of records in each batch.
+    parse_fn: (Optional.) A function taking the `key` and `value` string
+      tensors of a record and returning a list or dictionary of tensors, which
+      may include `SparseTensor`s. Defaults to returning `[key, value]`.
+    num_readers: The number of readers, and of threads running them.
+    min_readers: (Optional.) The number of readers that are never parked.
+      Defaults to `num_readers`, i.e. a fixed pool.
+    capacity: (Optional.) The maximum number of records in the queue. Defaults
+      to `min_after_dequeue + (num_readers + 3) * batch_size`.
+    min_after_dequeue: (Optional.) When shuffling, the minimum number of
+      records in the queue after a dequeue. Defaults to
+      `(num_readers + 3) * batch_size`.
+    num_epochs: (Optional.) An integer. If specified, each file is read
+      `num_epochs` times, after which the batches raise `OutOfRangeError`.
+    shuffle: Boolean. If `True`, the files are shuffled in each epoch and the
+      records are shuffled in the queue.
+    seed: (Optional.) The seed of the shuffles.
+    reader_kwargs: (Optional.) A dictionary of keyword arguments for
+      `reader_class`.
+    allow_smaller_final_batch: (Optional) Boolean. If `True`, allow the final
+      batch to be smaller if there are insufficient items left in the queue.
+    metrics_interval_secs: How often the pool is sampled for the summaries,
+      and resized if `min_readers` is less than `num_readers`.
+    name: (Optional) A name for the operations.
+
+  Returns:
+    A list or dictionary of batched tensors, with the structure returned by
+    `parse_fn`.
+
+  Raises:
+    ValueError: If `num_readers` or `min_readers` is not valid, or if
+      `min_after_dequeue` is given without `shuffle`.
+  """
+  if num_readers <= 0:
+    raise ValueError("num_readers must be positive: %s" % num_readers)
+  if min_readers is None:
+    min_readers = num_readers
+  if not 0 < min_readers <= num_readers:
+    raise ValueError("min_readers must be in [1, num_readers]: %s" %
+                     min_readers)
+  if min_after_dequeue is not None and not shuffle:
+    raise ValueError("min_after_dequeue requires shuffle.")
+  if parse_fn is None:
+    parse_fn = lambda key, value: [key, value]
+  reader_kwargs = reader_kwargs or {}
+  margin = (num_readers + 3) * batch_size
+  if not shuffle:
+    min_after_dequeue = 0
+  elif min_after_dequeue is None:
+    min_after_dequeue = margin
+  if capacity is None:
+    capacity = min_after_dequeue + margin
+
+  with ops.name_scope(name, "parallel_read_and_batch") as name:
+    filename_queue = string_input_producer(
+        data_files, num_epochs=num_epochs, shuffle=shuffle, seed=seed)
+    tensors_list = []
+    for _ in xrange(num_readers):
+      key, value = reader_class(**reader_kwargs).read(filename_queue)
+      tensors_list.append(parse_fn(key, value))
+
+    tensor_list_list = _validate_join(_as_tensor_list_list(tensors_list))
+    keep_input = _validate_keep_input(True, False)
+    tensor_list_list, sparse_info = _store_sparse_tensors_join(
+        tensor_list_list, False, keep_input)
+    types = _dtypes(tensor_list_list)
+    shapes = _shapes(tensor_list_list, None, False)
+    if shuffle:
+      queue = data_flow_ops.RandomShuffleQueue(
+          capacity=capacity, min_after_dequeue=min_after_dequeue, seed=seed,
+          dtypes=types, shapes=shapes)
+    else:
+      queue = data_flow_ops.FIFOQueue(
+          capacity=capacity, dtypes=types, shapes=shapes)
+
+    enqueue_ops = [queue.enqueue(tensor_list)
+                   for tensor_list in tensor_list_list]
+    # A fixed pool is autoscaled between `num_readers` and itself: no reader is
+    # ever parked, but the pool is still sampled for the summaries.
+    queue_runner.add_queue_runner(queue_runner.QueueRunner(
+        queue, enqueue_ops, min_threads=min_readers,
+        autoscale_interval_secs=metrics_interval_secs))
+
+    if allow_smaller_final_batch:
+      dequeued = queue.dequeue_up_to(batch_size, name=name)
+    else:
+      dequeued = queue.dequeue_many(batch_size, name=name)
+    dequeued = _restore_sparse_tensors(dequeued, sparse_info)
+    return _as_original_type(tensors_list[0], dequeued)
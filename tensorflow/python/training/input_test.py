@@ -27,8 +27,10 @@ from six.moves import xrange  # pylint: disable=redefined-builtin
 from tensorflow.python.framework import constant_op
 from tensorflow.python.framework import dtypes
 from tensorflow.python.framework import errors_impl
+from tensorflow.python.framework import ops
 from tensorflow.python.framework import sparse_tensor
 from tensorflow.python.ops import array_ops
+from tensorflow.python.ops import io_ops
 from tensorflow.python.ops import math_ops
 from tensorflow.python.ops import variables
 from tensorflow.python.platform import test as test_lib
@@ -2217,5 +2219,92 @@ class ShuffleBatchJoinTest(test_lib.TestCase):
     self.assertIs(None, batched.dense_shape.get_shape().num_elements())
 
 
+class ParallelReadAndBatchTest(test_lib.TestCase):
+
+  def _createFiles(self, num_files, num_lines):
+    filenames = []
+    for i in range(num_files):
+      filename = os.path.join(self.get_temp_dir(), "parallel_read.%d.txt" % i)
+      with open(filename, "w") as f:
+        for j in range(num_lines):
+          f.write("%d-%d\n" % (i, j))
+      filenames.append(filename)
+    expected = [compat.as_bytes("%d-%d" % (i, j))
+                for i in range(num_files) for j in range(num_lines)]
+    return filenames, expected
+
+  def _readAll(self, sess, batched):
+    coord = coordinator.Coordinator()
+    threads = queue_runner_impl.start_queue_runners(sess, coord=coord)
+    values = []
+    with self.assertRaises(errors_impl.OutOfRangeError):
+      while True:
+        values.extend(sess.run(batched))
+    coord.request_stop()
+    coord.join(threads)
+    return values
+
+  def testReadsAllRecords(self):
+    filenames, expected = self._createFiles(3, 5)
+    with self.test_session() as sess:
+      keys, values = inp.parallel_read_and_batch(
+          filenames, io_ops.TextLineReader, batch_size=4, num_readers=3,
+          num_epochs=1, shuffle=False, allow_smaller_final_batch=True)
+      self.assertEqual([None], keys.get_shape().as_list())
+      # A fixed pool of readers is never resized.
+      self.assertEqual(3, ops.get_collection(
+          ops.GraphKeys.QUEUE_RUNNERS)[-1].min_threads)
+      variables.local_variables_initializer().run()
+      self.assertItemsEqual(expected, self._readAll(sess, values))
+
+  def testAdaptiveReaders(self):
+    filenames, expected = self._createFiles(4, 20)
+    with self.test_session() as sess:
+      batched = inp.parallel_read_and_batch(
+          filenames, io_ops.TextLineReader, batch_size=5,
+          parse_fn=lambda key, value: {"line": value},
+          num_readers=4, min_readers=1, num_epochs=1, seed=1,
+          metrics_interval_secs=0.01, name="reader_pool")
+      self.assertEqual([5], batched["line"].get_shape().as_list())
+      variables.local_variables_initializer().run()
+      # The input is exhausted even while some readers are parked.
+      self.assertItemsEqual(expected, self._readAll(sess, batched["line"]))
+      running_readers = sess.run(sess.graph.get_tensor_by_name(
+          "reader_pool/queue_runner/running_threads:0"))
+      self.assertTrue(1 <= running_readers <= 4)
+
+  def testFixedReadersExportMetrics(self):
+    filenames, expected = self._createFiles(2, 20)
+    with self.test_session() as sess:
+      batched = inp.parallel_read_and_batch(
+          filenames, io_ops.TextLineReader, batch_size=5,
+          parse_fn=lambda key, value: {"line": value},
+          num_readers=2, num_epochs=1, seed=1,
+          metrics_interval_secs=0.01, name="fixed_pool")
+      tags = sess.run([summary.op.inputs[0] for summary in
+                       ops.get_collection(ops.GraphKeys.SUMMARIES)])
+      for metric in ("fill_fraction", "running_threads", "enqueues_per_sec"):
+        prefix = compat.as_bytes("fixed_pool/queue_runner/%s" % metric)
+        self.assertTrue(any(tag.startswith(prefix) for tag in tags), tags)
+      variables.local_variables_initializer().run()
+      self.assertItemsEqual(expected, self._readAll(sess, batched["line"]))
+      # No reader was parked.
+      self.assertEqual(2, sess.run(sess.graph.get_tensor_by_name(
+          "fixed_pool/queue_runner/running_threads:0")))
+
+  def testInvalidArguments(self):
+    with self.assertRaisesRegexp(ValueError, "num_readers"):
+      inp.parallel_read_and_batch(
+          ["a"], io_ops.TextLineReader, batch_size=2, num_readers=0)
+    with self.assertRaisesRegexp(ValueError, "min_readers"):
+      inp.parallel_read_and_batch(
+          ["a"], io_ops.TextLineReader, batch_size=2, num_readers=2,
+          min_readers=3)
+    with self.assertRaisesRegexp(ValueError, "shuffle"):
+      inp.parallel_read_and_batch(
+          ["a"], io_ops.TextLineReader, batch_size=2, min_after_dequeue=2,
+          shuffle=False)
+
+
 if __name__ == "__main__":
   test_lib.main()
@@ -42,7 +42,8 @@ class MomentumOptimizer(optimizer.Optimizer):
   """
 
   def __init__(self, learning_rate, momentum,
-               use_locking=False, name="Momentum", use_nesterov=False):
+               use_locking=False, name="Momentum", use_nesterov=False,
+               fused=False):
     """Construct a new Momentum optimizer.
 
     Args:
@@ -54,12 +55,17 @@ class MomentumOptimizer(optimizer.Optimizer):
       use_nesterov: If `True` use Nesterov Momentum.
         See [Sutskever et. al., 2013](
         http://jmlr.org/proceedings/papers/v28/sutskever13.pdf)
+      fused: If `True`, dense gradients of (non-resource) variables are applied
+        with a single op for each group of variables that share a dtype and a
+        device, instead of one op per variable. The slots are the same either
+        way, so checkpoints can be shared with `fused=False`.
 
     """
     super(MomentumOptimizer, self).__init__(use_locking, name)
     self._learning_rate = learning_rate
     self._momentum = momentum
     self._use_nesterov = use_nesterov
+    self._fused = fused
 
   def _create_slots(self, var_list):
     for v in var_list:
@@ -81,6 +87,16 @@ class MomentumOptimizer(optimizer.Optimizer):
         use_locking=self._use_locking,
         use_nesterov=self._use_nesterov).op
 
+  def _apply_dense_fused(self, grads, var_list):
+    dtype = var_list[0].dtype.base_dtype
+    return training_ops.multi_apply_momentum(
+        var_list, [self.get_slot(var, "momentum") for var in var_list],
+        math_ops.cast(self._learning_rate_tensor, dtype),
+        math_ops.cast(self._momentum_tensor, dtype),
+        grads,
+        use_locking=self._use_locking,
+        use_nesterov=self._use_nesterov)[0].op
+
   def _resource_apply_dense(self, grad, var):
     mom = self.get_slot(var, "momentum")
     return training_ops.resource_apply_momentum(
@@ -42,7 +42,7 @@ class MomentumOptimizerTest(test.TestCase):
     var = var - accum * lr * momentum
     return var, accum
 
-  def doTestBasic(self, use_resource=False):
+  def doTestBasic(self, use_resource=False, fused=False):
     for dtype in [dtypes.half, dtypes.float32, dtypes.float64]:
       with self.test_session():
         if use_resource:
@@ -54,7 +54,7 @@ class MomentumOptimizerTest(test.TestCase):
         grads0 = constant_op.constant([0.1, 0.1], dtype=dtype)
         grads1 = constant_op.constant([0.01, 0.01], dtype=dtype)
         mom_opt = momentum_lib.MomentumOptimizer(
-            learning_rate=2.0, momentum=0.9)
+            learning_rate=2.0, momentum=0.9, fused=fused)
         mom_update = mom_opt.apply_gradients(
             zip([grads0, grads1], [var0, var1]))
         variables.global_variables_initializer().run()
@@ -106,6 +106,9 @@ class MomentumOptimizerTest(test.TestCase):
   def testResourceBasic(self):
     self.doTestBasic(use_resource=True)
 
+  def testFusedBasic(self):
+    self.doTestBasic(use_resource=False, fused=True)
+
   def testNesterovMomentum(self):
     for dtype in [dtypes.float32, dtypes.float64]:
       with self.test_session():
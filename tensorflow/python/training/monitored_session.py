@@ -22,11 +22,13 @@ from __future__ import print_function
 import abc
 
 from tensorflow.core.protobuf import config_pb2
+from tensorflow.python.framework import constant_op
 from tensorflow.python.framework import errors
 from tensorflow.python.framework import ops
 from tensorflow.python.ops import array_ops
 from tensorflow.python.ops import control_flow_ops
 from tensorflow.python.ops import lookup_ops
+from tensorflow.python.ops import math_ops
 from tensorflow.python.ops import resources
 from tensorflow.python.ops import variables
 from tensorflow.python.platform import tf_logging as logging
@@ -281,6 +283,15 @@ def MonitoredTrainingSession(master='',  # pylint: disable=invalid-name
   utility sets proper session creator which waits for the chief to
   initialize/restore.
 
+  To run several training steps per call to `run()`, build the train op with
+  `repeat_train_step`. The hooks then see the global step once per call.
+
+  Hooks that act every N steps skip the calls to `run()` in between, and a
+  call that every hook skips goes straight to the session. A hook that acts
+  every N seconds, like the default checkpoint saver, or a `NanTensorHook`,
+  sees every call. To leave calls to the session alone, set
+  `save_checkpoint_secs=None` and pass a `CheckpointSaverHook` with
+  `save_steps` in `chief_only_hooks`.
 
   Args:
     master: `String` the TensorFlow master to use.
@@ -352,6 +363,108 @@ def MonitoredTrainingSession(master='',  # pylint: disable=invalid-name
                           stop_grace_period_secs=stop_grace_period_secs)
 
 
+def repeat_train_step(step_fn, steps_per_run, name=None):
+  """Builds a train op that runs several training steps per call to `run()`.
+
+  `step_fn` builds the ops of one training step. It is called once, in the body
+  of a `while_loop` which runs the step `steps_per_run` times, one after the
+  other. Small models then pay the overhead of `Session.run()` and of the hooks
+  of a `MonitoredSession` once for `steps_per_run` steps:
+
+  ```python
+  def step_fn():
+    loss = ...
+    train_op = optimizer.minimize(loss, global_step=global_step)
+    return train_op, loss
+
+  train_op, loss, step_summary = tf.train.repeat_train_step(
+      step_fn, steps_per_run=10)
+  scaffold = tf.train.Scaffold(summary_op=step_summary)
+  with tf.train.MonitoredTrainingSession(scaffold=scaffold, ...) as sess:
+    while not sess.should_stop():
+      sess.run(train_op)
+  ```
+
+  The train op of `step_fn` should increment the global step, so that the
+  global step, and the hooks which read it, count the training steps rather
+  than the calls to `run()`. A hook such as `StopAtStepHook` only sees the
+  global step between calls to `run()`, so it may stop up to
+  `steps_per_run - 1` steps late.
+
+  The ops built by `step_fn` only exist inside the loop and cannot be fetched.
+  The summaries it adds to the `SUMMARIES` collection are removed from it, and
+  a single summary holding their values at the last step of the loop is
+  returned instead. Fetching that summary runs the loop, so it is not added to
+  any collection: fetch it together with `train_op`, e.g. as the `summary_op`
+  of the `Scaffold`. `step_fn` must read its inputs with ops which produce new
+  data each time they run. It must not add queue runners or table
+  initializers, which cannot run inside the loop, nor create variables from
+  `Tensor` initial values.
+
+  Args:
+    step_fn: A callable without arguments which builds one training step and
+      returns a `(train_op, loss)` pair, where `loss` is a scalar `Tensor`.
+    steps_per_run: Number of training steps per call to `run()`. If 1, the
+      step is built without a loop.
+    name: Optional name for the loop.
+
+  Returns:
+    A `(train_op, loss, summary_op)` triple. Running `train_op` runs
+    `steps_per_run` training steps. `loss` is the loss of the last step, cast
+    to a `float32` scalar. `summary_op` is the summary of the last step, or
+    `None` if `step_fn` adds no summaries or if `steps_per_run` is 1, in which
+    case the summaries stay in the `SUMMARIES` collection.
+
+  Raises:
+    ValueError: If `steps_per_run` is not positive, or if `step_fn` adds queue
+      runners or table initializers and `steps_per_run` is more than 1.
+  """
+  if steps_per_run < 1:
+    raise ValueError('steps_per_run must be positive, got %s.' % steps_per_run)
+  if steps_per_run == 1:
+    train_op, loss = step_fn()
+    return train_op, math_ops.to_float(array_ops.reshape(loss, [])), None
+
+  with ops.name_scope(name, 'repeat_train_step') as name:
+    summaries = ops.get_collection_ref(ops.GraphKeys.SUMMARIES)
+    num_summaries = len(summaries)
+    loop_keys = (ops.GraphKeys.QUEUE_RUNNERS,
+                 ops.GraphKeys.TABLE_INITIALIZERS)
+    num_loop_items = [len(ops.get_collection(key)) for key in loop_keys]
+
+    def _body(step, unused_loss, unused_summary):
+      train_op, loss = step_fn()
+      with ops.control_dependencies([train_op]):
+        loss = math_ops.to_float(array_ops.reshape(loss, []))
+        if len(summaries) > num_summaries:
+          step_summary = summary.merge(summaries[num_summaries:])
+        else:
+          step_summary = constant_op.constant('')
+      return step + 1, loss, step_summary
+
+    _, loss, step_summary = control_flow_ops.while_loop(
+        lambda step, unused_loss, unused_summary: step < steps_per_run,
+        _body,
+        [constant_op.constant(0), constant_op.constant(0.0),
+         constant_op.constant('')],
+        parallel_iterations=1,
+        back_prop=False)
+    for key, num_items in zip(loop_keys, num_loop_items):
+      if len(ops.get_collection(key)) > num_items:
+        raise ValueError(
+            'step_fn added to the %s collection, which cannot be run in the '
+            'loop of repeat_train_step. Create lookup tables outside of '
+            'step_fn, read the inputs with e.g. a Dataset iterator rather than '
+            'queues, or use steps_per_run=1.' % key)
+    if len(summaries) > num_summaries:
+      del summaries[num_summaries:]
+    else:
+      step_summary = None
+    # Only the loss is needed to run all steps, so the summaries of the steps
+    # are not computed unless they are fetched.
+    return control_flow_ops.group(loss, name=name), loss, step_summary
+
+
 class SessionCreator(object):
   """A factory for tf.Session."""
 
@@ -911,6 +1024,11 @@ class _HookedSession(_WrappedSession):
   If any call to the hooks, requests stop via run_context the session will be
   marked as needing to stop and its `should_stop()` method will now return
   `True`.
+
+  Hooks are not called for the `run()` calls they skip, see
+  `SessionRunHook.runs_to_skip()`. If no hook is called, `run()` goes directly
+  to the wrapped session. That requires every hook to skip the call: a single
+  hook that sees every call, e.g. a `NanTensorHook`, disables it.
   """
 
   def __init__(self, sess, hooks):
@@ -922,8 +1040,14 @@ class _HookedSession(_WrappedSession):
     """
 
     _WrappedSession.__init__(self, sess)
-    self._hooks = hooks
+    self._hooks = list(hooks)
     self._should_stop = False
+    # The number of upcoming calls to run() that each hook skips.
+    self._runs_to_skip = [0] * len(self._hooks)
+    # The fetches of the last call to run() that called hooks, as a
+    # `(key, merged_fetches)` pair, so that a call requesting the same fetches
+    # passes the same structure to the session.
+    self._merged_fetches = None
 
   def _check_stop(self):
     """See base class."""
@@ -934,15 +1058,29 @@ class _HookedSession(_WrappedSession):
     if self.should_stop():
       raise RuntimeError('Run called even after should_stop requested.')
 
-    actual_fetches = {'caller': fetches}
+    hooks = []
+    for i, hook in enumerate(self._hooks):
+      if self._runs_to_skip[i]:
+        self._runs_to_skip[i] -= 1
+      else:
+        hooks.append((i, hook))
+    if not hooks:
+      return _WrappedSession.run(self,
+                                 fetches=fetches,
+                                 feed_dict=feed_dict,
+                                 options=options,
+                                 run_metadata=run_metadata)
 
     run_context = session_run_hook.SessionRunContext(
         original_args=session_run_hook.SessionRunArgs(fetches, feed_dict),
         session=self._sess)
 
     options = options or config_pb2.RunOptions()
-    feed_dict = self._call_hook_before_run(run_context, actual_fetches,
-                                           feed_dict, options)
+    hook_fetches = {}
+    feed_dict = self._call_hook_before_run(
+        run_context, [hook for _, hook in hooks], hook_fetches, feed_dict,
+        options)
+    actual_fetches = self._merge_fetches(fetches, hook_fetches)
 
     # Do session run.
     run_metadata = run_metadata or config_pb2.RunMetadata()
@@ -952,22 +1090,46 @@ class _HookedSession(_WrappedSession):
                                   options=options,
                                   run_metadata=run_metadata)
 
-    for hook in self._hooks:
+    for i, hook in hooks:
       hook.after_run(
           run_context,
           session_run_hook.SessionRunValues(
               results=outputs[hook] if hook in outputs else None,
               options=options,
               run_metadata=run_metadata))
+      self._runs_to_skip[i] = hook.runs_to_skip()
     self._should_stop = self._should_stop or run_context.stop_requested
 
     return outputs['caller']
 
-  def _call_hook_before_run(self, run_context, fetch_dict, user_feed_dict,
-                            options):
+  def _merge_fetches(self, fetches, hook_fetches):
+    """Returns the fetches of the caller and of the hooks, as one dict.
+
+    The dict of the previous call is reused if the caller and the hooks
+    request the same objects.
+
+    Args:
+      fetches: The fetches of the caller.
+      hook_fetches: A dict mapping hooks to their fetches.
+
+    Returns:
+      A dict mapping `'caller'` to `fetches` and each hook to its fetches.
+    """
+    key = (id(fetches),) + tuple(
+        (id(hook), id(hook_fetch)) for hook, hook_fetch in hook_fetches.items())
+    if self._merged_fetches is not None and self._merged_fetches[0] == key:
+      return self._merged_fetches[1]
+    merged = {'caller': fetches}
+    merged.update(hook_fetches)
+    # The merged dict keeps the fetches alive, so their ids remain valid.
+    self._merged_fetches = (key, merged)
+    return merged
+
+  def _call_hook_before_run(self, run_context, hooks, fetch_dict,
+                            user_feed_dict, options):
     """Calls hooks.before_run and handles requests from hooks."""
     hook_feeds = {}
-    for hook in self._hooks:
+    for hook in hooks:
       request = hook.before_run(run_context)
       if request is not None:
         if request.fetches is not None:
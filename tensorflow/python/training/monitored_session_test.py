@@ -31,6 +31,7 @@ from tensorflow.core.protobuf import config_pb2
 from tensorflow.core.protobuf import debug_pb2
 from tensorflow.python.client import session as session_lib
 from tensorflow.python.framework import constant_op
+from tensorflow.python.framework import dtypes
 from tensorflow.python.framework import errors_impl
 from tensorflow.python.framework import ops
 from tensorflow.python.ops import array_ops
@@ -40,6 +41,7 @@ from tensorflow.python.platform import test
 from tensorflow.python.summary import summary
 from tensorflow.python.training import basic_session_run_hooks
 from tensorflow.python.training import coordinator
+from tensorflow.python.training import input as input_lib
 from tensorflow.python.training import monitored_session
 from tensorflow.python.training import saver as saver_lib
 from tensorflow.python.training import session_run_hook
@@ -237,6 +239,7 @@ class FakeHook(session_run_hook.SessionRunHook):
     self.call_counter = collections.Counter()
     self.last_run_context = None
     self.last_run_values = None
+    self.skip = 0
 
   def begin(self):
     self.call_counter['begin'] += 1
@@ -255,6 +258,9 @@ class FakeHook(session_run_hook.SessionRunHook):
     if self.should_stop:
       run_context.request_stop()
 
+  def runs_to_skip(self):
+    return self.skip
+
   def end(self, session):
     self.call_counter['end'] += 1
 
@@ -339,6 +345,91 @@ class MonitoredTrainingSessionTest(test.TestCase):
         self.assertEqual(0, session.run(gstep))
 
 
+class RepeatTrainStepTest(test.TestCase):
+  """Tests repeat_train_step."""
+
+  def test_runs_steps_per_run(self):
+    logdir = _test_dir(self.get_temp_dir(), 'test_runs_steps_per_run')
+    with ops.Graph().as_default():
+      gstep = variables_lib.get_or_create_global_step()
+
+      def step_fn():
+        new_gstep = state_ops.assign_add(gstep, 1)
+        return new_gstep, new_gstep * 2
+
+      train_op, loss, step_summary = monitored_session.repeat_train_step(
+          step_fn, steps_per_run=10)
+      self.assertIs(None, step_summary)
+      with monitored_session.MonitoredTrainingSession(
+          is_chief=True, checkpoint_dir=logdir) as session:
+        self.assertEqual(0, session.run(gstep))
+        _, loss_value = session.run([train_op, loss])
+        self.assertEqual(20., loss_value)
+        self.assertEqual(10, session.run(gstep))
+        session.run(train_op)
+        self.assertEqual(20, session.run(gstep))
+
+  def test_one_step_per_run_builds_no_loop(self):
+    with ops.Graph().as_default():
+      gstep = variables_lib.get_or_create_global_step()
+      new_gstep = state_ops.assign_add(gstep, 1)
+      train_op, loss, step_summary = monitored_session.repeat_train_step(
+          lambda: (new_gstep, gstep), steps_per_run=1)
+      self.assertIs(new_gstep, train_op)
+      # The loss is cast as with a loop.
+      self.assertEqual(dtypes.float32, loss.dtype)
+      self.assertIs(None, step_summary)
+
+  def test_summaries_of_last_step(self):
+    logdir = _test_dir(self.get_temp_dir(), 'test_summaries_of_last_step')
+    with ops.Graph().as_default():
+      gstep = variables_lib.get_or_create_global_step()
+
+      def step_fn():
+        new_gstep = state_ops.assign_add(gstep, 1)
+        summary.scalar('my_summary_tag', new_gstep * 2)
+        return new_gstep, new_gstep
+
+      train_op, _, step_summary = monitored_session.repeat_train_step(
+          step_fn, steps_per_run=10)
+      # Fetching the summary runs the loop, so it is not shared.
+      self.assertEqual([], ops.get_collection(ops.GraphKeys.SUMMARIES))
+      with monitored_session.MonitoredTrainingSession(
+          is_chief=True,
+          checkpoint_dir=logdir,
+          scaffold=monitored_session.Scaffold(summary_op=step_summary),
+          save_summaries_steps=10,
+          log_step_count_steps=10) as session:
+        for _ in range(3):
+          session.run(train_op)
+    summaries = util_test.latest_summaries(logdir)
+    values = [
+        s.summary.value[0].simple_value
+        for s in summaries
+        if s.summary.value[0].tag == 'my_summary_tag'
+    ]
+    self.assertIn(20., values)
+    self.assertTrue(all(value % 20 == 0 for value in values))
+
+  def test_raise_on_queue_runners_in_loop(self):
+    with ops.Graph().as_default():
+      gstep = variables_lib.get_or_create_global_step()
+
+      def step_fn():
+        batch = input_lib.batch([constant_op.constant(1)], batch_size=2)
+        new_gstep = state_ops.assign_add(gstep, 1)
+        return new_gstep, batch[0]
+
+      with self.assertRaisesRegexp(ValueError, 'queue_runners'):
+        monitored_session.repeat_train_step(step_fn, steps_per_run=2)
+      # Without a loop, the queue runner is run as usual.
+      monitored_session.repeat_train_step(step_fn, steps_per_run=1)
+
+  def test_raise_on_invalid_steps_per_run(self):
+    with self.assertRaisesRegexp(ValueError, 'steps_per_run must be positive'):
+      monitored_session.repeat_train_step(lambda: None, steps_per_run=0)
+
+
 class StopAtNSession(monitored_session._WrappedSession):
   """A wrapped session that stops at the N-th call to _check_stop."""
 
@@ -603,9 +694,11 @@ class FakeSession(monitored_session._WrappedSession):
   def __init__(self, sess):
     monitored_session._WrappedSession.__init__(self, sess)
     self.args_called = {}
+    self.fetches_called = None
 
   def run(self, fetches, **kwargs):
     self.args_called = dict(kwargs)
+    self.fetches_called = fetches
     # Call run only with fetches since we directly pass other arguments.
     return monitored_session._WrappedSession.run(self, fetches)
 
@@ -689,6 +782,62 @@ class HookedSessionTest(test.TestCase):
       self.assertEqual(mock_hook.last_run_values.results, [5])
       self.assertEqual(mock_hook2.last_run_values.results, [10])
 
+  def testSkipsHooks(self):
+    with ops.Graph().as_default(), session_lib.Session() as sess:
+      mock_hook = FakeHook()
+      mock_hook2 = FakeHook()
+      mon_sess = monitored_session._HookedSession(
+          sess=sess, hooks=[mock_hook, mock_hook2])
+      a_tensor = constant_op.constant([0], name='a_tensor')
+      another_tensor = constant_op.constant([5], name='another_tensor')
+      mock_hook.request = session_run_hook.SessionRunArgs([another_tensor])
+      mock_hook.skip = 2
+      sess.run(variables.global_variables_initializer())
+
+      for _ in range(6):
+        self.assertEqual(mon_sess.run(fetches=a_tensor), [0])
+      self.assertEqual(mock_hook.call_counter['before_run'], 2)
+      self.assertEqual(mock_hook.call_counter['after_run'], 2)
+      self.assertEqual(mock_hook.last_run_values.results, [5])
+      self.assertEqual(mock_hook2.call_counter['before_run'], 6)
+      self.assertEqual(mock_hook2.call_counter['after_run'], 6)
+
+  def testRunsDirectlyWhenAllHooksSkip(self):
+    with ops.Graph().as_default(), session_lib.Session() as sess:
+      mock_run = FakeSession(sess)
+      mock_hook = FakeHook()
+      mock_hook.skip = 1
+      mon_sess = monitored_session._HookedSession(
+          sess=mock_run, hooks=[mock_hook])
+      a_tensor = constant_op.constant([0], name='a_tensor')
+      sess.run(variables.global_variables_initializer())
+
+      self.assertEqual(mon_sess.run(fetches=a_tensor), [0])
+      self.assertEqual(mock_run.fetches_called, {'caller': a_tensor})
+      self.assertEqual(mon_sess.run(fetches=a_tensor), [0])
+      self.assertIs(mock_run.fetches_called, a_tensor)
+      self.assertEqual(mock_hook.call_counter['before_run'], 1)
+
+  def testReusesMergedFetches(self):
+    with ops.Graph().as_default(), session_lib.Session() as sess:
+      mock_run = FakeSession(sess)
+      mock_hook = FakeHook()
+      mon_sess = monitored_session._HookedSession(
+          sess=mock_run, hooks=[mock_hook])
+      a_tensor = constant_op.constant([0], name='a_tensor')
+      another_tensor = constant_op.constant([5], name='another_tensor')
+      mock_hook.request = session_run_hook.SessionRunArgs([another_tensor])
+      sess.run(variables.global_variables_initializer())
+
+      mon_sess.run(fetches=a_tensor)
+      merged = mock_run.fetches_called
+      mon_sess.run(fetches=a_tensor)
+      self.assertIs(mock_run.fetches_called, merged)
+      mock_hook.request = session_run_hook.SessionRunArgs([a_tensor])
+      mon_sess.run(fetches=a_tensor)
+      self.assertIsNot(mock_run.fetches_called, merged)
+      self.assertEqual(mock_hook.last_run_values.results, [0])
+
   def testOnlyHooksHaveFeeds(self):
     with ops.Graph().as_default(), session_lib.Session() as sess:
       mock_hook = FakeHook()
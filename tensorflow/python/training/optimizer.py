@@ -21,6 +21,7 @@ from __future__ import division
 from __future__ import print_function
 
 import abc
+import collections
 
 from tensorflow.python.framework import dtypes
 from tensorflow.python.framework import ops
@@ -267,6 +268,8 @@ class Optimizer(object):
       raise ValueError("Must specify the optimizer name")
     self._use_locking = use_locking
     self._name = name
+    # Set by the subclasses that implement _apply_dense_fused().
+    self._fused = False
     # Dictionary of slots.
     #  {slot_name : { variable_to_train: slot_for_the_variable, ...}, ... }
     self._slots = {}
@@ -447,13 +450,25 @@ class Optimizer(object):
     update_ops = []
     with ops.name_scope(name, self._name) as name:
       self._prepare()
+      # Dense updates of ref variables, grouped by dtype and device, when fused.
+      fused_groups = collections.OrderedDict()
       for grad, var, processor in converted_grads_and_vars:
         if grad is None:
           continue
+        if (self._fused and isinstance(grad, ops.Tensor) and
+            isinstance(processor, _RefVariableProcessor)):
+          key = (var.dtype.base_dtype, var.device)
+          fused_groups.setdefault(key, []).append((grad, var))
+          continue
         # We colocate all ops created in _apply_dense or _apply_sparse
         # on the same device as the variable.
         with ops.name_scope("update_" + var.op.name), ops.colocate_with(var):
           update_ops.append(processor.update_op(self, grad))
+      for group in fused_groups.values():
+        grads, group_vars = zip(*group)
+        with ops.name_scope("update_fused"), ops.colocate_with(group_vars[0]):
+          update_ops.append(
+              self._apply_dense_fused(list(grads), list(group_vars)))
       if global_step is None:
         apply_updates = self._finish(update_ops, name)
       else:
@@ -559,6 +574,21 @@ class Optimizer(object):
     """
     raise NotImplementedError()
 
+  def _apply_dense_fused(self, grads, var_list):
+    """Add ops to apply dense gradients to all the variables in `var_list`.
+
+    Only called if the subclass sets `self._fused`. All the variables have the
+    same dtype and device.
+
+    Args:
+      grads: A list of `Tensor`.
+      var_list: A list of `Variable` objects, one per gradient.
+
+    Return:
+      An `Operation`.
+    """
+    raise NotImplementedError()
+
   def _resource_apply_dense(self, grad, handle):
     """Add ops to apply dense gradients to the variable `handle`.
 
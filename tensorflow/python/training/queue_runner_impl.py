@@ -19,12 +19,20 @@ from __future__ import division
 from __future__ import print_function
 
 import threading
+import time
 import weakref
 
 from tensorflow.core.protobuf import queue_runner_pb2
+from tensorflow.python.framework import dtypes
 from tensorflow.python.framework import errors
 from tensorflow.python.framework import ops
+from tensorflow.python.ops import array_ops
+from tensorflow.python.ops import control_flow_ops
+from tensorflow.python.ops import math_ops
+from tensorflow.python.ops import state_ops
+from tensorflow.python.ops import variable_scope
 from tensorflow.python.platform import tf_logging as logging
+from tensorflow.python.summary import summary
 
 
 class QueueRunner(object):
@@ -42,11 +50,19 @@ class QueueRunner(object):
   and reporting exceptions, etc.
 
   The `QueueRunner`, combined with the `Coordinator`, helps handle these issues.
+
+  A `QueueRunner` can also autoscale its threads: with `min_threads`, only that
+  many enqueue threads run at first. Every `autoscale_interval_secs` the queue
+  is sampled: while it is less than `target_fill_fraction` full, one more
+  thread runs, up to one per op in `enqueue_ops`. While it is nearly full, one
+  thread is parked, down to `min_threads`. To let it scale, pass the same op
+  several times in `enqueue_ops`, e.g. `[enqueue_op] * max_threads`.
   """
 
   def __init__(self, queue=None, enqueue_ops=None, close_op=None,
                cancel_op=None, queue_closed_exception_types=None,
-               queue_runner_def=None, import_scope=None):
+               queue_runner_def=None, import_scope=None, min_threads=None,
+               target_fill_fraction=0.5, autoscale_interval_secs=1.0):
     """Create a QueueRunner.
 
     On construction the `QueueRunner` adds an op to close the queue.  That op
@@ -58,6 +74,13 @@ class QueueRunner(object):
     to all be the same op, but it is expected that they all enqueue tensors in
     `queue`.
 
+    With `min_threads`, the following scalar summaries are added, under a
+    `queue_runner` name scope: `fill_fraction`, how full the queue is (above
+    `min_after_dequeue` for a `RandomShuffleQueue`), `running_threads` and
+    `enqueues_per_sec`. The last two are local variables, set by the
+    `QueueRunner` every `autoscale_interval_secs`. Autoscaling is not kept by
+    `to_proto()`.
+
     Args:
       queue: A `Queue`.
       enqueue_ops: List of enqueue ops to run in threads later.
@@ -73,22 +96,34 @@ class QueueRunner(object):
         other arguments are mutually exclusive.
       import_scope: Optional `string`. Name scope to add. Only used when
         initializing from protocol buffer.
+      min_threads: Optional integer. If set, the number of threads is
+        autoscaled between `min_threads` and `len(enqueue_ops)`.
+      target_fill_fraction: A float in (0, 1). When autoscaling, threads are
+        added while the queue is less full than this.
+      autoscale_interval_secs: When autoscaling, how often the queue is
+        sampled.
 
     Raises:
       ValueError: If both `queue_runner_def` and `queue` are both specified.
       ValueError: If `queue` or `enqueue_ops` are not provided when not
         restoring from `queue_runner_def`.
+      ValueError: If `min_threads` or `target_fill_fraction` is not valid, or
+        if autoscaling an unbounded queue.
     """
     if queue_runner_def:
       if queue or enqueue_ops:
         raise ValueError("queue_runner_def and queue are mutually exclusive.")
       self._init_from_proto(queue_runner_def,
                             import_scope=import_scope)
+      self._min_threads = None
     else:
       self._init_from_args(
           queue=queue, enqueue_ops=enqueue_ops,
           close_op=close_op, cancel_op=cancel_op,
           queue_closed_exception_types=queue_closed_exception_types)
+      self._min_threads = min_threads
+      if min_threads is not None:
+        self._init_autoscaling(target_fill_fraction, autoscale_interval_secs)
     # Protect the count of runs to wait for.
     self._lock = threading.Lock()
     # A map from a session object to the number of outstanding queue runner
@@ -96,6 +131,16 @@ class QueueRunner(object):
     self._runs_per_session = weakref.WeakKeyDictionary()
     # List of exceptions raised by the running threads.
     self._exceptions_raised = []
+    # When autoscaling: signaled when the number of running threads changes.
+    self._threads_changed = threading.Condition(self._lock)
+    # When autoscaling: maps from a session object to the number of threads
+    # that are not parked, to whether the queue was closed by an enqueue op,
+    # to whether a thread stopped on another error, and to the number of
+    # enqueues done by each thread.
+    self._running_threads = weakref.WeakKeyDictionary()
+    self._input_exhausted = weakref.WeakKeyDictionary()
+    self._stopped = weakref.WeakKeyDictionary()
+    self._enqueue_counts = weakref.WeakKeyDictionary()
 
   def _init_from_args(self, queue=None, enqueue_ops=None, close_op=None,
                       cancel_op=None, queue_closed_exception_types=None):
@@ -145,6 +190,52 @@ class QueueRunner(object):
       self._queue_closed_exception_types = tuple(
           self._queue_closed_exception_types)
 
+  def _init_autoscaling(self, target_fill_fraction, autoscale_interval_secs):
+    """Creates the ops that sample the queue and publish the metrics."""
+    if not 0 < self._min_threads <= len(self._enqueue_ops):
+      raise ValueError("min_threads must be in [1, len(enqueue_ops)]: %s" %
+                       self._min_threads)
+    if not 0 < target_fill_fraction < 1:
+      raise ValueError("target_fill_fraction must be in (0, 1): %s" %
+                       target_fill_fraction)
+    queue_op = self._queue.queue_ref.op
+    try:
+      capacity = queue_op.get_attr("capacity")
+    except ValueError:
+      capacity = -1
+    if capacity <= 0:
+      raise ValueError("Cannot autoscale the threads of a queue without a "
+                       "capacity: %s" % self._queue.name)
+    try:
+      min_after_dequeue = queue_op.get_attr("min_after_dequeue")
+    except ValueError:
+      min_after_dequeue = 0
+    self._target_fill_fraction = target_fill_fraction
+    # Threads are parked above halfway between the target and a full queue.
+    self._park_fill_fraction = (1. + target_fill_fraction) / 2
+    self._autoscale_interval_secs = autoscale_interval_secs
+    with ops.name_scope(None, "queue_runner", [self._queue.queue_ref]):
+      self._fill_fraction = (
+          math_ops.cast(
+              math_ops.maximum(0, self._queue.size() - min_after_dequeue),
+              dtypes.float32) *
+          (1. / max(1, capacity - min_after_dequeue)))
+      running_threads = variable_scope.variable(
+          self._min_threads, name="running_threads", trainable=False,
+          collections=[ops.GraphKeys.LOCAL_VARIABLES])
+      enqueues_per_sec = variable_scope.variable(
+          0., name="enqueues_per_sec", trainable=False,
+          collections=[ops.GraphKeys.LOCAL_VARIABLES])
+      self._running_threads_value = array_ops.placeholder(dtypes.int32, [])
+      self._enqueues_per_sec_value = array_ops.placeholder(dtypes.float32, [])
+      self._update_metrics_op = control_flow_ops.group(
+          state_ops.assign(running_threads, self._running_threads_value),
+          state_ops.assign(enqueues_per_sec, self._enqueues_per_sec_value),
+          name="update_metrics")
+      summary.scalar("fill_fraction", self._fill_fraction)
+      summary.scalar("running_threads", running_threads.read_value())
+      summary.scalar("enqueues_per_sec", enqueues_per_sec.read_value())
+
   def _init_from_proto(self, queue_runner_def, import_scope=None):
     """Create a QueueRunner from `QueueRunnerDef`.
 
@@ -191,6 +282,11 @@ class QueueRunner(object):
   def queue_closed_exception_types(self):
     return self._queue_closed_exception_types
 
+  @property
+  def min_threads(self):
+    """The minimum number of threads when autoscaling, else `None`."""
+    return self._min_threads
+
   @property
   def exceptions_raised(self):
     """Exceptions raised but not handled by the `QueueRunner` threads.
@@ -215,8 +311,18 @@ class QueueRunner(object):
     """The string name of the underlying Queue."""
     return self._queue.name
 
+  def _wait_until_running(self, sess, thread_index, coord):
+    """Blocks while thread `thread_index` is parked. Returns False on stop."""
+    with self._lock:
+      while (thread_index >= self._running_threads[sess] and
+             not self._input_exhausted[sess]):
+        if self._stopped[sess] or (coord and coord.should_stop()):
+          return False
+        self._threads_changed.wait(self._autoscale_interval_secs)
+    return True
+
   # pylint: disable=broad-except
-  def _run(self, sess, enqueue_op, coord=None):
+  def _run(self, sess, enqueue_op, coord=None, thread_index=None):
     """Execute the enqueue op in a loop, close the queue in case of error.
 
     Args:
@@ -224,20 +330,33 @@ class QueueRunner(object):
       enqueue_op: The Operation to run.
       coord: Optional Coordinator object for reporting errors and checking
         for stop conditions.
+      thread_index: When autoscaling, the index of this thread, which is parked
+        while it is not less than the number of running threads.
     """
     decremented = False
     try:
       # Make a cached callable from the `enqueue_op` to decrease the
       # Python overhead in the queue-runner loop.
       enqueue_callable = sess.make_callable(enqueue_op)
+      if thread_index is not None:
+        enqueue_counts = self._enqueue_counts[sess]
       while True:
         if coord and coord.should_stop():
           break
+        if thread_index is not None:
+          if not self._wait_until_running(sess, thread_index, coord):
+            break
         try:
           enqueue_callable()
+          if thread_index is not None:
+            enqueue_counts[thread_index] += 1
         except self._queue_closed_exception_types:  # pylint: disable=catching-non-exception
           # This exception indicates that a queue was closed.
           with self._lock:
+            if thread_index is not None:
+              # Wake up the parked threads so that they see it too.
+              self._input_exhausted[sess] = True
+              self._threads_changed.notify_all()
             self._runs_per_session[sess] -= 1
             decremented = True
             if self._runs_per_session[sess] == 0:
@@ -249,6 +368,12 @@ class QueueRunner(object):
             return
     except Exception as e:
       # This catches all other exceptions.
+      if thread_index is not None:
+        # Without a coordinator, nothing else would stop the parked threads,
+        # e.g. when the session is closed.
+        with self._lock:
+          self._stopped[sess] = True
+          self._threads_changed.notify_all()
       if coord:
         coord.request_stop(e)
       else:
@@ -276,6 +401,54 @@ class QueueRunner(object):
     except Exception as e:
       # Intentionally ignore errors from cancel_op.
       logging.vlog(1, "Ignored exception: %s", str(e))
+
+  def _autoscale(self, sess, coord):
+    """Samples the queue, publishes the metrics and parks or adds threads.
+
+    Args:
+      sess: A Session.
+      coord: Optional Coordinator.
+    """
+    enqueue_counts = self._enqueue_counts[sess]
+    last_count = sum(enqueue_counts)
+    last_time = time.time()
+    while True:
+      if coord:
+        if coord.wait_for_stop(self._autoscale_interval_secs):
+          return
+      else:
+        time.sleep(self._autoscale_interval_secs)
+      with self._lock:
+        if self._runs_per_session[sess] <= 0:
+          return
+      try:
+        fill_fraction = sess.run(self._fill_fraction)
+      except Exception as e:
+        # The session is usually being closed.
+        logging.vlog(1, "Ignored exception: %s", str(e))
+        return
+      count = sum(enqueue_counts)
+      now = time.time()
+      enqueues_per_sec = (count - last_count) / max(now - last_time, 1e-6)
+      last_count, last_time = count, now
+      with self._lock:
+        running = self._running_threads[sess]
+        if (fill_fraction < self._target_fill_fraction and
+            running < len(self._enqueue_ops)):
+          running += 1
+        elif (fill_fraction > self._park_fill_fraction and
+              running > self._min_threads):
+          running -= 1
+        self._running_threads[sess] = running
+        self._threads_changed.notify_all()
+      try:
+        sess.run(self._update_metrics_op,
+                 {self._running_threads_value: running,
+                  self._enqueues_per_sec_value: enqueues_per_sec})
+      except Exception as e:
+        # E.g. the local variables are not initialized: the metrics are best
+        # effort.
+        logging.vlog(1, "Ignored exception: %s", str(e))
   # pylint: enable=broad-except
 
   def create_threads(self, sess, coord=None, daemon=False, start=False):
@@ -290,6 +463,8 @@ class QueueRunner(object):
     this method starts an additional thread to close the queue when the
     coordinator requests a stop.
 
+    When autoscaling, one more thread parks and adds enqueue threads.
+
     If previously created threads for the given session are still running, no
     new threads will be created.
 
@@ -314,9 +489,21 @@ class QueueRunner(object):
         pass
       self._runs_per_session[sess] = len(self._enqueue_ops)
       self._exceptions_raised = []
-
-    ret_threads = [threading.Thread(target=self._run, args=(sess, op, coord))
-                   for op in self._enqueue_ops]
+      if self._min_threads is not None:
+        self._running_threads[sess] = self._min_threads
+        self._input_exhausted[sess] = False
+        self._stopped[sess] = False
+        self._enqueue_counts[sess] = [0] * len(self._enqueue_ops)
+
+    if self._min_threads is None:
+      ret_threads = [threading.Thread(target=self._run, args=(sess, op, coord))
+                     for op in self._enqueue_ops]
+    else:
+      ret_threads = [
+          threading.Thread(target=self._run, args=(sess, op, coord, i))
+          for i, op in enumerate(self._enqueue_ops)]
+      ret_threads.append(threading.Thread(target=self._autoscale,
+                                          args=(sess, coord)))
     if coord:
       ret_threads.append(threading.Thread(target=self._close_on_stop,
                                           args=(sess, self._cancel_op, coord)))
@@ -267,6 +267,82 @@ class QueueRunnerTest(test.TestCase):
       # The variable should be 3.
       self.assertEqual(3, var.eval())
 
+  def testAutoscalingExhaustsInput(self):
+    with self.test_session() as sess:
+      zero64 = constant_op.constant(0, dtype=dtypes.int64)
+      var = variables.Variable(zero64)
+      queue = data_flow_ops.FIFOQueue(10, dtypes.int64)
+      enqueue = queue.enqueue((var.count_up_to(100),))
+      dequeue = queue.dequeue()
+      qr = queue_runner_impl.QueueRunner(
+          queue, [enqueue] * 4, min_threads=1, autoscale_interval_secs=0.001)
+      variables.global_variables_initializer().run()
+      variables.local_variables_initializer().run()
+      coord = coordinator.Coordinator()
+      threads = qr.create_threads(sess, coord=coord, start=True)
+      self.assertItemsEqual(range(100), [dequeue.eval() for _ in range(100)])
+      # All the threads, parked or not, see the end of the input and close the
+      # queue.
+      with self.assertRaises(errors_impl.OutOfRangeError):
+        dequeue.eval()
+      coord.request_stop()
+      coord.join(threads)
+      self.assertEqual(0, len(qr.exceptions_raised))
+
+  def testAutoscalingAddsThreads(self):
+    with self.test_session() as sess:
+      queue = data_flow_ops.FIFOQueue(1000000, dtypes.float32)
+      enqueue = queue.enqueue((1.0,))
+      qr = queue_runner_impl.QueueRunner(
+          queue, [enqueue] * 3, min_threads=1, autoscale_interval_secs=0.001)
+      self.assertEqual(1, qr.min_threads)
+      self.assertEqual(3, len(ops.get_collection(ops.GraphKeys.SUMMARIES)))
+      running_threads = sess.graph.get_tensor_by_name(
+          "queue_runner/running_threads:0")
+      variables.local_variables_initializer().run()
+      self.assertEqual(1, running_threads.eval())
+      coord = coordinator.Coordinator()
+      threads = qr.create_threads(sess, coord=coord, start=True)
+      # The queue stays far below the target fill fraction.
+      while running_threads.eval() != 3:
+        time.sleep(0.01)
+      coord.request_stop()
+      coord.join(threads)
+      self.assertGreater(queue.size().eval(), 0)
+
+  def testAutoscalingStopsParkedThreadsWithoutCoordinator(self):
+    with ops.Graph().as_default():
+      queue = data_flow_ops.FIFOQueue(1, dtypes.float32)
+      enqueue = queue.enqueue((1.0,))
+      qr = queue_runner_impl.QueueRunner(
+          queue, [enqueue] * 3, min_threads=1, autoscale_interval_secs=0.01)
+      sess = session.Session()
+      variables.local_variables_initializer().run(session=sess)
+      # The queue stays full: one thread blocks in its enqueue and the other
+      # two stay parked.
+      sess.run(enqueue)
+      threads = qr.create_threads(sess, start=True)
+      time.sleep(0.1)
+      # The blocked enqueue fails, which stops the parked threads too.
+      sess.close()
+      for t in threads:
+        t.join(10)
+        self.assertFalse(t.is_alive())
+      self.assertEqual(1, len(qr.exceptions_raised))
+
+  def testAutoscalingInvalidArguments(self):
+    queue = data_flow_ops.FIFOQueue(10, dtypes.float32)
+    enqueue = queue.enqueue((1.0,))
+    with self.assertRaisesRegexp(ValueError, "min_threads"):
+      queue_runner_impl.QueueRunner(queue, [enqueue] * 2, min_threads=3)
+    with self.assertRaisesRegexp(ValueError, "target_fill_fraction"):
+      queue_runner_impl.QueueRunner(
+          queue, [enqueue], min_threads=1, target_fill_fraction=1.)
+    unbounded = data_flow_ops.FIFOQueue(-1, dtypes.float32)
+    with self.assertRaisesRegexp(ValueError, "capacity"):
+      queue_runner_impl.QueueRunner(
+          unbounded, [unbounded.enqueue((1.0,))], min_threads=1)
+
   def testQueueRunnerSerializationRoundTrip(self):
     graph = ops.Graph()
     with graph.as_default():
@@ -60,7 +60,8 @@ class RMSPropOptimizer(optimizer.Optimizer):
                epsilon=1e-10,
                use_locking=False,
                centered=False,
-               name="RMSProp"):
+               name="RMSProp",
+               fused=False):
     """Construct a new RMSProp optimizer.
 
     Note that in dense implement of this algorithm, m_t and v_t will
@@ -79,8 +80,18 @@ class RMSPropOptimizer(optimizer.Optimizer):
         computation and memory. Defaults to False.
       name: Optional name prefix for the operations created when applying
         gradients. Defaults to "RMSProp".
+      fused: If `True`, dense gradients of (non-resource) variables are applied
+        with a single op for each group of variables that share a dtype and a
+        device, instead of one op per variable. The slots are the same either
+        way, so checkpoints can be shared with `fused=False`.
+
+    Raises:
+      ValueError: If both `centered` and `fused` are set.
     """
+    if centered and fused:
+      raise ValueError("fused is not supported with centered RMSProp.")
     super(RMSPropOptimizer, self).__init__(use_locking, name)
+    self._fused = fused
     self._learning_rate = learning_rate
     self._decay = decay
     self._momentum = momentum
@@ -139,6 +150,19 @@ class RMSPropOptimizer(optimizer.Optimizer):
           grad,
           use_locking=self._use_locking).op
 
+  def _apply_dense_fused(self, grads, var_list):
+    dtype = var_list[0].dtype.base_dtype
+    return training_ops.multi_apply_rms_prop(
+        var_list,
+        [self.get_slot(var, "rms") for var in var_list],
+        [self.get_slot(var, "momentum") for var in var_list],
+        math_ops.cast(self._learning_rate_tensor, dtype),
+        math_ops.cast(self._decay_tensor, dtype),
+        math_ops.cast(self._momentum_tensor, dtype),
+        math_ops.cast(self._epsilon_tensor, dtype),
+        grads,
+        use_locking=self._use_locking)[0].op
+
   def _resource_apply_dense(self, grad, var):
     rms = self.get_slot(var, "rms")
     mom = self.get_slot(var, "momentum")
@@ -162,6 +162,46 @@ class RMSPropOptimizerTest(test.TestCase):
           self.assertAllCloseAccordingToType(var0_np, var0.eval())
           self.assertAllCloseAccordingToType(var1_np, var1.eval())
 
+  def testDenseFused(self):
+    for dtype in _DATA_TYPES:
+      for momentum in [0.0, 0.9]:
+        with self.test_session(use_gpu=True):
+          var0_np = np.array([1.0, 2.0], dtype=dtype.as_numpy_dtype)
+          grads0_np = np.array([0.1, 0.2], dtype=dtype.as_numpy_dtype)
+          var1_np = np.array([3.0, 4.0], dtype=dtype.as_numpy_dtype)
+          grads1_np = np.array([0.01, 0.2], dtype=dtype.as_numpy_dtype)
+          var0 = variables.Variable(var0_np)
+          var1 = variables.Variable(var1_np)
+          opt = rmsprop.RMSPropOptimizer(
+              learning_rate=2.0, momentum=momentum, epsilon=1e-3, fused=True)
+          update = opt.apply_gradients(
+              zip([constant_op.constant(grads0_np),
+                   constant_op.constant(grads1_np)], [var0, var1]))
+          variables.global_variables_initializer().run()
+
+          mg0_np = np.array([0.0, 0.0], dtype=dtype.as_numpy_dtype)
+          mg1_np = np.array([0.0, 0.0], dtype=dtype.as_numpy_dtype)
+          rms0_np = np.array([1.0, 1.0], dtype=dtype.as_numpy_dtype)
+          rms1_np = np.array([1.0, 1.0], dtype=dtype.as_numpy_dtype)
+          mom0_np = np.array([0.0, 0.0], dtype=dtype.as_numpy_dtype)
+          mom1_np = np.array([0.0, 0.0], dtype=dtype.as_numpy_dtype)
+          for _ in range(3):
+            update.run()
+            var0_np, mg0_np, rms0_np, mom0_np = self._rmsprop_update_numpy(
+                var0_np, grads0_np, mg0_np, rms0_np, mom0_np, 2.0, 0.9,
+                momentum, 1e-3, False)
+            var1_np, mg1_np, rms1_np, mom1_np = self._rmsprop_update_numpy(
+                var1_np, grads1_np, mg1_np, rms1_np, mom1_np, 2.0, 0.9,
+                momentum, 1e-3, False)
+            self.assertAllCloseAccordingToType(rms0_np,
+                                               opt.get_slot(var0, "rms").eval())
+            self.assertAllCloseAccordingToType(var0_np, var0.eval())
+            self.assertAllCloseAccordingToType(var1_np, var1.eval())
+
+  def testFusedCentered(self):
+    with self.assertRaisesRegexp(ValueError, "centered"):
+      rmsprop.RMSPropOptimizer(learning_rate=2.0, centered=True, fused=True)
+
   def testMinimizeSparseResourceVariable(self):
     for dtype in [dtypes.float32, dtypes.float64]:
       with self.test_session():
@@ -22,8 +22,10 @@ from __future__ import print_function
 import collections
 import os.path
 import re
+import threading
 import time
 import uuid
+import weakref
 
 import numpy as np
 import six
@@ -35,12 +37,14 @@ from tensorflow.core.protobuf import saver_pb2
 from tensorflow.python.client import session
 from tensorflow.python.framework import constant_op
 from tensorflow.python.framework import device as pydev
+from tensorflow.python.framework import dtypes
 from tensorflow.python.framework import errors
 from tensorflow.python.framework import meta_graph
 from tensorflow.python.framework import ops
 from tensorflow.python.lib.io import file_io
 from tensorflow.python.ops import array_ops
 from tensorflow.python.ops import control_flow_ops
+from tensorflow.python.ops import gen_array_ops
 from tensorflow.python.ops import gen_io_ops
 from tensorflow.python.ops import io_ops
 from tensorflow.python.ops import resource_variable_ops
@@ -49,6 +53,8 @@ from tensorflow.python.ops import string_ops
 from tensorflow.python.ops import variables
 from tensorflow.python.platform import gfile
 from tensorflow.python.platform import tf_logging as logging
+from tensorflow.python.training import coordinator
+from tensorflow.python.training import delta_checkpoint
 from tensorflow.python.training import training_util
 from tensorflow.python.training.checkpoint_state_pb2 import CheckpointState
 from tensorflow.python.util import compat
@@ -61,6 +67,10 @@ _VARIABLE_OPS = set(["Variable",
                      "VarHandleOp",
                      "ReadVariableOp"])
 
+# Default bound on the bytes read from a checkpoint but not yet assigned to
+# their variables during a streaming restore.
+_DEFAULT_RESTORE_MEMORY_BUDGET = 1 << 30
+
 
 def _set_cpu0(device_string):
   """Creates a new device string based on `device_string` but using /CPU:0.
@@ -708,6 +718,351 @@ class BaseSaverBuilder(object):
         keep_checkpoint_every_n_hours=keep_checkpoint_every_n_hours,
         version=self._write_version)
 
+  @staticmethod
+  def _CanRestoreInPieces(saveable):
+    """Whether `saveable` is a variable that can be restored a row at a time."""
+    if type(saveable) not in (BaseSaverBuilder.VariableSaveable,
+                              BaseSaverBuilder.ResourceVariableSaveable):
+      return False
+    spec = saveable.specs[0]
+    shape = spec.tensor.get_shape()
+    if not (shape.is_fully_defined() and shape.ndims > 0 and
+            spec.tensor.dtype.base_dtype != dtypes.string):
+      return False
+    if shape[0].value > np.iinfo(np.int32).max:
+      # The rows are assigned with int32 indices.
+      return False
+    if spec.slice_spec:
+      # A piece of a variable partitioned along another dimension than the
+      # first is not a range of rows of the saved tensor, and reading it
+      # would read the whole stored partition once per piece.
+      full_shape, var_slices = spec.slice_spec.rsplit(" ", 1)
+      for dim, dim_slice in zip(full_shape.split()[1:],
+                                var_slices.split(":")[1:]):
+        if dim_slice not in ("-", "0,%s" % dim):
+          return False
+    return True
+
+  def _AddRowRestoreOps(self, filename_tensor, saveable):
+    """Adds the ops that restore a range of rows of a variable.
+
+    Args:
+      filename_tensor: Tensor for the path of the file to load.
+      saveable: A `VariableSaveable` or `ResourceVariableSaveable` for which
+        `_CanRestoreInPieces()` is true.
+
+    Returns:
+      A `_RowRestoreOps`.
+    """
+    spec = saveable.specs[0]
+    dtype = spec.tensor.dtype.base_dtype
+    shape = spec.tensor.get_shape()
+    with ops.device(_set_cpu0(saveable.device) if saveable.device else None):
+      slice_spec = array_ops.placeholder(dtypes.string, [1], name="slice_spec")
+      # The GPU kernels of the strided slice assigns only take int32 indices.
+      begin = array_ops.placeholder(dtypes.int32, [1], name="begin")
+      end = array_ops.placeholder(dtypes.int32, [1], name="end")
+      strides = constant_op.constant([1], dtype=dtypes.int32)
+      rows = io_ops.restore_v2(filename_tensor, [spec.name], slice_spec,
+                               [dtype])[0]
+    if isinstance(saveable, BaseSaverBuilder.VariableSaveable):
+      var = saveable.op
+      with ops.colocate_with(var):
+        is_initialized = state_ops.is_variable_initialized(var)
+        initialize = state_ops.assign(var, array_ops.zeros(shape, dtype)).op
+        assign_rows = gen_array_ops.strided_slice_assign(
+            ref=var, begin=begin, end=end, strides=strides, value=rows).op
+    else:
+      handle = saveable.handle_op
+      with ops.colocate_with(handle):
+        is_initialized = resource_variable_ops.var_is_initialized_op(handle)
+        initialize = resource_variable_ops.assign_variable_op(
+            handle, array_ops.zeros(shape, dtype))
+        assign_rows = gen_array_ops.resource_strided_slice_assign(
+            ref=handle, begin=begin, end=end, strides=strides, value=rows)
+    return _RowRestoreOps(spec.name, spec.slice_spec, shape.as_list(), dtype,
+                          slice_spec, begin, end, is_initialized, initialize,
+                          assign_rows)
+
+  def build_streaming_restore(self, names_to_saveables, reshape=False):
+    """Adds the ops for restoring variables in pieces of consecutive rows.
+
+    Restoring a variable with a single op holds all of it in memory twice,
+    once as read from the checkpoint and once in the variable. The ops added
+    here instead read a range of rows of a variable and assign it into the
+    variable, so that a restore can be split into many small steps, run in
+    parallel with a bound on the memory they use. See `Saver.restore()`.
+
+    Saveables that are not plain variables of known shape and rank of at
+    least 1, partitions of variables partitioned along another dimension than
+    the first, and all saveables if `reshape` is true, are restored whole by
+    a single restore op.
+
+    Args:
+      names_to_saveables: A dictionary mapping name to a Variable or
+        SaveableObject, as for `build()`.
+      reshape: If True, allow restoring parameters from a checkpoint
+        where the parameters have a different shape.
+
+    Returns:
+      A `_StreamingRestore`.
+
+    Raises:
+      TypeError: If 'names_to_saveables' is not a dictionary mapping string
+        keys to variable Tensors.
+      ValueError: If any of the keys or values in 'names_to_saveables' is not
+        unique.
+    """
+    saveables = self._ValidateAndSliceInputs(names_to_saveables)
+    with ops.name_scope(None, "streaming_restore",
+                        [saveable.op for saveable in saveables]):
+      filename_tensor = constant_op.constant("model")
+      row_restores = []
+      remaining = []
+      for saveable in saveables:
+        if not reshape and self._CanRestoreInPieces(saveable):
+          row_restores.append(self._AddRowRestoreOps(filename_tensor,
+                                                     saveable))
+        else:
+          remaining.append(saveable)
+      remaining_restore_op = None
+      if remaining:
+        remaining_restore_op = self._AddRestoreOps(
+            filename_tensor, remaining, restore_sequentially=False,
+            reshape=reshape, name="restore_remaining")
+    return _StreamingRestore(filename_tensor, row_restores,
+                             remaining_restore_op)
+
+
+class RestoreStats(object):
+  """Statistics of a streaming `Saver.restore()`.
+
+  Only the variables restored in pieces are counted; see
+  `BaseSaverBuilder.build_streaming_restore()`.
+  """
+
+  def __init__(self):
+    self._num_bytes = 0
+    self._total_time = 0.0
+    self._variable_times = {}
+
+  @property
+  def num_bytes(self):
+    """The number of bytes read from the checkpoint."""
+    return self._num_bytes
+
+  @property
+  def total_time(self):
+    """The time in seconds the restore took."""
+    return self._total_time
+
+  @property
+  def bytes_per_second(self):
+    """The average restore throughput."""
+    if not self._total_time:
+      return 0.0
+    return self._num_bytes / self._total_time
+
+  @property
+  def variable_times(self):
+    """A dictionary from checkpoint name to the time in seconds spent on it.
+
+    The time of a variable runs from the start of its first piece to the end
+    of its last one, so the times of variables restored in parallel overlap.
+    """
+    return dict(self._variable_times)
+
+  def __repr__(self):
+    return ("<RestoreStats num_bytes=%d total_time=%.3fs "
+            "bytes_per_second=%.0f>" % (self._num_bytes, self._total_time,
+                                        self.bytes_per_second))
+
+
+class _RowRestoreOps(object):
+  """The ops that restore a range of rows of one variable."""
+
+  def __init__(self, name, slice_spec, shape, dtype, slice_spec_tensor,
+               begin_tensor, end_tensor, is_initialized, initialize,
+               assign_rows):
+    """Creates a `_RowRestoreOps`.
+
+    Args:
+      name: The name of the tensor in the checkpoint.
+      slice_spec: The slice of the tensor held by the variable, as in
+        `Variable.SaveSliceInfo.spec`, or "" for a whole tensor.
+      shape: The shape of the variable, as a list.
+      dtype: The `DType` of the variable.
+      slice_spec_tensor: A string placeholder of shape [1] for the slice of
+        the tensor to read.
+      begin_tensor: An int32 placeholder of shape [1] for the first row of the
+        variable to assign.
+      end_tensor: An int32 placeholder of shape [1] for the end of the rows
+        of the variable to assign.
+      is_initialized: A bool `Tensor` that is true if the variable has been
+        initialized.
+      initialize: An `Operation` that initializes the variable with zeros.
+      assign_rows: An `Operation` that reads the rows selected by the
+        placeholders and assigns them into the variable.
+    """
+    self.name = name
+    self.slice_spec = slice_spec
+    self.num_rows = shape[0]
+    self.row_bytes = int(np.prod(shape[1:], dtype=np.int64)) * dtype.size
+    self._shape = shape
+    self.slice_spec_tensor = slice_spec_tensor
+    self.begin_tensor = begin_tensor
+    self.end_tensor = end_tensor
+    self.is_initialized = is_initialized
+    self.initialize = initialize
+    self.assign_rows = assign_rows
+
+  def rows_slice_spec(self, begin, end):
+    """Returns the checkpoint slice spec of rows [begin, end) of the variable.
+
+    Args:
+      begin: The first row.
+      end: The end of the rows.
+
+    Returns:
+      A slice spec string for the `shape_and_slices` input of `restore_v2`.
+    """
+    if self.slice_spec:
+      full_shape, var_slices = self.slice_spec.rsplit(" ", 1)
+      dim_slices = var_slices.split(":")
+      if dim_slices[0] == "-":
+        offset = 0
+      else:
+        offset = int(dim_slices[0].split(",")[0])
+    else:
+      full_shape = " ".join(str(dim) for dim in self._shape)
+      dim_slices = ["-"] * len(self._shape)
+      offset = 0
+    dim_slices[0] = "%d,%d" % (offset + begin, end - begin)
+    return "%s %s" % (full_shape, ":".join(dim_slices))
+
+
+class _MemoryBudget(object):
+  """Bounds the total size of the pieces restored at the same time."""
+
+  def __init__(self, num_bytes):
+    self._num_bytes = num_bytes
+    self._in_use = 0
+    self._cond = threading.Condition()
+
+  def acquire(self, num_bytes):
+    with self._cond:
+      # A piece larger than the budget is restored on its own.
+      while self._in_use and self._in_use + num_bytes > self._num_bytes:
+        self._cond.wait()
+      self._in_use += num_bytes
+
+  def release(self, num_bytes):
+    with self._cond:
+      self._in_use -= num_bytes
+      self._cond.notify_all()
+
+
+class _StreamingRestore(object):
+  """Restores variables in pieces of consecutive rows, in parallel."""
+
+  def __init__(self, filename_tensor, row_restores, remaining_restore_op):
+    """Creates a `_StreamingRestore`.
+
+    Args:
+      filename_tensor: The tensor to feed with the checkpoint path.
+      row_restores: A list of `_RowRestoreOps`.
+      remaining_restore_op: An `Operation` that restores the saveables that
+        cannot be restored in pieces, or None.
+    """
+    self._filename_tensor = filename_tensor
+    self._row_restores = row_restores
+    self._remaining_restore_op = remaining_restore_op
+
+  def run(self, sess, save_path, num_threads, memory_budget):
+    """Restores the variables from `save_path`.
+
+    Each variable is split into pieces of at most `memory_budget /
+    num_threads` bytes. `num_threads` threads restore the pieces, each with
+    its own `Session.run()`, while the pieces being restored add up to at
+    most `memory_budget` bytes. Variables that are not initialized yet are
+    first initialized with zeros, which allocates their memory.
+
+    Args:
+      sess: A `Session` to use to restore the parameters.
+      save_path: Path where parameters were previously saved.
+      num_threads: The number of pieces to restore in parallel.
+      memory_budget: The bound on the bytes of the pieces being restored.
+
+    Returns:
+      A `RestoreStats`.
+    """
+    stats = RestoreStats()
+    start_time = time.time()
+    if self._row_restores:
+      initialized = sess.run([r.is_initialized for r in self._row_restores])
+      initializers = [r.initialize for r, is_initialized
+                      in zip(self._row_restores, initialized)
+                      if not is_initialized]
+      if initializers:
+        sess.run(initializers)
+    if self._remaining_restore_op is not None:
+      sess.run(self._remaining_restore_op, {self._filename_tensor: save_path})
+
+    piece_bytes = max(1, memory_budget // num_threads)
+    pieces = collections.deque()
+    for r in self._row_restores:
+      rows_per_piece = max(1, piece_bytes // max(1, r.row_bytes))
+      for begin in six.moves.range(0, r.num_rows, rows_per_piece):
+        pieces.append((r, begin, min(begin + rows_per_piece, r.num_rows)))
+
+    coord = coordinator.Coordinator()
+    budget = _MemoryBudget(memory_budget)
+    lock = threading.Lock()
+    # Checkpoint name -> (start of the first piece, end of the last piece).
+    variable_intervals = {}
+
+    def _RestorePieces():
+      with coord.stop_on_exception():
+        while not coord.should_stop():
+          with lock:
+            if not pieces:
+              return
+            r, begin, end = pieces.popleft()
+          num_bytes = (end - begin) * r.row_bytes
+          budget.acquire(num_bytes)
+          try:
+            piece_start = time.time()
+            sess.run(r.assign_rows,
+                     {self._filename_tensor: save_path,
+                      r.slice_spec_tensor: [r.rows_slice_spec(begin, end)],
+                      r.begin_tensor: [begin],
+                      r.end_tensor: [end]})
+            piece_end = time.time()
+          finally:
+            budget.release(num_bytes)
+          with lock:
+            # pylint: disable=protected-access
+            stats._num_bytes += num_bytes
+            # pylint: enable=protected-access
+            first_start, last_end = variable_intervals.get(
+                r.name, (piece_start, piece_end))
+            variable_intervals[r.name] = (min(first_start, piece_start),
+                                          max(last_end, piece_end))
+
+    threads = [threading.Thread(target=_RestorePieces)
+               for _ in six.moves.range(min(num_threads, len(pieces)))]
+    for t in threads:
+      t.start()
+    coord.join(threads)
+
+    # pylint: disable=protected-access
+    stats._total_time = time.time() - start_time
+    for name, (first_start, last_end) in variable_intervals.items():
+      stats._variable_times[name] = last_end - first_start
+      logging.vlog(1, "Restored %s in %.3fs", name, last_end - first_start)
+    # pylint: enable=protected-access
+    return stats
+
 
 def _get_saver_or_default():
   """Returns the saver from SAVERS collection, or creates a default one.
@@ -1034,7 +1389,10 @@ class Saver(object):
                write_version=saver_pb2.SaverDef.V2,
                pad_step_number=False,
                save_relative_paths=False,
-               filename=None):
+               filename=None,
+               restore_threads=None,
+               restore_memory_budget=None,
+               max_deltas=None):
     """Creates a `Saver`.
 
     The constructor adds ops to save and restore variables.
@@ -1071,6 +1429,42 @@ class Saver(object):
     The optional `sharded` argument, if `True`, instructs the saver to shard
     checkpoints per device.
 
+    The optional `restore_threads` argument makes `restore()` stream the
+    variables from the checkpoint instead of running a single restore op,
+    which holds every variable in memory twice: once as read and once in the
+    variable. Variables are read and assigned in pieces of consecutive rows,
+    with `restore_threads` pieces in flight at once and at most
+    `restore_memory_budget` bytes read but not yet assigned. The bound holds
+    when the checkpoint stores each variable whole or partitioned along its
+    first dimension, which is how savers write unpartitioned variables and
+    variables partitioned by rows. A piece that overlaps a saved partition
+    split along another dimension reads that whole partition, so restoring
+    such a checkpoint may use more memory than the budget. Statistics of the
+    last streaming restore are available as `last_restore_stats`:
+
+    ```python
+    saver = tf.train.Saver(restore_threads=16,
+                           restore_memory_budget=4 << 30)
+    saver.restore(sess, checkpoint_path)
+    print(saver.last_restore_stats.bytes_per_second)
+    ```
+
+    The optional `max_deltas` argument makes `save()` write incremental
+    checkpoints. The first checkpoint written by the saver is a full one;
+    the next `max_deltas` checkpoints only hold the variables, and for
+    variables of rank 2 or more the rows, that changed since the previous
+    checkpoint. The checkpoint after that is full again, which bounds the
+    number of files needed to resolve a checkpoint. The `restore()` of a
+    saver created with `max_deltas` and `checkpoint_utils.load_variable()`
+    resolve delta checkpoints transparently; other savers refuse to restore
+    them. Old checkpoints are only deleted once no kept delta checkpoint
+    depends on them. This works well for large embedding tables of
+    which each step only updates a few rows:
+
+    ```python
+    saver = tf.train.Saver(max_deltas=10)
+    ```
+
     Args:
       var_list: A list of `Variable`/`SaveableObject`, or a dictionary mapping
         names to `SaveableObject`s. If `None`, defaults to the list of all
@@ -1112,11 +1506,36 @@ class Saver(object):
         checkpoint directory and reload from the copied directory.
       filename: If known at graph construction time, filename used for variable
         loading/saving.
+      restore_threads: If set, the number of pieces of variables that
+        `restore()` restores in parallel. If `None`, `restore()` runs a
+        single restore op.
+      restore_memory_budget: The maximum number of bytes read by a streaming
+        `restore()` but not yet assigned to their variables. Defaults to 1GB.
+      max_deltas: If set, the number of delta checkpoints written between two
+        full checkpoints. Requires unsharded V2 checkpoints of unpartitioned
+        reference variables. If `None`, every checkpoint is a full one.
 
     Raises:
       TypeError: If `var_list` is invalid.
-      ValueError: If any of the keys or values in `var_list` are not unique.
+      ValueError: If any of the keys or values in `var_list` are not unique,
+        if `restore_threads` or `restore_memory_budget` is not positive, or if
+        `max_deltas` is negative or used with an unsupported configuration.
     """
+    if restore_threads is not None and restore_threads < 1:
+      raise ValueError("restore_threads must be positive: %s" %
+                       restore_threads)
+    if restore_memory_budget is None:
+      restore_memory_budget = _DEFAULT_RESTORE_MEMORY_BUDGET
+    elif restore_memory_budget < 1:
+      raise ValueError("restore_memory_budget must be positive: %s" %
+                       restore_memory_budget)
+    if max_deltas is not None:
+      if max_deltas < 0:
+        raise ValueError("max_deltas must not be negative: %s" % max_deltas)
+      if (saver_def is not None or sharded or
+          write_version != saver_pb2.SaverDef.V2):
+        raise ValueError("max_deltas requires an unsharded V2 Saver built "
+                         "from variables, not from a SaverDef.")
     if defer_build and var_list:
       raise ValueError(
           "If `var_list` is provided then build cannot be deferred. "
@@ -1136,6 +1555,20 @@ class Saver(object):
     self._write_version = write_version
     self._pad_step_number = pad_step_number
     self._filename = filename
+    self._restore_threads = restore_threads
+    self._restore_memory_budget = restore_memory_budget
+    self._streaming_restore = None
+    self._last_restore_stats = None
+    self._max_deltas = max_deltas
+    self._delta_ops = None
+    # The checkpoint the next delta is written on top of, a weak reference to
+    # the session that wrote it, and the number of deltas since the last full
+    # checkpoint.
+    self._delta_parent = None
+    self._delta_session = None
+    self._num_deltas = 0
+    # Checkpoints past `max_to_keep` that kept deltas still depend on.
+    self._delta_bases_to_delete = []
     if not defer_build:
       self.build()
     if self.saver_def:
@@ -1170,6 +1603,16 @@ class Saver(object):
           name=self._name,
           restore_sequentially=self._restore_sequentially,
           filename=self._filename)
+      if self._restore_threads is not None:
+        self._streaming_restore = self._builder.build_streaming_restore(
+            self._var_list, reshape=self._reshape)
+      if self._max_deltas is not None:
+        # pylint: disable=protected-access
+        with ops.name_scope(self._name, "delta_checkpoint"):
+          self._delta_ops = delta_checkpoint.DeltaCheckpointOps(
+              self._builder._ValidateAndSliceInputs(self._var_list),
+              self._builder.save_op)
+        # pylint: enable=protected-access
     elif self.saver_def and self._name:
       # Since self._name is used as a name_scope by builder(), we are
       # overloading the use of this field to represent the "import_scope" as
@@ -1262,20 +1705,41 @@ class Saver(object):
         return
 
       # Otherwise delete the files.
+      if self._delta_ops is not None:
+        self._delta_bases_to_delete.append(self._CheckpointFilename(p))
+        self._DeleteUnusedDeltaBases(meta_graph_suffix)
+      else:
+        self._DeleteCheckpoint(self._CheckpointFilename(p), meta_graph_suffix)
+
+  def _DeleteUnusedDeltaBases(self, meta_graph_suffix):
+    """Deletes dropped checkpoints that no kept checkpoint depends on."""
+    in_use = set()
+    for p in self._last_checkpoints:
       try:
-        checkpoint_prefix = self._CheckpointFilename(p)
-        self._delete_file_if_exists(
-            self._MetaGraphFilename(checkpoint_prefix, meta_graph_suffix))
-        if self.saver_def.version == saver_pb2.SaverDef.V2:
-          # V2 has a metadata file and some data files.
-          self._delete_file_if_exists(checkpoint_prefix + ".index")
-          self._delete_file_if_exists(checkpoint_prefix +
-                                      ".data-?????-of-?????")
-        else:
-          # V1, Legacy.  Exact match on the data file.
-          self._delete_file_if_exists(checkpoint_prefix)
-      except Exception as e:  # pylint: disable=broad-except
+        in_use.update(
+            delta_checkpoint.checkpoint_chain(self._CheckpointFilename(p)))
+      except errors.OpError as e:
         logging.warning("Ignoring: %s", str(e))
+    to_delete = [prefix for prefix in self._delta_bases_to_delete
+                 if prefix not in in_use]
+    for prefix in to_delete:
+      self._delta_bases_to_delete.remove(prefix)
+      self._DeleteCheckpoint(prefix, meta_graph_suffix)
+
+  def _DeleteCheckpoint(self, checkpoint_prefix, meta_graph_suffix):
+    try:
+      self._delete_file_if_exists(
+          self._MetaGraphFilename(checkpoint_prefix, meta_graph_suffix))
+      if self.saver_def.version == saver_pb2.SaverDef.V2:
+        # V2 has a metadata file and some data files.
+        self._delete_file_if_exists(checkpoint_prefix + ".index")
+        self._delete_file_if_exists(checkpoint_prefix +
+                                    ".data-?????-of-?????")
+      else:
+        # V1, Legacy.  Exact match on the data file.
+        self._delete_file_if_exists(checkpoint_prefix)
+    except Exception as e:  # pylint: disable=broad-except
+      logging.warning("Ignoring: %s", str(e))
 
   def _delete_file_if_exists(self, filespec):
     for pathname in file_io.get_matching_files(filespec):
@@ -1329,6 +1793,14 @@ class Saver(object):
     """
     return Saver(saver_def=saver_def, name=import_scope)
 
+  @property
+  def last_restore_stats(self):
+    """The `RestoreStats` of the last streaming `restore()`, or None.
+
+    See the `restore_threads` argument of the constructor.
+    """
+    return self._last_restore_stats
+
   @property
   def last_checkpoints(self):
     """List of not-yet-deleted checkpoint filenames.
@@ -1469,19 +1941,16 @@ class Saver(object):
     save_path_parent = os.path.dirname(save_path)
     if not self._is_empty:
       try:
-        model_checkpoint_path = sess.run(
-            self.saver_def.save_tensor_name,
-            {self.saver_def.filename_tensor_name: checkpoint_file})
+        if self._delta_ops is not None:
+          model_checkpoint_path = self._SaveDelta(sess, checkpoint_file)
+        else:
+          model_checkpoint_path = sess.run(
+              self.saver_def.save_tensor_name,
+              {self.saver_def.filename_tensor_name: checkpoint_file})
         model_checkpoint_path = compat.as_str(model_checkpoint_path)
         if write_state:
-          self._MaybeDeleteOldCheckpoints(
-              model_checkpoint_path, meta_graph_suffix=meta_graph_suffix)
-          _update_checkpoint_state(
-              save_dir=save_path_parent,
-              model_checkpoint_path=model_checkpoint_path,
-              all_model_checkpoint_paths=self.last_checkpoints,
-              latest_filename=latest_filename,
-              save_relative_paths=self._save_relative_paths)
+          self._RecordCheckpoint(model_checkpoint_path, save_path_parent,
+                                 latest_filename, meta_graph_suffix)
       except (errors.FailedPreconditionError, errors.NotFoundError) as exc:
         if not gfile.IsDirectory(save_path_parent):
           exc = ValueError(
@@ -1500,6 +1969,42 @@ class Saver(object):
     else:
       return model_checkpoint_path
 
+  def _RecordCheckpoint(self, model_checkpoint_path, save_dir,
+                        latest_filename="checkpoint", meta_graph_suffix="meta"):
+    """Adds a written checkpoint to `last_checkpoints` and the state file.
+
+    Checkpoints that are no longer kept are deleted.
+
+    Args:
+      model_checkpoint_path: The path of the checkpoint that was written.
+      save_dir: Directory of the `CheckpointStateProto` file.
+      latest_filename: Name of the `CheckpointStateProto` file.
+      meta_graph_suffix: Suffix for `MetaGraphDef` file. Defaults to 'meta'.
+    """
+    self._MaybeDeleteOldCheckpoints(
+        model_checkpoint_path, meta_graph_suffix=meta_graph_suffix)
+    _update_checkpoint_state(
+        save_dir=save_dir,
+        model_checkpoint_path=model_checkpoint_path,
+        all_model_checkpoint_paths=self.last_checkpoints,
+        latest_filename=latest_filename,
+        save_relative_paths=self._save_relative_paths)
+
+  def _SaveDelta(self, sess, checkpoint_file):
+    """Writes a delta checkpoint, or a full one to start a new chain."""
+    parent = self._delta_parent
+    # The fingerprints of the parent are kept in the session that wrote it.
+    # In another session they are not initialized, and the variables may
+    # hold other values.
+    if (parent == checkpoint_file or self._num_deltas >= self._max_deltas or
+        self._delta_session is None or self._delta_session() is not sess):
+      parent = None
+    self._delta_ops.save(sess, checkpoint_file, parent=parent)
+    self._num_deltas = 0 if parent is None else self._num_deltas + 1
+    self._delta_parent = checkpoint_file
+    self._delta_session = weakref.ref(sess)
+    return checkpoint_file
+
   def export_meta_graph(self,
                         filename=None,
                         collection_list=None,
@@ -1544,15 +2049,58 @@ class Saver(object):
     The `save_path` argument is typically a value previously returned from a
     `save()` call, or a call to `latest_checkpoint()`.
 
+    If the saver was created with `restore_threads`, the variables are
+    streamed from the checkpoint in pieces instead, as described in the
+    constructor, and `last_restore_stats` is updated.
+
+    `save_path` can be a delta checkpoint written by a saver created with
+    `max_deltas`. Such a checkpoint can only be restored by a saver created
+    with `max_deltas`, which restores the full checkpoint the delta starts
+    from and applies the deltas to the variables with scatter updates.
+
     Args:
       sess: A `Session` to use to restore the parameters.
       save_path: Path where parameters were previously saved.
+
+    Raises:
+      ValueError: If `save_path` is a delta checkpoint and the saver was
+        created without `max_deltas`.
     """
     if self._is_empty:
       return
     logging.info("Restoring parameters from %s", save_path)
-    sess.run(self.saver_def.restore_op_name,
-             {self.saver_def.filename_tensor_name: save_path})
+    try:
+      self._Restore(sess, save_path)
+    except errors.NotFoundError:
+      # A delta checkpoint does not hold the variables under their own names,
+      # so only look for its parent when restoring it as is fails.
+      if not delta_checkpoint.is_delta_checkpoint(save_path):
+        raise
+      if self._delta_ops is None:
+        raise ValueError(
+            "%s is a delta checkpoint, which can only be restored by a Saver "
+            "created with max_deltas." % save_path)
+      chain = delta_checkpoint.checkpoint_chain(save_path)
+      self._Restore(sess, chain[0])
+      for delta_path in chain[1:]:
+        self._delta_ops.apply(sess, delta_path)
+    if self._delta_ops is not None:
+      # The fingerprints no longer describe the variables; the next save
+      # starts a new chain.
+      self._delta_parent = None
+
+  def _Restore(self, sess, save_path):
+    """Restores the full checkpoint `save_path`."""
+    if self._streaming_restore is not None:
+      stats = self._streaming_restore.run(sess, save_path,
+                                          self._restore_threads,
+                                          self._restore_memory_budget)
+      logging.info("Restored %d bytes in %.2fs (%.1f MB/s)", stats.num_bytes,
+                   stats.total_time, stats.bytes_per_second / (1 << 20))
+      self._last_restore_stats = stats
+    else:
+      sess.run(self.saver_def.restore_op_name,
+               {self.saver_def.filename_tensor_name: save_path})
 
   @staticmethod
   def _add_collection_def(meta_graph_def, key, export_scope=None):
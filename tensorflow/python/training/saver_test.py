@@ -57,6 +57,7 @@ from tensorflow.python.ops import partitioned_variables
 from tensorflow.python.ops import random_ops
 from tensorflow.python.ops import resource_variable_ops
 from tensorflow.python.ops import sparse_ops
+from tensorflow.python.ops import state_ops
 from tensorflow.python.ops import variable_scope
 from tensorflow.python.ops import variables
 import tensorflow.python.ops.nn_grad  # pylint: disable=unused-import
@@ -64,6 +65,8 @@ from tensorflow.python.platform import gfile
 from tensorflow.python.platform import test
 from tensorflow.python.summary import summary
 from tensorflow.python.training import adam
+from tensorflow.python.training import checkpoint_utils
+from tensorflow.python.training import delta_checkpoint
 from tensorflow.python.training import gradient_descent
 from tensorflow.python.training import queue_runner_impl
 from tensorflow.python.training import saver as saver_module
@@ -887,6 +890,287 @@ class SaveRestoreShardedTest(test.TestCase):
     self._testPartitionedVariables(use_resource=True)
 
 
+class StreamingRestoreTest(test.TestCase):
+
+  def _CreateVariables(self, offset):
+    v0 = variables.Variable(
+        np.arange(60, dtype=np.float32).reshape([10, 6]) + offset, name="v0")
+    v1 = resource_variable_ops.ResourceVariable(
+        np.arange(20, dtype=np.float64) + offset, name="v1")
+    v2 = variables.Variable(3.0 + offset, name="v2")
+    v3 = variable_scope.get_variable(
+        "v3", shape=[9, 4],
+        partitioner=partitioned_variables.fixed_size_partitioner(3))
+    return v0, v1, v2, v3
+
+  def _Save(self, save_path):
+    with ops_lib.Graph().as_default() as g, self.test_session(graph=g) as sess:
+      v0, v1, v2, v3 = self._CreateVariables(0)
+      variables.global_variables_initializer().run()
+      saver_module.Saver().save(sess, save_path)
+      return sess.run([v0, v1, v2, v3.as_tensor()])
+
+  def _Restore(self, save_path, initialize):
+    with ops_lib.Graph().as_default() as g, self.test_session(graph=g) as sess:
+      v0, v1, v2, v3 = self._CreateVariables(100)
+      save = saver_module.Saver(restore_threads=3, restore_memory_budget=64)
+      if initialize:
+        variables.global_variables_initializer().run()
+      save.restore(sess, save_path)
+      return save.last_restore_stats, sess.run([v0, v1, v2, v3.as_tensor()])
+
+  def testStreamingRestore(self):
+    save_path = os.path.join(self.get_temp_dir(), "streaming_restore")
+    saved = self._Save(save_path)
+    stats, restored = self._Restore(save_path, initialize=False)
+    for saved_value, restored_value in zip(saved, restored):
+      self.assertAllEqual(saved_value, restored_value)
+    # The scalar v2 is restored whole and not counted.
+    self.assertEqual(10 * 6 * 4 + 20 * 8 + 9 * 4 * 4, stats.num_bytes)
+    self.assertEqual(set(["v0", "v1", "v3"]), set(stats.variable_times))
+    self.assertGreater(stats.total_time, 0)
+    self.assertGreater(stats.bytes_per_second, 0)
+
+  def testStreamingRestoreIntoInitializedVariables(self):
+    save_path = os.path.join(self.get_temp_dir(), "streaming_restore_init")
+    saved = self._Save(save_path)
+    _, restored = self._Restore(save_path, initialize=True)
+    for saved_value, restored_value in zip(saved, restored):
+      self.assertAllEqual(saved_value, restored_value)
+
+  def testStreamingRestoreOfColumnPartitions(self):
+    # Partitions along the second dimension are not ranges of rows of the
+    # saved tensor, so they are restored whole and not counted.
+    save_path = os.path.join(self.get_temp_dir(), "streaming_restore_columns")
+
+    def _CreateVariable(offset):
+      return variable_scope.get_variable(
+          "v", initializer=np.arange(24, dtype=np.float32).reshape([4, 6]) +
+          offset, partitioner=lambda shape, dtype: [1, 2])
+
+    with ops_lib.Graph().as_default() as g, self.test_session(graph=g) as sess:
+      v = _CreateVariable(0)
+      variables.global_variables_initializer().run()
+      saver_module.Saver().save(sess, save_path)
+      saved = sess.run(v.as_tensor())
+    with ops_lib.Graph().as_default() as g, self.test_session(graph=g) as sess:
+      v = _CreateVariable(100)
+      save = saver_module.Saver(restore_threads=3, restore_memory_budget=16)
+      save.restore(sess, save_path)
+      self.assertAllEqual(saved, sess.run(v.as_tensor()))
+      self.assertEqual(0, save.last_restore_stats.num_bytes)
+
+  def testNonStreamingRestoreHasNoStats(self):
+    save_path = os.path.join(self.get_temp_dir(), "non_streaming_restore")
+    with self.test_session() as sess:
+      v = variables.Variable([1.0, 2.0], name="v")
+      save = saver_module.Saver()
+      v.initializer.run()
+      save.save(sess, save_path)
+      save.restore(sess, save_path)
+      self.assertIsNone(save.last_restore_stats)
+
+  def testInvalidArguments(self):
+    variables.Variable(1.0, name="v")
+    with self.assertRaisesRegexp(ValueError, "restore_threads"):
+      saver_module.Saver(restore_threads=0)
+    with self.assertRaisesRegexp(ValueError, "restore_memory_budget"):
+      saver_module.Saver(restore_threads=1, restore_memory_budget=0)
+
+
+class DeltaCheckpointTest(test.TestCase):
+
+  def _CreateVariables(self):
+    emb = variables.Variable(
+        np.arange(40, dtype=np.float32).reshape([10, 4]), name="emb")
+    bias = variables.Variable([1.0, 2.0, 3.0], name="bias")
+    step = variables.Variable(0, dtype=dtypes.int64, name="step")
+    return emb, bias, step
+
+  def testDeltaOnlyHoldsChangedRows(self):
+    save_dir = os.path.join(self.get_temp_dir(), "delta_rows")
+    with self.test_session() as sess:
+      emb, bias, step = self._CreateVariables()
+      update = state_ops.scatter_update(emb, [2, 7], array_ops.ones([2, 4]))
+      increment = state_ops.assign_add(step, 1)
+      save = saver_module.Saver(max_deltas=5)
+      variables.global_variables_initializer().run()
+      s0 = save.save(sess, os.path.join(save_dir, "ckpt"), global_step=0)
+      sess.run([update, increment])
+      s1 = save.save(sess, os.path.join(save_dir, "ckpt"), global_step=1)
+      expected = sess.run([emb, bias, step])
+
+    self.assertEqual([s0, s1], delta_checkpoint.checkpoint_chain(s1))
+    reader = pywrap_tensorflow.NewCheckpointReader(s1)
+    self.assertAllEqual([2, 7], reader.get_tensor("emb/.DELTA_ROWS"))
+    self.assertAllEqual(np.ones([2, 4]), reader.get_tensor("emb/.DELTA_VALUES"))
+    self.assertEqual(0, reader.get_tensor("bias/.DELTA_ROWS").size)
+    self.assertAllEqual([0], reader.get_tensor("step/.DELTA_ROWS"))
+    self.assertFalse(reader.has_tensor("emb"))
+    for name, value in zip(["emb", "bias", "step"], expected):
+      self.assertAllEqual(value, checkpoint_utils.load_variable(s1, name))
+      self.assertAllEqual(value, checkpoint_utils.load_variable(save_dir, name))
+    reader = checkpoint_utils.load_checkpoint(s1)
+    self.assertEqual(dtypes.int64, reader.get_variable_to_dtype_map()["step"])
+    self.assertAllEqual(expected[0][1:3, 1:],
+                        reader.get_slice("emb", [1, 1], [2, -1]))
+    self.assertAllEqual(expected[0][6:], reader.get_slice("emb", [6, 0],
+                                                          [-1, -1]))
+    self.assertAllEqual(expected[1][1:], reader.get_slice("bias", [1], [-1]))
+
+  def testRestoreAppliesDeltas(self):
+    save_dir = os.path.join(self.get_temp_dir(), "delta_restore")
+    with ops_lib.Graph().as_default() as g, self.test_session(graph=g) as sess:
+      emb, bias, step = self._CreateVariables()
+      updates = [
+          state_ops.scatter_update(emb, [1], [[-1.0] * 4]),
+          state_ops.assign(bias, [4.0, 5.0, 6.0]),
+          state_ops.scatter_update(emb, [1, 9], [[-2.0] * 4, [-3.0] * 4]),
+      ]
+      save = saver_module.Saver(max_deltas=5)
+      variables.global_variables_initializer().run()
+      save.save(sess, os.path.join(save_dir, "ckpt"), global_step=0)
+      for i, update in enumerate(updates):
+        sess.run(update)
+        last = save.save(sess, os.path.join(save_dir, "ckpt"),
+                         global_step=i + 1)
+      expected = sess.run([emb, bias, step])
+    self.assertEqual(4, len(delta_checkpoint.checkpoint_chain(last)))
+
+    with ops_lib.Graph().as_default() as g, self.test_session(graph=g) as sess:
+      restored_vars = self._CreateVariables()
+      save = saver_module.Saver(max_deltas=5)
+      save.restore(sess, saver_module.latest_checkpoint(save_dir))
+      for value, restored in zip(expected, sess.run(restored_vars)):
+        self.assertAllEqual(value, restored)
+      # The first checkpoint after a restore is a full one.
+      full = save.save(sess, os.path.join(save_dir, "after_restore"))
+      self.assertEqual([full], delta_checkpoint.checkpoint_chain(full))
+
+  def testPlainSaverRejectsDeltas(self):
+    save_dir = os.path.join(self.get_temp_dir(), "delta_plain_restore")
+    with ops_lib.Graph().as_default() as g, self.test_session(graph=g) as sess:
+      emb, _, _ = self._CreateVariables()
+      update = state_ops.scatter_update(emb, [3], [[-1.0] * 4])
+      save = saver_module.Saver(max_deltas=5)
+      variables.global_variables_initializer().run()
+      s0 = save.save(sess, os.path.join(save_dir, "ckpt"), global_step=0)
+      sess.run(update)
+      last = save.save(sess, os.path.join(save_dir, "ckpt"), global_step=1)
+      expected = sess.run(emb)
+    self.assertEqual(2, len(delta_checkpoint.checkpoint_chain(last)))
+
+    # Savers without max_deltas, like the default saver of a Scaffold, need a
+    # delta-aware saver to restore a delta, but still restore full ones.
+    for saver_kwargs in ({}, {"sharded": True}, {"restore_threads": 2}):
+      with ops_lib.Graph().as_default() as g, self.test_session(
+          graph=g) as sess:
+        emb, _, _ = self._CreateVariables()
+        save = saver_module.Saver(**saver_kwargs)
+        with self.assertRaisesRegexp(ValueError, "max_deltas"):
+          save.restore(sess, last)
+        save.restore(sess, s0)
+        self.assertAllEqual(np.arange(40).reshape([10, 4]), sess.run(emb))
+
+    with ops_lib.Graph().as_default() as g, self.test_session(graph=g) as sess:
+      emb, _, _ = self._CreateVariables()
+      saver_module.Saver(max_deltas=5, restore_threads=2).restore(sess, last)
+      self.assertAllEqual(expected, sess.run(emb))
+
+  def testFingerprintsDetectSmallChanges(self):
+    save_dir = os.path.join(self.get_temp_dir(), "delta_fingerprints")
+    with self.test_session() as sess:
+      v = variables.Variable(np.zeros([4, 3], dtype=np.float32), name="v")
+      # Swapping two words and flipping the lowest bit of a word.
+      update = state_ops.scatter_update(
+          v, [1, 2], [[0.0, 1.0, 0.0], [0.0, 0.0, 1.4e-45]])
+      swap = state_ops.scatter_update(v, [1], [[1.0, 0.0, 0.0]])
+      save = saver_module.Saver(max_deltas=5)
+      variables.global_variables_initializer().run()
+      save.save(sess, os.path.join(save_dir, "ckpt"), global_step=0)
+      sess.run(update)
+      s1 = save.save(sess, os.path.join(save_dir, "ckpt"), global_step=1)
+      sess.run(swap)
+      s2 = save.save(sess, os.path.join(save_dir, "ckpt"), global_step=2)
+    self.assertAllEqual([1, 2], pywrap_tensorflow.NewCheckpointReader(
+        s1).get_tensor("v/.DELTA_ROWS"))
+    self.assertAllEqual([1], pywrap_tensorflow.NewCheckpointReader(
+        s2).get_tensor("v/.DELTA_ROWS"))
+
+  def testDeltaOfRowsWithCollidingSums(self):
+    # [0, 0] and [3, -1] have the same weighted sum of their words, which
+    # must not make the change invisible.
+    save_dir = os.path.join(self.get_temp_dir(), "delta_collision")
+    with self.test_session() as sess:
+      v = variables.Variable(np.zeros([2, 2], dtype=np.int32), name="v")
+      update = state_ops.scatter_update(v, [0], [[3, -1]])
+      save = saver_module.Saver(max_deltas=5)
+      variables.global_variables_initializer().run()
+      save.save(sess, os.path.join(save_dir, "ckpt"), global_step=0)
+      sess.run(update)
+      last = save.save(sess, os.path.join(save_dir, "ckpt"), global_step=1)
+    reader = pywrap_tensorflow.NewCheckpointReader(last)
+    self.assertAllEqual([0], reader.get_tensor("v/.DELTA_ROWS"))
+    self.assertAllEqual([[3, -1], [0, 0]],
+                        checkpoint_utils.load_variable(last, "v"))
+
+  def testNewSessionStartsNewChain(self):
+    save_dir = os.path.join(self.get_temp_dir(), "delta_new_session")
+    with ops_lib.Graph().as_default() as g:
+      self._CreateVariables()
+      save = saver_module.Saver(max_deltas=5)
+      init = variables.global_variables_initializer()
+      with self.test_session(graph=g) as sess:
+        init.run()
+        save.save(sess, os.path.join(save_dir, "ckpt"), global_step=0)
+      # The fingerprints of the last save are not initialized in a new
+      # session, so its first checkpoint is a full one.
+      with self.test_session(graph=g) as sess:
+        init.run()
+        s1 = save.save(sess, os.path.join(save_dir, "ckpt"), global_step=1)
+        s2 = save.save(sess, os.path.join(save_dir, "ckpt"), global_step=2)
+    self.assertEqual([s1], delta_checkpoint.checkpoint_chain(s1))
+    self.assertEqual([s1, s2], delta_checkpoint.checkpoint_chain(s2))
+
+  def testFullCheckpointAfterMaxDeltas(self):
+    save_dir = os.path.join(self.get_temp_dir(), "delta_max_deltas")
+    with self.test_session() as sess:
+      self._CreateVariables()
+      save = saver_module.Saver(max_deltas=1)
+      variables.global_variables_initializer().run()
+      s0 = save.save(sess, os.path.join(save_dir, "ckpt"), global_step=0)
+      s1 = save.save(sess, os.path.join(save_dir, "ckpt"), global_step=1)
+      s2 = save.save(sess, os.path.join(save_dir, "ckpt"), global_step=2)
+    self.assertEqual([s0], delta_checkpoint.checkpoint_chain(s0))
+    self.assertEqual([s0, s1], delta_checkpoint.checkpoint_chain(s1))
+    self.assertEqual([s2], delta_checkpoint.checkpoint_chain(s2))
+
+  def testMaxToKeepKeepsCheckpointsDeltasDependOn(self):
+    save_dir = os.path.join(self.get_temp_dir(), "delta_max_to_keep")
+    with self.test_session() as sess:
+      self._CreateVariables()
+      save = saver_module.Saver(max_to_keep=1, max_deltas=1)
+      variables.global_variables_initializer().run()
+      s0 = save.save(sess, os.path.join(save_dir, "ckpt"), global_step=0)
+      s1 = save.save(sess, os.path.join(save_dir, "ckpt"), global_step=1)
+      self.assertEqual([s1], save.last_checkpoints)
+      self.assertTrue(saver_module.checkpoint_exists(s0))
+      s2 = save.save(sess, os.path.join(save_dir, "ckpt"), global_step=2)
+      self.assertEqual([s2], save.last_checkpoints)
+      self.assertFalse(saver_module.checkpoint_exists(s0))
+      self.assertFalse(saver_module.checkpoint_exists(s1))
+
+  def testInvalidArguments(self):
+    variables.Variable(1.0, name="v")
+    with self.assertRaisesRegexp(ValueError, "max_deltas"):
+      saver_module.Saver(max_deltas=-1)
+    with self.assertRaisesRegexp(ValueError, "max_deltas"):
+      saver_module.Saver(max_deltas=1, sharded=True)
+    resource_variable_ops.ResourceVariable(1.0, name="r")
+    with self.assertRaisesRegexp(ValueError, "reference variables"):
+      saver_module.Saver(max_deltas=1)
+
+
 class MaxToKeepTest(test.TestCase):
 
   def _get_test_dir(self, dirname):
@@ -1999,6 +2283,10 @@ class CheckpointReaderTest(test.TestCase):
       var_map = reader.get_variable_to_shape_map()
       self.assertEquals([2, 3], var_map["v0"])
       self.assertEquals([3, 2, 1], var_map["v1"])
+      # Verifies get_variable_to_dtype_map() returns the correct information.
+      var_map = reader.get_variable_to_dtype_map()
+      self.assertEquals(dtypes.float32, var_map["v0"])
+      self.assertEquals(dtypes.float32, var_map["v1"])
       # Verifies get_tensor() returns the tensor value.
       v0_tensor = reader.get_tensor("v0")
       v1_tensor = reader.get_tensor("v1")
@@ -2009,6 +2297,38 @@ class CheckpointReaderTest(test.TestCase):
                                    "v3 not found in checkpoint"):
         reader.get_tensor("v3")
 
+  def testGetSliceAndTensorView(self):
+    v0 = variables.Variable(
+        np.arange(24, dtype=np.float32).reshape([6, 4]), name="v0")
+    v1 = variables.Variable(["a", "b"], name="v1")
+    v2 = variable_scope.get_variable(
+        "v2", initializer=np.arange(30, dtype=np.int64).reshape([10, 3]),
+        partitioner=partitioned_variables.fixed_size_partitioner(3))
+    save = saver_module.Saver(write_version=self._WRITE_VERSION)
+    save_path = os.path.join(self.get_temp_dir(),
+                             "ckpt_for_get_slice" + str(self._WRITE_VERSION))
+    with self.test_session() as sess:
+      variables.global_variables_initializer().run()
+      save.save(sess, save_path)
+      v0_value, v1_value, v2_value = sess.run([v0, v1, v2.as_tensor()])
+
+    reader = pywrap_tensorflow.NewCheckpointReader(save_path)
+    for name, value in [("v0", v0_value), ("v1", v1_value), ("v2", v2_value)]:
+      view = reader.get_tensor_view(name)
+      self.assertAllEqual(value, view)
+      self.assertFalse(view.flags.writeable)
+    self.assertAllEqual(v0_value[2:5, 1:3], reader.get_slice("v0", [2, 1],
+                                                             [3, 2]))
+    self.assertAllEqual(v0_value[4:], reader.get_slice("v0", [4, 0], [-1, -1]))
+    # Rows 2 to 7 span all three partitions.
+    self.assertAllEqual(v2_value[2:8], reader.get_slice("v2", [2, 0], [6, 3]))
+    with self.assertRaises(errors.NotFoundError):
+      reader.get_tensor_view("v3")
+    if self._WRITE_VERSION == saver_pb2.SaverDef.V2:
+      with self.assertRaisesRegexp(errors.InvalidArgumentError,
+                                   "out of bounds"):
+        reader.get_slice("v0", [4, 0], [3, 4])
+
   def testNonexistentPath(self):
     with self.assertRaisesRegexp(errors.NotFoundError,
                                  "Unsuccessful TensorSliceReader"):
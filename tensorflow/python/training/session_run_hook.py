@@ -80,6 +80,10 @@ hooks.after_run() will not be called but hooks.end() will still be called.
 If sess.run() raises any other exception then neither hooks.after_run() nor
 hooks.end() will be called.
 
+A hook that only acts every so often can return from `runs_to_skip()` how many
+of the next `run()` calls it does not need. It is not called for those, and
+when no hook is called, the `run()` call goes straight to the session.
+
 @@SessionRunHook
 @@SessionRunArgs
 @@SessionRunContext
@@ -166,6 +170,19 @@ class SessionRunHook(object):
     """
     pass
 
+  def runs_to_skip(self):
+    """Returns how many of the next calls to run() can skip this hook.
+
+    Called after each call to `after_run()`. For the returned number of calls
+    to `run()`, neither `before_run()` nor `after_run()` is called, so a hook
+    that returns more than 0 must account for the calls it does not see, e.g.
+    by advancing its own iteration counter.
+
+    Returns:
+      A non-negative integer. Defaults to 0: the hook sees every call.
+    """
+    return 0
+
   def end(self, session):  # pylint: disable=unused-argument
     """Called at the end of session.
 
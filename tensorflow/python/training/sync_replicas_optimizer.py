@@ -18,11 +18,17 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import collections
+
 from tensorflow.core.framework import types_pb2
+from tensorflow.python.framework import constant_op
+from tensorflow.python.framework import dtypes
 from tensorflow.python.framework import ops
 from tensorflow.python.ops import array_ops
 from tensorflow.python.ops import control_flow_ops
 from tensorflow.python.ops import data_flow_ops
+from tensorflow.python.ops import math_ops
+from tensorflow.python.ops import nn_ops
 from tensorflow.python.ops import state_ops
 from tensorflow.python.ops import variable_scope
 from tensorflow.python.ops import variables
@@ -33,6 +39,41 @@ from tensorflow.python.training import session_manager
 from tensorflow.python.training import session_run_hook
 
 
+def _num_bytes(tensor):
+  """Returns the size of `tensor` in bytes, as an int64 scalar `Tensor`."""
+  if isinstance(tensor, ops.IndexedSlices):
+    return _num_bytes(tensor.values) + _num_bytes(tensor.indices)
+  return (array_ops.size(tensor, out_type=dtypes.int64) *
+          tensor.dtype.base_dtype.size)
+
+
+class _TransferStats(object):
+  """Counts what a replica sends to the gradient accumulators in one step."""
+
+  _KEYS = ("gradient_bytes", "sent_bytes", "fp16_saved_bytes",
+           "top_k_saved_bytes")
+
+  def __init__(self):
+    self.num_pushes = 0
+    self._bytes = collections.defaultdict(list)
+
+  def add(self, key, num_bytes):
+    """Adds `num_bytes`, a python int or an int64 `Tensor`, to `key`."""
+    self._bytes[key].append(num_bytes)
+
+  def as_dict(self):
+    stats = {"num_pushes": constant_op.constant(self.num_pushes,
+                                                dtype=dtypes.int64)}
+    for key in self._KEYS:
+      values = [ops.convert_to_tensor(b, dtype=dtypes.int64)
+                for b in self._bytes[key]]
+      if values:
+        stats[key] = math_ops.add_n(values, name=key)
+      else:
+        stats[key] = constant_op.constant(0, dtype=dtypes.int64, name=key)
+    return stats
+
+
 # Please note that the gradients from replicas are averaged instead of summed
 # (as in the old sync_replicas_optimizer) so you need to increase the learning
 # rate according to the number of replicas. This change is introduced to be
@@ -52,10 +93,11 @@ class SyncReplicasOptimizer(optimizer.Optimizer):
 
   The following accumulators/queue are created:
   <empty line>
-  * N `gradient accumulators`, one per variable to train. Gradients are pushed
-    to them and the chief worker will wait until enough gradients are collected
-    and then average them before applying to variables. The accumulator will
-    drop all stale gradients (more details in the accumulator op).
+  * N `gradient accumulators`, one per variable to train (or per bucket of
+    variables, see below). Gradients are pushed to them and the chief worker
+    will wait until enough gradients are collected and then average them before
+    applying to variables. The accumulator will drop all stale gradients (more
+    details in the accumulator op).
   * 1 `token` queue where the optimizer pushes the new global_step value after
     all variables are updated.
 
@@ -131,6 +173,25 @@ class SyncReplicasOptimizer(optimizer.Optimizer):
   my_estimator = DNNClassifier(..., optimizer=opt)
   my_estimator.fit(..., hooks=[sync_replicas_hook])
   ```
+
+  ### Reducing the traffic
+
+  Pushing the gradients to the accumulators is usually bound by the bandwidth
+  and the number of RPCs. Three independent options reduce them, for dense
+  gradients:
+
+  * `bucket_size_bytes` coalesces the gradients of the variables that live on
+    the same device into flat buckets of up to that many bytes, each with a
+    single accumulator.
+  * `compress_fp16` sends float32 and float64 gradients as float16.
+  * `top_k_ratio` only sends the largest entries, by magnitude, of each
+    gradient (or bucket). What is not sent is accumulated locally and added to
+    the next gradient ("error feedback"). The entries are summed over the
+    replicas and divided by `replicas_to_aggregate`, so that an entry not sent
+    by a replica counts as a zero, like in the average of dense gradients.
+
+  `get_transfer_stats()` returns the number of bytes sent by each step, and the
+  savings of each option.
   """
 
   def __init__(self,
@@ -140,7 +201,10 @@ class SyncReplicasOptimizer(optimizer.Optimizer):
                variable_averages=None,
                variables_to_average=None,
                use_locking=False,
-               name="sync_replicas"):
+               name="sync_replicas",
+               bucket_size_bytes=None,
+               compress_fp16=False,
+               top_k_ratio=None):
     """Construct a sync_replicas optimizer.
 
     Args:
@@ -161,9 +225,25 @@ class SyncReplicasOptimizer(optimizer.Optimizer):
         needed if variable_averages is passed in.
       use_locking: If True use locks for update operation.
       name: string. Optional name of the returned operation.
+      bucket_size_bytes: Optional positive int. If set, the dense gradients of
+        the variables of fully-defined shape that share a device and a dtype are
+        pushed together, in flat buckets of up to this many bytes.
+      compress_fp16: If True, float32 and float64 gradients are sent as
+        float16.
+      top_k_ratio: Optional float in (0, 1]. If set, only this fraction of the
+        entries of each dense gradient (or bucket) is sent, the ones with the
+        largest magnitude, and the rest is added to the next gradient.
+
+    Raises:
+      ValueError: If `bucket_size_bytes` or `top_k_ratio` is out of range.
     """
     if total_num_replicas is None:
       total_num_replicas = replicas_to_aggregate
+    if bucket_size_bytes is not None and bucket_size_bytes <= 0:
+      raise ValueError("bucket_size_bytes must be positive: %s" %
+                       bucket_size_bytes)
+    if top_k_ratio is not None and not 0 < top_k_ratio <= 1:
+      raise ValueError("top_k_ratio must be in (0, 1]: %s" % top_k_ratio)
 
     super(SyncReplicasOptimizer, self).__init__(use_locking, name)
     logging.info(
@@ -178,6 +258,10 @@ class SyncReplicasOptimizer(optimizer.Optimizer):
     self._tokens_per_step = max(total_num_replicas, replicas_to_aggregate)
     self._global_step = None
     self._sync_token_queue = None
+    self._bucket_size_bytes = bucket_size_bytes
+    self._compress_fp16 = compress_fp16
+    self._top_k_ratio = top_k_ratio
+    self._transfer_stats = None
 
     # The synchronization op will be executed in a queue runner which should
     # only be executed by one of the replicas (usually the chief).
@@ -229,6 +313,7 @@ class SyncReplicasOptimizer(optimizer.Optimizer):
       ValueError: If global step is not provided, the staleness cannot be
         checked.
     """
+    grads_and_vars = tuple(grads_and_vars)
     if not grads_and_vars:
       raise ValueError("Must supply at least one variable")
 
@@ -237,8 +322,9 @@ class SyncReplicasOptimizer(optimizer.Optimizer):
 
     self._global_step = global_step
     train_ops = []
-    aggregated_grad = []
-    var_list = []
+    var_list = [var for _, var in grads_and_vars]
+    aggregated_grad = [None] * len(var_list)
+    stats = _TransferStats()
 
     # local_anchor op will be placed on this worker task by default.
     local_anchor = control_flow_ops.no_op()
@@ -257,33 +343,20 @@ class SyncReplicasOptimizer(optimizer.Optimizer):
         variables.global_variables())
 
     with ops.name_scope(None, self._name):
-      for grad, var in grads_and_vars:
-        var_list.append(var)
-        with ops.device(var.device):
-          # Dense gradients.
-          if grad is None:
-            aggregated_grad.append(None)  # pass-through.
-            continue
-          elif isinstance(grad, ops.Tensor):
-            grad_accum = data_flow_ops.ConditionalAccumulator(
-                grad.dtype,
-                shape=var.get_shape(),
-                shared_name=var.name + "/grad_accum")
-            train_ops.append(grad_accum.apply_grad(
-                grad, local_step=self._local_step))
-            aggregated_grad.append(grad_accum.take_grad(
-                self._replicas_to_aggregate))
-          else:
-            if not isinstance(grad, ops.IndexedSlices):
-              raise ValueError("Unknown grad type!")
-            grad_accum = data_flow_ops.SparseConditionalAccumulator(
-                grad.dtype, shape=(), shared_name=var.name + "/grad_accum")
-            train_ops.append(grad_accum.apply_indexed_slices_grad(
-                grad, local_step=self._local_step))
-            aggregated_grad.append(grad_accum.take_indexed_slices_grad(
-                self._replicas_to_aggregate))
-
-          self._accumulator_list.append((grad_accum, var.device))
+      for indices, flat in self._group_gradients(grads_and_vars):
+        grads = [grads_and_vars[i][0] for i in indices]
+        unit_vars = [var_list[i] for i in indices]
+        if flat:
+          aggregated = self._push_flat_gradients(
+              grads, unit_vars, local_anchor, train_ops, stats)
+        else:
+          aggregated = [self._push_gradient(grads[0], unit_vars[0], train_ops,
+                                            stats)]
+        for i, grad in zip(indices, aggregated):
+          aggregated_grad[i] = grad
+
+      with ops.name_scope("transfer_stats"):
+        self._transfer_stats = stats.as_dict()
 
       aggregated_grads_and_vars = zip(aggregated_grad, var_list)
 
@@ -340,6 +413,209 @@ class SyncReplicasOptimizer(optimizer.Optimizer):
       self._gradients_applied = True
       return train_op
 
+  def _group_gradients(self, grads_and_vars):
+    """Groups the gradients that are pushed to the same accumulator.
+
+    Args:
+      grads_and_vars: A tuple of (gradient, variable) pairs.
+
+    Returns:
+      A list of `(indices, flat)` pairs, where `indices` are indices in
+      `grads_and_vars` and `flat` tells whether the gradients are flattened
+      (bucketed or sparsified) or pushed as they are.
+    """
+    units = []
+    open_buckets = {}
+    for i, (grad, var) in enumerate(grads_and_vars):
+      if grad is None:
+        continue
+      flat = (isinstance(grad, ops.Tensor) and
+              var.get_shape().is_fully_defined() and
+              (self._bucket_size_bytes is not None or
+               self._top_k_ratio is not None))
+      if not flat or self._bucket_size_bytes is None:
+        units.append(([i], flat))
+        continue
+      size = var.get_shape().num_elements() * grad.dtype.base_dtype.size
+      key = (var.device, grad.dtype.base_dtype)
+      bucket, bucket_size = open_buckets.get(key, (None, 0))
+      if bucket is None or bucket_size + size > self._bucket_size_bytes:
+        bucket, bucket_size = [], 0
+        units.append((bucket, True))
+      bucket.append(i)
+      open_buckets[key] = (bucket, bucket_size + size)
+    return units
+
+  def _send_dtype(self, dtype):
+    if self._compress_fp16 and dtype in (dtypes.float32, dtypes.float64):
+      return dtypes.float16
+    return dtype
+
+  def _push_gradient(self, grad, var, train_ops, stats):
+    """Pushes `grad` as it is to an accumulator and returns the average."""
+    dtype = grad.dtype.base_dtype
+    send_dtype = self._send_dtype(dtype)
+    stats.num_pushes += 1
+    stats.add("gradient_bytes", _num_bytes(grad))
+    if isinstance(grad, ops.Tensor):
+      if send_dtype != dtype:
+        stats.add("fp16_saved_bytes",
+                  _num_bytes(grad) // dtype.size * (dtype.size - 2))
+        grad = math_ops.cast(grad, send_dtype)
+      stats.add("sent_bytes", _num_bytes(grad))
+      with ops.device(var.device):
+        grad_accum = data_flow_ops.ConditionalAccumulator(
+            send_dtype,
+            shape=var.get_shape(),
+            shared_name=var.name + "/grad_accum")
+        train_ops.append(grad_accum.apply_grad(
+            grad, local_step=self._local_step))
+        aggregated = math_ops.cast(
+            grad_accum.take_grad(self._replicas_to_aggregate), dtype)
+    else:
+      if not isinstance(grad, ops.IndexedSlices):
+        raise ValueError("Unknown grad type!")
+      if send_dtype != dtype:
+        stats.add("fp16_saved_bytes",
+                  _num_bytes(grad.values) // dtype.size * (dtype.size - 2))
+        grad = ops.IndexedSlices(math_ops.cast(grad.values, send_dtype),
+                                 grad.indices, grad.dense_shape)
+      stats.add("sent_bytes", _num_bytes(grad))
+      with ops.device(var.device):
+        grad_accum = data_flow_ops.SparseConditionalAccumulator(
+            send_dtype, shape=(), shared_name=var.name + "/grad_accum")
+        train_ops.append(grad_accum.apply_indexed_slices_grad(
+            grad, local_step=self._local_step))
+        aggregated = grad_accum.take_indexed_slices_grad(
+            self._replicas_to_aggregate)
+        if send_dtype != dtype:
+          aggregated = ops.IndexedSlices(
+              math_ops.cast(aggregated.values, dtype), aggregated.indices,
+              aggregated.dense_shape)
+
+    self._accumulator_list.append((grad_accum, var.device))
+    return aggregated
+
+  def _push_flat_gradients(self, grads, var_list, local_anchor, train_ops,
+                           stats):
+    """Pushes dense `grads` as one flat tensor and returns their averages.
+
+    The gradients are flattened and concatenated on the replica, compressed if
+    requested, then pushed to a single accumulator on the device of the
+    variables. The average is split back into one gradient per variable there.
+
+    Args:
+      grads: A list of dense gradients of the same dtype.
+      var_list: The variables of `grads`, all on the same device and with
+        fully-defined shapes.
+      local_anchor: An op on the replica, to colocate the local state with.
+      train_ops: A list the ops each replica runs every step are appended to.
+      stats: A `_TransferStats`.
+
+    Returns:
+      A list with the averaged gradient of each variable.
+    """
+    dtype = grads[0].dtype.base_dtype
+    send_dtype = self._send_dtype(dtype)
+    device = var_list[0].device
+    shapes = [var.get_shape() for var in var_list]
+    sizes = [shape.num_elements() for shape in shapes]
+    num_elements = sum(sizes)
+    if len(var_list) == 1:
+      flat = array_ops.reshape(grads[0], [-1])
+      shared_name = var_list[0].name + "/grad_accum"
+    else:
+      flat = array_ops.concat(
+          [array_ops.reshape(grad, [-1]) for grad in grads], 0)
+      shared_name = var_list[0].name + "/grad_bucket_accum"
+    stats.num_pushes += 1
+    stats.add("gradient_bytes", num_elements * dtype.size)
+    stats.add("fp16_saved_bytes",
+              num_elements * (dtype.size - send_dtype.size))
+
+    if self._top_k_ratio is None:
+      stats.add("sent_bytes", num_elements * send_dtype.size)
+      with ops.device(device):
+        grad_accum = data_flow_ops.ConditionalAccumulator(
+            send_dtype, shape=[num_elements], shared_name=shared_name)
+        train_ops.append(grad_accum.apply_grad(
+            math_ops.cast(flat, send_dtype), local_step=self._local_step))
+        aggregated = grad_accum.take_grad(self._replicas_to_aggregate)
+    else:
+      k = max(1, int(num_elements * self._top_k_ratio))
+      with ops.colocate_with(local_anchor):
+        residual = variable_scope.variable(
+            array_ops.zeros([num_elements], dtype=dtype),
+            trainable=False,
+            collections=[ops.GraphKeys.LOCAL_VARIABLES],
+            name=var_list[0].op.name + "/top_k_residual")
+      corrected = flat + residual
+      _, indices = nn_ops.top_k(math_ops.abs(corrected), k, sorted=False)
+      values = math_ops.cast(array_ops.gather(corrected, indices), send_dtype)
+      # Keep what is not sent, including the rounding error of the values.
+      sent = array_ops.scatter_nd(array_ops.expand_dims(indices, 1),
+                                  math_ops.cast(values, dtype), [num_elements])
+      train_ops.append(state_ops.assign(residual, corrected - sent))
+      sent_size = k * (send_dtype.size + indices.dtype.size)
+      # With the indices, sending a large fraction of the values can take more
+      # bytes than sending them all, which saves nothing.
+      stats.add("top_k_saved_bytes",
+                max(0, num_elements * send_dtype.size - sent_size))
+      stats.add("sent_bytes", sent_size)
+      with ops.device(device):
+        # An index is only sent by some of the replicas, so averaging per
+        # index would scale it up. Sum the values and divide by the number of
+        # replicas instead, like the dense average does.
+        grad_accum = data_flow_ops.SparseConditionalAccumulator(
+            send_dtype, shape=[num_elements], shared_name=shared_name,
+            reduction_type="SUM")
+        train_ops.append(grad_accum.apply_indexed_slices_grad(
+            ops.IndexedSlices(values, indices, [num_elements]),
+            local_step=self._local_step))
+        taken = grad_accum.take_indexed_slices_grad(
+            self._replicas_to_aggregate)
+        aggregated = array_ops.scatter_nd(
+            array_ops.expand_dims(taken.indices, 1), taken.values,
+            constant_op.constant([num_elements], dtype=dtypes.int64))
+        aggregated /= math_ops.cast(self._replicas_to_aggregate,
+                                    aggregated.dtype)
+
+    self._accumulator_list.append((grad_accum, device))
+    with ops.device(device):
+      aggregated = math_ops.cast(aggregated, dtype)
+      if len(var_list) > 1:
+        pieces = array_ops.split(aggregated, sizes)
+      else:
+        pieces = [aggregated]
+      return [array_ops.reshape(piece, shape)
+              for piece, shape in zip(pieces, shapes)]
+
+  def get_transfer_stats(self):
+    """Returns statistics on the gradients this replica sends in each step.
+
+    The values are computed from the gradients of the step they are fetched
+    with, e.g. `sess.run([train_op, opt.get_transfer_stats()])`, and can be
+    summarized like any other tensor.
+
+    Returns:
+      A dict of int64 scalar `Tensor`s:
+      * "num_pushes": The number of gradient accumulators pushed to, which
+        `bucket_size_bytes` reduces.
+      * "gradient_bytes": The size of the gradients.
+      * "sent_bytes": The number of bytes sent to the accumulators.
+      * "fp16_saved_bytes": The number of bytes saved by `compress_fp16`.
+      * "top_k_saved_bytes": The number of bytes saved by `top_k_ratio`,
+        counting the indices that are sent with the values. This is 0 when
+        the values and indices take more bytes than the dense gradient.
+
+    Raises:
+      ValueError: If this is called before apply_gradients().
+    """
+    if self._gradients_applied is False:
+      raise ValueError(
+          "get_transfer_stats() should be called after apply_gradients().")
+    return dict(self._transfer_stats)
+
   def get_chief_queue_runner(self):
     """Returns the QueueRunner for the chief to execute.
 
@@ -23,7 +23,9 @@ import time
 import portpicker
 
 from tensorflow.python.framework import constant_op
+from tensorflow.python.framework import dtypes
 from tensorflow.python.framework import ops
+from tensorflow.python.ops import array_ops
 from tensorflow.python.ops import variables
 from tensorflow.python.platform import test
 from tensorflow.python.training import gradient_descent
@@ -107,6 +109,49 @@ def get_workers(num_workers, replicas_to_aggregate, workers):
   return sessions, graphs, train_ops
 
 
+def get_compressed_workers(num_workers, workers, **kwargs):
+  sessions = []
+  graphs = []
+  train_ops = []
+  for worker_id in range(num_workers):
+    graph = ops.Graph()
+    is_chief = (worker_id == 0)
+    with graph.as_default():
+      with ops.device("/job:ps/task:0"):
+        global_step = variables.Variable(0, name="global_step", trainable=False)
+        var_0 = variables.Variable(0.0, name="v0")
+        var_1 = variables.Variable([1.0, 2.0], name="v1")
+
+      with ops.device("/job:worker/task:" + str(worker_id)):
+        grads_0 = constant_op.constant(0.1 + worker_id * 0.2)
+        grads_1 = constant_op.constant([0.9 + worker_id * 0.2, -0.05])
+        sgd_opt = gradient_descent.GradientDescentOptimizer(2.0)
+        sync_rep_opt = training.SyncReplicasOptimizer(
+            sgd_opt,
+            replicas_to_aggregate=num_workers,
+            total_num_replicas=num_workers,
+            **kwargs)
+        train_op = [
+            sync_rep_opt.apply_gradients(
+                zip([grads_0, grads_1], [var_0, var_1]),
+                global_step=global_step),
+            sync_rep_opt.get_transfer_stats()
+        ]
+        sync_replicas_hook = sync_rep_opt.make_session_run_hook(
+            is_chief, num_tokens=num_workers)
+
+      session = training.MonitoredTrainingSession(
+          master=workers[worker_id].target,
+          is_chief=is_chief,
+          hooks=[sync_replicas_hook])
+
+    sessions.append(session)
+    graphs.append(graph)
+    train_ops.append(train_op)
+
+  return sessions, graphs, train_ops
+
+
 class SyncReplicasOptimizerTest(test.TestCase):
 
   def _run(self, train_op, sess):
@@ -277,6 +322,147 @@ class SyncReplicasOptimizerTest(test.TestCase):
     self.assertAllClose(-1.2 - (0.9 + 1.1) / 2 * 2.0,
                         sessions[1].run(var_1_g_1))
 
+  def test2WorkersCompressed(self):
+    num_workers = 2
+    workers, _ = create_local_cluster(num_workers=num_workers, num_ps=1)
+
+    # v0 and v1 share a bucket, of which only the 2 largest entries are sent.
+    sessions, graphs, train_ops = get_compressed_workers(
+        num_workers, workers, bucket_size_bytes=1024, compress_fp16=True,
+        top_k_ratio=0.7)
+
+    _, stats = sessions[0].run(train_ops[0])
+    sessions[1].run(train_ops[1])
+
+    var_0_g_1 = graphs[1].get_tensor_by_name("v0:0")
+    var_1_g_1 = graphs[1].get_tensor_by_name("v1:0")
+    global_step = graphs[1].get_tensor_by_name("global_step:0")
+    while sessions[1].run(global_step) != 1:
+      time.sleep(0.01)
+
+    # The -0.05 entry is kept in the residuals, and float16 is only accurate
+    # to about 1e-3.
+    self.assertAllClose(
+        0 - (0.1 + 0.3) / 2 * 2.0, sessions[1].run(var_0_g_1), atol=1e-3)
+    self.assertAllClose(
+        [1 - (0.9 + 1.1) / 2 * 2.0, 2.0], sessions[1].run(var_1_g_1),
+        atol=1e-3)
+    self.assertEqual(1, stats["num_pushes"])
+    self.assertEqual(12, stats["gradient_bytes"])
+    self.assertEqual(6, stats["fp16_saved_bytes"])
+    self.assertEqual(2 * (2 + 4), stats["sent_bytes"])
+    # The 2 values and their indices take as many bytes as the 3 float32
+    # values would have, and more than the 3 float16 values.
+    self.assertEqual(0, stats["top_k_saved_bytes"])
+
+  def test2WorkersTopKDisjointIndices(self):
+    num_workers = 2
+    workers, _ = create_local_cluster(num_workers=num_workers, num_ps=1)
+
+    sessions = []
+    graphs = []
+    train_ops = []
+    for worker_id in range(num_workers):
+      graph = ops.Graph()
+      is_chief = (worker_id == 0)
+      with graph.as_default():
+        with ops.device("/job:ps/task:0"):
+          global_step = variables.Variable(
+              0, name="global_step", trainable=False)
+          var = variables.Variable(array_ops.zeros([4]), name="v")
+        with ops.device("/job:worker/task:" + str(worker_id)):
+          # Each worker only sends its single largest entry, and the two
+          # workers send different ones.
+          grads = array_ops.one_hot(2 * worker_id, 4) * (1.0 + worker_id)
+          sync_rep_opt = training.SyncReplicasOptimizer(
+              gradient_descent.GradientDescentOptimizer(2.0),
+              replicas_to_aggregate=num_workers,
+              total_num_replicas=num_workers,
+              top_k_ratio=0.25)
+          train_op = sync_rep_opt.apply_gradients(
+              [(grads, var)], global_step=global_step)
+          sync_replicas_hook = sync_rep_opt.make_session_run_hook(
+              is_chief, num_tokens=num_workers)
+        sessions.append(training.MonitoredTrainingSession(
+            master=workers[worker_id].target,
+            is_chief=is_chief,
+            hooks=[sync_replicas_hook]))
+      graphs.append(graph)
+      train_ops.append(train_op)
+
+    sessions[0].run(train_ops[0])
+    sessions[1].run(train_ops[1])
+
+    var_g_1 = graphs[1].get_tensor_by_name("v:0")
+    global_step = graphs[1].get_tensor_by_name("global_step:0")
+    while sessions[1].run(global_step) != 1:
+      time.sleep(0.01)
+    # The update is the dense mean [0.5, 0, 1, 0] of the gradients, not the
+    # mean over the workers that sent each entry.
+    self.assertAllClose([-1.0, 0.0, -2.0, 0.0], sessions[1].run(var_g_1))
+
+
+class SyncReplicasOptimizerTransferStatsTest(test.TestCase):
+
+  def _stats(self, grads_and_vars, **kwargs):
+    opt = training.SyncReplicasOptimizer(
+        opt=gradient_descent.GradientDescentOptimizer(1.0),
+        replicas_to_aggregate=1,
+        total_num_replicas=1,
+        **kwargs)
+    global_step = variables.Variable(0, name="global_step", trainable=False)
+    opt.apply_gradients(grads_and_vars, global_step=global_step)
+    with self.test_session() as sess:
+      return sess.run(opt.get_transfer_stats())
+
+  def testNoCompression(self):
+    v = variables.Variable(array_ops.zeros([100]))
+    v_sparse = variables.Variable(array_ops.zeros([10, 3]))
+    grads_sparse = ops.IndexedSlices(
+        array_ops.ones([2, 3]), constant_op.constant([1, 4]),
+        constant_op.constant([10, 3]))
+    stats = self._stats([(array_ops.ones([100]), v), (grads_sparse, v_sparse)])
+    self.assertEqual(2, stats["num_pushes"])
+    self.assertEqual(400 + 24 + 8, stats["gradient_bytes"])
+    self.assertEqual(400 + 24 + 8, stats["sent_bytes"])
+    self.assertEqual(0, stats["fp16_saved_bytes"])
+    self.assertEqual(0, stats["top_k_saved_bytes"])
+
+  def testBuckets(self):
+    var_list = [variables.Variable(array_ops.zeros([10])) for _ in range(5)]
+    grads = [array_ops.ones([10]) for _ in range(5)]
+    stats = self._stats(zip(grads, var_list), bucket_size_bytes=80)
+    self.assertEqual(3, stats["num_pushes"])
+    self.assertEqual(200, stats["sent_bytes"])
+
+  def testFp16AndTopK(self):
+    v = variables.Variable(array_ops.zeros([100]))
+    v_double = variables.Variable(array_ops.zeros([10], dtype=dtypes.float64))
+    stats = self._stats(
+        [(array_ops.ones([100]), v),
+         (array_ops.ones([10], dtype=dtypes.float64), v_double)],
+        compress_fp16=True, top_k_ratio=0.1)
+    self.assertEqual(2, stats["num_pushes"])
+    self.assertEqual(400 + 80, stats["gradient_bytes"])
+    self.assertEqual(200 + 60, stats["fp16_saved_bytes"])
+    # 10 and 1 float16 values, with their int32 indices.
+    self.assertEqual(10 * (2 + 4) + 1 * (2 + 4), stats["sent_bytes"])
+    self.assertEqual(200 - 60 + 20 - 6, stats["top_k_saved_bytes"])
+
+  def testErrorIfCalledBeforeApplyGradients(self):
+    opt = training.SyncReplicasOptimizer(
+        opt=gradient_descent.GradientDescentOptimizer(1.0),
+        replicas_to_aggregate=1)
+    with self.assertRaisesRegexp(ValueError, "after apply_gradients"):
+      opt.get_transfer_stats()
+
+  def testInvalidOptions(self):
+    sgd_opt = gradient_descent.GradientDescentOptimizer(1.0)
+    with self.assertRaisesRegexp(ValueError, "bucket_size_bytes"):
+      training.SyncReplicasOptimizer(sgd_opt, 1, bucket_size_bytes=0)
+    with self.assertRaisesRegexp(ValueError, "top_k_ratio"):
+      training.SyncReplicasOptimizer(sgd_opt, 1, top_k_ratio=1.5)
+
 
 class SyncReplicasOptimizerHookTest(test.TestCase):
 
@@ -29,6 +29,7 @@ See the @{$python/train} guide.
 @@ProximalAdagradOptimizer
 @@RMSPropOptimizer
 @@gradients
+@@GradientBuilder
 @@AggregationMethod
 @@stop_gradient
 @@hessians
@@ -54,6 +55,7 @@ See the @{$python/train} guide.
 @@ClusterSpec
 @@replica_device_setter
 @@MonitoredTrainingSession
+@@repeat_train_step
 @@MonitoredSession
 @@SingularMonitoredSession
 @@Scaffold
@@ -145,6 +147,7 @@ from tensorflow.python.training.basic_loops import basic_train_loop
 from tensorflow.python.training.device_setter import replica_device_setter
 from tensorflow.python.training.monitored_session import Scaffold
 from tensorflow.python.training.monitored_session import MonitoredTrainingSession
+from tensorflow.python.training.monitored_session import repeat_train_step
 from tensorflow.python.training.monitored_session import SessionCreator
 from tensorflow.python.training.monitored_session import ChiefSessionCreator
 from tensorflow.python.training.monitored_session import WorkerSessionCreator
@@ -66,6 +66,33 @@ limitations under the License.
   $result = output_map.release();
 }
 
+%typemap(out) const tensorflow::checkpoint::CheckpointReader::VarToDataTypeMap& {
+  tensorflow::Safe_PyObjectPtr output_map(tensorflow::make_safe(PyDict_New()));
+  for (auto v : *$1) {
+%#if PY_MAJOR_VERSION >= 3
+    tensorflow::Safe_PyObjectPtr key(
+        tensorflow::make_safe(PyUnicode_FromStringAndSize(v.first.c_str(),
+            v.first.size())));
+    tensorflow::Safe_PyObjectPtr value(
+        tensorflow::make_safe(PyLong_FromLong(v.second)));
+%#else
+    tensorflow::Safe_PyObjectPtr key(
+        tensorflow::make_safe(PyString_FromStringAndSize(v.first.c_str(),
+            v.first.size())));
+    tensorflow::Safe_PyObjectPtr value(
+        tensorflow::make_safe(PyInt_FromLong(v.second)));
+%#endif
+    if (!key || !value) {
+      SWIG_fail;
+    }
+    if (PyDict_SetItem(output_map.get(), key.get(), value.get()) == -1) {
+      SWIG_fail;
+    }
+  }
+
+  $result = output_map.release();
+}
+
 %{
 static PyObject* CheckpointReader_GetTensor(
       tensorflow::checkpoint::CheckpointReader* reader,
@@ -85,12 +112,104 @@ static PyObject* CheckpointReader_GetTensor(
 }
 %}
 
-// Wrap this function.
+%{
+// Converts a sequence of Python integers.  Returns false with a Python
+// exception set on failure.
+static bool CheckpointReader_Int64List(PyObject* seq,
+                                       std::vector<tensorflow::int64>* out) {
+  tensorflow::Safe_PyObjectPtr fast(tensorflow::make_safe(
+      PySequence_Fast(seq, "Expected a sequence of integers")));
+  if (!fast) {
+    return false;
+  }
+  const Py_ssize_t n = PySequence_Fast_GET_SIZE(fast.get());
+  for (Py_ssize_t i = 0; i < n; ++i) {
+    const long long value =
+        PyLong_AsLongLong(PySequence_Fast_GET_ITEM(fast.get(), i));
+    if (value == -1 && PyErr_Occurred()) {
+      return false;
+    }
+    out->push_back(value);
+  }
+  return true;
+}
+
+static PyObject* CheckpointReader_GetTensorSlice(
+      tensorflow::checkpoint::CheckpointReader* reader,
+      const string& name,
+      PyObject* py_begin,
+      PyObject* py_size,
+      TF_Status* out_status) {
+  PyObject* py_obj = Py_None;
+  std::vector<tensorflow::int64> begin;
+  std::vector<tensorflow::int64> size;
+  if (!CheckpointReader_Int64List(py_begin, &begin) ||
+      !CheckpointReader_Int64List(py_size, &size)) {
+    return nullptr;
+  }
+  std::unique_ptr<tensorflow::Tensor> tensor;
+  reader->GetTensorSlice(name, begin, size, &tensor, out_status);
+  if (TF_GetCode(out_status) == TF_OK) {
+    tensorflow::Status status =
+        tensorflow::ConvertTensorToNdarray(*tensor.get(), &py_obj);
+    if (!status.ok()) {
+      Set_TF_Status_from_Status(out_status, status);
+    }
+  }
+  return py_obj;
+}
+
+// Returns a tuple (filename, offset, dtype enum, list of dimensions).
+static PyObject* CheckpointReader_GetTensorDataLocation(
+      tensorflow::checkpoint::CheckpointReader* reader,
+      const string& name,
+      TF_Status* out_status) {
+  string filename;
+  tensorflow::int64 offset = 0;
+  tensorflow::DataType dtype;
+  tensorflow::TensorShape shape;
+  reader->GetTensorDataLocation(name, &filename, &offset, &dtype, &shape,
+                                out_status);
+  if (TF_GetCode(out_status) != TF_OK) {
+    return Py_None;
+  }
+  tensorflow::Safe_PyObjectPtr dims(
+      tensorflow::make_safe(PyList_New(shape.dims())));
+  if (!dims) {
+    return nullptr;
+  }
+  for (int i = 0; i < shape.dims(); ++i) {
+    PyObject* dim = PyLong_FromLongLong(shape.dim_size(i));
+    if (dim == nullptr) {
+      return nullptr;
+    }
+    PyList_SET_ITEM(dims.get(), i, dim);
+  }
+  return Py_BuildValue("(s#LiO)", filename.data(),
+                       static_cast<int>(filename.size()),
+                       static_cast<long long>(offset),
+                       static_cast<int>(dtype), dims.get());
+}
+%}
+
+// Wrap these functions.
 PyObject* CheckpointReader_GetTensor(
     tensorflow::checkpoint::CheckpointReader* reader,
     const string& name,
     TF_Status* out_status);
 
+PyObject* CheckpointReader_GetTensorSlice(
+    tensorflow::checkpoint::CheckpointReader* reader,
+    const string& name,
+    PyObject* py_begin,
+    PyObject* py_size,
+    TF_Status* out_status);
+
+PyObject* CheckpointReader_GetTensorDataLocation(
+    tensorflow::checkpoint::CheckpointReader* reader,
+    const string& name,
+    TF_Status* out_status);
+
 %ignoreall
 
 %unignore tensorflow;
@@ -100,8 +219,11 @@ PyObject* CheckpointReader_GetTensor(
 %unignore tensorflow::checkpoint::CheckpointReader::~CheckpointReader;
 %rename("debug_string") tensorflow::checkpoint::CheckpointReader::DebugString;
 %rename("get_variable_to_shape_map") tensorflow::checkpoint::CheckpointReader::GetVariableToShapeMap;
+%rename("_GetVariableToDataTypeMap") tensorflow::checkpoint::CheckpointReader::GetVariableToDataTypeMap;
 %rename("_HasTensor") tensorflow::checkpoint::CheckpointReader::HasTensor;
 %unignore CheckpointReader_GetTensor;
+%unignore CheckpointReader_GetTensorSlice;
+%unignore CheckpointReader_GetTensorDataLocation;
 
 %extend tensorflow::checkpoint::CheckpointReader {
 %insert("python") %{
@@ -109,12 +231,84 @@ PyObject* CheckpointReader_GetTensor(
     from tensorflow.python.util import compat
     return self._HasTensor(compat.as_bytes(tensor_str))
 
+  def get_variable_to_dtype_map(self):
+    """Returns a dictionary from tensor names to their `DType`."""
+    from tensorflow.python.framework import dtypes
+    return {name: dtypes.DType(type_enum)
+            for name, type_enum in self._GetVariableToDataTypeMap().items()}
+
   def get_tensor(self, tensor_str):
     from tensorflow.python.framework import errors
     with errors.raise_exception_on_not_ok_status() as status:
       from tensorflow.python.util import compat
       return CheckpointReader_GetTensor(self, compat.as_bytes(tensor_str),
                                         status)
+
+  def get_slice(self, tensor_str, begin, size):
+    """Returns a slice of a tensor as a NumPy array.
+
+    Only the requested part of the tensor is read when the checkpoint layout
+    allows it, e.g. for ranges of rows of a V2 checkpoint.
+
+    Args:
+      tensor_str: Name of the tensor.
+      begin: The index of the first element of the slice in each dimension.
+      size: The number of elements of the slice in each dimension. -1 selects
+        all the remaining elements of a dimension.
+
+    Returns:
+      A NumPy array.
+    """
+    from tensorflow.python.framework import errors
+    from tensorflow.python.util import compat
+    try:
+      with errors.raise_exception_on_not_ok_status() as status:
+        return CheckpointReader_GetTensorSlice(
+            self, compat.as_bytes(tensor_str), list(begin), list(size), status)
+    except errors.UnimplementedError:
+      # V1 checkpoints can only be read whole.
+      value = self.get_tensor(tensor_str)
+      sliced = value[tuple(slice(b, None if s == -1 else b + s)
+                           for b, s in zip(begin, size))]
+      # The slice is a view of `value`, which only needs copying if it is
+      # smaller.
+      return value if sliced.shape == value.shape else sliced.copy()
+
+  def get_tensor_view(self, tensor_str):
+    """Returns a read-only, memory-mapped NumPy view of a tensor.
+
+    Only the pages of the data file that are accessed are read, so inspecting
+    part of a large tensor is cheap. Tensors that cannot be mapped (string
+    tensors, tensors saved as several slices, V1 checkpoints and checkpoints
+    on non-local file systems) are read whole, as by `get_tensor`. Unlike
+    `get_tensor`, the checksum of a mapped tensor is not verified.
+
+    Args:
+      tensor_str: Name of the tensor.
+
+    Returns:
+      A read-only NumPy array.
+    """
+    import os
+    import numpy as np
+    from tensorflow.python.framework import dtypes
+    from tensorflow.python.framework import errors
+    from tensorflow.python.util import compat
+    try:
+      with errors.raise_exception_on_not_ok_status() as status:
+        location = CheckpointReader_GetTensorDataLocation(
+            self, compat.as_bytes(tensor_str), status)
+    except (errors.UnimplementedError, errors.InvalidArgumentError):
+      location = None
+    if location is not None:
+      filename, offset, dtype, shape = location
+      if os.path.isfile(filename) and np.prod(shape, dtype=np.int64) > 0:
+        return np.memmap(filename, dtype=dtypes.as_dtype(dtype).as_numpy_dtype,
+                         mode="r", offset=offset, shape=tuple(shape))
+    value = self.get_tensor(tensor_str)
+    if isinstance(value, np.ndarray):
+      value.flags.writeable = False
+    return value
 %}
 }
 
@@ -55,6 +55,8 @@ else:
   REQUIRED_PACKAGES.append('wheel')
   # mock comes with unittest.mock for python3, need to install for python2
   REQUIRED_PACKAGES.append('mock >= 2.0.0')
+  # concurrent.futures (used by Session.run_async) is built into python3.
+  REQUIRED_PACKAGES.append('futures >= 3.1.1')
 
 # pylint: disable=line-too-long
 CONSOLE_SCRIPTS = [